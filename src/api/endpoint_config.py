@@ -4,7 +4,7 @@ Stores proper formats, parameters, and examples for all API endpoints
 """
 
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 
 class EndpointStatus(Enum):
@@ -13,6 +13,33 @@ class EndpointStatus(Enum):
     PARTIAL = "⚠️ PARTIAL"
     UNTESTED = "❓ UNTESTED"
 
+@dataclass
+class TableMapping:
+    """Staging table the records of an endpoint response are written to"""
+    table: str
+    record_path: str  # dotted path to the records; "[]" after a segment fans out over that list
+    columns: Dict[str, str]  # column: source ("key" in the record, "@param" call parameter, "^key" parent record key)
+    conflict_keys: List[str]
+    column_types: Dict[str, str] = field(default_factory=dict)  # column: 'int', 'date', 'time' or 'json'
+    conflict_where: Optional[str] = None  # predicate of a partial unique index
+    update_columns: Optional[List[str]] = None  # columns updated on conflict (None = all but the keys)
+    required: List[str] = field(default_factory=list)  # columns a record must have to be written
+    raw_payload: bool = True  # store each record through raw_data_hash
+
+@dataclass
+class LoaderSpec:
+    """How the shared loader engine (etl/loader_engine.py) loads an endpoint"""
+    tables: List[TableMapping]
+    fan_out_query: Optional[str] = None  # SQL returning one row of call parameters per call
+    skip_if_present: bool = False  # skip calls whose parameters already have rows in the first table
+    final_after: Optional[str] = None  # response date (dotted path); the call is final once it is past
+
+@dataclass
+class CallCost:
+    """What one call of an endpoint spans, for choosing the endpoints with the fewest calls"""
+    per: str  # scope of one call: 'global', 'country', 'league', 'league_season', 'team_season' or 'match'
+    covers: List[str] = field(default_factory=list)  # entity kinds one call provides, e.g. 'player_match'
+
 @dataclass
 class EndpointConfig:
     """Configuration for a single API endpoint"""
@@ -25,6 +52,8 @@ class EndpointConfig:
     example_request: Dict[str, Any]
     example_response: Dict[str, Any]
     notes: str = ""
+    loader: Optional[LoaderSpec] = None  # declared for endpoints loaded by the loader engine
+    cost: Optional[CallCost] = None  # call scope and coverage, used by the coverage planner
 
 # FBR API Endpoint Configurations
 ENDPOINT_CONFIGS = {
@@ -44,7 +73,8 @@ ENDPOINT_CONFIGS = {
             "#_players": 215,
             "national_teams": ["M", "F"]
         },
-        notes="Returns 225 countries"
+        notes="Returns 225 countries",
+        cost=CallCost(per="global", covers=["country"])
     ),
     
     "leagues": EndpointConfig(
@@ -68,7 +98,8 @@ ENDPOINT_CONFIGS = {
                 }
             ]
         },
-        notes="Returns leagues by country code"
+        notes="Returns leagues by country code",
+        cost=CallCost(per="country", covers=["league"])
     ),
     
     "league_seasons": EndpointConfig(
@@ -103,7 +134,8 @@ ENDPOINT_CONFIGS = {
                 }
             ]
         },
-        notes="Returns seasons for a specific league with champion and top scorer data"
+        notes="Returns seasons for a specific league with champion and top scorer data",
+        cost=CallCost(per="league", covers=["league_season"])
     ),
     
     "league_season_details": EndpointConfig(
@@ -131,7 +163,27 @@ ENDPOINT_CONFIGS = {
                 ]
             }
         },
-        notes="Returns metadata for specific league-season combination including dates, type, and rounds. Works for some leagues (e.g., Champions League) but returns 500 errors for others (e.g., Premier League)"
+        notes="Returns metadata for specific league-season combination including dates, type, and rounds. Works for some leagues (e.g., Champions League) but returns 500 errors for others (e.g., Premier League)",
+        loader=LoaderSpec(
+            tables=[TableMapping(
+                table="staging.league_season_details",
+                record_path="data",
+                columns={
+                    "league_id": "lg_id",
+                    "season_id": "season_id",
+                    "league_start": "league_start",
+                    "league_end": "league_end",
+                    "league_type": "league_type",
+                    "has_adv_stats": "has_adv_stats",
+                    "rounds": "rounds"
+                },
+                conflict_keys=["league_id", "season_id"],
+                column_types={"league_start": "date", "league_end": "date", "rounds": "json"},
+                required=["league_id"]
+            )],
+            final_after="data.league_end"
+        ),
+        cost=CallCost(per="league_season", covers=["league_season"])
     ),
     
     "league_standings": EndpointConfig(
@@ -143,7 +195,36 @@ ENDPOINT_CONFIGS = {
         description="Returns league standings table",
         example_request={"league_id": 9, "season_id": "2024-2025"},
         example_response={"error": "500 Server Error"},
-        notes="Consistently returns 500 Server Error - server-side issue"
+        notes="Consistently returns 500 Server Error - server-side issue",
+        loader=LoaderSpec(
+            tables=[TableMapping(
+                table="staging.league_standings",
+                record_path="data[].standings",
+                columns={
+                    "league_id": "@league_id",
+                    "season_id": "@season_id",
+                    "standings_type": "^standings_type",
+                    "position": "rk",
+                    "team_id": "team_id",
+                    "team_name": "team_name",
+                    "played": "mp",
+                    "won": "w",
+                    "drawn": "d",
+                    "lost": "l",
+                    "goals_for": "gf",
+                    "goals_against": "ga",
+                    "goal_difference": "gd",  # kept as text for +/- values
+                    "points": "pts",
+                    "top_team_scorer": "top_team_scorer"
+                },
+                conflict_keys=["league_id", "season_id", "team_id"],
+                column_types={
+                    "position": "int", "played": "int", "won": "int", "drawn": "int", "lost": "int",
+                    "goals_for": "int", "goals_against": "int", "points": "int", "top_team_scorer": "json"
+                }
+            )]
+        ),
+        cost=CallCost(per="league_season", covers=["team_season"])
     ),
     
     "teams": EndpointConfig(
@@ -158,7 +239,52 @@ ENDPOINT_CONFIGS = {
             "team_roster": [{"player_id": "abc123", "name": "Player Name"}],
             "team_schedule": [{"match_id": "xyz789", "date": "2024-08-16"}]
         },
-        notes="Returns team roster (71 players) and schedule (67 matches)"
+        notes="Returns team roster (71 players) and schedule (67 matches)",
+        loader=LoaderSpec(
+            tables=[
+                TableMapping(
+                    table="staging.team_rosters",
+                    record_path="team_roster.data",
+                    columns={
+                        "team_id": "@team_id",
+                        "player_id": "player_id",
+                        "player_name": "player",
+                        "nationality": "nationality",
+                        "position": "position",
+                        "age": "age",
+                        "matches_played": "mp",
+                        "starts": "starts"
+                    },
+                    conflict_keys=["team_id", "player_id"]
+                ),
+                TableMapping(
+                    table="staging.team_schedules",
+                    record_path="team_schedule.data",
+                    columns={
+                        "team_id": "@team_id",
+                        "match_id": "match_id",
+                        "match_date": "date",
+                        "match_time": "time",
+                        "league_name": "league_name",
+                        "league_id": "league_id",
+                        "opponent": "opponent",
+                        "opponent_id": "opponent_id",
+                        "home_away": "home_away",
+                        "result": "result",
+                        "goals_for": "gf",
+                        "goals_against": "ga",
+                        "attendance": "attendance",
+                        "captain": "captain",
+                        "formation": "formation",
+                        "referee": "referee"
+                    },
+                    conflict_keys=["team_id", "match_id"],
+                    column_types={"match_date": "date", "match_time": "time"}
+                )
+            ],
+            fan_out_query="SELECT DISTINCT team_id FROM staging.team_schedules ORDER BY team_id"
+        ),
+        cost=CallCost(per="team_season", covers=["team_season"])
     ),
     
     "players": EndpointConfig(
@@ -181,7 +307,8 @@ ENDPOINT_CONFIGS = {
             "height": 184.0,
             "weight": 79.0
         },
-        notes="Returns detailed player metadata including positions, nationality, wages"
+        notes="Returns detailed player metadata including positions, nationality, wages",
+        cost=CallCost(per="player", covers=["player"])
     ),
     
     "team_season_stats": EndpointConfig(
@@ -200,7 +327,8 @@ ENDPOINT_CONFIGS = {
                 "passing": {"ttl_pass_cmp": 17066, "pct_pass_cmp": 84.3}
             }
         },
-        notes="Returns comprehensive team statistics including shooting, passing, defense, possession, goalkeeping"
+        notes="Returns comprehensive team statistics including shooting, passing, defense, possession, goalkeeping",
+        cost=CallCost(per="league_season", covers=["team_season"])
     ),
     
     "player_season_stats": EndpointConfig(
@@ -215,7 +343,8 @@ ENDPOINT_CONFIGS = {
             "outfield": [{"meta_data": {"player_id": "abc123"}, "stats": {}}],
             "keepers": [{"meta_data": {"player_id": "def456"}, "stats": {}}]
         },
-        notes="Returns detailed stats including shooting, passing, defense, possession, goalkeeping"
+        notes="Returns detailed stats including shooting, passing, defense, possession, goalkeeping",
+        cost=CallCost(per="team_season", covers=["player_season"])
     ),
     
     "matches": EndpointConfig(
@@ -241,26 +370,43 @@ ENDPOINT_CONFIGS = {
             "attendance": "73,297",
             "referee": "Robert Jones"
         },
-        notes="Returns 380 matches per season"
+        notes="Returns 380 matches per season",
+        cost=CallCost(per="league_season", covers=["match"])
     ),
     
     "all_players_match_stats": EndpointConfig(
         name="All Players Match Stats",
         path="/all-players-match-stats",
         status=EndpointStatus.WORKING,
+        required_params={"league_id": "int", "season_id": "string"},
+        optional_params={},
+        description="Returns player statistics of every player in every match of a league and season",
+        example_request={"league_id": 9, "season_id": "2023-2024"},
+        example_response={
+            "data": [{
+                "meta_data": {"match_id": "404ee5d3", "date": "2019-08-10", "home_team_id": "361ca564"},
+                "players": [{"meta_data": {"player_id": "8b04d6c1", "min": 90}, "stats": {"stats": {"gls": 0}}}]
+            }]
+        },
+        notes="One call covers every match of a league-season (8,000+ player rows); "
+              "season totals aggregate from its match rows",
+        cost=CallCost(per="league_season", covers=["player_match", "player_season"])
+    ),
+    
+    "player_match_stats": EndpointConfig(
+        name="Player Match Stats",
+        path="/player-match-stats",
+        status=EndpointStatus.WORKING,
         required_params={"match_id": "string"},
         optional_params={},
-        description="Returns comprehensive player statistics for all players in a match",
-        example_request={"match_id": "cc5b4244"},
+        description="Returns player statistics of every player in a single match",
+        example_request={"match_id": "404ee5d3"},
         example_response={
-            "summary": [{"player_id": "abc123", "name": "Player Name"}],
-            "passing": [{"player_id": "abc123", "passes": 45}],
-            "defense": [{"player_id": "abc123", "tackles": 3}],
-            "possession": [{"player_id": "abc123", "touches": 67}],
-            "misc": [{"player_id": "abc123", "fouls": 1}],
-            "keepers": [{"player_id": "def456", "saves": 4}]
+            "data": [{"meta_data": {"player_id": "8b04d6c1", "team_id": "361ca564", "min": 90},
+                      "stats": {"stats": {"gls": 0}, "passing": {"pass_cmp": 45}}}]
         },
-        notes="Returns comprehensive player statistics across multiple categories"
+        notes="One call per match; only needed for matches a league-season call did not cover",
+        cost=CallCost(per="match", covers=["player_match"])
     )
 }
 
@@ -268,6 +414,13 @@ def get_endpoint_config(endpoint_name: str) -> Optional[EndpointConfig]:
     """Get configuration for a specific endpoint"""
     return ENDPOINT_CONFIGS.get(endpoint_name)
 
+def get_covering_endpoints(entity: str) -> List[EndpointConfig]:
+    """Working endpoints whose calls provide an entity kind (e.g. 'player_match')"""
+    return [
+        config for config in ENDPOINT_CONFIGS.values()
+        if config.cost and entity in config.cost.covers and config.status == EndpointStatus.WORKING
+    ]
+
 def get_working_endpoints() -> List[EndpointConfig]:
     """Get all working endpoints"""
     return [config for config in ENDPOINT_CONFIGS.values() if config.status == EndpointStatus.WORKING]
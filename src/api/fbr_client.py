@@ -11,59 +11,88 @@ import os
 from typing import Dict, Any, Optional, List
 from dotenv import load_dotenv
 from .endpoint_config import get_endpoint_config, format_api_call
+from utils.config_cache import cached_config
+from utils.progress import get_progress_reporter
+from utils.run_budget import get_run_budget
+from utils.tracing import get_tracer
+from utils.profiling import get_profiler
 
 load_dotenv()
 
+def load_api_config(config_path: str) -> Dict[str, Any]:
+    """Parse the API configuration file"""
+    with open(config_path, 'r') as f:
+        return yaml.safe_load(f)
+
 class FBRClient:
     """Client for interacting with the FBR API"""
     
+    # Shared by all clients in the process, so loaders that each create their
+    # own client still respect the rate limit between back-to-back calls
+    last_request_time = 0
+    
+    # HTTP sessions per API key, shared so keep-alive connections stay warm
+    # across the many short-lived clients the loaders create
+    sessions: Dict[str, requests.Session] = {}
+    
     def __init__(self, config_path: str = "config/config.yaml"):
         """Initialize the FBR API client"""
         self.api_key = os.getenv("FBR_API_KEY")
         if not self.api_key:
             raise ValueError("FBR_API_KEY environment variable not set")
         
-        # Load configuration
-        with open(config_path, 'r') as f:
-            self.config = yaml.safe_load(f)
+        # Load configuration (parsed once per process, again if the file changes)
+        self.config = cached_config("API config", config_path, load_api_config)
         
         self.base_url = self.config['api']['base_url']
         self.rate_limit_delay = self.config['api']['rate_limit_delay']
         self.timeout = self.config['api']['timeout']
         
-        self.session = requests.Session()
-        self.session.headers.update({
-            'X-API-Key': self.api_key,
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
-        })
-        
-        self.last_request_time = 0
+        if self.api_key not in FBRClient.sessions:
+            session = requests.Session()
+            session.headers.update({
+                'X-API-Key': self.api_key,
+                'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+            })
+            FBRClient.sessions[self.api_key] = session
+        self.session = FBRClient.sessions[self.api_key]
     
     def _rate_limit(self):
         """Ensure rate limiting compliance"""
         current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        time_since_last = current_time - FBRClient.last_request_time
         
         if time_since_last < self.rate_limit_delay:
             sleep_time = self.rate_limit_delay - time_since_last
             time.sleep(sleep_time)
         
-        self.last_request_time = time.time()
+        FBRClient.last_request_time = time.time()
     
     def _make_request(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a rate-limited request to the FBR API"""
-        self._rate_limit()
-        
-        # Add trailing slash to handle redirects properly
-        url = f"{self.base_url}/{endpoint}/"
-        
-        try:
-            response = self.session.get(url, params=params, timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"API request failed: {e}")
-            return {"error": str(e)}
+        tracer = get_tracer()
+        with tracer.span("http.request", endpoint=endpoint, **(params or {})):
+            with tracer.span("http.rate_limit_sleep"), get_profiler().paused():
+                self._rate_limit()
+            get_progress_reporter().api_call()
+            get_run_budget().api_call()
+            
+            # Add trailing slash to handle redirects properly
+            url = f"{self.base_url}/{endpoint}/"
+            
+            try:
+                with tracer.span("http.get"):
+                    response = self.session.get(url, params=params, timeout=self.timeout)
+                    response.raise_for_status()
+                with tracer.span("http.json_parse"):
+                    return response.json()
+            except requests.exceptions.RequestException as e:
+                print(f"API request failed: {e}")
+                return {"error": str(e)}
+    
+    def get_endpoint(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Get any endpoint by path name (used by the loader engine)"""
+        return self._make_request(endpoint, params or None)
     
     def get_countries(self, country: Optional[str] = None) -> Dict[str, Any]:
         """Get countries data"""
@@ -181,11 +210,16 @@ class FBRClient:
             params["team_id"] = team_id
         return self._make_request("matches", params)
     
-    def get_match_stats(self, match_id: str) -> Dict[str, Any]:
-        """Get match stats for all players in a specific match"""
-        params = {"match_id": match_id}
+    def get_match_stats(self, league_id: int, season_id: str) -> Dict[str, Any]:
+        """Get player stats for every match of a league and season (one call per league-season)"""
+        params = {"league_id": league_id, "season_id": season_id}
         return self._make_request("all-players-match-stats", params)
     
+    def get_player_match_stats(self, match_id: str) -> Dict[str, Any]:
+        """Get player stats for a single match"""
+        params = {"match_id": match_id}
+        return self._make_request("player-match-stats", params)
+    
     def test_connection(self) -> bool:
         """Test API connection by making a simple request"""
         try:
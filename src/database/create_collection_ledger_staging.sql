@@ -0,0 +1,85 @@
+-- Collection Ledger Staging Table
+-- One row per API call unit (endpoint + params) recording when and how it was last collected
+-- Loaders plan their work from this table in a single query instead of probing each unit
+
+-- Create staging schema if it doesn't exist
+CREATE SCHEMA IF NOT EXISTS staging;
+
+-- Create collection ledger table
+CREATE TABLE IF NOT EXISTS staging.collection_ledger (
+    -- Primary key
+    id SERIAL PRIMARY KEY,
+
+    -- Call unit
+    endpoint VARCHAR(50) NOT NULL,  -- blacklist naming, e.g. 'matches', 'league-seasons'
+    params JSONB NOT NULL,          -- e.g. {"league_id": 9, "season_id": "2023-2024"}
+
+    -- Last fetch
+    last_fetched_at TIMESTAMP WITH TIME ZONE,
+    response_digest BYTEA,          -- SHA-256 of the response data
+    row_count INTEGER,
+    status VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (status IN ('pending', 'ok', 'empty', 'error')),
+    complete BOOLEAN NOT NULL DEFAULT FALSE,
+    error_message TEXT,
+
+    -- Audit fields
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+
+    -- One row per call unit
+    CONSTRAINT uk_collection_ledger_unit UNIQUE (endpoint, params)
+);
+
+-- Add comments
+COMMENT ON TABLE staging.collection_ledger IS 'Per-unit collection state, loaded once per run to plan API calls';
+COMMENT ON COLUMN staging.collection_ledger.endpoint IS 'API endpoint name as used in the endpoint blacklist';
+COMMENT ON COLUMN staging.collection_ledger.params IS 'Call parameters; integer IDs as numbers, season and team IDs as strings';
+COMMENT ON COLUMN staging.collection_ledger.response_digest IS 'SHA-256 of the response data, used to skip rewriting unchanged responses';
+COMMENT ON COLUMN staging.collection_ledger.row_count IS 'Number of elements in the last response';
+COMMENT ON COLUMN staging.collection_ledger.status IS 'Outcome of the last fetch: ok, empty or error';
+COMMENT ON COLUMN staging.collection_ledger.complete IS 'True when the unit needs no further fetching (e.g. every match in the response has a result)';
+
+-- Create indexes for performance
+CREATE INDEX IF NOT EXISTS idx_collection_ledger_endpoint ON staging.collection_ledger(endpoint);
+CREATE INDEX IF NOT EXISTS idx_collection_ledger_last_fetched_at ON staging.collection_ledger(last_fetched_at);
+
+-- Create trigger to update updated_at timestamp
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_collection_ledger_updated_at ON staging.collection_ledger;
+CREATE TRIGGER update_collection_ledger_updated_at
+    BEFORE UPDATE ON staging.collection_ledger
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+-- Seed the ledger from data collected before it existed
+-- League matches: complete once every match has an ID and a result
+INSERT INTO staging.collection_ledger (endpoint, params, last_fetched_at, row_count, status, complete)
+SELECT 'matches',
+       jsonb_build_object('league_id', league_id, 'season_id', season_id),
+       MAX(updated_at),
+       COUNT(*),
+       'ok',
+       BOOL_AND(match_id IS NOT NULL AND home_team_score IS NOT NULL)
+FROM staging.league_matches
+GROUP BY league_id, season_id
+ON CONFLICT ON CONSTRAINT uk_collection_ledger_unit DO NOTHING;
+
+-- Team matches: only rows fetched for the team itself, not mirrored ones
+INSERT INTO staging.collection_ledger (endpoint, params, last_fetched_at, row_count, status, complete)
+SELECT 'matches',
+       jsonb_build_object('league_id', league_id, 'season_id', season_id, 'team_id', team_id),
+       MAX(updated_at),
+       COUNT(*),
+       'ok',
+       BOOL_AND(match_id IS NOT NULL AND goals_for IS NOT NULL)
+FROM staging.team_matches
+WHERE is_mirrored = FALSE
+GROUP BY league_id, season_id, team_id
+ON CONFLICT ON CONSTRAINT uk_collection_ledger_unit DO NOTHING;
@@ -0,0 +1,86 @@
+-- Collection Runs Staging Tables
+-- Manifest and checkpointed per-unit state of each collection run
+-- An interrupted run is resumed with --resume <run_id> without repeating finished API calls
+
+-- Create staging schema if it doesn't exist
+CREATE SCHEMA IF NOT EXISTS staging;
+
+-- Create collection runs table
+CREATE TABLE IF NOT EXISTS staging.collection_runs (
+    -- Primary key
+    run_id BIGSERIAL PRIMARY KEY,
+
+    -- Run arguments (scope, countries, time_period, force, full_refresh, delta)
+    args JSONB NOT NULL,
+
+    -- Lifecycle
+    status VARCHAR(20) NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'interrupted', 'failed', 'completed')),
+    started_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    checkpointed_at TIMESTAMP WITH TIME ZONE,
+    finished_at TIMESTAMP WITH TIME ZONE,
+    resume_count INTEGER NOT NULL DEFAULT 0,
+
+    -- Audit fields
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create collection run units table
+CREATE TABLE IF NOT EXISTS staging.collection_run_units (
+    -- Run
+    run_id BIGINT NOT NULL REFERENCES staging.collection_runs(run_id) ON DELETE CASCADE,
+
+    -- Call unit (same naming as staging.collection_ledger)
+    endpoint VARCHAR(50) NOT NULL,
+    params JSONB NOT NULL,
+
+    -- Checkpointed state
+    state VARCHAR(20) NOT NULL DEFAULT 'pending' CHECK (state IN ('pending', 'in_flight', 'done', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error_message TEXT,
+
+    -- Audit fields
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (run_id, endpoint, params)
+);
+
+-- Add comments
+COMMENT ON TABLE staging.collection_runs IS 'One row per collection run, with the arguments needed to resume it';
+COMMENT ON COLUMN staging.collection_runs.args IS 'Collection arguments, reused by --resume';
+COMMENT ON COLUMN staging.collection_runs.status IS 'running, interrupted (Ctrl-C or crash), failed, or completed';
+COMMENT ON COLUMN staging.collection_runs.started_at IS 'Start of the first attempt; ledger fetches after it count as done on resume';
+COMMENT ON COLUMN staging.collection_runs.checkpointed_at IS 'Last time unit states were flushed';
+COMMENT ON TABLE staging.collection_run_units IS 'Run manifest: planned and discovered API call units with their checkpointed state';
+COMMENT ON COLUMN staging.collection_run_units.params IS 'Call parameters; integer IDs as numbers, season and team IDs as strings';
+COMMENT ON COLUMN staging.collection_run_units.state IS 'pending, in_flight (claimed, not finished), done, or failed';
+COMMENT ON COLUMN staging.collection_run_units.attempts IS 'Times the unit was started in this run, across resumes';
+
+-- Create indexes for performance
+CREATE INDEX IF NOT EXISTS idx_collection_runs_status
+ON staging.collection_runs(status);
+
+CREATE INDEX IF NOT EXISTS idx_collection_run_units_state
+ON staging.collection_run_units(run_id, state);
+
+-- Create trigger to update updated_at timestamp
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_collection_runs_updated_at ON staging.collection_runs;
+CREATE TRIGGER update_collection_runs_updated_at
+    BEFORE UPDATE ON staging.collection_runs
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS update_collection_run_units_updated_at ON staging.collection_run_units;
+CREATE TRIGGER update_collection_run_units_updated_at
+    BEFORE UPDATE ON staging.collection_run_units
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
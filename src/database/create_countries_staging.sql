@@ -13,7 +13,7 @@ CREATE TABLE IF NOT EXISTS staging.countries (
     num_clubs INTEGER DEFAULT 0,
     num_players INTEGER DEFAULT 0,
     national_teams TEXT[] DEFAULT '{}',
-    raw_data JSONB NOT NULL,
+    raw_data_hash BYTEA,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -25,8 +25,6 @@ ON staging.countries(country_code);
 CREATE INDEX IF NOT EXISTS idx_countries_governing_body 
 ON staging.countries(governing_body);
 
-CREATE INDEX IF NOT EXISTS idx_countries_raw_data 
-ON staging.countries USING GIN(raw_data);
 
 -- Add comments for documentation
 COMMENT ON TABLE staging.countries IS 
@@ -50,8 +48,8 @@ COMMENT ON COLUMN staging.countries.num_players IS
 COMMENT ON COLUMN staging.countries.national_teams IS 
 'Types of national teams (M for men, F for women)';
 
-COMMENT ON COLUMN staging.countries.raw_data IS 
-'Raw JSON response from API for debugging and data integrity';
+COMMENT ON COLUMN staging.countries.raw_data_hash IS 
+'SHA-256 of the raw API element stored in staging.raw_payloads';
 
 -- Create trigger to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
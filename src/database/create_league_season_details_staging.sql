@@ -19,7 +19,7 @@ CREATE TABLE IF NOT EXISTS staging.league_season_details (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     
     -- Raw API response for debugging/backup
-    raw_data JSONB,
+    raw_data_hash BYTEA,
     
     -- Composite unique constraint
     UNIQUE(league_id, season_id)
@@ -34,7 +34,7 @@ COMMENT ON COLUMN staging.league_season_details.league_end IS 'Last match date f
 COMMENT ON COLUMN staging.league_season_details.league_type IS 'Either cup or league';
 COMMENT ON COLUMN staging.league_season_details.has_adv_stats IS 'Whether advanced stats are available (yes/no)';
 COMMENT ON COLUMN staging.league_season_details.rounds IS 'Array of round names for cup competitions with multiple rounds';
-COMMENT ON COLUMN staging.league_season_details.raw_data IS 'Complete API response JSON for debugging and backup';
+COMMENT ON COLUMN staging.league_season_details.raw_data_hash IS 'SHA-256 of the raw API element stored in staging.raw_payloads';
 
 -- Create indexes for performance
 CREATE INDEX IF NOT EXISTS idx_league_season_details_league_id ON staging.league_season_details(league_id);
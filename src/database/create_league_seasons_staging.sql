@@ -27,7 +27,7 @@ CREATE TABLE staging.league_seasons (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     
     -- Raw API response
-    raw_data JSONB NOT NULL,
+    raw_data_hash BYTEA,
     
     -- Composite unique constraint
     UNIQUE(league_id, season_id)
@@ -47,7 +47,7 @@ COMMENT ON COLUMN staging.league_seasons.num_squads IS 'Number of teams that com
 COMMENT ON COLUMN staging.league_seasons.champion IS 'Name of the team that won the competition';
 COMMENT ON COLUMN staging.league_seasons.top_scorer_player IS 'Name of top scorer(s) - can be single player or array for ties';
 COMMENT ON COLUMN staging.league_seasons.top_scorer_goals IS 'Number of goals scored by top scorer';
-COMMENT ON COLUMN staging.league_seasons.raw_data IS 'Full JSON response from API';
+COMMENT ON COLUMN staging.league_seasons.raw_data_hash IS 'SHA-256 of the raw API element stored in staging.raw_payloads';
 
 -- Create trigger to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
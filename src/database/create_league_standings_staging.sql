@@ -37,7 +37,7 @@ CREATE TABLE IF NOT EXISTS staging.league_standings (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     
     -- Raw API response for debugging/backup
-    raw_data JSONB,
+    raw_data_hash BYTEA,
     
     -- Composite unique constraint
     UNIQUE(league_id, season_id, team_id)
@@ -60,7 +60,7 @@ COMMENT ON COLUMN staging.league_standings.goals_against IS 'Goals conceded by t
 COMMENT ON COLUMN staging.league_standings.goal_difference IS 'Goal difference (goals_for - goals_against)';
 COMMENT ON COLUMN staging.league_standings.points IS 'Total points earned';
 COMMENT ON COLUMN staging.league_standings.top_team_scorer IS 'Nested JSON with top scorer data';
-COMMENT ON COLUMN staging.league_standings.raw_data IS 'Complete API response JSON for debugging and backup';
+COMMENT ON COLUMN staging.league_standings.raw_data_hash IS 'SHA-256 of the raw API element stored in staging.raw_payloads';
 
 -- Create indexes for performance
 CREATE INDEX IF NOT EXISTS idx_league_standings_league_id ON staging.league_standings(league_id);
@@ -15,7 +15,7 @@ CREATE TABLE IF NOT EXISTS staging.leagues (
     first_season VARCHAR(20),
     last_season VARCHAR(20),
     tier VARCHAR(10),
-    raw_data JSONB NOT NULL,
+    raw_data_hash BYTEA,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -33,8 +33,6 @@ ON staging.leagues(league_type);
 CREATE INDEX IF NOT EXISTS idx_leagues_gender 
 ON staging.leagues(gender);
 
-CREATE INDEX IF NOT EXISTS idx_leagues_raw_data 
-ON staging.leagues USING GIN(raw_data);
 
 -- Create unique constraint to prevent duplicates
 CREATE UNIQUE INDEX IF NOT EXISTS idx_leagues_unique 
@@ -68,8 +66,8 @@ COMMENT ON COLUMN staging.leagues.last_season IS
 COMMENT ON COLUMN staging.leagues.tier IS 
 'Level in country football pyramid (1st, 2nd, 3rd, 4th)';
 
-COMMENT ON COLUMN staging.leagues.raw_data IS 
-'Raw JSON response from API for debugging and data integrity';
+COMMENT ON COLUMN staging.leagues.raw_data_hash IS 
+'SHA-256 of the raw API element stored in staging.raw_payloads';
 
 -- Create trigger to update updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
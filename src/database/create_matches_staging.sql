@@ -39,7 +39,7 @@ CREATE TABLE IF NOT EXISTS staging.league_matches (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     
     -- Raw API response for debugging/backup
-    raw_data JSONB
+    raw_data_hash BYTEA
 );
 
 -- Team Matches Staging Table (when team_id is provided)
@@ -78,14 +78,20 @@ CREATE TABLE IF NOT EXISTS staging.team_matches (
     attendance VARCHAR(50),
     referee VARCHAR(200),
     
+    -- Derived from the opponent's response instead of fetched for this team
+    is_mirrored BOOLEAN NOT NULL DEFAULT FALSE,
+    
     -- Audit fields
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     
     -- Raw API response for debugging/backup
-    raw_data JSONB
+    raw_data_hash BYTEA
 );
 
+-- Add columns introduced after the initial release
+ALTER TABLE staging.team_matches ADD COLUMN IF NOT EXISTS is_mirrored BOOLEAN NOT NULL DEFAULT FALSE;
+
 -- Add comments for league_matches table
 COMMENT ON TABLE staging.league_matches IS 'Staging table for league match data from /matches endpoint (when team_id is not provided)';
 COMMENT ON COLUMN staging.league_matches.match_id IS 'Football reference match ID (nullable for future matches)';
@@ -104,7 +110,7 @@ COMMENT ON COLUMN staging.league_matches.away_team_score IS 'Goals scored by awa
 COMMENT ON COLUMN staging.league_matches.venue IS 'Match venue';
 COMMENT ON COLUMN staging.league_matches.attendance IS 'Match attendance';
 COMMENT ON COLUMN staging.league_matches.referee IS 'Match referee';
-COMMENT ON COLUMN staging.league_matches.raw_data IS 'Complete API response JSON for debugging and backup';
+COMMENT ON COLUMN staging.league_matches.raw_data_hash IS 'SHA-256 of the raw API element stored in staging.raw_payloads';
 
 -- Add comments for team_matches table
 COMMENT ON TABLE staging.team_matches IS 'Staging table for team match data from /matches endpoint (when team_id is provided)';
@@ -125,7 +131,8 @@ COMMENT ON COLUMN staging.team_matches.formation IS 'Formation played by team';
 COMMENT ON COLUMN staging.team_matches.captain IS 'Name of team captain for match';
 COMMENT ON COLUMN staging.team_matches.attendance IS 'Match attendance';
 COMMENT ON COLUMN staging.team_matches.referee IS 'Match referee';
-COMMENT ON COLUMN staging.team_matches.raw_data IS 'Complete API response JSON for debugging and backup';
+COMMENT ON COLUMN staging.team_matches.is_mirrored IS 'TRUE when the row was mirrored from the opponent''s /matches response (formation and captain are unknown)';
+COMMENT ON COLUMN staging.team_matches.raw_data_hash IS 'SHA-256 of the raw API element stored in staging.raw_payloads';
 
 -- Create indexes for league_matches table
 CREATE INDEX IF NOT EXISTS idx_league_matches_match_id ON staging.league_matches(match_id);
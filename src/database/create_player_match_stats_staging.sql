@@ -0,0 +1,234 @@
+-- Player Match Stats Staging Tables
+-- Stores player stats per match from /all-players-match-stats (one call per
+-- league-season) and /player-match-stats (one call per match), flattened from the
+-- nested stats categories into one typed column per stat
+
+-- Create staging schema if it doesn't exist
+CREATE SCHEMA IF NOT EXISTS staging;
+
+-- Outfield player stats (the players block of each match)
+CREATE TABLE IF NOT EXISTS staging.player_match_stats (
+    -- Primary key
+    id SERIAL PRIMARY KEY,
+
+    -- Match identification
+    match_id VARCHAR(20) NOT NULL,
+    league_id INTEGER NOT NULL,
+    season_id VARCHAR(20) NOT NULL,
+    match_date DATE,
+    round VARCHAR(200),
+
+    -- Player information
+    player_id VARCHAR(20) NOT NULL,
+    player_name VARCHAR(200),
+    player_country_code VARCHAR(10),
+    age INTEGER,
+
+    -- Team context
+    team VARCHAR(200),
+    team_id VARCHAR(20),
+    opponent VARCHAR(200),
+    opponent_id VARCHAR(20),
+    home_away VARCHAR(10),
+    formation VARCHAR(50),
+    position VARCHAR(20),
+    minutes INTEGER,
+
+    -- Summary stats
+    gls INTEGER,
+    ast INTEGER,
+    gls_and_ast INTEGER,
+    non_pen_gls INTEGER,
+    xg NUMERIC(8, 3),
+    non_pen_xg NUMERIC(8, 3),
+    xag NUMERIC(8, 3),
+    pk_made INTEGER,
+    pk_att INTEGER,
+    yellow_cards INTEGER,
+    red_cards INTEGER,
+    carries_prog INTEGER,
+    passes_prog INTEGER,
+
+    -- Shooting stats
+    sh INTEGER,
+    sot INTEGER,
+    pct_sot NUMERIC(8, 3),
+    gls_per_sh NUMERIC(8, 3),
+    gls_per_sot NUMERIC(8, 3),
+    avg_sh_dist NUMERIC(8, 3),
+    fk_sh INTEGER,
+    npxg_per_sh NUMERIC(8, 3),
+    gls_xg_diff NUMERIC(8, 3),
+    non_pen_gls_xg_diff NUMERIC(8, 3),
+
+    -- Passing stats
+    pass_cmp INTEGER,
+    pass_att INTEGER,
+    pct_pass_cmp NUMERIC(8, 3),
+    pass_ttl_dist INTEGER,
+    pass_cmp_s INTEGER,
+    pass_att_s INTEGER,
+    pct_pass_cmp_s NUMERIC(8, 3),
+    pass_cmp_m INTEGER,
+    pass_att_m INTEGER,
+    pct_pass_cmp_m NUMERIC(8, 3),
+    pass_cmp_l INTEGER,
+    pass_att_l INTEGER,
+    pct_pass_cmp_l NUMERIC(8, 3),
+    xa NUMERIC(8, 3),
+    ast_xag_diff NUMERIC(8, 3),
+    pass_prog INTEGER,
+    pass_prog_ttl_dist INTEGER,
+    key_passes INTEGER,
+    pass_fthird INTEGER,
+    pass_opp_box INTEGER,
+    cross_opp_box INTEGER,
+
+    -- Defense stats
+    tkl INTEGER,
+    tkl_won INTEGER,
+    tkl_def_third INTEGER,
+    tkl_mid_third INTEGER,
+    tkl_att_third INTEGER,
+    tkl_drb INTEGER,
+    tkl_drb_att INTEGER,
+    pct_tkl_drb_suc NUMERIC(8, 3),
+    blocks INTEGER,
+    sh_blocked INTEGER,
+    interceptions INTEGER,
+    tkl_plus_int INTEGER,
+    clearances INTEGER,
+    def_error INTEGER,
+
+    -- Possession stats
+    touches INTEGER,
+    touch_def_box INTEGER,
+    touch_def_third INTEGER,
+    touch_mid_third INTEGER,
+    touch_fthird INTEGER,
+    touch_opp_box INTEGER,
+    touch_live INTEGER,
+    take_on_att INTEGER,
+    take_on_suc INTEGER,
+    pct_take_on_suc NUMERIC(8, 3),
+    take_on_tkld INTEGER,
+    pct_take_on_tkld NUMERIC(8, 3),
+    carries INTEGER,
+    ttl_carries_dist INTEGER,
+    ttl_carries_prog_dist INTEGER,
+    carries_fthird INTEGER,
+    carries_opp_box INTEGER,
+    carries_miscontrolled INTEGER,
+    carries_dispossessed INTEGER,
+    pass_recvd INTEGER,
+    pass_prog_rcvd INTEGER,
+
+    -- Miscellaneous stats
+    second_yellow_cards INTEGER,
+    fls_com INTEGER,
+    fls_drawn INTEGER,
+    offside INTEGER,
+    pk_won INTEGER,
+    pk_conceded INTEGER,
+    og INTEGER,
+    ball_recov INTEGER,
+    air_dual_won INTEGER,
+    air_dual_lost INTEGER,
+    pct_air_dual_won NUMERIC(8, 3),
+
+    -- Stats without a column of their own, by category
+    extra_stats JSONB,
+
+    -- Audit fields
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+
+    UNIQUE (match_id, player_id)
+);
+
+-- Goalkeeper stats (the keepers block of each match)
+CREATE TABLE IF NOT EXISTS staging.keeper_match_stats (
+    -- Primary key
+    id SERIAL PRIMARY KEY,
+
+    -- Match identification
+    match_id VARCHAR(20) NOT NULL,
+    league_id INTEGER NOT NULL,
+    season_id VARCHAR(20) NOT NULL,
+    match_date DATE,
+    round VARCHAR(200),
+
+    -- Player information
+    player_id VARCHAR(20) NOT NULL,
+    player_name VARCHAR(200),
+    player_country_code VARCHAR(10),
+    age INTEGER,
+
+    -- Team context
+    team VARCHAR(200),
+    team_id VARCHAR(20),
+    opponent VARCHAR(200),
+    opponent_id VARCHAR(20),
+    home_away VARCHAR(10),
+    formation VARCHAR(50),
+    position VARCHAR(20),
+    minutes INTEGER,
+
+    -- Goalkeeping stats
+    sot_ag INTEGER,
+    gls_ag INTEGER,
+    saves INTEGER,
+    save_pct NUMERIC(8, 3),
+    clean_sheets INTEGER,
+    psxg NUMERIC(8, 3),
+    psxg_gls_ag_diff NUMERIC(8, 3),
+
+    -- Stats without a column of their own, by category
+    extra_stats JSONB,
+
+    -- Audit fields
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+
+    UNIQUE (match_id, player_id)
+);
+
+-- Add comments
+COMMENT ON TABLE staging.player_match_stats IS 'Outfield player stats per match, one typed column per stat';
+COMMENT ON TABLE staging.keeper_match_stats IS 'Goalkeeper stats per match, one typed column per stat';
+COMMENT ON COLUMN staging.player_match_stats.interceptions IS 'Interceptions (int in the API)';
+COMMENT ON COLUMN staging.player_match_stats.home_away IS 'Home or Away; derived from the match home team where the response omits it';
+COMMENT ON COLUMN staging.player_match_stats.minutes IS 'Minutes played (min in the API)';
+COMMENT ON COLUMN staging.player_match_stats.extra_stats IS 'Stats the API returned without a typed column, as {category: {key: value}}';
+COMMENT ON COLUMN staging.keeper_match_stats.home_away IS 'Home or Away; derived from the match home team where the response omits it';
+COMMENT ON COLUMN staging.keeper_match_stats.minutes IS 'Minutes played (min in the API)';
+COMMENT ON COLUMN staging.keeper_match_stats.extra_stats IS 'Stats the API returned without a typed column, as {category: {key: value}}';
+
+-- Create indexes for performance
+CREATE INDEX IF NOT EXISTS idx_player_match_stats_league_season ON staging.player_match_stats(league_id, season_id);
+CREATE INDEX IF NOT EXISTS idx_player_match_stats_player_id ON staging.player_match_stats(player_id);
+CREATE INDEX IF NOT EXISTS idx_player_match_stats_team_id ON staging.player_match_stats(team_id);
+CREATE INDEX IF NOT EXISTS idx_keeper_match_stats_league_season ON staging.keeper_match_stats(league_id, season_id);
+CREATE INDEX IF NOT EXISTS idx_keeper_match_stats_player_id ON staging.keeper_match_stats(player_id);
+CREATE INDEX IF NOT EXISTS idx_keeper_match_stats_team_id ON staging.keeper_match_stats(team_id);
+
+-- Create trigger to update updated_at timestamp
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_player_match_stats_updated_at ON staging.player_match_stats;
+CREATE TRIGGER update_player_match_stats_updated_at
+    BEFORE UPDATE ON staging.player_match_stats
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
+
+DROP TRIGGER IF EXISTS update_keeper_match_stats_updated_at ON staging.keeper_match_stats;
+CREATE TRIGGER update_keeper_match_stats_updated_at
+    BEFORE UPDATE ON staging.keeper_match_stats
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
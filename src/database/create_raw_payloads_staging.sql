@@ -0,0 +1,124 @@
+-- Raw Payloads Staging Table
+-- Content-addressed, compressed store for raw API elements
+-- Hot staging tables keep only raw_data_hash; identical payloads are stored once
+
+-- Create staging schema if it doesn't exist
+CREATE SCHEMA IF NOT EXISTS staging;
+
+-- Create raw payloads table (COMPRESSION lz4 requires PostgreSQL 14+ built with lz4)
+CREATE TABLE IF NOT EXISTS staging.raw_payloads (
+    -- SHA-256 of the canonical jsonb text
+    payload_hash BYTEA PRIMARY KEY,
+
+    -- Raw API element
+    payload JSONB COMPRESSION lz4 NOT NULL,
+
+    -- Audit fields
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Try compression for small payloads too (default threshold is ~2KB)
+ALTER TABLE staging.raw_payloads SET (toast_tuple_target = 128);
+
+-- Add comments
+COMMENT ON TABLE staging.raw_payloads IS 'Deduplicated raw API elements referenced by raw_data_hash in staging tables';
+COMMENT ON COLUMN staging.raw_payloads.payload_hash IS 'SHA-256 of payload::text (jsonb text is canonical, so equal payloads share a hash)';
+COMMENT ON COLUMN staging.raw_payloads.payload IS 'Raw API element, lz4-compressed';
+
+-- Advisory lock between writers and the prune: writers hold it shared until their
+-- transaction commits, so the prune (exclusive) never sees a hash whose referencing
+-- row is not committed yet
+CREATE OR REPLACE FUNCTION staging.raw_payload_lock_key()
+RETURNS BIGINT AS $$
+    SELECT hashtextextended('staging.raw_payloads', 0);
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Store a payload once and return its hash (NULL in, NULL out)
+CREATE OR REPLACE FUNCTION staging.store_raw_payload(p_payload JSONB)
+RETURNS BYTEA AS $$
+DECLARE
+    v_hash BYTEA := sha256(convert_to(p_payload::text, 'UTF8'));
+BEGIN
+    PERFORM pg_advisory_xact_lock_shared(staging.raw_payload_lock_key());
+    INSERT INTO staging.raw_payloads (payload_hash, payload)
+    VALUES (v_hash, p_payload)
+    ON CONFLICT (payload_hash) DO NOTHING;
+    RETURN v_hash;
+END;
+$$ LANGUAGE plpgsql STRICT;
+
+-- Look up a payload by hash for debugging and verification queries
+CREATE OR REPLACE FUNCTION staging.raw_payload(p_hash BYTEA)
+RETURNS JSONB AS $$
+    SELECT payload FROM staging.raw_payloads WHERE payload_hash = p_hash;
+$$ LANGUAGE sql STABLE STRICT;
+
+-- Tables that reference raw payloads
+CREATE OR REPLACE FUNCTION staging.raw_payload_tables()
+RETURNS TEXT[] AS $$
+    SELECT ARRAY[
+        'countries', 'leagues', 'league_seasons', 'league_season_details',
+        'league_standings', 'league_matches', 'team_matches',
+        'teams', 'team_rosters', 'team_schedules'
+    ];
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Delete payloads no staging row references any more (superseded versions)
+-- Waits for writers in flight and blocks new ones until the caller's transaction ends
+CREATE OR REPLACE FUNCTION staging.prune_raw_payloads()
+RETURNS INTEGER AS $$
+DECLARE
+    v_table TEXT;
+    v_referenced TEXT := '';
+    v_deleted INTEGER;
+BEGIN
+    PERFORM pg_advisory_xact_lock(staging.raw_payload_lock_key());
+    FOREACH v_table IN ARRAY staging.raw_payload_tables() LOOP
+        IF to_regclass('staging.' || v_table) IS NOT NULL THEN
+            v_referenced := v_referenced || format(
+                ' AND NOT EXISTS (SELECT 1 FROM staging.%I t WHERE t.raw_data_hash = p.payload_hash)',
+                v_table
+            );
+        END IF;
+    END LOOP;
+
+    EXECUTE 'DELETE FROM staging.raw_payloads p WHERE TRUE' || v_referenced;
+    GET DIAGNOSTICS v_deleted = ROW_COUNT;
+    RETURN v_deleted;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Migrate existing tables: move raw_data into the side table and keep only the hash
+-- Run VACUUM FULL on the migrated tables afterwards to return the space
+DO $$
+DECLARE
+    v_table TEXT;
+BEGIN
+    FOREACH v_table IN ARRAY staging.raw_payload_tables() LOOP
+        CONTINUE WHEN to_regclass('staging.' || v_table) IS NULL;
+
+        EXECUTE format('ALTER TABLE staging.%I ADD COLUMN IF NOT EXISTS raw_data_hash BYTEA', v_table);
+
+        IF EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_schema = 'staging' AND table_name = v_table AND column_name = 'raw_data'
+        ) THEN
+            EXECUTE format(
+                'UPDATE staging.%I SET raw_data_hash = staging.store_raw_payload(raw_data) WHERE raw_data IS NOT NULL',
+                v_table
+            );
+            EXECUTE format('ALTER TABLE staging.%I DROP COLUMN raw_data', v_table);
+        END IF;
+
+        -- The prune looks every hash up in every table
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS %I ON staging.%I(raw_data_hash)',
+            'idx_' || v_table || '_raw_data_hash', v_table
+        );
+
+        EXECUTE format(
+            'COMMENT ON COLUMN staging.%I.raw_data_hash IS %L',
+            v_table, 'Hash of the raw API element in staging.raw_payloads'
+        );
+    END LOOP;
+END $$;
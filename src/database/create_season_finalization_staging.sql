@@ -0,0 +1,51 @@
+-- Season Finalization Staging Table
+-- Registry of league-seasons that never need another API call: finalized seasons
+-- (historical, last fixture past the buffer, every match scored and covered by
+-- team matches) and absent seasons (expected but not listed by /league-seasons)
+
+-- Create staging schema if it doesn't exist
+CREATE SCHEMA IF NOT EXISTS staging;
+
+-- Create season finalization table
+CREATE TABLE IF NOT EXISTS staging.season_finalization (
+    -- League-season
+    league_id INTEGER NOT NULL,
+    season_id VARCHAR(20) NOT NULL,
+
+    -- Finalization
+    status VARCHAR(20) NOT NULL CHECK (status IN ('finalized', 'absent')),
+    last_match_date DATE,
+    match_count INTEGER,
+    finalized_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    -- Audit fields
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+
+    PRIMARY KEY (league_id, season_id)
+);
+
+-- Add comments
+COMMENT ON TABLE staging.season_finalization IS 'League-seasons excluded from every planner and loader unless --refinalize is given';
+COMMENT ON COLUMN staging.season_finalization.status IS 'finalized (complete and verified) or absent (expected but not listed by the API)';
+COMMENT ON COLUMN staging.season_finalization.last_match_date IS 'Date of the last fixture when the season was finalized';
+COMMENT ON COLUMN staging.season_finalization.match_count IS 'League matches verified when the season was finalized';
+COMMENT ON COLUMN staging.season_finalization.finalized_at IS 'When the season was last marked finalized or absent';
+
+-- Create indexes for performance
+CREATE INDEX IF NOT EXISTS idx_season_finalization_status ON staging.season_finalization(status);
+
+-- Create trigger to update updated_at timestamp
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_season_finalization_updated_at ON staging.season_finalization;
+CREATE TRIGGER update_season_finalization_updated_at
+    BEFORE UPDATE ON staging.season_finalization
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
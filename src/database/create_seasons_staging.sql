@@ -0,0 +1,103 @@
+-- Seasons Staging Table
+-- Season dimension with parsed integer years, plus indexed season_start_year
+-- columns on the staging tables so time periods filter with integer ranges
+
+-- Create staging schema if it doesn't exist
+CREATE SCHEMA IF NOT EXISTS staging;
+
+-- Parse season IDs ("2024" or "2024-2025"); NULL for unknown formats
+CREATE OR REPLACE FUNCTION staging.season_start_year(p_season_id TEXT)
+RETURNS INTEGER AS $$
+    SELECT CASE WHEN p_season_id ~ '^\d{4}(-\d{4})?$'
+                THEN substr(p_season_id, 1, 4)::INTEGER END;
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION staging.season_end_year(p_season_id TEXT)
+RETURNS INTEGER AS $$
+    SELECT CASE WHEN p_season_id ~ '^\d{4}-\d{4}$' THEN substr(p_season_id, 6, 4)::INTEGER
+                WHEN p_season_id ~ '^\d{4}$' THEN p_season_id::INTEGER END;
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+CREATE OR REPLACE FUNCTION staging.season_format(p_season_id TEXT)
+RETURNS VARCHAR(10) AS $$
+    SELECT CASE WHEN p_season_id ~ '^\d{4}-\d{4}$' THEN 'YYYY-YYYY'
+                WHEN p_season_id ~ '^\d{4}$' THEN 'YYYY' END;
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+-- Create seasons table
+CREATE TABLE IF NOT EXISTS staging.seasons (
+    -- Season ID as returned by the API
+    season_id VARCHAR(20) PRIMARY KEY,
+
+    -- Parsed fields
+    start_year INTEGER NOT NULL,
+    end_year INTEGER NOT NULL,
+    format VARCHAR(10) NOT NULL CHECK (format IN ('YYYY', 'YYYY-YYYY')),
+
+    -- Audit fields
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Add comments
+COMMENT ON TABLE staging.seasons IS 'Season dimension: every season ID seen in league_seasons, parsed into integer years';
+COMMENT ON COLUMN staging.seasons.start_year IS 'First calendar year of the season (2024 for both "2024" and "2024-2025")';
+COMMENT ON COLUMN staging.seasons.end_year IS 'Last calendar year of the season';
+COMMENT ON COLUMN staging.seasons.format IS 'YYYY for calendar-year seasons, YYYY-YYYY for split seasons';
+
+-- Create indexes for performance
+CREATE INDEX IF NOT EXISTS idx_seasons_start_year ON staging.seasons(start_year);
+
+-- Keep the dimension in sync with league_seasons
+CREATE OR REPLACE FUNCTION staging.register_season()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF staging.season_format(NEW.season_id) IS NOT NULL THEN
+        INSERT INTO staging.seasons (season_id, start_year, end_year, format)
+        VALUES (NEW.season_id, staging.season_start_year(NEW.season_id),
+                staging.season_end_year(NEW.season_id), staging.season_format(NEW.season_id))
+        ON CONFLICT (season_id) DO NOTHING;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS register_league_seasons_season ON staging.league_seasons;
+CREATE TRIGGER register_league_seasons_season
+    AFTER INSERT ON staging.league_seasons
+    FOR EACH ROW
+    EXECUTE FUNCTION staging.register_season();
+
+-- Backfill from existing seasons
+INSERT INTO staging.seasons (season_id, start_year, end_year, format)
+SELECT DISTINCT season_id, staging.season_start_year(season_id),
+       staging.season_end_year(season_id), staging.season_format(season_id)
+FROM staging.league_seasons
+WHERE staging.season_format(season_id) IS NOT NULL
+ON CONFLICT (season_id) DO NOTHING;
+
+-- Add generated season_start_year columns and (league_id, season_start_year) indexes
+DO $$
+DECLARE
+    v_table TEXT;
+BEGIN
+    FOREACH v_table IN ARRAY ARRAY[
+        'league_seasons', 'league_season_details', 'league_standings',
+        'league_matches', 'team_matches', 'teams'
+    ] LOOP
+        CONTINUE WHEN to_regclass('staging.' || v_table) IS NULL;
+
+        EXECUTE format(
+            'ALTER TABLE staging.%I ADD COLUMN IF NOT EXISTS season_start_year INTEGER '
+            'GENERATED ALWAYS AS (staging.season_start_year(season_id)) STORED',
+            v_table
+        );
+        EXECUTE format(
+            'CREATE INDEX IF NOT EXISTS %I ON staging.%I(league_id, season_start_year)',
+            'idx_' || v_table || '_league_start_year', v_table
+        );
+        EXECUTE format(
+            'COMMENT ON COLUMN staging.%I.season_start_year IS %L',
+            v_table, 'Start year parsed from season_id, for integer time period filters'
+        );
+    END LOOP;
+END $$;
@@ -24,7 +24,7 @@ CREATE TABLE IF NOT EXISTS staging.team_rosters (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     
     -- Raw API response for debugging/backup
-    raw_data JSONB,
+    raw_data_hash BYTEA,
     
     -- Composite unique constraint
     UNIQUE(team_id, player_id)
@@ -40,7 +40,7 @@ COMMENT ON COLUMN staging.team_rosters.position IS 'Player position(s) (e.g., FW
 COMMENT ON COLUMN staging.team_rosters.age IS 'Player age';
 COMMENT ON COLUMN staging.team_rosters.matches_played IS 'Number of matches played';
 COMMENT ON COLUMN staging.team_rosters.starts IS 'Number of starts';
-COMMENT ON COLUMN staging.team_rosters.raw_data IS 'Complete API response JSON for debugging and backup';
+COMMENT ON COLUMN staging.team_rosters.raw_data_hash IS 'SHA-256 of the raw API element stored in staging.raw_payloads';
 
 -- Create indexes for performance
 CREATE INDEX IF NOT EXISTS idx_team_rosters_team_id ON staging.team_rosters(team_id);
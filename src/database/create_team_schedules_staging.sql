@@ -36,7 +36,7 @@ CREATE TABLE IF NOT EXISTS staging.team_schedules (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     
     -- Raw API response for debugging/backup
-    raw_data JSONB,
+    raw_data_hash BYTEA,
     
     -- Composite unique constraint
     UNIQUE(team_id, match_id)
@@ -60,7 +60,7 @@ COMMENT ON COLUMN staging.team_schedules.attendance IS 'Match attendance';
 COMMENT ON COLUMN staging.team_schedules.captain IS 'Team captain for the match';
 COMMENT ON COLUMN staging.team_schedules.formation IS 'Team formation used';
 COMMENT ON COLUMN staging.team_schedules.referee IS 'Match referee';
-COMMENT ON COLUMN staging.team_schedules.raw_data IS 'Complete API response JSON for debugging and backup';
+COMMENT ON COLUMN staging.team_schedules.raw_data_hash IS 'SHA-256 of the raw API element stored in staging.raw_payloads';
 
 -- Create indexes for performance
 CREATE INDEX IF NOT EXISTS idx_team_schedules_team_id ON staging.team_schedules(team_id);
@@ -0,0 +1,92 @@
+-- Team Season Stats Staging Table
+-- Stores team stats per season from /team-season-stats (one call per league-season,
+-- covering every team), with one typed column per known stat like
+-- staging.player_match_stats
+
+-- Create staging schema if it doesn't exist
+CREATE SCHEMA IF NOT EXISTS staging;
+
+-- Replace the earlier per-stat layout (team_season_stat_values / team_season_stat_keys).
+-- Its rows are not carried over: the stored teams and their ledger entries are
+-- removed, so each league-season is fetched again once into the typed columns
+DO $$
+BEGIN
+    IF to_regclass('staging.team_season_stat_values') IS NOT NULL THEN
+        DROP VIEW IF EXISTS staging.team_season_stats_long;
+        DROP TABLE staging.team_season_stat_values;
+        DROP TABLE IF EXISTS staging.team_season_stat_keys;
+        DROP TABLE IF EXISTS staging.team_season_stats;
+        IF to_regclass('staging.collection_ledger') IS NOT NULL THEN
+            DELETE FROM staging.collection_ledger WHERE endpoint = 'team-season-stats';
+        END IF;
+    END IF;
+END $$;
+
+CREATE TABLE IF NOT EXISTS staging.team_season_stats (
+    -- Primary key
+    id SERIAL PRIMARY KEY,
+
+    -- League and season context
+    league_id INTEGER NOT NULL,
+    season_id VARCHAR(20) NOT NULL,
+
+    -- Team information
+    team_id VARCHAR(20) NOT NULL,
+    team_name VARCHAR(200),
+
+    -- Table stats
+    position INTEGER,
+    played INTEGER,
+    won INTEGER,
+    drawn INTEGER,
+    lost INTEGER,
+    goals_for INTEGER,
+    goals_against INTEGER,
+    goal_difference INTEGER,
+    points INTEGER,
+    expected_goals NUMERIC(8, 3),
+    expected_goals_against NUMERIC(8, 3),
+    clean_sheets INTEGER,
+    failed_to_score INTEGER,
+
+    -- Squad, shooting and passing stats
+    roster_size INTEGER,
+    matches_played INTEGER,
+    ttl_sh INTEGER,
+    ttl_sot INTEGER,
+    ttl_pass_cmp INTEGER,
+    pct_pass_cmp NUMERIC(8, 3),
+
+    -- Stats without a column of their own, by category
+    extra_stats JSONB,
+
+    -- Audit fields
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+
+    UNIQUE (league_id, season_id, team_id)
+);
+
+-- Add comments
+COMMENT ON TABLE staging.team_season_stats IS 'Team stats per league-season from /team-season-stats, one typed column per stat';
+COMMENT ON COLUMN staging.team_season_stats.position IS 'Final league position';
+COMMENT ON COLUMN staging.team_season_stats.pct_pass_cmp IS 'Pass completion as given by the API (84.3 = 84.3%)';
+COMMENT ON COLUMN staging.team_season_stats.extra_stats IS 'Stats the API returned without a typed column, as {category: {stat: value}}';
+
+-- Create indexes for performance
+CREATE INDEX IF NOT EXISTS idx_team_season_stats_team_id ON staging.team_season_stats(team_id);
+
+-- Create trigger to update updated_at timestamp
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_team_season_stats_updated_at ON staging.team_season_stats;
+CREATE TRIGGER update_team_season_stats_updated_at
+    BEFORE UPDATE ON staging.team_season_stats
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
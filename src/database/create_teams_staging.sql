@@ -17,7 +17,7 @@ CREATE TABLE IF NOT EXISTS staging.teams (
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     
     -- Raw API response for debugging/backup
-    raw_data JSONB,
+    raw_data_hash BYTEA,
     
     -- Composite unique constraint
     UNIQUE(team_id, season_id)
@@ -30,7 +30,7 @@ COMMENT ON COLUMN staging.teams.team_name IS 'Name of the team';
 COMMENT ON COLUMN staging.teams.league_id IS 'League ID the team competes in';
 COMMENT ON COLUMN staging.teams.league_name IS 'Name of the league';
 COMMENT ON COLUMN staging.teams.season_id IS 'Season ID (format varies by league)';
-COMMENT ON COLUMN staging.teams.raw_data IS 'Complete API response JSON for debugging and backup';
+COMMENT ON COLUMN staging.teams.raw_data_hash IS 'SHA-256 of the raw API element stored in staging.raw_payloads';
 
 -- Create indexes for performance
 CREATE INDEX IF NOT EXISTS idx_teams_team_id ON staging.teams(team_id);
@@ -0,0 +1,79 @@
+-- Work Queue Staging Table
+-- API call units planned from collection scopes and drained by any number of workers
+-- Workers lease jobs with FOR UPDATE SKIP LOCKED and keep them alive with heartbeats
+
+-- Create staging schema if it doesn't exist
+CREATE SCHEMA IF NOT EXISTS staging;
+
+-- Create work queue table
+CREATE TABLE IF NOT EXISTS staging.work_queue (
+    -- Primary key
+    id BIGSERIAL PRIMARY KEY,
+
+    -- Call unit (same naming as staging.collection_ledger)
+    endpoint VARCHAR(50) NOT NULL,
+    params JSONB NOT NULL,
+
+    -- Planning context, used to plan follow-up units
+    scope VARCHAR(100),
+    time_period VARCHAR(50),
+
+    -- Scheduling
+    priority INTEGER NOT NULL DEFAULT 100,  -- lower runs first
+    status VARCHAR(20) NOT NULL DEFAULT 'queued' CHECK (status IN ('queued', 'leased', 'done', 'dead')),
+    available_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 5,
+
+    -- Lease
+    leased_by VARCHAR(100),
+    lease_until TIMESTAMP WITH TIME ZONE,
+    heartbeat_at TIMESTAMP WITH TIME ZONE,
+
+    -- Outcome
+    last_error TEXT,
+    completed_at TIMESTAMP WITH TIME ZONE,
+
+    -- Audit fields
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+
+    -- One job per call unit
+    CONSTRAINT uk_work_queue_unit UNIQUE (endpoint, params)
+);
+
+-- Add comments
+COMMENT ON TABLE staging.work_queue IS 'Distributed crawl queue: one job per API call unit, leased by workers';
+COMMENT ON COLUMN staging.work_queue.params IS 'Call parameters; integer IDs as numbers, season and team IDs as strings';
+COMMENT ON COLUMN staging.work_queue.scope IS 'Collection scope the job was planned for';
+COMMENT ON COLUMN staging.work_queue.time_period IS 'Time period the job was planned for, used when planning follow-up jobs';
+COMMENT ON COLUMN staging.work_queue.priority IS 'Lower values are leased first (earlier collection stages)';
+COMMENT ON COLUMN staging.work_queue.status IS 'queued, leased, done, or dead (gave up after max_attempts)';
+COMMENT ON COLUMN staging.work_queue.available_at IS 'Earliest time the job may be leased (retry backoff)';
+COMMENT ON COLUMN staging.work_queue.lease_until IS 'Lease expiry; expired leases are returned to the queue or dead-lettered';
+COMMENT ON COLUMN staging.work_queue.heartbeat_at IS 'Last time the leasing worker extended its lease';
+
+-- Create indexes for performance
+CREATE INDEX IF NOT EXISTS idx_work_queue_ready
+ON staging.work_queue(priority, available_at, id) WHERE status = 'queued';
+
+CREATE INDEX IF NOT EXISTS idx_work_queue_lease_until
+ON staging.work_queue(lease_until) WHERE status = 'leased';
+
+CREATE INDEX IF NOT EXISTS idx_work_queue_status
+ON staging.work_queue(status);
+
+-- Create trigger to update updated_at timestamp
+CREATE OR REPLACE FUNCTION update_updated_at_column()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS update_work_queue_updated_at ON staging.work_queue;
+CREATE TRIGGER update_work_queue_updated_at
+    BEFORE UPDATE ON staging.work_queue
+    FOR EACH ROW
+    EXECUTE FUNCTION update_updated_at_column();
@@ -6,11 +6,11 @@ Integrates all parameterized scripts for cascading data collection
 
 import os
 import sys
+import time
 import argparse
-import psycopg2
 import json
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Tuple
+from typing import Callable, Iterable, List, Optional, Dict, Any, Tuple
 from dotenv import load_dotenv
 
 # Add src to path
@@ -18,25 +18,63 @@ sys.path.append('src')
 
 from api.fbr_client import FBRClient
 from utils.collection_config import load_collection_config
-from utils.endpoint_blacklist import load_endpoint_blacklist
+from utils.endpoint_blacklist import EndpointBlacklist, load_endpoint_blacklist
+from utils.raw_payloads import prune_raw_payloads
+from utils.collection_ledger import CollectionLedger, load_collection_ledger
+from utils.seasons import resolve_season_range
+from utils.league_catalog import LeagueCatalog, load_league_catalog
+from utils.work_claims import WorkClaims, WorkUnit, load_work_claims
+from utils.crawl_planner import CrawlManifest, CrawlPlanner, StagePlan, merge_stage_plans, priority_rank, scope_time_period
+from utils.league_diff import LeagueDiff, fetch_league_diff
+from utils.change_set import known_seasons, league_changes, match_changes, season_changes
+from utils.coverage_planner import load_player_stats_settings
+from utils.run_checkpoint import RunCheckpoint, resume_run, start_run
+from utils.progress import get_progress_reporter
+from utils.run_budget import get_run_budget, parse_deadline
+from utils.season_registry import get_season_registry
+from utils.tracing import get_tracer, traced
+from utils.profiling import get_profiler
+from utils.db import connect
 from etl.load_countries_data import load_countries_data
 from etl.load_leagues_data import load_leagues_data
 from etl.load_league_seasons_data import load_league_seasons_data
 from etl.load_league_season_details_data import load_league_season_details_data
 from etl.load_league_matches_data import load_league_matches_data
-from etl.load_team_matches_data import load_team_matches_data
+from etl.load_team_matches_data import get_completed_league_matches, load_team_matches_data
+from etl.load_player_match_stats_data import load_player_match_stats_data
+
+# Player stats loaders by endpoint, each taking its planned units plus the ledger and claims;
+# the coverage planner only plans utils.coverage_planner.LOADABLE_ENDPOINTS
+PLAYER_STATS_LOADERS: Dict[str, Callable[..., bool]] = {
+    "all-players-match-stats": load_player_match_stats_data,
+    "player-match-stats": load_player_match_stats_data,
+}
 
 class FootballDataCollector:
     """Master orchestrator for football data collection"""
     
-    def __init__(self, dry_run: bool = False, verbose: bool = False):
+    def __init__(self, dry_run: bool = False, verbose: bool = False, full_refresh: bool = False,
+                 delta: bool = False):
         """Initialize the collector"""
         load_dotenv()
         self.database_url = os.getenv("DATABASE_URL")
         self.client = FBRClient()
         self.dry_run = dry_run
         self.verbose = verbose
-        self.blacklist = load_endpoint_blacklist()
+        # Rebuild countries, leagues and league seasons through atomic shadow-table swaps
+        self.full_refresh = full_refresh
+        # Re-fetch seasons in progress only when matches were completed since the last fetch
+        self.delta = delta
+        self._ledger: Optional[CollectionLedger] = None
+        self._catalog: Optional[LeagueCatalog] = None
+        self._catalog_blacklist = None
+        # One unfiltered /leagues diff per run, shared by every scope
+        self._league_diff: Optional[LeagueDiff] = None
+        # Set when the unfiltered call failed; the run then checks countries one by one
+        self._league_diff_failed = False
+        self._league_metadata_loaded_at = time.monotonic()
+        # Checkpoint of the current run, if it is checkpointed
+        self.run: Optional[RunCheckpoint] = None
         
         if not self.database_url:
             raise ValueError("DATABASE_URL not found in .env file")
@@ -46,12 +84,117 @@ class FootballDataCollector:
         prefix = "[DRY RUN] " if self.dry_run else ""
         print(f"{prefix}{level}: {message}")
     
+    @property
+    def blacklist(self) -> EndpointBlacklist:
+        """Endpoint blacklist, rebuilt when the config file changes"""
+        return load_endpoint_blacklist()
+    
+    @property
+    def league_freshness(self) -> str:
+        """League freshness mode: 'global' (one /leagues call) or 'per_country'"""
+        return load_collection_config().defaults.get('league_freshness', 'per_country')
+    
+    def reset_run_caches(self, league_metadata_ttl: Optional[float] = None):
+        """
+        Prepare a long-lived collector for its next job
+        
+        The ledger is always reloaded, since other runs may have collected
+        since. The league catalog and the global league diff are kept warm
+        until they are older than league_metadata_ttl seconds. The season
+        registry is reloaded like the ledger.
+        
+        Args:
+            league_metadata_ttl: Max age of league metadata in seconds (None = keep)
+        """
+        self._ledger = None
+        get_season_registry().invalidate()
+        if league_metadata_ttl is not None and \
+                time.monotonic() - self._league_metadata_loaded_at > league_metadata_ttl:
+            self._catalog = None
+            self._league_diff = None
+            self._league_diff_failed = False
+            self._league_metadata_loaded_at = time.monotonic()
+    
+    @property
+    def ledger(self) -> CollectionLedger:
+        """Collection ledger, loaded once per run in a single query"""
+        if self._ledger is None:
+            self._ledger = load_collection_ledger(database_url=self.database_url)
+            self._ledger.run = self.run
+        return self._ledger
+    
+    def attach_run(self, run: RunCheckpoint):
+        """Checkpoint every unit of the coming collection into a run"""
+        self.run = run
+        self.ledger.run = run
+        reconciled = run.reconcile(self.ledger)
+        if reconciled:
+            self.log(f"{reconciled} units fetched before the interruption marked done from the ledger", "INFO")
+    
+    def detach_run(self):
+        """Stop checkpointing into the current run"""
+        self.run = None
+        if self._ledger is not None:
+            self._ledger.run = None
+    
+    def run_unit_done(self, endpoint: str, **params) -> bool:
+        """Check if the checkpointed run already finished a unit"""
+        return self.run is not None and self.run.is_done(endpoint, **params)
+    
+    def mark_run_unit(self, endpoint: str, state: str, **params):
+        """Checkpoint and report a unit the orchestrator fetches itself (countries, leagues)"""
+        if self.run is not None:
+            self.run.mark(endpoint, params, state)
+        if state in ('done', 'failed'):
+            get_progress_reporter().unit_done(endpoint, params, ok=state == 'done')
+    
+    @property
+    def claims(self) -> WorkClaims:
+        """Advisory-lock claims shared with concurrent collector runs"""
+        return load_work_claims(self.database_url)
+    
+    @property
+    def catalog(self) -> LeagueCatalog:
+        """League catalog, loaded in a single query and reloaded after league data or blacklist changes"""
+        blacklist = self.blacklist
+        if self._catalog is None or self._catalog_blacklist is not blacklist:
+            self._catalog = load_league_catalog(self.database_url, blacklist)
+            self._catalog_blacklist = blacklist
+        return self._catalog
+    
+    def crawl_planner(self) -> CrawlPlanner:
+        """Crawl planner over the current catalog and ledger"""
+        return CrawlPlanner(self.database_url, self.blacklist, self.catalog, self.ledger, delta=self.delta)
+    
+    def plan_crawl(self, scope_name: Optional[str] = None, country_codes: Optional[List[str]] = None,
+                   time_period: Optional[str] = None, force_refresh: bool = False) -> CrawlManifest:
+        """
+        Expand a scope or country list into per-stage API calls without calling the API
+        
+        Args:
+            scope_name: Predefined scope name, or several separated by commas
+            country_codes: Country codes (when no scope is given)
+            time_period: Time period filter
+            force_refresh: Plan as if freshness checks were ignored
+            
+        Returns:
+            CrawlManifest with call counts, cache hits and an ETA
+        """
+        planner = self.crawl_planner()
+        force = force_refresh or self.full_refresh
+        if scope_name and ',' in scope_name:
+            return planner.plan_scopes(split_scope_names(scope_name), time_period, force)
+        if scope_name:
+            return planner.plan_scope(scope_name, time_period, force)
+        return planner.plan(country_codes, None, time_period, force)
+    
+    @traced("freshness.countries")
     def check_countries_freshness(self, country_codes: List[str]) -> Tuple[bool, List[str]]:
         """Check if countries data is fresh"""
         self.log("Checking countries freshness...")
         
         try:
-            with psycopg2.connect(self.database_url) as conn:
+            with connect(self.database_url) as conn:
                 with conn.cursor() as cur:
                     placeholders = ','.join(['%s'] * len(country_codes))
                     cur.execute(f"""
@@ -73,12 +216,55 @@ class FootballDataCollector:
             self.log(f"Error checking countries: {e}", "ERROR")
             return False, country_codes
     
+    @traced("freshness.leagues")
     def check_leagues_freshness(self, country_codes: List[str]) -> Tuple[bool, List[Dict]]:
-        """Check if leagues data is fresh by comparing last_season field"""
+        """
+        Check if leagues data is fresh by comparing last_season field
+        
+        With league_freshness: global, one unfiltered /leagues call is diffed for
+        every scope. Its leagues carry no country, so only leagues already in
+        staging.leagues can be matched to a scope; new leagues are left to the
+        per_country mode (the default).
+        """
+        if self.league_freshness != 'global' or self._league_diff_failed:
+            return self.check_leagues_freshness_per_country(country_codes)
+        
+        self.log("Checking leagues freshness against the global league list...")
+        if self._league_diff is None:
+            # The probe is an API call too; with the budget spent, changes are left for the next run
+            spent = get_run_budget().check()
+            if spent:
+                self.log(f"Skipping the leagues freshness check: {spent}", "WARN")
+                return True, []
+            self._league_diff = fetch_league_diff(self.client, self.database_url)
+            if self._league_diff is None:
+                self._league_diff_failed = True
+                self.log("Falling back to per-country league checks for this run", "WARN")
+                return self.check_leagues_freshness_per_country(country_codes)
+            unattributed = self._league_diff.unattributed()
+            if unattributed:
+                # Not matched to any scope; a per_country run picks them up
+                self.log(f"Ignoring {len(unattributed)} new leagues without a country "
+                         f"(use league_freshness: per_country to add them)", "WARN")
+        
+        leagues_needing_update = self._league_diff.for_countries(country_codes)
+        if self.verbose:
+            for league in leagues_needing_update:
+                self.log(f"League {league['league_id']} ({league['competition_name']}) needs update: "
+                         f"{league['db_last_season']} -> {league['api_last_season']}", "WARN")
+        
+        if leagues_needing_update:
+            self.log(f"{len(leagues_needing_update)} leagues need update", "WARN")
+            return False, leagues_needing_update
+        self.log("All leagues are fresh", "INFO")
+        return True, []
+    
+    def check_leagues_freshness_per_country(self, country_codes: List[str]) -> Tuple[bool, List[Dict]]:
+        """Check leagues freshness with one /leagues call per country"""
         self.log("Checking leagues freshness...")
         
         try:
-            with psycopg2.connect(self.database_url) as conn:
+            with connect(self.database_url) as conn:
                 with conn.cursor() as cur:
                     placeholders = ','.join(['%s'] * len(country_codes))
                     cur.execute(f"""
@@ -91,6 +277,10 @@ class FootballDataCollector:
                     leagues_needing_update = []
                     
                     for country_code in country_codes:
+                        spent = get_run_budget().check()
+                        if spent:
+                            self.log(f"Stopping the leagues freshness check before {country_code}: {spent}", "WARN")
+                            break
                         if self.verbose:
                             self.log(f"Checking {country_code} leagues...")
                         
@@ -148,6 +338,7 @@ class FootballDataCollector:
             self.log(f"Error checking leagues: {e}", "ERROR")
             return False, []
     
+    @traced("freshness.league_seasons")
     def check_league_seasons_freshness(self, league_ids: List[int], time_period: Optional[str] = None) -> Tuple[bool, List[int]]:
         """Check if league seasons data is fresh for the specified time period"""
         self.log("Checking league seasons freshness...")
@@ -157,171 +348,57 @@ class FootballDataCollector:
             return True, []
         
         try:
-            with psycopg2.connect(self.database_url) as conn:
-                with conn.cursor() as cur:
-                    # Get existing seasons for these leagues
-                    placeholders = ','.join(['%s'] * len(league_ids))
-                    cur.execute(f"""
-                        SELECT league_id, season_id 
-                        FROM staging.league_seasons 
-                        WHERE league_id IN ({placeholders})
-                    """, league_ids)
-                    
-                    existing_seasons = {}
-                    for row in cur.fetchall():
-                        league_id, season_id = row
-                        if league_id not in existing_seasons:
-                            existing_seasons[league_id] = set()
-                        existing_seasons[league_id].add(season_id)
-                    
-                    # Check what seasons we should have for the time period
-                    config = load_collection_config()
-                    time_period_config = config.get_time_period(time_period)
-                    
-                    if not time_period_config:
-                        self.log(f"Time period '{time_period}' not found, assuming fresh", "WARN")
-                        return True, []
-                    
-                    leagues_needing_seasons = []
-                    
-                    for league_id in league_ids:
-                        # Check if this league is blacklisted for league-seasons endpoint
-                        if self.blacklist.is_blacklisted("league-seasons", league_id=league_id):
-                            if self.verbose:
-                                self.log(f"League {league_id} is blacklisted for league-seasons endpoint, skipping", "INFO")
-                            continue
-                        
-                        # Get the league's last_season from the database
-                        last_season = None
-                        try:
-                            with psycopg2.connect(self.database_url) as conn:
-                                with conn.cursor() as cur:
-                                    cur.execute("SELECT last_season FROM staging.leagues WHERE league_id = %s", (league_id,))
-                                    result = cur.fetchone()
-                                    if result:
-                                        last_season = result[0]
-                        except Exception as e:
-                            self.log(f"Error getting last_season for league {league_id}: {e}", "WARN")
-                        
-                        # Get league-specific expected seasons using smart pattern recognition
-                        expected_seasons = self._get_expected_seasons_for_time_period(time_period_config, league_id, time_period, last_season)
-                        
-                        if self.verbose:
-                            self.log(f"League {league_id} expected seasons for '{time_period}': {sorted(expected_seasons)}", "INFO")
-                        
-                        if league_id not in existing_seasons:
-                            # No seasons at all for this league
-                            if self.verbose:
-                                self.log(f"League {league_id}: No seasons found in database", "WARN")
-                            leagues_needing_seasons.append(league_id)
-                            continue
-                        
-                        # Check if we have all expected seasons for this league
-                        missing_seasons = expected_seasons - existing_seasons[league_id]
-                        existing_count = len(existing_seasons[league_id])
-                        expected_count = len(expected_seasons)
-                        
-                        if self.verbose:
-                            self.log(f"League {league_id}: {existing_count} existing seasons, {expected_count} expected seasons", "INFO")
-                            if missing_seasons:
-                                self.log(f"League {league_id} missing seasons: {sorted(missing_seasons)}", "WARN")
-                            else:
-                                self.log(f"League {league_id}: All expected seasons present", "INFO")
-                        
-                        if missing_seasons:
-                            leagues_needing_seasons.append(league_id)
-                    
-                    if leagues_needing_seasons:
-                        self.log(f"{len(leagues_needing_seasons)} leagues need season updates", "WARN")
-                        return False, leagues_needing_seasons
-                    else:
-                        self.log("All league seasons are fresh for time period", "INFO")
-                        return True, []
-                        
-        except Exception as e:
-            self.log(f"Error checking league seasons: {e}", "ERROR")
-            return False, league_ids
-    
-    def _get_expected_seasons_for_time_period(self, time_period_config, league_id: Optional[int] = None, time_period_name: Optional[str] = None, last_season: Optional[str] = None) -> set:
-        """Get expected seasons for a time period configuration using league's last_season as cutoff"""
-        import re
-        
-        # If we have a specific league_id, use smart pattern recognition
-        if league_id and time_period_name:
+            # Planned entirely from the in-memory league catalog
             try:
-                from etl.load_league_seasons_data import generate_league_specific_pattern
-                pattern = generate_league_specific_pattern(league_id, time_period_name, self.database_url)
+                resolve_season_range(time_period)
+            except ValueError:
+                self.log(f"Time period '{time_period}' not found, assuming fresh", "WARN")
+                return True, []
+            
+            leagues_needing_seasons = []
+            
+            for league_id in league_ids:
+                # Check if this league is blacklisted for league-seasons endpoint
+                if self.catalog.is_blacklisted("league-seasons", league_id):
+                    if self.verbose:
+                        self.log(f"League {league_id} is blacklisted for league-seasons endpoint, skipping", "INFO")
+                    continue
                 
-                # Parse the smart pattern to get expected seasons
-                expected_seasons = set()
-                if pattern.startswith("^(") and pattern.endswith(")$"):
-                    # Extract seasons from pattern like "^(2020-2021|2021-2022)$"
-                    seasons_str = pattern[2:-2]  # Remove ^( and )$
-                    seasons = seasons_str.split("|")
-                    for season in seasons:
-                        expected_seasons.add(season.strip())
-                else:
-                    # Fallback to basic pattern matching
-                    expected_seasons.add(pattern)
+                league = self.catalog.get(league_id)
+                if not league or not league.seasons:
+                    # No seasons at all for this league
+                    if self.verbose:
+                        self.log(f"League {league_id}: No seasons found in database", "WARN")
+                    leagues_needing_seasons.append(league_id)
+                    continue
                 
-                return expected_seasons
+                # Get league-specific expected seasons in the league's own season format
+                expected_seasons = self.catalog.expected_seasons(league_id, time_period)
+                missing_seasons = self.catalog.missing_seasons(league_id, time_period)
                 
-            except Exception as e:
-                self.log(f"Error in smart pattern generation for league {league_id}: {e}", "WARN")
-                # Fall back to basic logic
-        
-        # Basic logic (fallback)
-        pattern = time_period_config.pattern
-        expected_seasons = set()
-        
-        # For 2020s, generate all seasons from 2020 onwards up to the league's last_season
-        if pattern == "2020|2020-2021|2021|2021-2022|2022|2022-2023|2023|2023-2024|2024|2024-2025|2025|2025-2026":
-            # Use the league's last_season as the cutoff instead of hardcoded future years
-            if last_season:
-                # Parse last_season to get the year (e.g., "2024-2025" -> 2025)
-                try:
-                    if "-" in last_season:
-                        # Format like "2024-2025"
-                        max_year = int(last_season.split("-")[1])
-                    else:
-                        # Format like "2024"
-                        max_year = int(last_season)
-                    
-                    if self.verbose:
-                        self.log(f"Using last_season '{last_season}' -> max_year: {max_year}", "DEBUG")
-                except ValueError:
-                    # Fallback to current year if parsing fails
-                    from datetime import datetime
-                    max_year = datetime.now().year + 1
-                    if self.verbose:
-                        self.log(f"Failed to parse last_season '{last_season}', using fallback max_year: {max_year}", "WARN")
-            else:
-                # Fallback to current year if no last_season provided
-                from datetime import datetime
-                max_year = datetime.now().year + 1
                 if self.verbose:
-                    self.log(f"No last_season provided, using fallback max_year: {max_year}", "WARN")
-            
-            for year in range(2020, max_year + 1):
-                expected_seasons.add(str(year))
-                expected_seasons.add(f"{year}-{year+1}")
+                    self.log(f"League {league_id} expected seasons for '{time_period}': {list(expected_seasons)}", "INFO")
+                    self.log(f"League {league_id}: {len(league.seasons)} existing seasons, {len(expected_seasons)} expected seasons", "INFO")
+                    if missing_seasons:
+                        self.log(f"League {league_id} missing seasons: {sorted(missing_seasons)}", "WARN")
+                    else:
+                        self.log(f"League {league_id}: All expected seasons present", "INFO")
+                
+                if missing_seasons:
+                    leagues_needing_seasons.append(league_id)
             
-            if self.verbose:
-                self.log(f"Generated seasons from 2020 to {max_year}: {sorted(expected_seasons)}", "DEBUG")
-        # For default_2024, just 2024 and 2024-2025
-        elif pattern == "^(2024|2024-2025)$":
-            expected_seasons.add("2024")
-            expected_seasons.add("2024-2025")
-        else:
-            # For other patterns, try to parse them
-            seasons = pattern.split("|")
-            for season in seasons:
-                season = season.strip()
-                if season:
-                    expected_seasons.add(season)
-        
-        return expected_seasons
+            if leagues_needing_seasons:
+                self.log(f"{len(leagues_needing_seasons)} leagues need season updates", "WARN")
+                return False, leagues_needing_seasons
+            else:
+                self.log("All league seasons are fresh for time period", "INFO")
+                return True, []
+                        
+        except Exception as e:
+            self.log(f"Error checking league seasons: {e}", "ERROR")
+            return False, league_ids
     
+    @traced("stage.countries")
     def collect_countries(self, country_codes: List[str]) -> bool:
         """Collect countries data"""
         self.log(f"Collecting countries data for {len(country_codes)} countries...")
@@ -330,9 +407,18 @@ class FootballDataCollector:
             self.log("DRY RUN: Would collect countries data", "INFO")
             return True
         
+        if self.run_unit_done("countries"):
+            self.log("Countries already collected in this run, skipping", "INFO")
+            return True
+        
+        if not get_run_budget().allows("countries", {}):
+            return True
+        
         try:
             self.log(f"Calling load_countries_data with country_codes: {country_codes}", "DEBUG")
-            success = load_countries_data(country_codes=country_codes)
+            self.mark_run_unit("countries", "in_flight")
+            success = load_countries_data(country_codes=country_codes, full_refresh=self.full_refresh)
+            self.mark_run_unit("countries", "done" if success else "failed")
             self.log(f"load_countries_data returned: {success}", "DEBUG")
             if success:
                 self.log("Countries data collection completed", "INFO")
@@ -343,6 +429,7 @@ class FootballDataCollector:
             self.log(f"Error collecting countries: {e}", "ERROR")
             return False
     
+    @traced("stage.leagues")
     def collect_leagues(self, country_codes: List[str]) -> bool:
         """Collect leagues data"""
         self.log(f"Collecting leagues data for {len(country_codes)} countries...")
@@ -351,8 +438,30 @@ class FootballDataCollector:
             self.log("DRY RUN: Would collect leagues data", "INFO")
             return True
         
+        done = [code for code in country_codes if self.run_unit_done("leagues", country_code=code)]
+        if done:
+            self.log(f"Leagues of {len(done)} countries already collected in this run, skipping them", "INFO")
+            country_codes = [code for code in country_codes if code not in done]
+            if not country_codes:
+                return True
+        
+        # The countries' calls run back to back in one loader: start only as many as the budget covers
+        allowed = get_run_budget().allows_batch("leagues", [{'country_code': code} for code in country_codes])
+        if len(allowed) < len(country_codes):
+            country_codes = [params['country_code'] for params in allowed]
+            if not country_codes:
+                return True
+        
         try:
-            success = load_leagues_data(country_codes=country_codes)
+            for code in country_codes:
+                self.mark_run_unit("leagues", "in_flight", country_code=code)
+            success = load_leagues_data(country_codes=country_codes, full_refresh=self.full_refresh)
+            for code in country_codes:
+                self.mark_run_unit("leagues", "done" if success else "failed", country_code=code)
+            # League list or last seasons may have changed
+            self._catalog = None
+            if success and self._league_diff is not None:
+                self._league_diff.resolve(country_codes)
             if success:
                 self.log("Leagues data collection completed", "INFO")
             else:
@@ -362,6 +471,7 @@ class FootballDataCollector:
             self.log(f"Error collecting leagues: {e}", "ERROR")
             return False
     
+    @traced("stage.league_seasons")
     def collect_league_seasons(self, league_ids: List[int], time_period: Optional[str] = None) -> bool:
         """Collect league seasons data"""
         # Filter out blacklisted leagues
@@ -369,10 +479,13 @@ class FootballDataCollector:
         blacklisted_count = 0
         
         for league_id in league_ids:
-            if self.blacklist.is_blacklisted("league-seasons", league_id=league_id):
+            if self.catalog.is_blacklisted("league-seasons", league_id):
                 if self.verbose:
                     self.log(f"League {league_id} is blacklisted for league-seasons endpoint, skipping", "INFO")
                 blacklisted_count += 1
+            elif self.run_unit_done("league-seasons", league_id=league_id):
+                if self.verbose:
+                    self.log(f"League {league_id} seasons already collected in this run, skipping", "INFO")
             else:
                 filtered_league_ids.append(league_id)
         
@@ -380,7 +493,7 @@ class FootballDataCollector:
             self.log(f"Skipped {blacklisted_count} blacklisted leagues", "INFO")
         
         if not filtered_league_ids:
-            self.log("No leagues to collect after filtering blacklisted endpoints", "INFO")
+            self.log("No leagues to collect after filtering blacklisted and already collected leagues", "INFO")
             return True
         
         self.log(f"Collecting league seasons data for {len(filtered_league_ids)} leagues...")
@@ -397,8 +510,14 @@ class FootballDataCollector:
             success = load_league_seasons_data(
                 league_ids=filtered_league_ids,
                 time_period=time_period,
-                update_only=False  # Allow new seasons to be added
+                update_only=False,  # Allow new seasons to be added
+                catalog=self.catalog,
+                full_refresh=self.full_refresh,
+                ledger=self.ledger,
+                claims=self.claims
             )
+            # Known seasons have changed
+            self._catalog = None
             self.log(f"load_league_seasons_data returned: {success}", "DEBUG")
             if success:
                 self.log("League seasons data collection completed", "INFO")
@@ -409,6 +528,7 @@ class FootballDataCollector:
             self.log(f"Error collecting league seasons: {e}", "ERROR")
             return False
     
+    @traced("stage.league_season_details")
     def collect_league_season_details(self, league_ids: List[int], time_period: Optional[str] = None) -> bool:
         """Collect league season details data"""
         # Filter out blacklisted leagues
@@ -444,7 +564,9 @@ class FootballDataCollector:
             success = load_league_season_details_data(
                 league_ids=filtered_league_ids,
                 time_period=time_period,
-                update_only=False  # Allow new details to be added
+                update_only=False,  # Allow new details to be added
+                ledger=self.ledger,
+                claims=self.claims
             )
             self.log(f"load_league_season_details_data returned: {success}", "DEBUG")
             if success:
@@ -456,7 +578,9 @@ class FootballDataCollector:
             self.log(f"Error collecting league season details: {e}", "ERROR")
             return False
     
-    def collect_league_matches(self, league_ids: List[int], time_period: Optional[str] = None) -> bool:
+    @traced("stage.league_matches")
+    def collect_league_matches(self, league_ids: List[int], time_period: Optional[str] = None,
+                               league_seasons: Optional[List[Tuple[int, str]]] = None) -> bool:
         """Collect league matches data (fixtures/schedules)"""
         # Filter out blacklisted leagues
         filtered_league_ids = []
@@ -477,12 +601,20 @@ class FootballDataCollector:
             self.log("No leagues to collect after filtering blacklisted endpoints", "INFO")
             return True
         
+        if league_seasons is not None:
+            league_seasons = [pair for pair in league_seasons if pair[0] in filtered_league_ids]
+            if not league_seasons:
+                self.log("No league-seasons to collect after filtering blacklisted endpoints", "INFO")
+                return True
+        
         self.log(f"Collecting league matches data for {len(filtered_league_ids)} leagues...")
         if time_period:
             self.log(f"Filtering for time period: {time_period}")
         
         if self.dry_run:
-            self.log("DRY RUN: Would collect league matches data", "INFO")
+            summary = self.ledger.summary("matches")
+            self.log(f"DRY RUN: Would collect league matches data "
+                     f"({summary.get('complete', 0)} matches units already complete)", "INFO")
             return True
         
         try:
@@ -491,7 +623,11 @@ class FootballDataCollector:
             success = load_league_matches_data(
                 league_ids=filtered_league_ids,
                 time_period=time_period,
-                update_only=False  # Allow new matches to be added
+                update_only=False,  # Allow new matches to be added
+                ledger=self.ledger,
+                claims=self.claims,
+                delta=self.delta,
+                league_seasons=league_seasons
             )
             self.log(f"load_league_matches_data returned: {success}", "DEBUG")
             if success:
@@ -503,7 +639,9 @@ class FootballDataCollector:
             self.log(f"Error collecting league matches: {e}", "ERROR")
             return False
     
-    def collect_team_matches(self, league_ids: List[int], time_period: Optional[str] = None) -> bool:
+    @traced("stage.team_matches")
+    def collect_team_matches(self, league_ids: List[int], time_period: Optional[str] = None,
+                             league_seasons: Optional[List[Tuple[int, str]]] = None) -> bool:
         """Collect team matches data (actual results with scores)"""
         # Filter out blacklisted leagues
         filtered_league_ids = []
@@ -524,6 +662,12 @@ class FootballDataCollector:
             self.log("No leagues to collect after filtering blacklisted endpoints", "INFO")
             return True
         
+        if league_seasons is not None:
+            league_seasons = [pair for pair in league_seasons if pair[0] in filtered_league_ids]
+            if not league_seasons:
+                self.log("No league-seasons to collect after filtering blacklisted endpoints", "INFO")
+                return True
+        
         self.log(f"Collecting team matches data for {len(filtered_league_ids)} leagues...")
         if time_period:
             self.log(f"Filtering for time period: {time_period}")
@@ -538,7 +682,10 @@ class FootballDataCollector:
             success = load_team_matches_data(
                 league_ids=filtered_league_ids,
                 time_period=time_period,
-                update_only=False  # Allow new matches to be added
+                update_only=False,  # Allow new matches to be added
+                ledger=self.ledger,
+                claims=self.claims,
+                league_seasons=league_seasons
             )
             self.log(f"load_team_matches_data returned: {success}", "DEBUG")
             if success:
@@ -550,45 +697,172 @@ class FootballDataCollector:
             self.log(f"Error collecting team matches: {e}", "ERROR")
             return False
     
+    @traced("stage.player_stats")
+    def collect_player_stats(self, league_ids: List[int], time_period: Optional[str] = None,
+                             league_seasons: Optional[List[Tuple[int, str]]] = None) -> bool:
+        """
+        Collect player stats with the fewest calls covering every completed match
+        
+        The coverage planner picks one league-season call where the endpoint is
+        allowed and falls back to per-team or per-match calls only for gaps.
+        
+        Args:
+            league_ids: League IDs
+            time_period: Time period filter
+            league_seasons: Exact (league_id, season_id) pairs (None = all in the time period)
+        
+        Returns:
+            bool: True if successful
+        """
+        if not load_player_stats_settings().enabled:
+            return True
+        
+        plan = self.crawl_planner().plan_player_stats(league_ids, time_period, league_seasons)
+        self.log(f"Player stats: {len(plan.units)} calls planned "
+                 f"({plan.cache_hits} league-seasons already covered)")
+        for note in plan.notes:
+            self.log(note, "INFO")
+        if not plan.units:
+            return True
+        
+        if self.dry_run:
+            self.log("DRY RUN: Would collect player stats", "INFO")
+            return True
+        
+        units_by_endpoint: Dict[str, List[WorkUnit]] = {}
+        for unit in plan.units:
+            units_by_endpoint.setdefault(unit.endpoint, []).append(unit)
+        
+        success = True
+        for endpoint, units in units_by_endpoint.items():
+            loader = PLAYER_STATS_LOADERS.get(endpoint)
+            if loader is None:
+                self.log(f"No loader for /{endpoint} yet, skipping {len(units)} planned calls", "WARN")
+                continue
+            try:
+                if not loader(units, ledger=self.ledger, claims=self.claims):
+                    self.log(f"Player stats collection from /{endpoint} failed", "ERROR")
+                    success = False
+            except Exception as e:
+                self.log(f"Error collecting player stats from /{endpoint}: {e}", "ERROR")
+                success = False
+        return success
+    
+    @property
+    def cascade(self) -> str:
+        """Cascade mode: 'changes' (propagate change sets) or 'full' (every stage for every league)"""
+        return load_collection_config().defaults.get('cascade', 'changes')
+
+    @traced("cascade")
+    def collect_changes(self, league_ids: List[int], leagues_needing_update: List[Dict],
+                        time_period: Optional[str] = None) -> bool:
+        """
+        Run the league seasons, league matches and team matches stages on change sets
+
+        Each stage consumes what the stage above changed: leagues whose
+        last_season moved (or that miss expected seasons) load their seasons,
+        only the new league-seasons and seasons in progress with newly
+        completed matches load their matches, and only league-seasons whose
+        completed matches are not yet in team_matches load team schedules.
+
+        Args:
+            league_ids: League IDs in scope
+            leagues_needing_update: Changes from the leagues freshness check
+            time_period: Time period filter
+
+        Returns:
+            bool: True if successful
+        """
+        # Leagues → league seasons
+        leagues = league_changes(leagues_needing_update, league_ids)
+        seasons_fresh, leagues_needing_seasons = self.check_league_seasons_freshness(league_ids, time_period)
+        leagues.leagues.update(leagues_needing_seasons)
+        self.log(f"Cascade {leagues.describe()}", "INFO")
+
+        before = known_seasons(self.catalog, leagues.league_ids)
+        if leagues and not self.collect_league_seasons(leagues.league_ids, time_period):
+            self.log("Failed to collect league seasons data", "ERROR")
+            return False
+        seasons = season_changes(before, self.catalog, time_period)
+        self.log(f"Cascade {seasons.describe()}", "INFO")
+
+        # League seasons → league matches: new seasons plus seasons in progress with due matches
+        planner = CrawlPlanner(self.database_url, self.blacklist, self.catalog, self.ledger, delta=True)
+        in_progress = planner.plan_league_matches(league_ids, time_period)
+        league_seasons = set(seasons.league_seasons)
+        league_seasons.update(
+            (unit.params['league_id'], unit.params['season_id']) for unit in in_progress.units
+        )
+        self.log(f"Cascade league-matches input: {len(seasons.league_seasons)} new and "
+                 f"{len(league_seasons) - len(seasons.league_seasons)} due league-seasons "
+                 f"({in_progress.cache_hits} unchanged)", "INFO")
+        
+        for tier in self.value_tiers(planner, league_seasons):
+            if not self.collect_match_changes(tier, time_period):
+                return False
+        return True
+    
+    def value_tiers(self, planner: CrawlPlanner,
+                    league_seasons: Iterable[Tuple[int, str]]) -> List[List[Tuple[int, str]]]:
+        """
+        League-seasons ordered by expected value, split into tiers under a run budget
+        
+        Under a run budget, current seasons form their own tier so they go
+        through every match stage before older seasons start.
+        
+        Returns:
+            List of tiers, each a list of (league_id, season_id) pairs
+        """
+        ordered = sorted(league_seasons, key=lambda pair: (
+            planner.value_key(WorkUnit.of("matches", league_id=pair[0], season_id=pair[1])), pair
+        ))
+        if not get_run_budget().active:
+            return [ordered] if ordered else []
+        current = [pair for pair in ordered if self.catalog.is_current_season(*pair)]
+        older = [pair for pair in ordered if not self.catalog.is_current_season(*pair)]
+        return [tier for tier in (current, older) if tier]
+    
+    def collect_match_changes(self, league_seasons: List[Tuple[int, str]],
+                              time_period: Optional[str] = None) -> bool:
+        """
+        Collect league matches, then team matches where matches newly completed
+        
+        Args:
+            league_seasons: (league_id, season_id) pairs in collection order
+            time_period: Time period filter
+        
+        Returns:
+            bool: True if successful
+        """
+        league_ids = list(dict.fromkeys(league_id for league_id, _ in league_seasons))
+        if not self.collect_league_matches(league_ids, time_period, league_seasons=league_seasons):
+            self.log("Failed to collect league matches data", "ERROR")
+            return False
+        
+        # League matches → team matches: only league-seasons with newly completed matches
+        matches = match_changes(get_completed_league_matches(sorted(league_ids)), league_seasons)
+        self.log(f"Cascade {matches.describe()}", "INFO")
+        if matches and not self.collect_team_matches(
+                matches.league_ids, time_period,
+                league_seasons=[pair for pair in league_seasons if pair in matches.league_seasons]):
+            self.log("Failed to collect team matches data", "ERROR")
+            return False
+        
+        # Player stats cover the completed matches of the same league-seasons
+        if not self.collect_player_stats(league_ids, time_period, league_seasons=league_seasons):
+            self.log("Failed to collect player stats data", "ERROR")
+            return False
+        return True
+
     def get_league_ids_for_countries(self, country_codes: List[str]) -> List[int]:
         """Get league IDs for specified countries"""
-        try:
-            with psycopg2.connect(self.database_url) as conn:
-                with conn.cursor() as cur:
-                    placeholders = ','.join(['%s'] * len(country_codes))
-                    cur.execute(f"""
-                        SELECT DISTINCT league_id 
-                        FROM staging.leagues 
-                        WHERE country_code IN ({placeholders})
-                        AND league_type IN ('domestic_leagues', 'domestic_cups')
-                        ORDER BY league_id
-                    """, country_codes)
-                    
-                    return [row[0] for row in cur.fetchall()]
-        except Exception as e:
-            self.log(f"Error getting league IDs: {e}", "ERROR")
-            return []
+        return self.catalog.league_ids_for_countries(country_codes)
     
     def filter_league_ids_by_names(self, league_ids: List[int], league_names: List[str]) -> List[int]:
         """Filter league IDs by league names"""
-        try:
-            with psycopg2.connect(self.database_url) as conn:
-                with conn.cursor() as cur:
-                    placeholders = ','.join(['%s'] * len(league_ids))
-                    name_placeholders = ','.join(['%s'] * len(league_names))
-                    cur.execute(f"""
-                        SELECT league_id 
-                        FROM staging.leagues 
-                        WHERE league_id IN ({placeholders})
-                        AND competition_name IN ({name_placeholders})
-                        ORDER BY league_id
-                    """, league_ids + league_names)
-                    
-                    return [row[0] for row in cur.fetchall()]
-        except Exception as e:
-            self.log(f"Error filtering league IDs by names: {e}", "ERROR")
-            return []
+        return self.catalog.filter_by_names(league_ids, league_names)
     
+    @traced("scope")
     def collect_scope(self, scope_name: str, time_period: Optional[str] = None, force_refresh: bool = False) -> bool:
         """Collect data for a specific scope"""
         self.log(f"Starting collection for scope: {scope_name}")
@@ -610,7 +884,7 @@ class FootballDataCollector:
         # Step 1: Check and collect countries
         countries_fresh, missing_countries = self.check_countries_freshness(scope.countries)
         
-        if not countries_fresh or force_refresh:
+        if not countries_fresh or force_refresh or self.full_refresh:
             if not self.collect_countries(scope.countries):
                 self.log("Failed to collect countries data", "ERROR")
                 return False
@@ -620,7 +894,7 @@ class FootballDataCollector:
         # Step 2: Check and collect leagues
         leagues_fresh, leagues_needing_update = self.check_leagues_freshness(scope.countries)
         
-        if not leagues_fresh or force_refresh:
+        if not leagues_fresh or force_refresh or self.full_refresh:
             if not self.collect_leagues(scope.countries):
                 self.log("Failed to collect leagues data", "ERROR")
                 return False
@@ -642,27 +916,29 @@ class FootballDataCollector:
         
         if league_ids:
             # Use scope's time period if available, otherwise use CLI argument
-            # For scopes, we need to find the time period name from the pattern
             scope_time_period = None
             if scope.time_period:
-                # Find the time period name that matches this pattern
-                config = load_collection_config()
-                time_periods = config.config.get('time_periods', {})
-                for tp_name, tp_config in time_periods.items():
-                    if tp_config.get('pattern') == scope.time_period.pattern:
-                        scope_time_period = tp_name
-                        break
-                if not scope_time_period:
-                    scope_time_period = scope.time_period.pattern  # Fallback to pattern
+                # Predefined periods are passed by name; inline ones by their legacy pattern
+                scope_time_period = scope.time_period.name or scope.time_period.pattern or time_period
             else:
                 scope_time_period = time_period
             
+            # Steps 3-6 on change sets unless everything is refreshed
+            if self.cascade == 'changes' and not force_refresh and not self.full_refresh:
+                if not self.collect_changes(league_ids, leagues_needing_update, scope_time_period):
+                    return False
+                self.log(f"Collection for scope '{scope_name}' completed successfully!", "INFO")
+                return True
+            
             # Check if league seasons are fresh for the time period
             seasons_fresh, leagues_needing_seasons = self.check_league_seasons_freshness(league_ids, scope_time_period)
             
-            if not seasons_fresh or force_refresh:
+            if self.full_refresh:
+                leagues_needing_seasons = league_ids
+            
+            if not seasons_fresh or force_refresh or self.full_refresh:
                 self.log("League seasons need updating, collecting...")
-                # Only collect for leagues that actually need updates
+                # Only collect for leagues that actually need updates (all of them on a full refresh)
                 if leagues_needing_seasons:
                     if not self.collect_league_seasons(leagues_needing_seasons, scope_time_period):
                         self.log("Failed to collect league seasons data", "ERROR")
@@ -689,12 +965,170 @@ class FootballDataCollector:
             if not self.collect_team_matches(league_ids, scope_time_period):
                 self.log("Failed to collect team matches data", "ERROR")
                 return False
+            
+            # Step 7: Collect player stats (fewest calls covering the completed matches)
+            if not self.collect_player_stats(league_ids, scope_time_period):
+                self.log("Failed to collect player stats data", "ERROR")
+                return False
         else:
             self.log("No leagues found for countries, skipping league seasons and details", "WARN")
         
         self.log(f"Collection for scope '{scope_name}' completed successfully!", "INFO")
         return True
     
+    @traced("scopes")
+    def collect_scopes(self, scope_names: List[str], time_period: Optional[str] = None,
+                       force_refresh: bool = False) -> bool:
+        """
+        Collect several scopes as one batch
+        
+        Each stage is expanded for every scope, deduplicated and run once, so
+        countries, leagues, league seasons and matches shared by scopes are
+        checked and fetched once. Units run in priority order, each keeping
+        the highest priority of any scope that requested it.
+        """
+        config = load_collection_config()
+        scopes = []
+        for scope_name in scope_names:
+            scope = config.get_scope(scope_name)
+            if not scope:
+                self.log(f"Scope '{scope_name}' not found!", "ERROR")
+                return False
+            scopes.append(scope)
+        
+        # Highest priority first; equal priorities keep the requested order
+        scopes.sort(key=lambda scope: priority_rank(scope.priority))
+        self.log(f"Starting batch collection for scopes: "
+                 f"{', '.join(f'{scope.name} ({scope.priority})' for scope in scopes)}")
+        
+        country_codes = []
+        for scope in scopes:
+            country_codes.extend(code for code in scope.countries or [] if code not in country_codes)
+        
+        if country_codes:
+            self.log(f"Countries: {', '.join(country_codes)}")
+            
+            # Step 1: Check and collect countries once for all scopes
+            countries_fresh, missing_countries = self.check_countries_freshness(country_codes)
+            
+            if not countries_fresh or force_refresh or self.full_refresh:
+                if not self.collect_countries(country_codes):
+                    self.log("Failed to collect countries data", "ERROR")
+                    return False
+            else:
+                self.log("Countries data is fresh, skipping collection", "INFO")
+            
+            # Step 2: Check and collect leagues once for all scopes
+            leagues_fresh, leagues_needing_update = self.check_leagues_freshness(country_codes)
+            
+            if not leagues_fresh or force_refresh or self.full_refresh:
+                if not self.collect_leagues(country_codes):
+                    self.log("Failed to collect leagues data", "ERROR")
+                    return False
+            else:
+                self.log("Leagues data is fresh, skipping collection", "INFO")
+        
+        # (scope, time period, league IDs) per scope
+        planner = self.crawl_planner()
+        requests = []
+        for scope in scopes:
+            league_ids = planner.scope_league_ids(scope)
+            if not league_ids:
+                self.log(f"No leagues found for scope '{scope.name}'", "WARN")
+            requests.append((scope, scope_time_period(scope, time_period), league_ids))
+        
+        # Step 3: Check and collect league seasons once per league and time period
+        periods: Dict[Optional[str], List[int]] = {}
+        for scope, period, league_ids in requests:
+            period_league_ids = periods.setdefault(period, [])
+            period_league_ids.extend(league_id for league_id in league_ids if league_id not in period_league_ids)
+        
+        for period, league_ids in periods.items():
+            if not league_ids:
+                continue
+            seasons_fresh, leagues_needing_seasons = self.check_league_seasons_freshness(league_ids, period)
+            
+            if self.full_refresh:
+                leagues_needing_seasons = league_ids
+            
+            if (not seasons_fresh or force_refresh or self.full_refresh) and leagues_needing_seasons:
+                self.log(f"League seasons need updating for {len(leagues_needing_seasons)} leagues "
+                         f"({period or 'all seasons'}), collecting...")
+                if not self.collect_league_seasons(leagues_needing_seasons, period):
+                    self.log("Failed to collect league seasons data", "ERROR")
+                    return False
+            else:
+                self.log(f"League seasons are fresh for {period or 'all seasons'}, skipping collection", "INFO")
+        
+        # Steps 5-6: League-seasons were just loaded, so plan the match units afresh
+        planner = self.crawl_planner()
+        ranked = [(scope, period, league_ids, priority_rank(scope.priority))
+                  for scope, period, league_ids in requests if league_ids]
+        
+        # Units run by expected value; under a run budget, current seasons
+        # go through both match stages before older seasons start
+        tiers = [True, False] if get_run_budget().active else [None]
+        for current in tiers:
+            league_matches = merge_stage_plans("league-matches", [
+                (planner.plan_league_matches(league_ids, period), rank)
+                for scope, period, league_ids, rank in ranked
+            ], planner.value_key)
+            if current is not None:
+                league_matches.units = [
+                    unit for unit in league_matches.units
+                    if self.catalog.is_current_season(unit.params['league_id'], unit.params['season_id']) == current
+                ]
+            if not self.collect_merged_stage(league_matches, self.collect_league_matches):
+                self.log("Failed to collect league matches data", "ERROR")
+                return False
+            
+            team_matches = merge_stage_plans("team-matches", [
+                (planner.plan_team_matches(league_ids, period), rank)
+                for scope, period, league_ids, rank in ranked
+            ], planner.value_key)
+            if current is not None:
+                team_matches.units = [
+                    unit for unit in team_matches.units
+                    if self.catalog.is_current_season(unit.params['league_id'], unit.params['season_id']) == current
+                ]
+            if not self.collect_merged_stage(team_matches, self.collect_team_matches):
+                self.log("Failed to collect team matches data", "ERROR")
+                return False
+        
+        # Step 7: Player stats once per time period, after every match stage
+        for period, league_ids in periods.items():
+            if league_ids and not self.collect_player_stats(league_ids, period):
+                self.log("Failed to collect player stats data", "ERROR")
+                return False
+        
+        self.log(f"Batch collection for {len(scopes)} scopes completed successfully!", "INFO")
+        return True
+    
+    def collect_merged_stage(self, stage: StagePlan, collect) -> bool:
+        """
+        Collect the league-seasons of a merged matches stage, in unit order
+        
+        Args:
+            stage: Merged league-matches or team-matches stage
+            collect: collect_league_matches or collect_team_matches
+        
+        Returns:
+            bool: True if successful
+        """
+        league_seasons = list(dict.fromkeys(
+            (unit.params['league_id'], unit.params['season_id']) for unit in stage.units
+        ))
+        self.log(f"Collecting {stage.stage}: {len(stage.units)} units in {len(league_seasons)} "
+                 f"league-seasons ({stage.cache_hits} already complete)...")
+        for note in stage.notes:
+            self.log(note, "INFO")
+        if not league_seasons:
+            self.log(f"No {stage.stage} to collect", "INFO")
+            return True
+        league_ids = list(dict.fromkeys(league_id for league_id, _ in league_seasons))
+        return collect(league_ids, league_seasons=league_seasons)
+    
+    @traced("custom_countries")
     def collect_custom_countries(self, country_codes: List[str], time_period: Optional[str] = None, force_refresh: bool = False) -> bool:
         """Collect data for custom country selection"""
         self.log(f"Starting collection for custom countries: {', '.join(country_codes)}")
@@ -702,7 +1136,7 @@ class FootballDataCollector:
         # Step 1: Check and collect countries
         countries_fresh, missing_countries = self.check_countries_freshness(country_codes)
         
-        if not countries_fresh or force_refresh:
+        if not countries_fresh or force_refresh or self.full_refresh:
             if not self.collect_countries(country_codes):
                 self.log("Failed to collect countries data", "ERROR")
                 return False
@@ -712,7 +1146,7 @@ class FootballDataCollector:
         # Step 2: Check and collect leagues
         leagues_fresh, leagues_needing_update = self.check_leagues_freshness(country_codes)
         
-        if not leagues_fresh or force_refresh:
+        if not leagues_fresh or force_refresh or self.full_refresh:
             if not self.collect_leagues(country_codes):
                 self.log("Failed to collect leagues data", "ERROR")
                 return False
@@ -722,11 +1156,15 @@ class FootballDataCollector:
         # Step 3: Check and collect league seasons
         league_ids = self.get_league_ids_for_countries(country_codes)
         
-        if league_ids:
+        if league_ids and self.cascade == 'changes' and not force_refresh and not self.full_refresh:
+            # Steps 3-6 on change sets
+            if not self.collect_changes(league_ids, leagues_needing_update, time_period):
+                return False
+        elif league_ids:
             # Check if league seasons are fresh for the time period
             seasons_fresh, leagues_needing_seasons = self.check_league_seasons_freshness(league_ids, time_period)
             
-            if not seasons_fresh or force_refresh:
+            if not seasons_fresh or force_refresh or self.full_refresh:
                 self.log("League seasons need updating, collecting...")
                 if not self.collect_league_seasons(league_ids, time_period):
                     self.log("Failed to collect league seasons data", "ERROR")
@@ -751,20 +1189,181 @@ class FootballDataCollector:
             if not self.collect_team_matches(league_ids, time_period):
                 self.log("Failed to collect team matches data", "ERROR")
                 return False
+            
+            # Step 7: Collect player stats (fewest calls covering the completed matches)
+            if not self.collect_player_stats(league_ids, time_period):
+                self.log("Failed to collect player stats data", "ERROR")
+                return False
         else:
             self.log("No leagues found for countries, skipping league seasons and details", "WARN")
         
         self.log(f"Collection for custom countries completed successfully!", "INFO")
         return True
 
+def split_scope_names(scope_name: str) -> List[str]:
+    """Scope names from a comma-separated --scope value"""
+    return [name.strip() for name in scope_name.split(",") if name.strip()]
+
+def run_collection(collector: FootballDataCollector, scope_name: Optional[str] = None,
+                   country_codes: Optional[List[str]] = None, time_period: Optional[str] = None,
+                   force_refresh: bool = False, manifest_path: Optional[str] = None,
+                   resume_run_id: Optional[int] = None, trace: bool = False,
+                   profile: bool = False, max_api_calls: Optional[int] = None,
+                   deadline: Optional[datetime] = None, refinalize: bool = False) -> bool:
+    """
+    Run one collection job (or print its crawl manifest in dry-run mode)
+    
+    Every run is checkpointed in staging.collection_runs: its planned units
+    and each unit's state are saved as it goes, and an interrupted run is
+    continued with resume_run_id (its saved arguments replace the given ones).
+    
+    Args:
+        collector: Collector configured for the job
+        scope_name: Predefined scope name, or several separated by commas
+        country_codes: Country codes (when no scope is given)
+        time_period: Time period filter
+        force_refresh: Ignore freshness checks
+        manifest_path: Write the dry-run manifest to this JSON file
+        resume_run_id: Continue this interrupted run
+        trace: Record tracing spans for this run (also on when tracing.enabled is set)
+        profile: Sample CPU and allocations per stage (see the profiling config block)
+        max_api_calls: Stop starting units after this many API calls
+        deadline: Stop starting units when this local time is near
+        refinalize: Collect finalized and absent seasons again and re-evaluate them
+    
+    Returns:
+        bool: True if successful
+    """
+    get_season_registry().refinalize = refinalize
+    
+    if collector.dry_run:
+        # Plan from staging data only; no API calls are made
+        manifest = collector.plan_crawl(scope_name, country_codes, time_period, force_refresh)
+        manifest.print_manifest()
+        if manifest_path:
+            manifest.write(manifest_path)
+        return True
+    
+    if resume_run_id is not None:
+        run = resume_run(resume_run_id, collector.database_url)
+        scope_name = run.args.get('scope')
+        country_codes = run.args.get('countries')
+        time_period = run.args.get('time_period')
+        force_refresh = bool(run.args.get('force'))
+        collector.full_refresh = bool(run.args.get('full_refresh'))
+        collector.delta = bool(run.args.get('delta'))
+        get_season_registry().refinalize = bool(run.args.get('refinalize'))
+    else:
+        run = start_run({
+            'scope': scope_name,
+            'countries': country_codes,
+            'time_period': time_period,
+            'force': force_refresh,
+            'full_refresh': collector.full_refresh,
+            'delta': collector.delta,
+            'refinalize': refinalize
+        }, collector.database_url)
+    collector.attach_run(run)
+    
+    tracer = get_tracer()
+    if trace or tracer.settings.enabled:
+        tracer.begin()
+    run_span = tracer.start_span("run", run_id=run.run_id, scope=scope_name)
+    profiler = get_profiler()
+    if profile:
+        profiler.begin(f"run-{run.run_id}")
+    budget = get_run_budget()
+    
+    try:
+        # Save the planned units as the run manifest
+        with tracer.span("plan"):
+            manifest = collector.plan_crawl(scope_name, country_codes, time_period, force_refresh)
+        run.add_pending(unit for stage in manifest.stages for unit in stage.units)
+        budget.begin(max_api_calls, deadline, manifest.seconds_per_call)
+        get_progress_reporter().begin(
+            f"{scope_name or ','.join(country_codes or [])} (run {run.run_id})",
+            {stage.stage: len(stage.units) + stage.estimated_calls for stage in manifest.stages},
+            rate_limit_delay=collector.client.rate_limit_delay
+        )
+        
+        if scope_name and ',' in scope_name:
+            # Several predefined scopes, deduplicated into one batch
+            success = collector.collect_scopes(split_scope_names(scope_name), time_period, force_refresh)
+        elif scope_name:
+            # Use predefined scope
+            success = collector.collect_scope(scope_name, time_period, force_refresh)
+        else:
+            # Use custom country selection
+            success = collector.collect_custom_countries(country_codes, time_period, force_refresh)
+    except KeyboardInterrupt:
+        run.finish('interrupted')
+        run.print_summary()
+        print(f"\n🛑 Collection interrupted; continue with --resume {run.run_id}")
+        raise
+    except Exception:
+        run.finish('failed')
+        print(f"\n❌ Collection crashed; continue with --resume {run.run_id}")
+        raise
+    finally:
+        get_progress_reporter().finish()
+        tracer.end_span(run_span)
+        tracer.end()
+        profiler.end()
+        collector.detach_run()
+        budget.print_summary(run.run_id)
+        budget.end()
+    
+    # Units deferred by the run budget stay pending for --resume
+    if success and budget.deferred:
+        run.finish('interrupted')
+    else:
+        run.finish('completed' if success else 'failed')
+    run.print_summary()
+    if not success:
+        print(f"↩️  Retry the unfinished units with --resume {run.run_id}")
+    
+    # Finalize seasons that became complete and verified; drop superseded raw payloads
+    if success:
+        get_season_registry().finalize()
+        prune_raw_payloads()
+    
+    if success:
+        print("\n🎉 Collection completed successfully!")
+    else:
+        print("\n❌ Collection failed!")
+    return success
+
 def main():
     """Main CLI function"""
     parser = argparse.ArgumentParser(description="Football Data Collection Orchestrator")
-    parser.add_argument("--scope", help="Predefined scope name (e.g., european_majors)")
+    parser.add_argument("command", nargs="?", default="collect",
+                        choices=["collect", "serve", "submit", "service-status", "service-stop"],
+                        help="collect (default), serve jobs from a local socket, or talk to a running service")
+    parser.add_argument("--scope",
+                        help="Predefined scope name, or several comma-separated (e.g., european_majors,european_cups)")
+    parser.add_argument("--all-scopes", action="store_true", help="Collect every predefined scope in one batch")
     parser.add_argument("--countries", help="Comma-separated country codes (e.g., ENG,GER,FRA)")
     parser.add_argument("--time-period", help="Time period filter (e.g., 2024, 2020s)")
-    parser.add_argument("--dry-run", action="store_true", help="Test without making changes")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Print the planned API calls and ETA without making changes")
+    parser.add_argument("--manifest", help="Write the dry-run crawl manifest to this JSON file")
     parser.add_argument("--force", action="store_true", help="Force refresh ignoring freshness checks")
+    parser.add_argument("--full-refresh", action="store_true",
+                        help="Rebuild countries, leagues and league seasons via atomic shadow-table swaps")
+    parser.add_argument("--resume", type=int, metavar="RUN_ID",
+                        help="Continue an interrupted run where it stopped, with its original arguments")
+    parser.add_argument("--delta", action="store_true",
+                        help="Only re-fetch seasons in progress with matches completed since their last fetch")
+    parser.add_argument("--trace", action="store_true",
+                        help="Write tracing spans (see the tracing config block) and print self-time per span")
+    parser.add_argument("--profile", action="store_true",
+                        help="Sample CPU and allocations per stage and write flamegraph files (see the profiling config block)")
+    parser.add_argument("--max-api-calls", type=int, metavar="N",
+                        help="Stop starting units after N API calls, most valuable units first")
+    parser.add_argument("--deadline", metavar="WHEN",
+                        help="Stop starting units before this time (e.g. 05:30, 90m, 2h or an ISO datetime)")
+    parser.add_argument("--refinalize", action="store_true",
+                        help="Collect finalized and absent seasons again and re-evaluate their finalization")
     parser.add_argument("--verbose", action="store_true", help="Verbose output")
     parser.add_argument("--show-blacklist", action="store_true", help="Show blacklisted endpoints and exit")
     
@@ -776,30 +1375,55 @@ def main():
         blacklist.print_blacklist_summary()
         return 0
     
-    if not args.scope and not args.countries:
-        parser.error("Must specify either --scope or --countries")
+    country_codes = [code.strip() for code in args.countries.split(",")] if args.countries else None
+    if args.all_scopes:
+        args.scope = ",".join(load_collection_config().list_scopes())
+    
+    if args.command == "serve":
+        from etl.collection_service import serve
+        return serve(verbose=args.verbose)
+    
+    if args.command in ("service-status", "service-stop"):
+        from etl.collection_service import submit_job
+        return submit_job({'command': 'status' if args.command == "service-status" else 'shutdown'})
+    
+    if not args.scope and not args.countries and args.resume is None:
+        parser.error("Must specify either --scope, --countries or --resume")
     
     try:
-        collector = FootballDataCollector(dry_run=args.dry_run, verbose=args.verbose)
-        
-        if args.scope:
-            # Use predefined scope
-            success = collector.collect_scope(args.scope, args.time_period, args.force)
-        else:
-            # Use custom country selection
-            country_codes = [code.strip() for code in args.countries.split(",")]
-            success = collector.collect_custom_countries(country_codes, args.time_period, args.force)
-        
-        if success:
-            print("\n🎉 Collection completed successfully!")
-            return 0
-        else:
-            print("\n❌ Collection failed!")
-            return 1
+        deadline = parse_deadline(args.deadline) if args.deadline else None
+    except ValueError as e:
+        parser.error(str(e))
+    
+    if args.command == "submit":
+        from etl.collection_service import submit_job
+        return submit_job({
+            'scope': args.scope,
+            'countries': country_codes,
+            'time_period': args.time_period,
+            'force': args.force,
+            'full_refresh': args.full_refresh,
+            'delta': args.delta,
+            'dry_run': args.dry_run,
+            'resume': args.resume,
+            'trace': args.trace,
+            'profile': args.profile,
+            'max_api_calls': args.max_api_calls,
+            'deadline': deadline.isoformat() if deadline else None,
+            'refinalize': args.refinalize
+        })
+    
+    try:
+        collector = FootballDataCollector(dry_run=args.dry_run, verbose=args.verbose,
+                                          full_refresh=args.full_refresh, delta=args.delta)
+        success = run_collection(collector, args.scope, country_codes, args.time_period,
+                                 args.force, args.manifest, args.resume, args.trace,
+                                 args.profile, args.max_api_calls, deadline, args.refinalize)
+        return 0 if success else 1
             
     except Exception as e:
         print(f"❌ Error: {e}")
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main()) 
\ No newline at end of file
+    sys.exit(main())
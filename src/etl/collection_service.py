@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Collection Service
+Long-running collector that keeps config, blacklist, league metadata, database
+connections and the HTTP session warm, and runs collection jobs submitted over
+a local unix socket one at a time
+
+Usage:
+    python3 src/etl/collect_football_data.py serve
+    python3 src/etl/collect_football_data.py submit --scope european_majors --delta
+"""
+
+import os
+import sys
+import json
+import queue
+import socket
+import threading
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+# Add src to path
+sys.path.append('src')
+
+from utils.collection_config import load_collection_config
+from utils.db import close_connection_pool, enable_connection_pool
+from etl.collect_football_data import FootballDataCollector, run_collection, split_scope_names
+
+class CollectionServiceSettings:
+    """Service settings from the `service` config block, re-read when the file changes"""
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Current `service` config block"""
+        return load_collection_config().config.get('service', {})
+
+    @property
+    def socket_path(self) -> str:
+        """Unix socket jobs are submitted on"""
+        return self.config.get('socket_path', '/tmp/footydata_collector.sock')
+
+    @property
+    def db_pool_max_connections(self) -> int:
+        """Pooled database connections kept open at most"""
+        return self.config.get('db_pool_max_connections', 10)
+
+    @property
+    def league_metadata_ttl_seconds(self) -> float:
+        """How long the league catalog and global league diff are reused across jobs"""
+        return self.config.get('league_metadata_ttl_minutes', 360) * 60
+
+def load_collection_service_settings() -> CollectionServiceSettings:
+    """Load collection service settings"""
+    return CollectionServiceSettings()
+
+class CollectionService:
+    """Accepts jobs on a unix socket and runs them on one warm collector"""
+
+    def __init__(self, settings: Optional[CollectionServiceSettings] = None, verbose: bool = False):
+        """Initialize the service (the socket is opened by run())"""
+        self.settings = settings or load_collection_service_settings()
+        self.verbose = verbose
+        self.jobs: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue()
+        self.current: Optional[Dict[str, Any]] = None
+        self.next_job_id = 1
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+
+    def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle one socket request
+
+        Requests are either a job ({"scope": ..., "countries": [...], "time_period": ...,
+        "force", "full_refresh", "delta", "dry_run", "resume", "trace", "profile",
+        "max_api_calls", "deadline", "refinalize"})
+        or a command ({"command": "status"} or {"command": "shutdown"}).
+        """
+        command = request.get('command', 'collect')
+        if command == 'status':
+            return {'status': 'ok', 'current': self.current, 'queued': self.jobs.qsize()}
+        if command == 'shutdown':
+            self.stopping.set()
+            self.jobs.put(None)
+            return {'status': 'stopping'}
+        if command != 'collect':
+            return {'status': 'error', 'error': f"Unknown command: {command}"}
+        if not request.get('scope') and not request.get('countries') and request.get('resume') is None:
+            return {'status': 'error', 'error': "A job needs a scope, countries or a run to resume"}
+        for scope_name in split_scope_names(request.get('scope') or ''):
+            if not load_collection_config().get_scope(scope_name):
+                return {'status': 'error', 'error': f"Scope '{scope_name}' not found"}
+
+        with self.lock:
+            job_id = self.next_job_id
+            self.next_job_id += 1
+        self.jobs.put(dict(request, job_id=job_id))
+        return {'status': 'queued', 'job_id': job_id, 'position': self.jobs.qsize()}
+
+    def _serve_client(self, conn: socket.socket):
+        """Read one JSON request line and write one JSON response line"""
+        with conn:
+            try:
+                line = conn.makefile('r').readline()
+                response = self.handle_request(json.loads(line))
+            except Exception as e:
+                response = {'status': 'error', 'error': str(e)}
+            conn.sendall((json.dumps(response) + "\n").encode('utf-8'))
+
+    def _accept_loop(self, server: socket.socket):
+        """Accept socket clients until the service stops"""
+        while not self.stopping.is_set():
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self._serve_client, args=(conn,), daemon=True).start()
+
+    def run_job(self, collector: FootballDataCollector, job: Dict[str, Any]) -> bool:
+        """Run one job on the warm collector"""
+        collector.dry_run = bool(job.get('dry_run'))
+        collector.full_refresh = bool(job.get('full_refresh'))
+        collector.delta = bool(job.get('delta'))
+        collector.reset_run_caches(self.settings.league_metadata_ttl_seconds)
+        return run_collection(
+            collector,
+            scope_name=job.get('scope'),
+            country_codes=job.get('countries'),
+            time_period=job.get('time_period'),
+            force_refresh=bool(job.get('force')),
+            resume_run_id=job.get('resume'),
+            trace=bool(job.get('trace')),
+            profile=bool(job.get('profile')),
+            max_api_calls=job.get('max_api_calls'),
+            deadline=datetime.fromisoformat(job['deadline']) if job.get('deadline') else None,
+            refinalize=bool(job.get('refinalize'))
+        )
+
+    def run(self) -> int:
+        """
+        Serve until shut down over the socket or interrupted
+
+        Returns:
+            int: Number of jobs run
+
+        Raises:
+            RuntimeError: If another service is already listening on the socket
+        """
+        socket_path = self.settings.socket_path
+        if os.path.exists(socket_path):
+            if socket_in_use(socket_path):
+                raise RuntimeError(f"A collection service is already listening on {socket_path}")
+            # Left behind by a service that did not shut down cleanly
+            os.unlink(socket_path)
+
+        enable_connection_pool(max_connections=self.settings.db_pool_max_connections)
+        collector = FootballDataCollector(verbose=self.verbose)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        # Only the service's own user may submit jobs
+        previous_umask = os.umask(0o177)
+        try:
+            server.bind(socket_path)
+        finally:
+            os.umask(previous_umask)
+        os.chmod(socket_path, 0o600)
+        server.listen()
+        server.settimeout(1.0)
+        threading.Thread(target=self._accept_loop, args=(server,), daemon=True).start()
+        print(f"🛰️  Collection service listening on {socket_path}")
+
+        completed = 0
+        try:
+            while not self.stopping.is_set():
+                job = self.jobs.get()
+                if job is None:
+                    break
+                self.current = job
+                target = job.get('scope') or ','.join(job.get('countries') or []) or f"run {job.get('resume')}"
+                print(f"\n📥 Job {job['job_id']}: {target}")
+                try:
+                    success = self.run_job(collector, job)
+                    print(f"{'✅' if success else '❌'} Job {job['job_id']} "
+                          f"{'completed' if success else 'failed'}")
+                except Exception as e:
+                    print(f"❌ Job {job['job_id']} failed: {e}")
+                self.current = None
+                completed += 1
+        except KeyboardInterrupt:
+            print("\n🛑 Collection service interrupted")
+        finally:
+            self.stopping.set()
+            server.close()
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            close_connection_pool()
+
+        print(f"🛰️  Collection service stopped after {completed} jobs")
+        return completed
+
+def socket_in_use(socket_path: str) -> bool:
+    """Check if a service answers on a unix socket"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+            return True
+        except OSError:
+            return False
+
+def serve(verbose: bool = False) -> int:
+    """Run the collection service (CLI entry point)"""
+    try:
+        CollectionService(verbose=verbose).run()
+        return 0
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+def submit_job(job: Dict[str, Any], settings: Optional[CollectionServiceSettings] = None) -> int:
+    """
+    Submit a request to a running collection service
+
+    Args:
+        job: Job fields, or a {"command": ...} request
+        settings: Service settings (None = load from config)
+
+    Returns:
+        int: 0 if the service accepted the request
+    """
+    settings = settings or load_collection_service_settings()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(settings.socket_path)
+            client.sendall((json.dumps(job) + "\n").encode('utf-8'))
+            response = json.loads(client.makefile('r').readline())
+    except OSError as e:
+        print(f"❌ Collection service not reachable on {settings.socket_path}: {e}")
+        return 1
+
+    if response.get('status') == 'queued':
+        print(f"📨 Job {response['job_id']} queued (position {response['position']})")
+        return 0
+    if response.get('status') == 'error':
+        print(f"❌ {response['error']}")
+        return 1
+    print(json.dumps(response, indent=2))
+    return 0
@@ -6,8 +6,6 @@ Parameterized version for cascading collection framework
 
 import os
 import sys
-import psycopg2
-import json
 from datetime import datetime
 from dotenv import load_dotenv
 from typing import List, Optional, Dict, Any
@@ -16,14 +14,39 @@ from typing import List, Optional, Dict, Any
 sys.path.append('src')
 
 from api.fbr_client import FBRClient
+from utils.raw_payloads import raw_payload
+from utils.shadow_swap import refresh_table
+from utils.db import connect
+from utils.progress import get_progress_reporter
+from utils.profiling import profiled
 
-def load_countries_data(country_codes: Optional[List[str]] = None, config: Optional[Dict[str, Any]] = None) -> bool:
+# Columns written for each country, in row order
+COUNTRY_COLUMNS = [
+    'country_name', 'country_code', 'governing_body',
+    'num_clubs', 'num_players', 'national_teams', 'raw_data_hash'
+]
+
+def country_row(country: Dict[str, Any]) -> tuple:
+    """Build the COUNTRY_COLUMNS row for one country from the API"""
+    return (
+        country.get('country'),
+        country.get('country_code'),
+        country.get('governing_body'),
+        country.get('#_clubs', 0),
+        country.get('#_players', 0),
+        country.get('national_teams', []),
+        raw_payload(country)  # Store individual country object
+    )
+
+def load_countries_data(country_codes: Optional[List[str]] = None, config: Optional[Dict[str, Any]] = None,
+                        full_refresh: bool = False) -> bool:
     """
     Load countries data from API to staging table
     
     Args:
         country_codes: Optional list of country codes to filter by. If None, loads all countries.
         config: Optional configuration dictionary for additional settings
+        full_refresh: If True, rebuild the table in a shadow copy and swap it in atomically
     
     Returns:
         bool: True if successful, False otherwise
@@ -67,8 +90,18 @@ def load_countries_data(country_codes: Optional[List[str]] = None, config: Optio
             filtered_countries = all_countries_data
             print(f"📊 Loading all {len(filtered_countries)} countries")
         
+        if full_refresh:
+            # Countries outside the filter keep their current rows
+            return refresh_table(
+                'countries', COUNTRY_COLUMNS, [country_row(country) for country in filtered_countries],
+                key_columns=['country_code'],
+                keep_where="country_code <> ALL(%s)" if country_codes else None,
+                keep_params=[country_codes] if country_codes else (),
+                database_url=database_url
+            )
+        
         # Connect to database and insert data
-        with psycopg2.connect(database_url) as conn:
+        with connect(database_url) as conn:
             with conn.cursor() as cur:
                 
                 # Clear existing data for specified countries (or all if none specified)
@@ -85,27 +118,20 @@ def load_countries_data(country_codes: Optional[List[str]] = None, config: Optio
                     cur.execute("""
                         INSERT INTO staging.countries (
                             country_name, country_code, governing_body, 
-                            num_clubs, num_players, national_teams, raw_data
-                        ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+                            num_clubs, num_players, national_teams, raw_data_hash
+                        ) VALUES (%s, %s, %s, %s, %s, %s, staging.store_raw_payload(%s::jsonb))
                         ON CONFLICT (country_code) DO UPDATE SET
                             country_name = EXCLUDED.country_name,
                             governing_body = EXCLUDED.governing_body,
                             num_clubs = EXCLUDED.num_clubs,
                             num_players = EXCLUDED.num_players,
                             national_teams = EXCLUDED.national_teams,
-                            raw_data = EXCLUDED.raw_data,
+                            raw_data_hash = EXCLUDED.raw_data_hash,
                             updated_at = CURRENT_TIMESTAMP
-                    """, (
-                        country.get('country'),
-                        country.get('country_code'),
-                        country.get('governing_body'),
-                        country.get('#_clubs', 0),
-                        country.get('#_players', 0),
-                        country.get('national_teams', []),
-                        json.dumps(country)  # Store individual country object
-                    ))
+                    """, country_row(country))
                 
                 print(f"✅ Inserted {len(filtered_countries)} countries into staging table")
+                get_progress_reporter().rows_written(len(filtered_countries))
                 
                 # Verify data was inserted
                 if country_codes:
@@ -155,13 +181,14 @@ def verify_data_integrity(country_codes: Optional[List[str]] = None) -> bool:
             api_data = [country for country in api_data if country.get('country_code') in country_codes]
         
         # Get data from database
-        with psycopg2.connect(database_url) as conn:
+        with connect(database_url) as conn:
             with conn.cursor() as cur:
                 if country_codes:
                     placeholders = ','.join(['%s'] * len(country_codes))
                     cur.execute(f"""
                         SELECT country_name, country_code, governing_body, 
-                               num_clubs, num_players, national_teams, raw_data
+                               num_clubs, num_players, national_teams,
+                               staging.raw_payload(raw_data_hash) AS raw_data
                         FROM staging.countries 
                         WHERE country_code IN ({placeholders})
                         ORDER BY country_code
@@ -169,7 +196,8 @@ def verify_data_integrity(country_codes: Optional[List[str]] = None) -> bool:
                 else:
                     cur.execute("""
                         SELECT country_name, country_code, governing_body, 
-                               num_clubs, num_players, national_teams, raw_data
+                               num_clubs, num_players, national_teams,
+                               staging.raw_payload(raw_data_hash) AS raw_data
                         FROM staging.countries 
                         ORDER BY country_code
                     """)
@@ -226,12 +254,19 @@ def verify_data_integrity(country_codes: Optional[List[str]] = None) -> bool:
 
 def main():
     """Main execution function for backward compatibility"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Load Countries Data")
+    parser.add_argument("--profile", action="store_true",
+                        help="Sample CPU and allocations and write flamegraph files (see the profiling config block)")
+    args = parser.parse_args()
     
     print("🚀 Starting Countries Data Loading (Parameterized Version)")
     print("=" * 60)
     
     # Load all countries (backward compatibility)
-    success = load_countries_data()
+    with profiled("load_countries_data", args.profile):
+        success = load_countries_data()
     
     if success:
         # Verify data integrity
@@ -5,25 +5,35 @@ Loads league matches data from /matches endpoint (without team_id)
 """
 
 import os
-import json
-import psycopg2
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Set, Tuple
 from dotenv import load_dotenv
 
 # Import FBR client
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from api.fbr_client import FBRClient
+from utils.raw_payloads import raw_payload
 from utils.endpoint_blacklist import load_endpoint_blacklist
+from utils.seasons import season_filter_sql
+from utils.collection_ledger import CollectionLedger, load_collection_ledger, response_digest
+from utils.work_claims import ClaimOutcome, WorkClaims, WorkUnit, load_work_claims
+from utils.season_registry import load_season_finalization_settings
+from utils.db import connect
+from utils.progress import get_progress_reporter
+from utils.tracing import traced
+from utils.profiling import profiled
+from api.endpoint_config import TableMapping
+from etl.loader_engine import upsert_rows
 
+@traced("db.probe_league_seasons")
 def get_league_season_combinations(league_ids: Optional[List[int]] = None, 
                                  season_ids: Optional[List[str]] = None,
                                  time_period: Optional[str] = None) -> List[Tuple[int, str]]:
     """Get league-season combinations from database or use fallbacks"""
     try:
         load_dotenv()
-        conn = psycopg2.connect(os.getenv('DATABASE_URL'))
+        conn = connect(os.getenv('DATABASE_URL'))
         cur = conn.cursor()
         
         # Build query based on provided filters
@@ -45,28 +55,10 @@ def get_league_season_combinations(league_ids: Optional[List[int]] = None,
             query += f" AND ls.season_id IN ({placeholders})"
             params.extend(season_ids)
         
-        if time_period:
-            # Filter by time period using the same logic as other scripts
-            if time_period == "2024":
-                # Match 2024 or 2024-2025
-                query += " AND ls.season_id ~ '^(2024|2024-2025)$'"
-            elif time_period == "default_2024":
-                # Match 2024 or 2024-2025 (default 2024 pattern)
-                query += " AND ls.season_id ~ '^(2024|2024-2025)$'"
-            elif time_period == "2020s":
-                # Match the full 2020s pattern
-                query += " AND ls.season_id ~ '^(2020|2020-2021|2021|2021-2022|2022|2022-2023|2023|2023-2024|2024|2024-2025|2025|2025-2026)$'"
-            elif time_period == "recent_seasons":
-                # Match last 5 years
-                current_year = datetime.now().year
-                patterns = []
-                for year in range(current_year-4, current_year+1):
-                    patterns.append(f"^{year}")
-                pattern = '|'.join(patterns)
-                query += f" AND ls.season_id ~ '({pattern})'"
-            else:
-                # Default: match exact pattern
-                query += f" AND ls.season_id ~ '{time_period}'"
+        # Filter by time period as an integer range on the season start year
+        season_clause, season_params = season_filter_sql(time_period, "ls.season_start_year")
+        query += season_clause
+        params.extend(season_params)
         
         query += " ORDER BY l.league_id, ls.season_id"
         
@@ -86,30 +78,210 @@ def get_league_season_combinations(league_ids: Optional[List[int]] = None,
         print(f"⚠️ Error querying database: {e}, using fallback combinations")
         return [(9, "2023-2024"), (8, "2023-2024"), (1, "2022")]
 
-def insert_league_matches_data(data: Dict[str, Any], league_id: int, season_id: str) -> bool:
-    """Insert league matches data into staging table"""
+def safe_int(value):
+    """Convert an API score to int, treating empty strings as missing"""
+    if value == "" or value is None:
+        return None
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+# Stored columns compared when applying a response as a diff
+DIFF_COLUMNS = (
+    'match_id', 'match_date', 'match_time', 'round', 'wk',
+    'home_team', 'home_team_id', 'away_team', 'away_team_id',
+    'home_team_score', 'away_team_score', 'venue', 'attendance', 'referee'
+)
+
+# Columns written for each league match, in row order (followed by the raw payload)
+LEAGUE_MATCH_COLUMNS = (
+    'match_id', 'league_id', 'season_id', 'match_date', 'match_time', 'round', 'wk',
+    'home_team', 'home_team_id', 'away_team', 'away_team_id',
+    'home_team_score', 'away_team_score', 'venue', 'attendance', 'referee'
+)
+
+# Bulk upsert targets: matches with an ID, and future fixtures not given one yet
+LEAGUE_MATCHES_WITH_ID = TableMapping(
+    table="staging.league_matches",
+    record_path="data",
+    columns={column: column for column in LEAGUE_MATCH_COLUMNS},
+    conflict_keys=['league_id', 'season_id', 'match_id'],
+    conflict_where="match_id IS NOT NULL"
+)
+LEAGUE_FIXTURES = TableMapping(
+    table="staging.league_matches",
+    record_path="data",
+    columns={column: column for column in LEAGUE_MATCH_COLUMNS},
+    conflict_keys=['league_id', 'season_id', 'match_date', 'home_team', 'away_team'],
+    conflict_where="match_id IS NULL",
+    update_columns=['match_time', 'round', 'wk', 'home_team_id', 'away_team_id',
+                    'venue', 'attendance', 'referee', 'raw_data_hash']
+)
+
+def match_key(match: Dict[str, Any]) -> Tuple:
+    """Identity of a league match row: its ID, else its fixture (date and teams)"""
+    if match.get('match_id'):
+        return ('id', match['match_id'])
+    return ('fixture', match.get('match_date'), match.get('home_team'), match.get('away_team'))
+
+def diff_values(match: Dict[str, Any]) -> Tuple:
+    """Comparable column values (as strings, since wk and attendance are stored as text)"""
+    return tuple(None if match.get(column) is None else str(match.get(column)) for column in DIFF_COLUMNS)
+
+@traced("db.probe_due_seasons")
+def get_due_league_seasons(combinations: List[Tuple[int, str]],
+                           ledger: CollectionLedger) -> List[Tuple[int, str]]:
+    """
+    League-seasons with matches completed since their last successful fetch
+    
+    A match is due once its date plus the 2-day data-entry buffer has passed
+    and neither its league row nor any team_matches row has a score. Only
+    matches that became due after the last fetch count, so a season costs a
+    call only in weeks it had matches. League-seasons never fetched
+    successfully are always due; complete ones never are.
+    
+    Args:
+        combinations: Candidate (league_id, season_id) pairs
+        ledger: Collection ledger with the last fetch times
+    
+    Returns:
+        Due (league_id, season_id) pairs in the order given
+    """
+    due = set()
+    fetched = []
+    for league_id, season_id in combinations:
+        entry = ledger.get("matches", league_id=league_id, season_id=season_id)
+        if entry is None or entry.status != 'ok' or entry.last_fetched_at is None:
+            due.add((league_id, season_id))
+        elif not entry.complete:
+            fetched.append((league_id, season_id, entry.last_fetched_at))
+    
+    if fetched:
+        load_dotenv()
+        with connect(os.getenv('DATABASE_URL')) as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    SELECT DISTINCT f.league_id, f.season_id
+                    FROM unnest(%s::int[], %s::text[], %s::timestamptz[])
+                         AS f(league_id, season_id, last_fetched_at)
+                    JOIN staging.league_matches lm
+                      ON lm.league_id = f.league_id AND lm.season_id = f.season_id
+                    WHERE lm.home_team_score IS NULL
+                      AND lm.match_date + INTERVAL '2 days' < CURRENT_DATE
+                      AND lm.match_date + INTERVAL '2 days' >= f.last_fetched_at::date
+                      AND NOT EXISTS (
+                          SELECT 1 FROM staging.team_matches tm
+                          WHERE tm.league_id = lm.league_id
+                            AND tm.season_id = lm.season_id
+                            AND tm.match_id = lm.match_id
+                            AND tm.goals_for IS NOT NULL
+                      )
+                """, (
+                    [row[0] for row in fetched],
+                    [row[1] for row in fetched],
+                    [row[2] for row in fetched]
+                ))
+                due.update(cur.fetchall())
+    
+    return [combination for combination in combinations if combination in due]
+
+# Stored league-seasons that need no further /matches calls. League-level
+# responses carry no scores, so a match counts as played once it has an ID and
+# a score from backfill_league_match_scores or a team_matches row. Historical
+# seasons are also complete once their last fixture is past the finalization buffer.
+COMPLETE_LEAGUE_SEASONS_QUERY = """
+    SELECT lm.league_id, lm.season_id
+    FROM staging.league_matches lm
+    WHERE (lm.league_id, lm.season_id) IN (SELECT * FROM unnest(%s::int[], %s::text[]))
+    GROUP BY lm.league_id, lm.season_id
+    HAVING BOOL_AND(
+               lm.match_id IS NOT NULL
+               AND ((lm.home_team_score IS NOT NULL AND lm.away_team_score IS NOT NULL)
+                    OR EXISTS (
+                        SELECT 1 FROM staging.team_matches tm
+                        WHERE tm.league_id = lm.league_id
+                          AND tm.season_id = lm.season_id
+                          AND tm.match_id = lm.match_id
+                          AND tm.goals_for IS NOT NULL
+                    ))
+           )
+        OR (MAX(lm.match_date) + %s::interval < CURRENT_DATE
+            AND NOT EXISTS (
+                SELECT 1 FROM staging.leagues l
+                WHERE l.league_id = lm.league_id AND l.last_season = lm.season_id
+            ))
+"""
+
+def get_complete_league_seasons(cur, combinations: List[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+    """
+    League-seasons whose stored matches are complete, derived from the stored rows
+    
+    Args:
+        cur: Cursor to read with (sees rows written earlier in its transaction)
+        combinations: Candidate (league_id, season_id) pairs
+    
+    Returns:
+        Set of complete (league_id, season_id) pairs
+    """
+    if not combinations:
+        return set()
+    cur.execute(COMPLETE_LEAGUE_SEASONS_QUERY, (
+        [league_id for league_id, _ in combinations],
+        [season_id for _, season_id in combinations],
+        f"{load_season_finalization_settings().buffer_days} days"
+    ))
+    return {(league_id, season_id) for league_id, season_id in cur.fetchall()}
+
+@traced("db.probe_complete_league_seasons")
+def probe_complete_league_seasons(combinations: List[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+    """get_complete_league_seasons on a connection of its own (empty on errors)"""
+    if not combinations:
+        return set()
+    try:
+        load_dotenv()
+        with connect(os.getenv('DATABASE_URL')) as conn:
+            with conn.cursor() as cur:
+                return get_complete_league_seasons(cur, combinations)
+    except Exception as e:
+        print(f"⚠️ Error checking stored league-season completeness: {e}")
+        return set()
+
+@traced("db.upsert_league_matches")
+def insert_league_matches_data(data: Dict[str, Any], league_id: int, season_id: str,
+                               ledger: Optional[CollectionLedger] = None) -> bool:
+    """Insert league matches data into staging table and record the fetch in the ledger"""
     try:
         load_dotenv()
-        conn = psycopg2.connect(os.getenv('DATABASE_URL'))
+        conn = connect(os.getenv('DATABASE_URL'))
         cur = conn.cursor()
         
         matches_data = data.get('data', [])
         
-        # Check for existing matches to avoid duplicates
+        # Stored rows of this league-season, to apply the response as a diff
+        cur.execute(f"""
+            SELECT {', '.join(DIFF_COLUMNS)}
+            FROM staging.league_matches
+            WHERE league_id = %s AND season_id = %s
+        """, (league_id, season_id))
+        stored_rows = {}
         existing_match_ids = set()
-        cur.execute(
-            "SELECT match_id FROM staging.league_matches WHERE league_id = %s AND season_id = %s",
-            (league_id, season_id)
-        )
         for row in cur.fetchall():
-            if row[0]:  # Only add non-null match_ids
-                existing_match_ids.add(row[0])
+            stored = dict(zip(DIFF_COLUMNS, row))
+            stored_rows[match_key(stored)] = diff_values(stored)
+            # Matches that already have a result are never rewritten
+            if stored['match_id'] and stored['home_team_score'] is not None:
+                existing_match_ids.add(stored['match_id'])
         
         if existing_match_ids:
-            print(f"   ℹ️  Found {len(existing_match_ids)} existing matches, will skip duplicates")
+            print(f"   ℹ️  Found {len(existing_match_ids)} completed matches, will skip duplicates")
         
         inserted_count = 0
         skipped_count = 0
+        unchanged_count = 0
+        response_keys = set()
+        rows_with_id: Dict[Tuple, Tuple] = {}
+        fixture_rows: Dict[Tuple, Tuple] = {}
         
         for match in matches_data:
             # Store matches with or without match_id (including future fixtures)
@@ -117,18 +289,10 @@ def insert_league_matches_data(data: Dict[str, Any], league_id: int, season_id:
             
             # Skip matches that already exist in database (only for matches with IDs)
             if match_id and match_id in existing_match_ids:
+                response_keys.add(('id', match_id))
                 skipped_count += 1
                 continue
             
-            # Handle empty strings and convert to proper types
-            def safe_int(value):
-                if value == "" or value is None:
-                    return None
-                try:
-                    return int(value)
-                except (ValueError, TypeError):
-                    return None
-            
             # Convert date string to date object
             match_date = None
             if match.get('date'):
@@ -162,73 +326,61 @@ def insert_league_matches_data(data: Dict[str, Any], league_id: int, season_id:
                 'venue': match.get('venue'),
                 'attendance': match.get('attendance'),
                 'referee': match.get('referee'),
-                'raw_data': json.dumps(match)
+                'raw_data': raw_payload(match)
             }
             
-            # Insert with upsert - handle both matches with IDs and future matches
-            if match_id:
-                # Match has ID - use the match_id unique constraint
-                cur.execute("""
-                    INSERT INTO staging.league_matches (
-                        match_id, league_id, season_id, match_date, match_time, round, wk,
-                        home_team, home_team_id, away_team, away_team_id,
-                        home_team_score, away_team_score, venue, attendance, referee, raw_data
-                    ) VALUES (
-                        %(match_id)s, %(league_id)s, %(season_id)s, %(match_date)s, %(match_time)s, 
-                        %(round)s, %(wk)s, %(home_team)s, %(home_team_id)s, %(away_team)s, %(away_team_id)s,
-                        %(home_team_score)s, %(away_team_score)s, %(venue)s, %(attendance)s, %(referee)s, %(raw_data)s
-                    ) ON CONFLICT ON CONSTRAINT uk_league_matches_match_id
-                    DO UPDATE SET
-                        match_date = EXCLUDED.match_date,
-                        match_time = EXCLUDED.match_time,
-                        round = EXCLUDED.round,
-                        wk = EXCLUDED.wk,
-                        home_team = EXCLUDED.home_team,
-                        home_team_id = EXCLUDED.home_team_id,
-                        away_team = EXCLUDED.away_team,
-                        away_team_id = EXCLUDED.away_team_id,
-                        home_team_score = EXCLUDED.home_team_score,
-                        away_team_score = EXCLUDED.away_team_score,
-                        venue = EXCLUDED.venue,
-                        attendance = EXCLUDED.attendance,
-                        referee = EXCLUDED.referee,
-                        raw_data = EXCLUDED.raw_data,
-                        updated_at = CURRENT_TIMESTAMP
-                """, insert_data)
-            else:
-                # Future match without ID - use the future match unique constraint
-                cur.execute("""
-                    INSERT INTO staging.league_matches (
-                        match_id, league_id, season_id, match_date, match_time, round, wk,
-                        home_team, home_team_id, away_team, away_team_id,
-                        home_team_score, away_team_score, venue, attendance, referee, raw_data
-                    ) VALUES (
-                        %(match_id)s, %(league_id)s, %(season_id)s, %(match_date)s, %(match_time)s, 
-                        %(round)s, %(wk)s, %(home_team)s, %(home_team_id)s, %(away_team)s, %(away_team_id)s,
-                        %(home_team_score)s, %(away_team_score)s, %(venue)s, %(attendance)s, %(referee)s, %(raw_data)s
-                    ) ON CONFLICT ON CONSTRAINT uk_league_matches_future
-                    DO UPDATE SET
-                        match_time = EXCLUDED.match_time,
-                        round = EXCLUDED.round,
-                        wk = EXCLUDED.wk,
-                        home_team_id = EXCLUDED.home_team_id,
-                        away_team_id = EXCLUDED.away_team_id,
-                        venue = EXCLUDED.venue,
-                        attendance = EXCLUDED.attendance,
-                        referee = EXCLUDED.referee,
-                        raw_data = EXCLUDED.raw_data,
-                        updated_at = CURRENT_TIMESTAMP
-                """, insert_data)
+            # Only write rows that are new or differ from the stored row
+            key = match_key(insert_data)
+            response_keys.add(key)
+            if stored_rows.get(key) == diff_values(insert_data):
+                unchanged_count += 1
+                continue
             
+            # Matches with an ID and fixtures without one have different conflict targets
+            row = tuple(insert_data[column] for column in LEAGUE_MATCH_COLUMNS) + (insert_data['raw_data'],)
+            (rows_with_id if match_id else fixture_rows)[key] = row
             inserted_count += 1
         
+        upsert_rows(cur, LEAGUE_MATCHES_WITH_ID, list(rows_with_id.values()))
+        upsert_rows(cur, LEAGUE_FIXTURES, list(fixture_rows.values()))
+        
+        # Fixtures without an ID that the response no longer lists were
+        # rescheduled or have since been given an ID
+        stale_fixtures = [
+            key for key in stored_rows
+            if key[0] == 'fixture' and key not in response_keys
+        ] if matches_data else []
+        for _, match_date, home_team, away_team in stale_fixtures:
+            cur.execute("""
+                DELETE FROM staging.league_matches
+                WHERE league_id = %s AND season_id = %s AND match_id IS NULL
+                  AND match_date IS NOT DISTINCT FROM %s
+                  AND home_team IS NOT DISTINCT FROM %s
+                  AND away_team IS NOT DISTINCT FROM %s
+            """, (league_id, season_id, match_date, home_team, away_team))
+        
+        if ledger is not None:
+            ledger.record(
+                "matches",
+                {'league_id': league_id, 'season_id': season_id},
+                'ok' if matches_data else 'empty',
+                data=matches_data,
+                complete=(league_id, season_id) in get_complete_league_seasons(cur, [(league_id, season_id)]),
+                cur=cur
+            )
+        
         conn.commit()
         cur.close()
         conn.close()
+        get_progress_reporter().rows_written(inserted_count)
         
         print(f"✅ Inserted {inserted_count} league matches for league {league_id}, season {season_id}")
         if skipped_count > 0:
             print(f"   ⏭️  Skipped {skipped_count} existing matches")
+        if unchanged_count > 0:
+            print(f"   ⏭️  {unchanged_count} matches unchanged")
+        if stale_fixtures:
+            print(f"   🗑️  Removed {len(stale_fixtures)} stale fixtures")
         return True
         
     except Exception as e:
@@ -238,15 +390,34 @@ def insert_league_matches_data(data: Dict[str, Any], league_id: int, season_id:
 def load_league_matches_data(league_ids: Optional[List[int]] = None, 
                            season_ids: Optional[List[str]] = None,
                            time_period: Optional[str] = None,
-                           update_only: bool = False) -> bool:
+                           update_only: bool = False,
+                           ledger: Optional[CollectionLedger] = None,
+                           claims: Optional[WorkClaims] = None,
+                           delta: bool = False,
+                           league_seasons: Optional[List[Tuple[int, str]]] = None) -> bool:
     """
     Load league matches data from API
     
+    Which league-seasons to fetch is decided from the collection ledger:
+    a league-season is skipped once its stored matches are complete (every
+    match has an ID and a score, or a historical season's last fixture is
+    past the finalization buffer), so partially loaded seasons are completed
+    on later runs. Each
+    league-season is claimed before its API call, so concurrent runs with
+    overlapping scopes never fetch it twice. In delta mode, seasons in
+    progress are only re-fetched when matches were completed since their
+    last successful fetch.
+    
     Args:
         league_ids: List of league IDs to collect (None = all available)
         season_ids: List of season IDs to collect (None = all available)
         time_period: Time period filter (e.g., "2024", "2020s")
         update_only: If True, only update existing records
+        ledger: Preloaded collection ledger (None = load it here)
+        claims: Work claims shared with concurrent runs (None = process-wide claims)
+        delta: Only re-fetch seasons in progress with newly completed matches
+        league_seasons: Exact (league_id, season_id) pairs to collect, in this
+            order (overrides league_ids, season_ids and time_period)
     
     Returns:
         bool: True if successful, False otherwise
@@ -261,54 +432,93 @@ def load_league_matches_data(league_ids: Optional[List[int]] = None,
         return False
     
     # Get league-season combinations
-    combinations = get_league_season_combinations(league_ids, season_ids, time_period)
+    if league_seasons is not None:
+        combinations = list(league_seasons)
+    else:
+        combinations = get_league_season_combinations(league_ids, season_ids, time_period)
     
     if not combinations:
         print("❌ No league-season combinations found")
         return False
     
+    # Compute the work set in memory from the ledger
+    if ledger is None:
+        ledger = load_collection_ledger(["matches"])
+    
+    to_fetch = [
+        (league_id, season_id) for league_id, season_id in combinations
+        if ledger.needs_fetch("matches", league_id=league_id, season_id=season_id)
+    ]
+    # Seasons fetched before their stored rows became complete
+    stored_complete = probe_complete_league_seasons(to_fetch)
+    to_fetch = [combination for combination in to_fetch if combination not in stored_complete]
+    complete_count = len(combinations) - len(to_fetch)
+    print(f"📋 {len(to_fetch)} league-seasons to fetch, {complete_count} already complete")
+    
+    if delta and to_fetch:
+        due = get_due_league_seasons(to_fetch, ledger)
+        print(f"📅 Delta mode: {len(due)} league-seasons have newly completed matches, "
+              f"{len(to_fetch) - len(due)} unchanged since last fetch")
+        complete_count += len(to_fetch) - len(due)
+        to_fetch = due
+    
     # Initialize FBR client
-    client = FBRClient()
+    client = FBRClient() if to_fetch else None
+    claims = claims or load_work_claims()
     
     # Collect data for each combination
     total_matches = 0
     successful_combinations = 0
-    data_available_combinations = 0
+    unchanged_combinations = 0
+    claimed_elsewhere = 0
+    deferred = 0
+    data_available_combinations = complete_count
     
-    for league_id, season_id in combinations:
+    for league_id, season_id in to_fetch:
         print(f"\n📊 Processing League {league_id}, Season {season_id}...")
         
+        unit = WorkUnit.of("matches", league_id=league_id, season_id=season_id)
+        outcome = claims.claim(unit, ledger)
+        if outcome is ClaimOutcome.DEFERRED:
+            deferred += 1
+            continue
+        if not outcome:
+            # Another run owns this league-season
+            claimed_elsewhere += 1
+            data_available_combinations += 1
+            continue
+        
         try:
-            # Check if we already have data for this combination
-            try:
-                load_dotenv()
-                conn = psycopg2.connect(os.getenv('DATABASE_URL'))
-                cur = conn.cursor()
-                cur.execute("""
-                    SELECT COUNT(*) FROM staging.league_matches 
-                    WHERE league_id = %s AND season_id = %s
-                """, (league_id, season_id))
-                existing_count = cur.fetchone()[0]
-                cur.close()
-                conn.close()
-                
-                if existing_count > 0:
-                    print(f"   ℹ️  Found {existing_count} existing matches, skipping API call")
-                    data_available_combinations += 1
-                    continue
-            except Exception as e:
-                print(f"   ⚠️  Error checking existing data: {e}")
+            entry = ledger.get("matches", league_id=league_id, season_id=season_id)
+            if entry and entry.row_count:
+                print(f"   ℹ️  Last fetch had {entry.row_count} matches ({entry.status}), refreshing")
             
             # Make API call
             response = client.get_matches(str(league_id), season_id)
             
             if 'error' in response:
                 print(f"   ❌ API Error: {response['error']}")
+                ledger.record("matches", {'league_id': league_id, 'season_id': season_id},
+                              'error', error_message=str(response['error']))
+                continue
+            
+            matches_data = response.get('data', [])
+            
+            # Identical to the stored response: nothing to write
+            if ledger.is_unchanged("matches", response_digest(matches_data),
+                                   league_id=league_id, season_id=season_id):
+                print(f"   ⏭️  Response unchanged since last fetch, skipping insert")
+                ledger.record("matches", {'league_id': league_id, 'season_id': season_id},
+                              'ok', data=matches_data,
+                              complete=(league_id, season_id) in probe_complete_league_seasons(
+                                  [(league_id, season_id)]))
+                unchanged_combinations += 1
+                data_available_combinations += 1
                 continue
             
             # Insert data
-            if insert_league_matches_data(response, league_id, season_id):
-                match_count = len(response.get('data', []))
+            if insert_league_matches_data(response, league_id, season_id, ledger):
+                match_count = len(matches_data)
                 total_matches += match_count
                 successful_combinations += 1
                 data_available_combinations += 1
@@ -318,10 +528,17 @@ def load_league_matches_data(league_ids: Optional[List[int]] = None,
                 
         except Exception as e:
             print(f"   ❌ Error processing league {league_id}, season {season_id}: {e}")
+        finally:
+            # Matches and ledger entry are committed by now
+            claims.release(unit)
     
     # Summary
     print(f"\n📊 Collection Summary:")
-    print(f"   - Successful combinations: {successful_combinations}/{len(combinations)}")
+    print(f"   - Successful combinations: {successful_combinations}/{len(to_fetch)}")
+    print(f"   - Unchanged responses: {unchanged_combinations}")
+    print(f"   - Claimed by other runs: {claimed_elsewhere}")
+    if deferred:
+        print(f"   - Deferred by the run budget: {deferred}")
     print(f"   - Data available combinations: {data_available_combinations}/{len(combinations)}")
     print(f"   - Total matches collected: {total_matches}")
     
@@ -334,8 +551,16 @@ def load_league_matches_data(league_ids: Optional[List[int]] = None,
         return False
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Load League Matches Data")
+    parser.add_argument("--profile", action="store_true",
+                        help="Sample CPU and allocations and write flamegraph files (see the profiling config block)")
+    args = parser.parse_args()
+    
     # Test the function
-    success = load_league_matches_data()
+    with profiled("load_league_matches_data", args.profile):
+        success = load_league_matches_data()
     if success:
         print("\n🎉 Test completed successfully!")
     else:
@@ -7,16 +7,17 @@ Parameterized script for collecting league season details data with optional fil
 import os
 import sys
 import psycopg2
-import json
-from datetime import datetime
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 
 # Add src to path
 sys.path.append('src')
 
-from api.fbr_client import FBRClient
-from utils.endpoint_blacklist import load_endpoint_blacklist
+from utils.seasons import season_filter_sql
+from utils.collection_ledger import CollectionLedger
+from utils.work_claims import WorkClaims
+from utils.profiling import profiled
+from etl.loader_engine import run_loader
 
 def get_league_season_combinations(league_ids: Optional[List[int]] = None, 
                                   season_ids: Optional[List[str]] = None,
@@ -45,10 +46,10 @@ def get_league_season_combinations(league_ids: Optional[List[int]] = None,
                     query += f" AND season_id IN ({placeholders})"
                     params.extend(season_ids)
                 
-                if time_period:
-                    # Add time period filtering logic here if needed
-                    # For now, we'll use the season_ids parameter
-                    pass
+                # Filter by time period as an integer range on the season start year
+                season_clause, season_params = season_filter_sql(time_period, "season_start_year")
+                query += season_clause
+                params.extend(season_params)
                 
                 query += " ORDER BY league_id, season_id"
                 
@@ -67,81 +68,28 @@ def get_league_season_combinations(league_ids: Optional[List[int]] = None,
         print(f"❌ Error getting league-season combinations: {e}")
         return []
 
-def insert_league_season_details_data(data: Dict[str, Any]) -> bool:
-    """Insert league season details data into staging table"""
-    load_dotenv()
-    database_url = os.getenv("DATABASE_URL")
-    
-    if not database_url:
-        print("❌ DATABASE_URL not found in .env file")
-        return False
-    
-    try:
-        with psycopg2.connect(database_url) as conn:
-            with conn.cursor() as cur:
-                # Extract data from API response
-                api_data = data.get('data', {})
-                
-                # Handle invalid date values
-                league_start = api_data.get('league_start')
-                league_end = api_data.get('league_end')
-                
-                # Convert invalid date strings to None
-                if league_start == 'Date' or league_start == '':
-                    league_start = None
-                if league_end == 'Date' or league_end == '':
-                    league_end = None
-                
-                # Prepare data for insertion
-                insert_data = {
-                    'league_id': api_data.get('lg_id'),  # API returns lg_id, we store as league_id
-                    'season_id': api_data.get('season_id'),
-                    'league_start': league_start,
-                    'league_end': league_end,
-                    'league_type': api_data.get('league_type'),
-                    'has_adv_stats': api_data.get('has_adv_stats'),
-                    'rounds': json.dumps(api_data.get('rounds', [])),
-                    'raw_data': json.dumps(data)
-                }
-                
-                # Insert with ON CONFLICT handling
-                cur.execute("""
-                    INSERT INTO staging.league_season_details 
-                    (league_id, season_id, league_start, league_end, league_type, has_adv_stats, rounds, raw_data)
-                    VALUES (%(league_id)s, %(season_id)s, %(league_start)s, %(league_end)s, 
-                            %(league_type)s, %(has_adv_stats)s, %(rounds)s, %(raw_data)s)
-                    ON CONFLICT (league_id, season_id) 
-                    DO UPDATE SET
-                        league_start = EXCLUDED.league_start,
-                        league_end = EXCLUDED.league_end,
-                        league_type = EXCLUDED.league_type,
-                        has_adv_stats = EXCLUDED.has_adv_stats,
-                        rounds = EXCLUDED.rounds,
-                        raw_data = EXCLUDED.raw_data,
-                        updated_at = CURRENT_TIMESTAMP
-                """, insert_data)
-                
-                conn.commit()
-                return True
-                
-    except Exception as e:
-        print(f"❌ Error inserting data: {e}")
-        return False
-
 def load_league_season_details_data(league_ids: Optional[List[int]] = None,
                                    season_ids: Optional[List[str]] = None,
                                    time_period: Optional[str] = None,
                                    update_only: bool = False,
-                                   verbose: bool = False) -> bool:
+                                   verbose: bool = False,
+                                   ledger: Optional[CollectionLedger] = None,
+                                   claims: Optional[WorkClaims] = None) -> bool:
     """
     Load league season details data with optional filtering
     
+    League-seasons whose details are final in the collection ledger are not
+    fetched again, and each fetch is recorded as it is stored, so an
+    interrupted run continues where it stopped.
+    
     Args:
         league_ids: List of league IDs to collect (None for all)
         season_ids: List of season IDs to collect (None for all)
         time_period: Time period filter (e.g., "2024", "2020s")
         update_only: Only update existing records, don't add new ones
         verbose: Enable verbose logging
+        ledger: Preloaded collection ledger (None = load it here)
+        claims: Work claims shared with concurrent runs (None = process-wide claims)
     
     Returns:
         bool: True if successful, False otherwise
@@ -152,10 +100,6 @@ def load_league_season_details_data(league_ids: Optional[List[int]] = None,
     print(f"   Time Period: {time_period if time_period else 'All'}")
     print(f"   Update Only: {update_only}")
     
-    # Initialize FBR client and blacklist
-    client = FBRClient()
-    blacklist = load_endpoint_blacklist()
-    
     # Get league-season combinations
     combinations = get_league_season_combinations(league_ids, season_ids, time_period)
     
@@ -163,59 +107,19 @@ def load_league_season_details_data(league_ids: Optional[List[int]] = None,
         print("❌ No league-season combinations found")
         return False
     
-    print(f"📋 Found {len(combinations)} league-season combinations to process")
-    
-    success_count = 0
-    error_count = 0
-    blacklisted_count = 0
-    
-    for i, combo in enumerate(combinations, 1):
-        league_id = combo['league_id']
-        season_id = combo['season_id']
-        
-        if verbose:
-            print(f"   [{i}/{len(combinations)}] Processing League {league_id}, Season {season_id}")
-        
-        # Check if blacklisted
-        if blacklist.is_blacklisted("league-season-details", league_id=league_id):
-            if verbose:
-                print(f"      ⚠️  League {league_id} is blacklisted, skipping")
-            blacklisted_count += 1
-            continue
-        
-        try:
-            # Make API call
-            response = client.get_league_season_details(league_id, season_id)
-            
-            if "error" in response:
-                if verbose:
-                    print(f"      ❌ API Error: {response['error']}")
-                error_count += 1
-                continue
-            
-            # Store data
-            if insert_league_season_details_data(response):
-                success_count += 1
-                if verbose:
-                    print(f"      ✅ Stored successfully")
-            else:
-                error_count += 1
-                if verbose:
-                    print(f"      ❌ Failed to store data")
-                
-        except Exception as e:
-            error_count += 1
-            if verbose:
-                print(f"      ❌ Error: {e}")
+    print(f"📋 Found {len(combinations)} league-season combinations")
     
-    # Print summary
-    print(f"\n📊 Collection Summary:")
-    print(f"   Successful: {success_count}")
-    print(f"   Errors: {error_count}")
-    print(f"   Blacklisted: {blacklisted_count}")
-    print(f"   Total Processed: {len(combinations)}")
+    # Seasons whose details are final are skipped through the ledger
+    metrics = run_loader(
+        "league_season_details",
+        calls=[{'league_id': combo['league_id'], 'season_id': combo['season_id']} for combo in combinations],
+        ledger=ledger,
+        claims=claims,
+        verbose=verbose
+    )
+    metrics.print_summary()
     
-    if success_count > 0:
+    if metrics.succeeded:
         print(f"✅ League season details collection completed successfully!")
         return True
     else:
@@ -232,6 +136,8 @@ def main():
     parser.add_argument("--time-period", help="Time period filter (e.g., 2024, 2020s)")
     parser.add_argument("--update-only", action="store_true", help="Only update existing records")
     parser.add_argument("--verbose", action="store_true", help="Verbose output")
+    parser.add_argument("--profile", action="store_true",
+                        help="Sample CPU and allocations and write flamegraph files (see the profiling config block)")
     
     args = parser.parse_args()
     
@@ -245,13 +151,14 @@ def main():
         season_ids = [x.strip() for x in args.season_ids.split(",")]
     
     # Run collection
-    success = load_league_season_details_data(
-        league_ids=league_ids,
-        season_ids=season_ids,
-        time_period=args.time_period,
-        update_only=args.update_only,
-        verbose=args.verbose
-    )
+    with profiled("load_league_season_details_data", args.profile):
+        success = load_league_season_details_data(
+            league_ids=league_ids,
+            season_ids=season_ids,
+            time_period=args.time_period,
+            update_only=args.update_only,
+            verbose=args.verbose
+        )
     
     return 0 if success else 1
 
@@ -6,9 +6,6 @@ Parameterized version for cascading collection framework
 
 import os
 import sys
-import psycopg2
-import json
-import re
 from datetime import datetime
 from dotenv import load_dotenv
 from typing import List, Optional, Dict, Any
@@ -17,136 +14,31 @@ from typing import List, Optional, Dict, Any
 sys.path.append('src')
 
 from api.fbr_client import FBRClient
+from utils.raw_payloads import raw_payload
+from utils.seasons import resolve_season_range, season_filter_sql
+from utils.league_catalog import LeagueCatalog, load_league_catalog
+from utils.shadow_swap import refresh_table
+from utils.collection_ledger import CollectionLedger, load_collection_ledger
+from utils.work_claims import ClaimOutcome, WorkClaims, WorkUnit, load_work_claims
+from utils.db import connect
+from utils.progress import get_progress_reporter
+from utils.season_registry import get_season_registry
+from utils.profiling import profiled
 
-def get_league_season_format(league_id: int, database_url: str) -> str:
-    """
-    Analyze existing seasons to determine format (YYYY vs YYYY-YYYY)
-    
-    Args:
-        league_id: League ID to analyze
-        database_url: Database connection string
-    
-    Returns:
-        str: "YYYY-YYYY" or "YYYY" based on dominant format
-    """
-    try:
-        with psycopg2.connect(database_url) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT season_id 
-                    FROM staging.league_seasons 
-                    WHERE league_id = %s 
-                    ORDER BY season_id
-                """, (league_id,))
-                
-                seasons = [row[0] for row in cur.fetchall()]
-                
-                if not seasons:
-                    # No existing data, use default format
-                    return "YYYY-YYYY"
-                
-                # Analyze format patterns
-                yyyy_yyyy_count = sum(1 for s in seasons if re.match(r"^\d{4}-\d{4}$", s))
-                yyyy_count = sum(1 for s in seasons if re.match(r"^\d{4}$", s))
-                
-                # Return dominant format
-                if yyyy_yyyy_count >= yyyy_count:
-                    return "YYYY-YYYY"
-                else:
-                    return "YYYY"
-                    
-    except Exception as e:
-        print(f"❌ Error analyzing format for league {league_id}: {e}")
-        return "YYYY-YYYY"  # Default to YYYY-YYYY format
-
-def get_max_available_season(league_id: int, database_url: str) -> str:
-    """
-    Get max season from leagues table (always current with API)
-    
-    Args:
-        league_id: League ID to check
-        database_url: Database connection string
-    
-    Returns:
-        str: Latest season available according to API
-    """
-    try:
-        with psycopg2.connect(database_url) as conn:
-            with conn.cursor() as cur:
-                cur.execute("""
-                    SELECT last_season 
-                    FROM staging.leagues 
-                    WHERE league_id = %s
-                """, (league_id,))
-                
-                result = cur.fetchone()
-                if result and result[0]:
-                    return result[0]
-                else:
-                    return None
-                    
-    except Exception as e:
-        print(f"❌ Error getting max season for league {league_id}: {e}")
-        return None
-
-def generate_league_specific_pattern(league_id: int, time_period: str, database_url: str) -> str:
-    """
-    Generate pattern only for the format this league uses
-    
-    Args:
-        league_id: League ID to generate pattern for
-        time_period: Time period name (e.g., "2020s", "default_2024")
-        database_url: Database connection string
-    
-    Returns:
-        str: Regex pattern for seasons in this league's format
-    """
-    # Get format from existing data
-    format_type = get_league_season_format(league_id, database_url)
-    
-    # Get max season from leagues table
-    max_season = get_max_available_season(league_id, database_url)
-    
-    # Generate format-specific patterns
-    if format_type == "YYYY-YYYY":
-        if time_period == "2020s":
-            # Only include seasons up to max_season
-            if max_season and re.match(r"^\d{4}-\d{4}$", max_season):
-                max_year = int(max_season.split('-')[1])  # Get end year
-                patterns = []
-                for year in range(2020, max_year):  # Stop at max_year, not max_year + 1
-                    patterns.append(f"{year}-{year+1}")
-                return f"^({'|'.join(patterns)})$"
-            else:
-                # Default 2020s pattern for YYYY-YYYY format
-                return r"^(2020-2021|2021-2022|2022-2023|2023-2024|2024-2025|2025-2026)$"
-        elif time_period == "default_2024":
-            return r"^(2024-2025)$"
-        else:
-            # Default pattern for YYYY-YYYY format
-            return r"^(2020-2021|2021-2022|2022-2023|2023-2024|2024-2025|2025-2026)$"
-    else:  # YYYY format
-        if time_period == "2020s":
-            # Only include seasons up to max_season
-            if max_season and re.match(r"^\d{4}$", max_season):
-                max_year = int(max_season)
-                patterns = []
-                for year in range(2020, max_year + 1):  # For YYYY format, include the max_year
-                    patterns.append(str(year))
-                return f"^({'|'.join(patterns)})$"
-            else:
-                # Default 2020s pattern for YYYY format
-                return r"^(2020|2021|2022|2023|2024|2025|2026)$"
-        elif time_period == "default_2024":
-            return r"^(2024)$"
-        else:
-            # Default pattern for YYYY format
-            return r"^(2020|2021|2022|2023|2024|2025|2026)$"
+# Columns written for each league season, in row order
+LEAGUE_SEASON_COLUMNS = [
+    'league_id', 'competition_name', 'season_id', 'num_squads',
+    'champion', 'top_scorer_player', 'top_scorer_goals', 'raw_data_hash'
+]
 
 def load_league_seasons_data(league_ids: Optional[List[int]] = None, 
                            time_period: Optional[str] = None,
                            config: Optional[Dict[str, Any]] = None,
-                           update_only: bool = False) -> bool:
+                           update_only: bool = False,
+                           catalog: Optional[LeagueCatalog] = None,
+                           full_refresh: bool = False,
+                           ledger: Optional[CollectionLedger] = None,
+                           claims: Optional[WorkClaims] = None) -> bool:
     """
     Load league seasons data from API to staging table with selective updates
     
@@ -154,6 +46,11 @@ def load_league_seasons_data(league_ids: Optional[List[int]] = None,
         league_ids: Optional list of league IDs to filter by. If None, uses all leagues.
         time_period: Optional time period pattern (e.g., "2024", "2020s"). If None, loads all seasons.
         config: Optional configuration dictionary for additional settings
+        update_only: If True, only update existing seasons
+        catalog: Preloaded league catalog (None = load it here)
+        full_refresh: If True, rebuild the table in a shadow copy and swap it in atomically
+        ledger: Preloaded collection ledger (None = load it here)
+        claims: Work claims shared with concurrent runs (None = process-wide claims)
     
     Returns:
         bool: True if successful, False otherwise
@@ -170,17 +67,17 @@ def load_league_seasons_data(league_ids: Optional[List[int]] = None,
         print("❌ DATABASE_URL not found in .env file")
         return False
     
-    # If no league IDs specified, get all leagues from database
+    # League formats, last seasons and known seasons in one query
+    if catalog is None:
+        catalog = load_league_catalog(database_url)
+    
+    # If no league IDs specified, use all leagues from the catalog
     if not league_ids:
-        try:
-            with psycopg2.connect(database_url) as conn:
-                with conn.cursor() as cur:
-                    cur.execute("SELECT DISTINCT league_id FROM staging.leagues ORDER BY league_id")
-                    league_ids = [row[0] for row in cur.fetchall()]
-            print(f"📊 Using all {len(league_ids)} leagues from database")
-        except Exception as e:
-            print(f"❌ Error getting leagues from database: {e}")
+        league_ids = sorted(catalog.leagues)
+        if not league_ids:
+            print("❌ No leagues found in database")
             return False
+        print(f"📊 Using all {len(league_ids)} leagues from database")
     
     print(f"📊 Processing {len(league_ids)} leagues")
     if time_period:
@@ -193,36 +90,54 @@ def load_league_seasons_data(league_ids: Optional[List[int]] = None,
         client = FBRClient()
         print("✅ FBR Client initialized")
         
+        if full_refresh:
+            return refresh_league_seasons_data(client, league_ids, time_period, database_url)
+        
+        # Leagues are claimed per call so concurrent runs never fetch the same one
+        if ledger is None:
+            ledger = load_collection_ledger(["league-seasons"], database_url)
+        claims = claims or load_work_claims(database_url)
+        
         # Connect to database
-        with psycopg2.connect(database_url) as conn:
+        with connect(database_url) as conn:
             with conn.cursor() as cur:
                 
                 total_seasons_processed = 0
                 total_seasons_skipped = 0
                 total_seasons_added = 0
                 failed_leagues = []
+                claimed_elsewhere = 0
+                deferred = 0
                 
                 for league_id in league_ids:
                     print(f"\n📡 Processing league ID: {league_id}")
                     
                     try:
                         # Pre-check: Skip leagues that don't need updates
+                        expected_seasons = set()
                         if time_period:
-                            # Use smart pattern recognition to check if this league needs updates
-                            expected_seasons = set()
+                            # Expected seasons in this league's own season format
                             try:
-                                pattern = generate_league_specific_pattern(league_id, time_period, database_url)
-                                if pattern.startswith("^(") and pattern.endswith(")$"):
-                                    seasons_str = pattern[2:-2]  # Remove ^( and )$
-                                    seasons = seasons_str.split("|")
-                                    for season in seasons:
-                                        expected_seasons.add(season.strip())
+                                expected_seasons = set(catalog.expected_seasons(league_id, time_period))
                             except Exception as e:
-                                print(f"❌ Error generating pattern for league {league_id}: {e}")
+                                print(f"❌ Error computing expected seasons for league {league_id}: {e}")
                                 # Fall back to processing the league
                                 expected_seasons = set()
+                            
+                            if expected_seasons and not catalog.missing_seasons(league_id, time_period):
+                                print(f"  ✅ League {league_id}: All expected seasons already present, skipping API call")
+                                continue
                         
-                        # Get existing seasons for this league
+                        unit = WorkUnit.of("league-seasons", league_id=league_id)
+                        outcome = claims.claim(unit, ledger)
+                        if outcome is ClaimOutcome.DEFERRED:
+                            deferred += 1
+                            continue
+                        if not outcome:
+                            claimed_elsewhere += 1
+                            continue
+                        
+                        # Get existing seasons for this league (after claiming, so another run's seasons are seen)
                         cur.execute("""
                             SELECT season_id, competition_name, num_squads, champion, 
                                    top_scorer_player, top_scorer_goals
@@ -255,8 +170,9 @@ def load_league_seasons_data(league_ids: Optional[List[int]] = None,
                         for season in data:
                             season_id = season.get('season_id')
                             
-                            # Apply time period filter if specified (using smart pattern matching)
-                            if time_period and not matches_time_period(season_id, time_period, league_id, database_url):
+                            # Apply time period filter if specified (integer range, league's format)
+                            if time_period and not matches_time_period(season_id, time_period,
+                                                                       expected_seasons=expected_seasons):
                                 continue
                             
                             # Skip if season doesn't exist in database and we're in update-only mode
@@ -284,15 +200,15 @@ def load_league_seasons_data(league_ids: Optional[List[int]] = None,
                                 cur.execute("""
                                     INSERT INTO staging.league_seasons (
                                         league_id, competition_name, season_id, num_squads,
-                                        champion, top_scorer_player, top_scorer_goals, raw_data
-                                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                                        champion, top_scorer_player, top_scorer_goals, raw_data_hash
+                                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, staging.store_raw_payload(%s::jsonb))
                                     ON CONFLICT (league_id, season_id) DO UPDATE SET
                                         competition_name = EXCLUDED.competition_name,
                                         num_squads = EXCLUDED.num_squads,
                                         champion = EXCLUDED.champion,
                                         top_scorer_player = EXCLUDED.top_scorer_player,
                                         top_scorer_goals = EXCLUDED.top_scorer_goals,
-                                        raw_data = EXCLUDED.raw_data,
+                                        raw_data_hash = EXCLUDED.raw_data_hash,
                                         updated_at = CURRENT_TIMESTAMP
                                 """, (
                                     league_id,
@@ -302,7 +218,7 @@ def load_league_seasons_data(league_ids: Optional[List[int]] = None,
                                     season.get('champion'),
                                     season.get('top_scorer_player'),
                                     season.get('top_scorer_goals'),
-                                    json.dumps(season)
+                                    raw_payload(season)
                                 ))
                                 league_seasons_added += 1
                                 
@@ -312,6 +228,20 @@ def load_league_seasons_data(league_ids: Optional[List[int]] = None,
                             
                             league_seasons_processed += 1
                         
+                        # Expected historical seasons the API does not list are never asked for again
+                        if expected_seasons:
+                            listed = {season.get('season_id') for season in data if season.get('season_id')}
+                            entry = catalog.get(league_id)
+                            absent = expected_seasons - listed - {entry.last_season if entry else None}
+                            if data and get_season_registry().mark_absent(cur, league_id, absent, listed):
+                                print(f"  🔒 {len(absent)} expected seasons not listed by the API, marked absent")
+                        
+                        # Commit per league before releasing its claim
+                        ledger.record("league-seasons", unit.params, 'ok' if data else 'empty',
+                                      data=data, cur=cur)
+                        conn.commit()
+                        get_progress_reporter().rows_written(league_seasons_added)
+                        
                         print(f"  ✅ Processed: {league_seasons_processed}, Skipped: {league_seasons_skipped}, Added: {league_seasons_added}")
                         total_seasons_processed += league_seasons_processed
                         total_seasons_skipped += league_seasons_skipped
@@ -319,13 +249,20 @@ def load_league_seasons_data(league_ids: Optional[List[int]] = None,
                         
                     except Exception as e:
                         print(f"❌ Error processing league {league_id}: {e}")
+                        conn.rollback()
                         failed_leagues.append(league_id)
+                    finally:
+                        claims.release(WorkUnit.of("league-seasons", league_id=league_id))
                 
                 print(f"\n📊 Summary:")
                 print(f"  Total seasons processed: {total_seasons_processed}")
                 print(f"  Total seasons skipped (already exist): {total_seasons_skipped}")
                 print(f"  Total seasons added/updated: {total_seasons_added}")
                 
+                if claimed_elsewhere:
+                    print(f"  Leagues claimed by other runs: {claimed_elsewhere}")
+                if deferred:
+                    print(f"  Leagues deferred by the run budget: {deferred}")
                 if failed_leagues:
                     print(f"⚠️ Failed leagues: {failed_leagues}")
                 
@@ -335,49 +272,100 @@ def load_league_seasons_data(league_ids: Optional[List[int]] = None,
         print(f"❌ Error loading data: {e}")
         return False
 
-def matches_time_period(season_id: str, time_period: str, league_id: Optional[int] = None, database_url: Optional[str] = None) -> bool:
+def refresh_league_seasons_data(client: FBRClient, league_ids: List[int],
+                                time_period: Optional[str], database_url: str) -> bool:
+    """
+    Fully refresh league seasons through a shadow-table swap
+    
+    Every league is fetched before the database is touched. Only seasons of the
+    fetched leagues inside the time period are replaced; everything else,
+    including leagues whose API call fails, keeps its current rows.
+    
+    Args:
+        client: FBR API client
+        league_ids: Leagues to refresh
+        time_period: Optional time period limiting the refreshed seasons
+        database_url: Database URL
+    
+    Returns:
+        bool: True if the refreshed table was swapped in, False otherwise
+    """
+    rows = []
+    refreshed_leagues = []
+    failed_leagues = []
+    
+    for league_id in league_ids:
+        print(f"\n📡 Fetching seasons for league ID: {league_id}")
+        seasons_response = client.get_league_seasons(league_id)
+        
+        if "error" in seasons_response:
+            print(f"❌ API call failed for league {league_id}: {seasons_response['error']}")
+            failed_leagues.append(league_id)
+            continue
+        
+        league_rows = [
+            (
+                league_id,
+                season.get('competition_name'),
+                season.get('season_id'),
+                season.get('num_squads'),
+                season.get('champion'),
+                season.get('top_scorer_player'),
+                season.get('top_scorer_goals'),
+                raw_payload(season)
+            )
+            for season in seasons_response.get('data', [])
+            if not time_period or matches_time_period(season.get('season_id'), time_period)
+        ]
+        print(f"  ✅ Fetched {len(league_rows)} seasons")
+        rows.extend(league_rows)
+        refreshed_leagues.append(league_id)
+    
+    if failed_leagues:
+        print(f"⚠️ Failed leagues (keeping current rows): {failed_leagues}")
+    
+    if not refreshed_leagues:
+        print("❌ No leagues fetched, nothing to refresh")
+        return False
+    
+    # Keep rows outside the refreshed leagues and time period (unparsable season IDs count as outside)
+    season_clause, season_params = season_filter_sql(time_period)
+    return refresh_table(
+        'league_seasons', LEAGUE_SEASON_COLUMNS, rows,
+        key_columns=['league_id', 'season_id'],
+        keep_where=f"NOT (league_id = ANY(%s) AND COALESCE(TRUE{season_clause}, FALSE))",
+        keep_params=[refreshed_leagues] + season_params,
+        database_url=database_url
+    )
+
+def matches_time_period(season_id: str, time_period: str, league_id: Optional[int] = None,
+                        catalog: Optional[LeagueCatalog] = None,
+                        expected_seasons: Optional[set] = None) -> bool:
     """
     Check if a season ID matches the specified time period
     
     Args:
         season_id: Season ID string (e.g., "2024", "2024-2025")
-        time_period: Time period name or pattern (e.g., "default_2024", "2020s", "^(2024|2024-2025)$")
-        league_id: Optional league ID for smart pattern generation
-        database_url: Optional database URL for smart pattern generation
+        time_period: Time period name or season ID (e.g., "default_2024", "2020s", "2024")
+        league_id: Optional league ID to restrict to the league's season format
+        catalog: League catalog used with league_id
+        expected_seasons: Precomputed expected seasons for the league (skips the lookup)
     
     Returns:
         bool: True if season matches time period
     """
+    season_range = resolve_season_range(time_period)
+    if season_range is not None and not season_range.contains(season_id):
+        return False
     
-    # If we have league_id and database_url, use smart pattern generation
-    if league_id and database_url:
-        try:
-            pattern = generate_league_specific_pattern(league_id, time_period, database_url)
-            return bool(re.match(pattern, season_id))
-        except Exception as e:
-            print(f"❌ Error in smart pattern matching for league {league_id}: {e}")
-            # Fall back to basic matching
-    
-    # Handle time period names from config (fallback)
-    if time_period == "default_2024":
-        # Match 2024 or 2024-2025
-        return bool(re.match(r"^(2024|2024-2025)$", season_id))
-    elif time_period == "2020s":
-        # Match the full 2020s pattern from config
-        return bool(re.match(r"^(2020|2020-2021|2021|2021-2022|2022|2022-2023|2023|2023-2024|2024|2024-2025|2025|2025-2026)$", season_id))
-    elif time_period == "recent_seasons":
-        # Match last 5 years
-        current_year = datetime.now().year
-        return any(re.match(rf"^{year}", season_id) for year in range(current_year-4, current_year+1))
-    elif time_period == "2024":
-        # Match 2024 or 2024-2025
-        return bool(re.match(r"^(2024|2024-2025)$", season_id))
-    elif time_period == "^(2024|2024-2025)$":
-        # Match 2024 or 2024-2025 (default_2024 pattern)
-        return bool(re.match(r"^(2024|2024-2025)$", season_id))
-    else:
-        # Default: match exact pattern
-        return bool(re.match(time_period, season_id))
+    # Restrict to the league's own format and latest available season
+    if expected_seasons is None and league_id and catalog:
+        expected_seasons = set(catalog.expected_seasons(league_id, time_period))
+    
+    if expected_seasons:
+        return season_id in expected_seasons
+    
+    return True
 
 def verify_data_integrity(league_ids: Optional[List[int]] = None, 
                          time_period: Optional[str] = None) -> bool:
@@ -409,7 +397,7 @@ def verify_data_integrity(league_ids: Optional[List[int]] = None,
         
         # Use provided league IDs or sample from database
         if not league_ids:
-            with psycopg2.connect(database_url) as conn:
+            with connect(database_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT DISTINCT league_id FROM staging.leagues ORDER BY league_id LIMIT 5")
                     league_ids = [row[0] for row in cur.fetchall()]
@@ -436,19 +424,14 @@ def verify_data_integrity(league_ids: Optional[List[int]] = None,
             api_season_count = len(api_data)
             
             # Get data from database
-            with psycopg2.connect(database_url) as conn:
+            with connect(database_url) as conn:
                 with conn.cursor() as cur:
-                    if time_period:
-                        # Filter database data by time period
-                        cur.execute("""
-                            SELECT COUNT(*) FROM staging.league_seasons 
-                            WHERE league_id = %s AND season_id ~ %s
-                        """, (league_id, time_period.replace("2024", "^(2024|2024-2025)$").replace("2020s", "^2020")))
-                    else:
-                        cur.execute("""
-                            SELECT COUNT(*) FROM staging.league_seasons 
-                            WHERE league_id = %s
-                        """, (league_id,))
+                    # Filter database data by time period (integer range on the start year)
+                    season_clause, season_params = season_filter_sql(time_period, "season_start_year")
+                    cur.execute("""
+                        SELECT COUNT(*) FROM staging.league_seasons 
+                        WHERE league_id = %s
+                    """ + season_clause, [league_id] + season_params)
                     db_season_count = cur.fetchone()[0]
             
             print(f"  API seasons: {api_season_count}")
@@ -479,12 +462,19 @@ def verify_data_integrity(league_ids: Optional[List[int]] = None,
 
 def main():
     """Main execution function for backward compatibility"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Load League Seasons Data")
+    parser.add_argument("--profile", action="store_true",
+                        help="Sample CPU and allocations and write flamegraph files (see the profiling config block)")
+    args = parser.parse_args()
     
     print("🚀 Starting League Seasons Data Loading (Parameterized Version)")
     print("=" * 60)
     
     # Load all seasons for all leagues (backward compatibility)
-    success = load_league_seasons_data()
+    with profiled("load_league_seasons_data", args.profile):
+        success = load_league_seasons_data()
     
     if success:
         # Verify data integrity
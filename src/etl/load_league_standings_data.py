@@ -5,19 +5,14 @@ Parameterized script for collecting league standings data with optional filterin
 Works with international competitions (World Cup, CONCACAF, OFC, AFC)
 """
 
-import os
 import sys
-import psycopg2
-import json
-from datetime import datetime
 from typing import List, Dict, Any, Optional
-from dotenv import load_dotenv
 
 # Add src to path
 sys.path.append('src')
 
-from api.fbr_client import FBRClient
-from utils.endpoint_blacklist import load_endpoint_blacklist
+from utils.profiling import profiled
+from etl.loader_engine import run_loader
 
 def get_working_league_combinations() -> List[Dict[str, Any]]:
     """Get working league-season combinations for international competitions"""
@@ -40,94 +35,6 @@ def get_working_league_combinations() -> List[Dict[str, Any]]:
     
     return working_combinations
 
-def insert_league_standings_data(data: Dict[str, Any], league_id: int, season_id: Optional[str]) -> bool:
-    """Insert league standings data into staging table"""
-    load_dotenv()
-    database_url = os.getenv("DATABASE_URL")
-    
-    if not database_url:
-        print("❌ DATABASE_URL not found in .env file")
-        return False
-    
-    try:
-        with psycopg2.connect(database_url) as conn:
-            with conn.cursor() as cur:
-                # Extract data from API response
-                standings_data = data.get('data', [])
-                
-                if not standings_data:
-                    print(f"      ⚠️  No standings data found for league_id={league_id}, season_id={season_id}")
-                    return True  # Not an error, just no data
-                
-                # Insert each group's standings
-                for group_standing in standings_data:
-                    standings_type = group_standing.get('standings_type')
-                    team_standings = group_standing.get('standings', [])
-                    
-                    for team_standing in team_standings:
-                        # Handle empty strings and convert to proper types
-                        def safe_int(value):
-                            if value == "" or value is None:
-                                return None
-                            try:
-                                return int(value)
-                            except (ValueError, TypeError):
-                                return None
-                        
-                        insert_data = {
-                            'league_id': league_id,
-                            'season_id': season_id,
-                            'standings_type': standings_type,
-                            'position': safe_int(team_standing.get('rk')),  # API uses 'rk' for rank
-                            'team_id': team_standing.get('team_id'),
-                            'team_name': team_standing.get('team_name'),
-                            'played': safe_int(team_standing.get('mp')),
-                            'won': safe_int(team_standing.get('w')),
-                            'drawn': safe_int(team_standing.get('d')),
-                            'lost': safe_int(team_standing.get('l')),
-                            'goals_for': safe_int(team_standing.get('gf')),
-                            'goals_against': safe_int(team_standing.get('ga')),
-                            'goal_difference': team_standing.get('gd'),  # Keep as string for +/- values
-                            'points': safe_int(team_standing.get('pts')),
-                            'top_team_scorer': json.dumps(team_standing.get('top_team_scorer')) if team_standing.get('top_team_scorer') else None,
-                            'raw_data': json.dumps(team_standing)
-                        }
-                        
-                        # Insert with ON CONFLICT handling
-                        cur.execute("""
-                            INSERT INTO staging.league_standings 
-                            (league_id, season_id, standings_type, position, team_id, team_name,
-                             played, won, drawn, lost, goals_for, goals_against, goal_difference,
-                             points, top_team_scorer, raw_data)
-                            VALUES (%(league_id)s, %(season_id)s, %(standings_type)s, %(position)s,
-                                    %(team_id)s, %(team_name)s, %(played)s, %(won)s, %(drawn)s,
-                                    %(lost)s, %(goals_for)s, %(goals_against)s, %(goal_difference)s,
-                                    %(points)s, %(top_team_scorer)s, %(raw_data)s)
-                            ON CONFLICT (league_id, season_id, team_id) 
-                            DO UPDATE SET
-                                standings_type = EXCLUDED.standings_type,
-                                position = EXCLUDED.position,
-                                team_name = EXCLUDED.team_name,
-                                played = EXCLUDED.played,
-                                won = EXCLUDED.won,
-                                drawn = EXCLUDED.drawn,
-                                lost = EXCLUDED.lost,
-                                goals_for = EXCLUDED.goals_for,
-                                goals_against = EXCLUDED.goals_against,
-                                goal_difference = EXCLUDED.goal_difference,
-                                points = EXCLUDED.points,
-                                top_team_scorer = EXCLUDED.top_team_scorer,
-                                raw_data = EXCLUDED.raw_data,
-                                updated_at = CURRENT_TIMESTAMP
-                        """, insert_data)
-                
-                conn.commit()
-                return True
-                
-    except Exception as e:
-        print(f"❌ Error inserting data: {e}")
-        return False
-
 def load_league_standings_data(league_ids: Optional[List[int]] = None,
                                season_ids: Optional[List[str]] = None,
                                update_only: bool = False,
@@ -149,10 +56,6 @@ def load_league_standings_data(league_ids: Optional[List[int]] = None,
     print(f"   Season IDs: {season_ids if season_ids else 'All Seasons'}")
     print(f"   Update Only: {update_only}")
     
-    # Initialize FBR client and blacklist
-    client = FBRClient()
-    blacklist = load_endpoint_blacklist()
-    
     # Get combinations to process
     if league_ids or season_ids:
         # Filter working combinations based on parameters
@@ -175,58 +78,15 @@ def load_league_standings_data(league_ids: Optional[List[int]] = None,
     
     print(f"📋 Found {len(combinations_to_process)} combinations to process")
     
-    success_count = 0
-    error_count = 0
-    blacklisted_count = 0
-    
-    for i, combination in enumerate(combinations_to_process, 1):
-        league_id = combination['league_id']
-        season_id = combination['season_id']
-        description = combination['description']
-        
-        if verbose:
-            print(f"   [{i}/{len(combinations_to_process)}] Processing {description}")
-        
-        # Check if blacklisted
-        if blacklist.is_blacklisted("league-standings", league_id=league_id):
-            if verbose:
-                print(f"      ⚠️  League {league_id} is blacklisted, skipping")
-            blacklisted_count += 1
-            continue
-        
-        try:
-            # Make API call
-            response = client.get_league_standings(league_id, season_id)
-            
-            if "error" in response:
-                if verbose:
-                    print(f"      ❌ API Error: {response['error']}")
-                error_count += 1
-                continue
-            
-            # Store data
-            if insert_league_standings_data(response, league_id, season_id):
-                success_count += 1
-                if verbose:
-                    print(f"      ✅ Stored successfully")
-            else:
-                error_count += 1
-                if verbose:
-                    print(f"      ❌ Failed to store data")
-                
-        except Exception as e:
-            error_count += 1
-            if verbose:
-                print(f"      ❌ Error: {e}")
-    
-    # Print summary
-    print(f"\n📊 Collection Summary:")
-    print(f"   Successful: {success_count}")
-    print(f"   Errors: {error_count}")
-    print(f"   Blacklisted: {blacklisted_count}")
-    print(f"   Total Processed: {len(combinations_to_process)}")
+    metrics = run_loader(
+        "league_standings",
+        calls=[{'league_id': combo['league_id'], 'season_id': combo['season_id']}
+               for combo in combinations_to_process],
+        verbose=verbose
+    )
+    metrics.print_summary()
     
-    if success_count > 0:
+    if metrics.fetched > 0:
         print(f"✅ League standings collection completed successfully!")
         return True
     else:
@@ -242,6 +102,8 @@ def main():
     parser.add_argument("--season-ids", help="Comma-separated list of season IDs")
     parser.add_argument("--update-only", action="store_true", help="Only update existing records")
     parser.add_argument("--verbose", action="store_true", help="Verbose output")
+    parser.add_argument("--profile", action="store_true",
+                        help="Sample CPU and allocations and write flamegraph files (see the profiling config block)")
     
     args = parser.parse_args()
     
@@ -255,12 +117,13 @@ def main():
         season_ids = [x.strip() for x in args.season_ids.split(",")]
     
     # Run collection
-    success = load_league_standings_data(
-        league_ids=league_ids,
-        season_ids=season_ids,
-        update_only=args.update_only,
-        verbose=args.verbose
-    )
+    with profiled("load_league_standings_data", args.profile):
+        success = load_league_standings_data(
+            league_ids=league_ids,
+            season_ids=season_ids,
+            update_only=args.update_only,
+            verbose=args.verbose
+        )
     
     return 0 if success else 1
 
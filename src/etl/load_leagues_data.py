@@ -6,8 +6,6 @@ Parameterized version for cascading collection framework
 
 import os
 import sys
-import psycopg2
-import json
 from datetime import datetime
 from dotenv import load_dotenv
 from typing import List, Optional, Dict, Any
@@ -16,14 +14,62 @@ from typing import List, Optional, Dict, Any
 sys.path.append('src')
 
 from api.fbr_client import FBRClient
+from utils.raw_payloads import raw_payload
+from utils.shadow_swap import refresh_table
+from utils.db import connect
+from utils.progress import get_progress_reporter
+from utils.profiling import profiled
 
-def load_leagues_data(country_codes: Optional[List[str]] = None, config: Optional[Dict[str, Any]] = None) -> bool:
+# Columns written for each league, in row order
+LEAGUE_COLUMNS = [
+    'country_code', 'league_type', 'league_id', 'competition_name',
+    'gender', 'first_season', 'last_season', 'tier', 'raw_data_hash'
+]
+
+def fetch_country_leagues(client: FBRClient, country_code: str) -> Optional[List[tuple]]:
+    """
+    Fetch one country's leagues as LEAGUE_COLUMNS rows
+
+    Args:
+        client: FBR API client
+        country_code: 3-letter country code
+
+    Returns:
+        List of rows, or None if the API call failed
+    """
+    leagues_response = client.get_leagues(country_code)
+    
+    if "error" in leagues_response:
+        print(f"❌ API call failed for {country_code}: {leagues_response['error']}")
+        return None
+    
+    rows = []
+    # Process each league type
+    for league_type_obj in leagues_response.get('data', []):
+        league_type = league_type_obj.get('league_type', 'unknown')
+        for league in league_type_obj.get('leagues', []):
+            rows.append((
+                country_code,
+                league_type,
+                league.get('league_id'),
+                league.get('competition_name'),
+                league.get('gender'),
+                league.get('first_season'),
+                league.get('last_season'),
+                league.get('tier'),
+                raw_payload(league)  # Store individual league object
+            ))
+    return rows
+
+def load_leagues_data(country_codes: Optional[List[str]] = None, config: Optional[Dict[str, Any]] = None,
+                      full_refresh: bool = False) -> bool:
     """
     Load leagues data from API to staging table
     
     Args:
         country_codes: Optional list of country codes to filter by. If None, loads all countries.
         config: Optional configuration dictionary for additional settings
+        full_refresh: If True, rebuild the table in a shadow copy and swap it in atomically
     
     Returns:
         bool: True if successful, False otherwise
@@ -43,7 +89,7 @@ def load_leagues_data(country_codes: Optional[List[str]] = None, config: Optiona
     # If no country codes specified, get all countries from database
     if not country_codes:
         try:
-            with psycopg2.connect(database_url) as conn:
+            with connect(database_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT DISTINCT country_code FROM staging.countries ORDER BY country_code")
                     country_codes = [row[0] for row in cur.fetchall()]
@@ -59,8 +105,11 @@ def load_leagues_data(country_codes: Optional[List[str]] = None, config: Optiona
         client = FBRClient()
         print("✅ FBR Client initialized")
         
+        if full_refresh:
+            return refresh_leagues_data(client, country_codes, database_url)
+        
         # Connect to database
-        with psycopg2.connect(database_url) as conn:
+        with connect(database_url) as conn:
             with conn.cursor() as cur:
                 
                 # Clear existing data for specified countries
@@ -76,52 +125,33 @@ def load_leagues_data(country_codes: Optional[List[str]] = None, config: Optiona
                     
                     try:
                         # Get leagues data for this country
-                        leagues_response = client.get_leagues(country_code)
+                        rows = fetch_country_leagues(client, country_code)
                         
-                        if "error" in leagues_response:
-                            print(f"❌ API call failed for {country_code}: {leagues_response['error']}")
+                        if rows is None:
                             failed_countries.append(country_code)
                             continue
                         
-                        data = leagues_response.get('data', [])
-                        country_leagues = 0
-                        
-                        # Process each league type
-                        for league_type_obj in data:
-                            league_type = league_type_obj.get('league_type', 'unknown')
-                            leagues = league_type_obj.get('leagues', [])
-                            
-                            # Insert each league
-                            for league in leagues:
-                                cur.execute("""
-                                    INSERT INTO staging.leagues (
-                                        country_code, league_type, league_id, competition_name,
-                                        gender, first_season, last_season, tier, raw_data
-                                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                                    ON CONFLICT (country_code, league_id) DO UPDATE SET
-                                        league_type = EXCLUDED.league_type,
-                                        competition_name = EXCLUDED.competition_name,
-                                        gender = EXCLUDED.gender,
-                                        first_season = EXCLUDED.first_season,
-                                        last_season = EXCLUDED.last_season,
-                                        tier = EXCLUDED.tier,
-                                        raw_data = EXCLUDED.raw_data,
-                                        updated_at = CURRENT_TIMESTAMP
-                                """, (
-                                    country_code,
-                                    league_type,
-                                    league.get('league_id'),
-                                    league.get('competition_name'),
-                                    league.get('gender'),
-                                    league.get('first_season'),
-                                    league.get('last_season'),
-                                    league.get('tier'),
-                                    json.dumps(league)  # Store individual league object
-                                ))
-                                country_leagues += 1
+                        # Insert each league
+                        for row in rows:
+                            cur.execute("""
+                                INSERT INTO staging.leagues (
+                                    country_code, league_type, league_id, competition_name,
+                                    gender, first_season, last_season, tier, raw_data_hash
+                                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, staging.store_raw_payload(%s::jsonb))
+                                ON CONFLICT (country_code, league_id) DO UPDATE SET
+                                    league_type = EXCLUDED.league_type,
+                                    competition_name = EXCLUDED.competition_name,
+                                    gender = EXCLUDED.gender,
+                                    first_season = EXCLUDED.first_season,
+                                    last_season = EXCLUDED.last_season,
+                                    tier = EXCLUDED.tier,
+                                    raw_data_hash = EXCLUDED.raw_data_hash,
+                                    updated_at = CURRENT_TIMESTAMP
+                            """, row)
                         
-                        print(f"✅ Inserted {country_leagues} leagues for {country_code}")
-                        total_leagues += country_leagues
+                        print(f"✅ Inserted {len(rows)} leagues for {country_code}")
+                        total_leagues += len(rows)
+                        get_progress_reporter().rows_written(len(rows))
                         
                     except Exception as e:
                         print(f"❌ Error processing {country_code}: {e}")
@@ -144,6 +174,56 @@ def load_leagues_data(country_codes: Optional[List[str]] = None, config: Optiona
         print(f"❌ Error loading data: {e}")
         return False
 
+def refresh_leagues_data(client: FBRClient, country_codes: List[str], database_url: str) -> bool:
+    """
+    Fully refresh leagues for the given countries through a shadow-table swap
+    
+    All countries are fetched before the database is touched. Countries whose
+    API call fails keep their current rows.
+    
+    Args:
+        client: FBR API client
+        country_codes: Countries to refresh
+        database_url: Database URL
+    
+    Returns:
+        bool: True if the refreshed table was swapped in, False otherwise
+    """
+    rows = []
+    refreshed_countries = []
+    failed_countries = []
+    
+    for country_code in country_codes:
+        print(f"\n📡 Fetching leagues for {country_code}...")
+        try:
+            country_rows = fetch_country_leagues(client, country_code)
+        except Exception as e:
+            print(f"❌ Error processing {country_code}: {e}")
+            country_rows = None
+        
+        if country_rows is None:
+            failed_countries.append(country_code)
+            continue
+        
+        print(f"✅ Fetched {len(country_rows)} leagues for {country_code}")
+        rows.extend(country_rows)
+        refreshed_countries.append(country_code)
+    
+    if failed_countries:
+        print(f"⚠️ Failed countries (keeping current rows): {', '.join(failed_countries)}")
+    
+    if not refreshed_countries:
+        print("❌ No countries fetched, nothing to refresh")
+        return False
+    
+    return refresh_table(
+        'leagues', LEAGUE_COLUMNS, rows,
+        key_columns=['country_code', 'league_id'],
+        keep_where="country_code <> ALL(%s)",
+        keep_params=[refreshed_countries],
+        database_url=database_url
+    )
+
 def verify_data_integrity(country_codes: Optional[List[str]] = None) -> bool:
     """
     Verify that stored data matches original API response
@@ -172,7 +252,7 @@ def verify_data_integrity(country_codes: Optional[List[str]] = None) -> bool:
         
         # Use provided country codes or sample from database
         if not country_codes:
-            with psycopg2.connect(database_url) as conn:
+            with connect(database_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("SELECT DISTINCT country_code FROM staging.countries ORDER BY country_code LIMIT 5")
                     country_codes = [row[0] for row in cur.fetchall()]
@@ -195,7 +275,7 @@ def verify_data_integrity(country_codes: Optional[List[str]] = None) -> bool:
                 api_league_count += len(league_type_obj.get('leagues', []))
             
             # Get data from database
-            with psycopg2.connect(database_url) as conn:
+            with connect(database_url) as conn:
                 with conn.cursor() as cur:
                     cur.execute("""
                         SELECT COUNT(*) FROM staging.leagues 
@@ -231,12 +311,19 @@ def verify_data_integrity(country_codes: Optional[List[str]] = None) -> bool:
 
 def main():
     """Main execution function for backward compatibility"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Load Leagues Data")
+    parser.add_argument("--profile", action="store_true",
+                        help="Sample CPU and allocations and write flamegraph files (see the profiling config block)")
+    args = parser.parse_args()
     
     print("🚀 Starting Leagues Data Loading (Parameterized Version)")
     print("=" * 60)
     
     # Load all leagues (backward compatibility)
-    success = load_leagues_data()
+    with profiled("load_leagues_data", args.profile):
+        success = load_leagues_data()
     
     if success:
         # Verify data integrity
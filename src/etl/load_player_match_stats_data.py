@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Player Match Stats Loader
+Loads /all-players-match-stats (one call per league-season) and, for the
+gaps it leaves, /player-match-stats (one call per match) into two wide typed
+tables: staging.player_match_stats (outfield players) and
+staging.keeper_match_stats (goalkeepers).
+
+Each match's players and keepers blocks are flattened from their nested
+stats categories into one row per player. For a full season that is about
+11k rows, so the flattening runs in a process pool, chunk by chunk, while
+the rows of finished chunks are already being upserted.
+"""
+
+import os
+import sys
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from dotenv import load_dotenv
+
+# Add src to path
+sys.path.append('src')
+
+from api.fbr_client import FBRClient
+from api.endpoint_config import TableMapping
+from utils.coverage_planner import load_player_stats_settings
+from utils.collection_ledger import CollectionLedger, load_collection_ledger
+from utils.league_catalog import LeagueCatalog, load_league_catalog
+from utils.work_claims import ClaimOutcome, WorkClaims, WorkUnit, load_work_claims
+from utils.db import connect
+from utils.progress import get_progress_reporter
+from utils.tracing import get_tracer
+from utils.profiling import profiled
+from etl.loader_engine import upsert_rows
+
+# Player and match columns shared by both tables, in row order
+META_COLUMNS = [
+    'match_id', 'league_id', 'season_id', 'match_date', 'round', 'player_id', 'player_name',
+    'player_country_code', 'age', 'team', 'team_id', 'opponent', 'opponent_id', 'home_away',
+    'formation', 'position', 'minutes'
+]
+
+# Outfield stat columns: (API key, column, type); keys are unique across the stats categories
+OUTFIELD_STATS = [
+    # stats
+    ('gls', 'gls', 'int'), ('ast', 'ast', 'int'), ('gls_and_ast', 'gls_and_ast', 'int'),
+    ('non_pen_gls', 'non_pen_gls', 'int'), ('xg', 'xg', 'num'), ('non_pen_xg', 'non_pen_xg', 'num'),
+    ('xag', 'xag', 'num'), ('pk_made', 'pk_made', 'int'), ('pk_att', 'pk_att', 'int'),
+    ('yellow_cards', 'yellow_cards', 'int'), ('red_cards', 'red_cards', 'int'),
+    ('carries_prog', 'carries_prog', 'int'), ('passes_prog', 'passes_prog', 'int'),
+    # shooting
+    ('sh', 'sh', 'int'), ('sot', 'sot', 'int'), ('pct_sot', 'pct_sot', 'num'),
+    ('gls_per_sh', 'gls_per_sh', 'num'), ('gls_per_sot', 'gls_per_sot', 'num'),
+    ('avg_sh_dist', 'avg_sh_dist', 'num'), ('fk_sh', 'fk_sh', 'int'), ('npxg_per_sh', 'npxg_per_sh', 'num'),
+    ('gls_xg_diff', 'gls_xg_diff', 'num'), ('non_pen_gls_xg_diff', 'non_pen_gls_xg_diff', 'num'),
+    # passing
+    ('pass_cmp', 'pass_cmp', 'int'), ('pass_att', 'pass_att', 'int'), ('pct_pass_cmp', 'pct_pass_cmp', 'num'),
+    ('pass_ttl_dist', 'pass_ttl_dist', 'int'), ('pass_cmp_s', 'pass_cmp_s', 'int'),
+    ('pass_att_s', 'pass_att_s', 'int'), ('pct_pass_cmp_s', 'pct_pass_cmp_s', 'num'),
+    ('pass_cmp_m', 'pass_cmp_m', 'int'), ('pass_att_m', 'pass_att_m', 'int'),
+    ('pct_pass_cmp_m', 'pct_pass_cmp_m', 'num'), ('pass_cmp_l', 'pass_cmp_l', 'int'),
+    ('pass_att_l', 'pass_att_l', 'int'), ('pct_pass_cmp_l', 'pct_pass_cmp_l', 'num'),
+    ('xa', 'xa', 'num'), ('ast_xag_diff', 'ast_xag_diff', 'num'), ('pass_prog', 'pass_prog', 'int'),
+    ('pass_prog_ttl_dist', 'pass_prog_ttl_dist', 'int'), ('key_passes', 'key_passes', 'int'),
+    ('pass_fthird', 'pass_fthird', 'int'), ('pass_opp_box', 'pass_opp_box', 'int'),
+    ('cross_opp_box', 'cross_opp_box', 'int'),
+    # defense
+    ('tkl', 'tkl', 'int'), ('tkl_won', 'tkl_won', 'int'), ('tkl_def_third', 'tkl_def_third', 'int'),
+    ('tkl_mid_third', 'tkl_mid_third', 'int'), ('tkl_att_third', 'tkl_att_third', 'int'),
+    ('tkl_drb', 'tkl_drb', 'int'), ('tkl_drb_att', 'tkl_drb_att', 'int'),
+    ('pct_tkl_drb_suc', 'pct_tkl_drb_suc', 'num'), ('blocks', 'blocks', 'int'),
+    ('sh_blocked', 'sh_blocked', 'int'), ('int', 'interceptions', 'int'),
+    ('tkl_plus_int', 'tkl_plus_int', 'int'), ('clearances', 'clearances', 'int'),
+    ('def_error', 'def_error', 'int'),
+    # possession
+    ('touches', 'touches', 'int'), ('touch_def_box', 'touch_def_box', 'int'),
+    ('touch_def_third', 'touch_def_third', 'int'), ('touch_mid_third', 'touch_mid_third', 'int'),
+    ('touch_fthird', 'touch_fthird', 'int'), ('touch_opp_box', 'touch_opp_box', 'int'),
+    ('touch_live', 'touch_live', 'int'), ('take_on_att', 'take_on_att', 'int'),
+    ('take_on_suc', 'take_on_suc', 'int'), ('pct_take_on_suc', 'pct_take_on_suc', 'num'),
+    ('take_on_tkld', 'take_on_tkld', 'int'), ('pct_take_on_tkld', 'pct_take_on_tkld', 'num'),
+    ('carries', 'carries', 'int'), ('ttl_carries_dist', 'ttl_carries_dist', 'int'),
+    ('ttl_carries_prog_dist', 'ttl_carries_prog_dist', 'int'), ('carries_fthird', 'carries_fthird', 'int'),
+    ('carries_opp_box', 'carries_opp_box', 'int'), ('carries_miscontrolled', 'carries_miscontrolled', 'int'),
+    ('carries_dispossessed', 'carries_dispossessed', 'int'), ('pass_recvd', 'pass_recvd', 'int'),
+    ('pass_prog_rcvd', 'pass_prog_rcvd', 'int'),
+    # misc
+    ('second_yellow_cards', 'second_yellow_cards', 'int'), ('fls_com', 'fls_com', 'int'),
+    ('fls_drawn', 'fls_drawn', 'int'), ('offside', 'offside', 'int'), ('pk_won', 'pk_won', 'int'),
+    ('pk_conceded', 'pk_conceded', 'int'), ('og', 'og', 'int'), ('ball_recov', 'ball_recov', 'int'),
+    ('air_dual_won', 'air_dual_won', 'int'), ('air_dual_lost', 'air_dual_lost', 'int'),
+    ('pct_air_dual_won', 'pct_air_dual_won', 'num'),
+]
+
+# Goalkeeper stat columns: (API key, column, type)
+KEEPER_STATS = [
+    ('sot_ag', 'sot_ag', 'int'), ('gls_ag', 'gls_ag', 'int'), ('saves', 'saves', 'int'),
+    ('save_pct', 'save_pct', 'num'), ('clean_sheets', 'clean_sheets', 'int'),
+    ('psxg', 'psxg', 'num'), ('psxg_gls_ag_diff', 'psxg_gls_ag_diff', 'num'),
+]
+
+def stats_mapping(table: str, stats: List[Tuple[str, str, str]]) -> TableMapping:
+    """Upsert mapping of a wide table: meta columns, stat columns, then unmapped stats as JSON"""
+    columns = META_COLUMNS + [column for _, column, _ in stats] + ['extra_stats']
+    return TableMapping(
+        table=table,
+        record_path="data",
+        columns={column: column for column in columns},
+        conflict_keys=['match_id', 'player_id'],
+        raw_payload=False  # every stat is a column or in extra_stats
+    )
+
+OUTFIELD_TABLE = stats_mapping("staging.player_match_stats", OUTFIELD_STATS)
+KEEPER_TABLE = stats_mapping("staging.keeper_match_stats", KEEPER_STATS)
+
+# API key -> (position in the stat columns, type), per table
+OUTFIELD_INDEX = {key: (i, column_type) for i, (key, _, column_type) in enumerate(OUTFIELD_STATS)}
+KEEPER_INDEX = {key: (i, column_type) for i, (key, _, column_type) in enumerate(KEEPER_STATS)}
+
+def to_number(value: Any, column_type: str) -> Any:
+    """Convert a stat to int or float (None for empty or unparseable values like "+0.61" → 0.61)"""
+    if value is None or value == "":
+        return None
+    try:
+        if column_type == 'int':
+            return int(value) if not isinstance(value, str) else int(float(value.replace(',', '')))
+        return float(value) if not isinstance(value, str) else float(value.replace(',', ''))
+    except (ValueError, TypeError):
+        return None
+
+def to_date(value: Any) -> Any:
+    """Convert a YYYY-MM-DD string to a date (None if missing or malformed)"""
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date() if value else None
+    except (ValueError, TypeError):
+        return None
+
+def flatten_player(record: Dict[str, Any], match: Dict[str, Any],
+                   index: Dict[str, Tuple[int, str]], width: int) -> Optional[Tuple]:
+    """
+    One wide row from a player record
+
+    Args:
+        record: Player record ({"meta_data": {...}, "stats": {category: {key: value}}})
+        match: Match context (match_id, league_id, season_id, date, round, home_team_id)
+        index: API key -> (stat position, type) of the target table
+        width: Number of stat columns of the target table
+
+    Returns:
+        Row tuple in table column order, or None without a player ID
+    """
+    meta = record.get('meta_data') or {}
+    player_id = meta.get('player_id')
+    if not player_id:
+        return None
+    team_id = meta.get('team_id')
+    home_away = meta.get('home_away')
+    if home_away is None and match.get('home_team_id') and team_id:
+        home_away = 'Home' if team_id == match['home_team_id'] else 'Away'
+
+    stats: List[Any] = [None] * width
+    extra: Dict[str, Dict[str, Any]] = {}
+    for category, values in (record.get('stats') or {}).items():
+        if not isinstance(values, dict):
+            continue
+        for key, value in values.items():
+            position = index.get(key)
+            if position is None:
+                extra.setdefault(category, {})[key] = value
+            else:
+                stats[position[0]] = to_number(value, position[1])
+
+    return (
+        match['match_id'], match['league_id'], match['season_id'],
+        to_date(meta.get('date') or match.get('date')), meta.get('round') or match.get('round'),
+        player_id, meta.get('player_name'), meta.get('player_country_code'),
+        to_number(meta.get('age'), 'int'), meta.get('team'), team_id,
+        meta.get('opponent'), meta.get('opponent_id'), home_away,
+        meta.get('formation'), meta.get('position'), to_number(meta.get('min'), 'int'),
+        *stats,
+        json.dumps(extra) if extra else None
+    )
+
+def flatten_matches(matches: List[Dict[str, Any]]) -> Tuple[List[Tuple], List[Tuple]]:
+    """
+    Outfield and keeper rows of a chunk of matches (runs in the process pool)
+
+    Args:
+        matches: Match entries, each with a "context" dict (match_id, league_id,
+            season_id, date, round, home_team_id), "players" and "keepers"
+
+    Returns:
+        Tuple of (outfield rows, keeper rows); a later row for the same
+        match and player replaces an earlier one
+    """
+    outfield: Dict[Tuple[str, str], Tuple] = {}
+    keepers: Dict[Tuple[str, str], Tuple] = {}
+    for entry in matches:
+        context = entry['context']
+        for record in entry.get('players') or []:
+            row = flatten_player(record, context, OUTFIELD_INDEX, len(OUTFIELD_STATS))
+            if row is not None:
+                outfield[(row[0], row[5])] = row
+        for record in entry.get('keepers') or []:
+            row = flatten_player(record, context, KEEPER_INDEX, len(KEEPER_STATS))
+            if row is not None:
+                keepers[(row[0], row[5])] = row
+    return list(outfield.values()), list(keepers.values())
+
+def season_match_entries(data: List[Dict[str, Any]], league_id: int, season_id: str) -> List[Dict[str, Any]]:
+    """Match entries of an /all-players-match-stats response"""
+    entries = []
+    for match in data:
+        meta = match.get('meta_data') or {}
+        if not meta.get('match_id'):
+            continue
+        entries.append({
+            'context': {
+                'match_id': meta['match_id'], 'league_id': league_id, 'season_id': season_id,
+                'date': meta.get('date'), 'round': meta.get('round'), 'home_team_id': meta.get('home_team_id')
+            },
+            'players': match.get('players'),
+            'keepers': match.get('keepers')
+        })
+    return entries
+
+def chunked(items: List[Any], size: int) -> Iterator[List[Any]]:
+    """Consecutive chunks of a list"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+class MatchFlattener:
+    """
+    Flattens match entries, in a process pool once there are enough of them
+
+    The pool is started on first use and shared by every response of a
+    loader run; results come back in chunk order as soon as each is done.
+    """
+
+    def __init__(self):
+        """Initialize without a pool"""
+        self.settings = load_player_stats_settings()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def flatten(self, entries: List[Dict[str, Any]]) -> Iterator[Tuple[List[Tuple], List[Tuple]]]:
+        """
+        Yield (outfield rows, keeper rows) per chunk of match entries
+
+        Args:
+            entries: Match entries from season_match_entries or a per-match response
+        """
+        chunks = list(chunked(entries, self.settings.flatten_chunk_matches))
+        workers = self.settings.flatten_workers
+        if workers <= 1 or len(entries) < self.settings.pool_min_matches:
+            for chunk in chunks:
+                yield flatten_matches(chunk)
+            return
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=workers)
+        yield from self._pool.map(flatten_matches, chunks)
+
+    def close(self):
+        """Shut the pool down"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+def match_seasons(match_ids: List[str], database_url: Optional[str] = None) -> Dict[str, Tuple]:
+    """(league_id, season_id, match_date, round, home_team_id) per match ID, from league_matches"""
+    if not match_ids:
+        return {}
+    with connect(database_url) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT DISTINCT ON (match_id) match_id, league_id, season_id, match_date, round, home_team_id
+                FROM staging.league_matches
+                WHERE match_id = ANY(%s)
+                ORDER BY match_id, updated_at DESC
+            """, (match_ids,))
+            return {row[0]: row[1:] for row in cur.fetchall()}
+
+def response_entries(unit: WorkUnit, response: Dict[str, Any],
+                     contexts: Dict[str, Tuple]) -> List[Dict[str, Any]]:
+    """Match entries of a league-season or single-match response"""
+    data = response.get('data') or []
+    if unit.endpoint == "all-players-match-stats":
+        return season_match_entries(data, unit.params['league_id'], unit.params['season_id'])
+    match_id = unit.params['match_id']
+    league_id, season_id, match_date, match_round, home_team_id = contexts[match_id]
+    return [{
+        'context': {
+            'match_id': match_id, 'league_id': league_id, 'season_id': season_id,
+            'date': match_date.isoformat() if match_date else None, 'round': match_round,
+            'home_team_id': home_team_id
+        },
+        'players': data,
+        'keepers': response.get('keepers')  # goalkeeper blocks, when the response has them
+    }]
+
+def load_player_match_stats_data(units: Optional[List[WorkUnit]] = None,
+                                 league_seasons: Optional[List[Tuple[int, str]]] = None,
+                                 ledger: Optional[CollectionLedger] = None,
+                                 claims: Optional[WorkClaims] = None,
+                                 catalog: Optional[LeagueCatalog] = None) -> bool:
+    """
+    Load player match stats for planned units
+
+    Args:
+        units: /all-players-match-stats and /player-match-stats units, e.g.
+            from the coverage planner (None = one league-season unit per pair)
+        league_seasons: (league_id, season_id) pairs when no units are given
+        ledger: Preloaded collection ledger (None = load it here)
+        claims: Work claims shared with concurrent runs (None = process-wide claims)
+        catalog: League catalog for current seasons (None = load it here)
+
+    Returns:
+        bool: True unless every planned call failed
+    """
+    load_dotenv()
+    database_url = os.getenv('DATABASE_URL')
+    if units is None:
+        units = [WorkUnit.of("all-players-match-stats", league_id=league_id, season_id=season_id)
+                 for league_id, season_id in league_seasons or []]
+    if not units:
+        print("ℹ️ No player match stats to load")
+        return True
+
+    if ledger is None:
+        ledger = load_collection_ledger(["all-players-match-stats", "player-match-stats"], database_url)
+    claims = claims or load_work_claims(database_url)
+    catalog = catalog or load_league_catalog(database_url)
+    contexts = match_seasons([unit.params['match_id'] for unit in units if 'match_id' in unit.params],
+                             database_url)
+
+    client = FBRClient()
+    flattener = MatchFlattener()
+    tracer = get_tracer()
+    fetched = failed = claimed_elsewhere = deferred = 0
+    total_outfield = total_keepers = 0
+
+    try:
+        for unit in units:
+            if unit.endpoint == "player-match-stats" and unit.params['match_id'] not in contexts:
+                print(f"   ⚠️ Match {unit.params['match_id']} is not in league_matches, skipping")
+                continue
+            outcome = claims.claim(unit, ledger)
+            if outcome is ClaimOutcome.DEFERRED:
+                deferred += 1
+                continue
+            if not outcome:
+                claimed_elsewhere += 1
+                continue
+            try:
+                print(f"\n📊 Fetching {unit}...")
+                response = client.get_endpoint(unit.endpoint, unit.params)
+                if 'error' in response:
+                    print(f"   ❌ API Error: {response['error']}")
+                    ledger.record(unit.endpoint, unit.params, 'error', error_message=str(response['error']))
+                    failed += 1
+                    continue
+
+                started = time.monotonic()
+                entries = response_entries(unit, response, contexts)
+                outfield_rows = keeper_rows = 0
+                with connect(database_url) as conn:
+                    with conn.cursor() as cur:
+                        # Chunks are upserted as the pool hands them back
+                        with tracer.span("flatten_and_upsert", endpoint=unit.endpoint, matches=len(entries)):
+                            for outfield, keepers in flattener.flatten(entries):
+                                outfield_rows += upsert_rows(cur, OUTFIELD_TABLE, outfield)
+                                keeper_rows += upsert_rows(cur, KEEPER_TABLE, keepers)
+                        written = outfield_rows + keeper_rows
+                        if unit.endpoint == "all-players-match-stats":
+                            # Re-fetched while the season runs; afterwards only its gaps are, per match
+                            complete = bool(written) and not catalog.is_current_season(
+                                unit.params['league_id'], unit.params['season_id'])
+                        else:
+                            # A finished match without player stats will not get them later
+                            complete = True
+                        ledger.record(unit.endpoint, unit.params, 'ok' if written else 'empty',
+                                      data=[entry['context']['match_id'] for entry in entries],
+                                      complete=complete, cur=cur)
+                get_progress_reporter().rows_written(written)
+                fetched += 1
+                total_outfield += outfield_rows
+                total_keepers += keeper_rows
+                print(f"   ✅ {len(entries)} matches: {outfield_rows} outfield and {keeper_rows} keeper rows "
+                      f"in {time.monotonic() - started:.1f}s")
+            except Exception as e:
+                print(f"   ❌ Error loading {unit}: {e}")
+                failed += 1
+            finally:
+                claims.release(unit)
+    finally:
+        flattener.close()
+
+    print(f"\n📊 Collection Summary:")
+    print(f"   - Calls: {fetched}/{len(units)} successful, {failed} failed")
+    print(f"   - Claimed by other runs: {claimed_elsewhere}")
+    if deferred:
+        print(f"   - Deferred by the run budget: {deferred}")
+    print(f"   - Outfield rows: {total_outfield}")
+    print(f"   - Keeper rows: {total_keepers}")
+
+    if fetched > 0 or failed == 0:
+        print("✅ Player match stats collection completed successfully!")
+        return True
+    print("❌ No player match stats were collected")
+    return False
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load Player Match Stats Data")
+    parser.add_argument("--league-id", type=int, required=True, help="League ID (e.g., 9)")
+    parser.add_argument("--season-id", required=True, help="Season ID (e.g., 2023-2024)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Sample CPU and allocations and write flamegraph files (see the profiling config block)")
+    args = parser.parse_args()
+
+    with profiled("load_player_match_stats_data", args.profile):
+        success = load_player_match_stats_data(league_seasons=[(args.league_id, args.season_id)])
+    if success:
+        print("\n🎉 Load completed successfully!")
+    else:
+        print("\n❌ Load failed!")
@@ -4,15 +4,16 @@ Parameterized Team Matches Data Loader
 Loads team matches data from /matches endpoint (with team_id)
 Uses team IDs extracted from league_matches table
 
-⚠️  DESIGN NOTE: This creates duplicate match data
-Each match is recorded twice - once from each team's perspective.
-This allows for easy team-centric analysis but doubles storage.
-For Premier League: 380 unique matches → 760 team match records per season.
+Minimum-call collection:
+League-level /matches rows come back without scores, but one team's response
+already holds the result, gf/ga and opponent of each of its matches. Only a
+minimal set of teams whose schedules cover every completed match is fetched;
+the opponent's perspective is mirrored and league_matches scores are filled
+in set-based SQL. Mirrored rows have no formation/captain, so the remaining
+teams are only fetched when those team-only fields are explicitly requested.
 """
 
 import os
-import json
-import psycopg2
 import re
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
@@ -22,12 +23,41 @@ from dotenv import load_dotenv
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from api.fbr_client import FBRClient
+from utils.raw_payloads import raw_payload
 from utils.endpoint_blacklist import load_endpoint_blacklist
+from utils.seasons import season_filter_sql
+from utils.collection_ledger import CollectionLedger, load_collection_ledger
+from utils.work_claims import ClaimOutcome, WorkClaims, WorkUnit, load_work_claims
+from utils.db import connect
+from utils.progress import get_progress_reporter
+from utils.season_registry import get_season_registry
+from utils.refresh_schedule import load_refresh_schedule_settings
+from utils.tracing import traced
+from utils.profiling import profiled
+from api.endpoint_config import TableMapping
+from etl.loader_engine import upsert_rows
+
+# Columns written for each team match, in row order (followed by the raw payload);
+# a team's own row replaces a row mirrored from its opponent
+TEAM_MATCH_COLUMNS = (
+    'match_id', 'league_id', 'season_id', 'team_id', 'match_date', 'match_time', 'round',
+    'home_away', 'opponent', 'opponent_id', 'result', 'goals_for', 'goals_against',
+    'formation', 'captain', 'attendance', 'referee', 'is_mirrored'
+)
+
+# Bulk upsert target for team matches with an ID
+TEAM_MATCHES_WITH_ID = TableMapping(
+    table="staging.team_matches",
+    record_path="data",
+    columns={column: column for column in TEAM_MATCH_COLUMNS},
+    conflict_keys=['league_id', 'season_id', 'match_id', 'team_id'],
+    conflict_where="match_id IS NOT NULL"
+)
 
 def get_database_connection():
     """Get database connection"""
     load_dotenv()
-    return psycopg2.connect(os.getenv('DATABASE_URL'))
+    return connect(os.getenv('DATABASE_URL'))
 
 def get_team_ids_from_league_matches(league_ids: Optional[List[int]] = None, 
                                     season_ids: Optional[List[str]] = None,
@@ -47,12 +77,12 @@ def get_team_ids_from_league_matches(league_ids: Optional[List[int]] = None,
         query = """
             SELECT DISTINCT league_id, season_id, team_id
             FROM (
-                SELECT league_id, season_id, home_team_id as team_id
+                SELECT league_id, season_id, season_start_year, home_team_id as team_id
                 FROM staging.league_matches 
                 WHERE home_team_id IS NOT NULL
                   AND match_date + INTERVAL '2 days' < CURRENT_DATE
                 UNION
-                SELECT league_id, season_id, away_team_id as team_id
+                SELECT league_id, season_id, season_start_year, away_team_id as team_id
                 FROM staging.league_matches 
                 WHERE away_team_id IS NOT NULL
                   AND match_date + INTERVAL '2 days' < CURRENT_DATE
@@ -71,29 +101,9 @@ def get_team_ids_from_league_matches(league_ids: Optional[List[int]] = None,
             query += f" AND season_id IN ({placeholders})"
             params.extend(season_ids)
         
-        if time_period:
-            # Filter by time period using the same logic as league matches
-            if time_period == "2024":
-                # Match 2024 or 2024-2025
-                query += " AND season_id ~ '^(2024|2024-2025)$'"
-            elif time_period == "default_2024":
-                # Match 2024 or 2024-2025 (default 2024 pattern)
-                query += " AND season_id ~ '^(2024|2024-2025)$'"
-            elif time_period == "2020s":
-                # Match the full 2020s pattern
-                query += " AND season_id ~ '^(2020|2020-2021|2021|2021-2022|2022|2022-2023|2023|2023-2024|2024|2024-2025|2025|2025-2026)$'"
-            elif time_period == "recent_seasons":
-                # Match last 5 years
-                current_year = datetime.now().year
-                patterns = []
-                for year in range(current_year-4, current_year+1):
-                    patterns.append(f"^{year}")
-                pattern = '|'.join(patterns)
-                query += f" AND season_id ~ '({pattern})'"
-            else:
-                # Default: match exact pattern
-                query += f" AND season_id ~ '{time_period}'"
-        
+        season_clause, season_params = season_filter_sql(time_period, "season_start_year")
+        query += season_clause
+        params.extend(season_params)
         query += " ORDER BY league_id, season_id, team_id"
         
         cur.execute(query, params)
@@ -112,8 +122,273 @@ def get_team_ids_from_league_matches(league_ids: Optional[List[int]] = None,
         print(f"⚠️ Error querying team combinations: {e}")
         return []
 
-def insert_team_matches_data(data: Dict[str, Any], league_id: int, season_id: str, team_id: str) -> bool:
-    """Insert team matches data into staging table"""
+@traced("db.probe_completed_matches")
+def get_completed_league_matches(league_ids: Optional[List[int]] = None, 
+                                 season_ids: Optional[List[str]] = None,
+                                 time_period: Optional[str] = None) -> Dict[Tuple[int, str], Dict[str, Any]]:
+    """
+    Get completed league matches grouped by league-season, with their team-match coverage
+    
+    A match is covered when any team_matches row for it already has a score,
+    whether it was fetched for that team or mirrored from the opponent.
+    A match is given up on (postponed or abandoned) when the schedule of
+    either team was fetched more than the refresh scheduler's
+    late_result_give_up_days after the match was due and still had no score;
+    it is neither uncovered nor retried.
+    
+    Returns:
+        Dict keyed by (league_id, season_id) with:
+            'uncovered': List of (match_id, home_team_id, away_team_id) still missing scores
+            'teams': Set of all team IDs playing completed matches
+            'fetched_teams': Set of team IDs already fetched with their own team_id
+    """
+    try:
+        conn = get_database_connection()
+        cur = conn.cursor()
+        
+        # Only include matches that have already happened + 2 days buffer for data entry
+        query = """
+            SELECT lm.league_id, lm.season_id, lm.match_id, lm.home_team_id, lm.away_team_id,
+                   EXISTS (
+                       SELECT 1 FROM staging.team_matches tm
+                       WHERE tm.league_id = lm.league_id
+                         AND tm.season_id = lm.season_id
+                         AND tm.match_id = lm.match_id
+                         AND tm.goals_for IS NOT NULL
+                   ) AS covered,
+                   EXISTS (
+                       SELECT 1 FROM staging.collection_ledger cl
+                       WHERE cl.endpoint = 'matches'
+                         AND cl.params IN (
+                             jsonb_build_object('league_id', lm.league_id, 'season_id', lm.season_id,
+                                                'team_id', lm.home_team_id),
+                             jsonb_build_object('league_id', lm.league_id, 'season_id', lm.season_id,
+                                                'team_id', lm.away_team_id)
+                         )
+                         AND cl.status <> 'error'
+                         AND cl.last_fetched_at > lm.match_date + INTERVAL '2 days' + %s
+                   ) AS given_up
+            FROM staging.league_matches lm
+            WHERE lm.match_id IS NOT NULL
+              AND lm.home_team_id IS NOT NULL
+              AND lm.away_team_id IS NOT NULL
+              AND lm.match_date + INTERVAL '2 days' < CURRENT_DATE
+        """
+        params = [load_refresh_schedule_settings().late_result_give_up]
+        
+        if league_ids:
+            placeholders = ','.join(['%s'] * len(league_ids))
+            query += f" AND lm.league_id IN ({placeholders})"
+            params.extend(league_ids)
+        
+        if season_ids:
+            placeholders = ','.join(['%s'] * len(season_ids))
+            query += f" AND lm.season_id IN ({placeholders})"
+            params.extend(season_ids)
+        
+        season_clause, season_params = season_filter_sql(time_period, "lm.season_start_year")
+        query += season_clause
+        params.extend(season_params)
+        query += " ORDER BY lm.league_id, lm.season_id, lm.match_date, lm.match_id"
+        
+        cur.execute(query, params)
+        
+        seasons = {}
+        given_up = 0
+        for league_id, season_id, match_id, home_team_id, away_team_id, covered, abandoned in cur.fetchall():
+            season = seasons.setdefault((league_id, season_id), {
+                'uncovered': [],
+                'teams': set(),
+                'fetched_teams': set()
+            })
+            season['teams'].update((home_team_id, away_team_id))
+            if covered:
+                continue
+            if abandoned:
+                given_up += 1
+            else:
+                season['uncovered'].append((match_id, home_team_id, away_team_id))
+        
+        # Teams that already have rows from their own perspective
+        if seasons:
+            cur.execute("""
+                SELECT DISTINCT league_id, season_id, team_id
+                FROM staging.team_matches
+                WHERE is_mirrored = FALSE
+            """)
+            for league_id, season_id, team_id in cur.fetchall():
+                if (league_id, season_id) in seasons:
+                    seasons[(league_id, season_id)]['fetched_teams'].add(team_id)
+        
+        cur.close()
+        conn.close()
+        
+        print(f"✅ Found completed matches for {len(seasons)} league-seasons in league_matches")
+        if given_up:
+            print(f"⏭️  Gave up on {given_up} matches still without a result (postponed or abandoned)")
+        return seasons
+            
+    except Exception as e:
+        print(f"⚠️ Error querying completed league matches: {e}")
+        return {}
+
+def select_covering_teams(matches: List[Tuple[str, str, str]]) -> List[str]:
+    """
+    Choose a small set of teams whose schedules cover every given match
+    
+    Each team's /matches response contains all of its matches, so this is a
+    vertex cover over the match graph. Leaf rule first (a team with a single
+    uncovered match is covered by its opponent), which is optimal for
+    knockout brackets, then the team with the most uncovered matches.
+    
+    Args:
+        matches: List of (match_id, home_team_id, away_team_id)
+    
+    Returns:
+        List of team IDs to fetch, in selection order
+    """
+    uncovered = {}
+    for match_id, home_team_id, away_team_id in matches:
+        uncovered.setdefault(home_team_id, set()).add(match_id)
+        uncovered.setdefault(away_team_id, set()).add(match_id)
+    
+    opponents = {}
+    for match_id, home_team_id, away_team_id in matches:
+        opponents[(match_id, home_team_id)] = away_team_id
+        opponents[(match_id, away_team_id)] = home_team_id
+    
+    selected = []
+    
+    while any(uncovered.values()):
+        # Leaf rule: the opponent of a team with one uncovered match covers it
+        leaf = next(
+            (team_id for team_id in sorted(uncovered) if len(uncovered[team_id]) == 1),
+            None
+        )
+        if leaf is not None:
+            match_id = next(iter(uncovered[leaf]))
+            team_id = opponents[(match_id, leaf)]
+        else:
+            team_id = max(sorted(uncovered), key=lambda t: len(uncovered[t]))
+        
+        selected.append(team_id)
+        
+        # Remove the chosen team's matches from every team
+        for match_id in uncovered.pop(team_id):
+            opponent_id = opponents[(match_id, team_id)]
+            if opponent_id in uncovered:
+                uncovered[opponent_id].discard(match_id)
+    
+    return selected
+
+def mirror_team_matches(cur, league_id: int, season_id: str) -> int:
+    """
+    Derive the opponent's perspective for fetched team matches
+    
+    Rows fetched for a team are never overwritten; mirrored rows are refreshed
+    when their source changes.
+    
+    Returns:
+        int: Number of mirrored rows inserted or refreshed
+    """
+    cur.execute("""
+        INSERT INTO staging.team_matches (
+            match_id, league_id, season_id, team_id, match_date, match_time, round,
+            home_away, opponent, opponent_id, result, goals_for, goals_against,
+            attendance, referee, is_mirrored
+        )
+        SELECT tm.match_id, tm.league_id, tm.season_id, tm.opponent_id,
+               tm.match_date, tm.match_time, tm.round,
+               CASE tm.home_away WHEN 'Home' THEN 'Away' WHEN 'Away' THEN 'Home' ELSE tm.home_away END,
+               CASE WHEN lm.home_team_id = tm.team_id THEN lm.home_team ELSE lm.away_team END,
+               tm.team_id,
+               CASE tm.result WHEN 'W' THEN 'L' WHEN 'L' THEN 'W' ELSE tm.result END,
+               tm.goals_against, tm.goals_for,
+               tm.attendance, tm.referee, TRUE
+        FROM staging.team_matches tm
+        JOIN staging.league_matches lm
+          ON lm.league_id = tm.league_id
+         AND lm.season_id = tm.season_id
+         AND lm.match_id = tm.match_id
+        WHERE tm.league_id = %s
+          AND tm.season_id = %s
+          AND tm.is_mirrored = FALSE
+          AND tm.match_id IS NOT NULL
+          AND tm.opponent_id IS NOT NULL
+        ON CONFLICT (league_id, season_id, match_id, team_id) WHERE match_id IS NOT NULL
+        DO UPDATE SET
+            match_date = EXCLUDED.match_date,
+            match_time = EXCLUDED.match_time,
+            round = EXCLUDED.round,
+            home_away = EXCLUDED.home_away,
+            opponent = EXCLUDED.opponent,
+            opponent_id = EXCLUDED.opponent_id,
+            result = EXCLUDED.result,
+            goals_for = EXCLUDED.goals_for,
+            goals_against = EXCLUDED.goals_against,
+            attendance = EXCLUDED.attendance,
+            referee = EXCLUDED.referee,
+            updated_at = CURRENT_TIMESTAMP
+        WHERE staging.team_matches.is_mirrored
+          AND (staging.team_matches.goals_for, staging.team_matches.goals_against, staging.team_matches.result)
+              IS DISTINCT FROM (EXCLUDED.goals_for, EXCLUDED.goals_against, EXCLUDED.result)
+    """, (league_id, season_id))
+    return cur.rowcount
+
+def backfill_league_match_scores(cur, league_id: int, season_id: str) -> int:
+    """
+    Fill league_matches scores from the home team's team_matches row
+    
+    Returns:
+        int: Number of league matches updated
+    """
+    cur.execute("""
+        UPDATE staging.league_matches lm
+        SET home_team_score = tm.goals_for,
+            away_team_score = tm.goals_against,
+            updated_at = CURRENT_TIMESTAMP
+        FROM staging.team_matches tm
+        WHERE tm.league_id = lm.league_id
+          AND tm.season_id = lm.season_id
+          AND tm.match_id = lm.match_id
+          AND tm.team_id = lm.home_team_id
+          AND tm.goals_for IS NOT NULL
+          AND lm.league_id = %s
+          AND lm.season_id = %s
+          AND (lm.home_team_score, lm.away_team_score)
+              IS DISTINCT FROM (tm.goals_for, tm.goals_against)
+    """, (league_id, season_id))
+    return cur.rowcount
+
+@traced("db.derive_perspectives")
+def derive_team_match_perspectives(league_id: int, season_id: str) -> Tuple[int, int]:
+    """
+    Mirror opponent rows and backfill league scores for one league-season
+    
+    Returns:
+        Tuple[int, int]: (mirrored rows, league matches with scores updated)
+    """
+    conn = get_database_connection()
+    try:
+        with conn:
+            with conn.cursor() as cur:
+                mirrored = mirror_team_matches(cur, league_id, season_id)
+                scored = backfill_league_match_scores(cur, league_id, season_id)
+        return mirrored, scored
+    finally:
+        conn.close()
+
+def is_team_season_complete(matches_data: List[Dict[str, Any]]) -> bool:
+    """Check if every match in a team's /matches response has an ID and a result"""
+    return bool(matches_data) and all(
+        match.get('match_id') and match.get('gf') not in (None, "")
+        for match in matches_data
+    )
+
+@traced("db.upsert_team_matches")
+def insert_team_matches_data(data: Dict[str, Any], league_id: int, season_id: str, team_id: str,
+                             ledger: Optional[CollectionLedger] = None) -> bool:
+    """Insert team matches data into staging table and record the fetch in the ledger"""
     try:
         conn = get_database_connection()
         cur = conn.cursor()
@@ -121,9 +396,14 @@ def insert_team_matches_data(data: Dict[str, Any], league_id: int, season_id: st
         matches_data = data.get('data', [])
         
         # Check for existing matches to avoid duplicates
+        # Mirrored rows are replaced so the team-only fields get filled in
         existing_match_ids = set()
         cur.execute(
-            "SELECT match_id FROM staging.team_matches WHERE league_id = %s AND season_id = %s AND team_id = %s",
+            """
+            SELECT match_id FROM staging.team_matches
+            WHERE league_id = %s AND season_id = %s AND team_id = %s
+              AND is_mirrored = FALSE AND goals_for IS NOT NULL
+            """,
             (league_id, season_id, team_id)
         )
         for row in cur.fetchall():
@@ -135,6 +415,7 @@ def insert_team_matches_data(data: Dict[str, Any], league_id: int, season_id: st
         
         inserted_count = 0
         skipped_count = 0
+        rows: Dict[str, Tuple] = {}
         
         for match in matches_data:
             # Skip matches without match_id
@@ -190,72 +471,32 @@ def insert_team_matches_data(data: Dict[str, Any], league_id: int, season_id: st
                 'captain': match.get('captain'),
                 'attendance': match.get('attendance'),
                 'referee': match.get('referee'),
-                'raw_data': json.dumps(match)
+                'is_mirrored': False,
+                'raw_data': raw_payload(match)
             }
             
-            # Insert with upsert - handle both matches with IDs and future matches
-            if match.get('match_id'):
-                # Match has ID - use the match_id unique constraint
-                cur.execute("""
-                    INSERT INTO staging.team_matches (
-                        match_id, league_id, season_id, team_id, match_date, match_time, round,
-                        home_away, opponent, opponent_id, result, goals_for, goals_against,
-                        formation, captain, attendance, referee, raw_data
-                    ) VALUES (
-                        %(match_id)s, %(league_id)s, %(season_id)s, %(team_id)s, %(match_date)s, %(match_time)s, 
-                        %(round)s, %(home_away)s, %(opponent)s, %(opponent_id)s, %(result)s, %(goals_for)s, %(goals_against)s,
-                        %(formation)s, %(captain)s, %(attendance)s, %(referee)s, %(raw_data)s
-                    ) ON CONFLICT ON CONSTRAINT uk_team_matches_match_id
-                    DO UPDATE SET
-                        match_date = EXCLUDED.match_date,
-                        match_time = EXCLUDED.match_time,
-                        round = EXCLUDED.round,
-                        home_away = EXCLUDED.home_away,
-                        opponent = EXCLUDED.opponent,
-                        opponent_id = EXCLUDED.opponent_id,
-                        result = EXCLUDED.result,
-                        goals_for = EXCLUDED.goals_for,
-                        goals_against = EXCLUDED.goals_against,
-                        formation = EXCLUDED.formation,
-                        captain = EXCLUDED.captain,
-                        attendance = EXCLUDED.attendance,
-                        referee = EXCLUDED.referee,
-                        raw_data = EXCLUDED.raw_data,
-                        updated_at = CURRENT_TIMESTAMP
-                """, insert_data)
-            else:
-                # Future match without ID - use the future match unique constraint
-                cur.execute("""
-                    INSERT INTO staging.team_matches (
-                        match_id, league_id, season_id, team_id, match_date, match_time, round,
-                        home_away, opponent, opponent_id, result, goals_for, goals_against,
-                        formation, captain, attendance, referee, raw_data
-                    ) VALUES (
-                        %(match_id)s, %(league_id)s, %(season_id)s, %(team_id)s, %(match_date)s, %(match_time)s, 
-                        %(round)s, %(home_away)s, %(opponent)s, %(opponent_id)s, %(result)s, %(goals_for)s, %(goals_against)s,
-                        %(formation)s, %(captain)s, %(attendance)s, %(referee)s, %(raw_data)s
-                    ) ON CONFLICT ON CONSTRAINT uk_team_matches_future
-                    DO UPDATE SET
-                        match_time = EXCLUDED.match_time,
-                        round = EXCLUDED.round,
-                        home_away = EXCLUDED.home_away,
-                        opponent_id = EXCLUDED.opponent_id,
-                        result = EXCLUDED.result,
-                        goals_for = EXCLUDED.goals_for,
-                        goals_against = EXCLUDED.goals_against,
-                        formation = EXCLUDED.formation,
-                        captain = EXCLUDED.captain,
-                        attendance = EXCLUDED.attendance,
-                        referee = EXCLUDED.referee,
-                        raw_data = EXCLUDED.raw_data,
-                        updated_at = CURRENT_TIMESTAMP
-                """, insert_data)
-            
+            # Matches without an ID were skipped above, so every row has the match_id conflict target
+            rows[match['match_id']] = (
+                tuple(insert_data[column] for column in TEAM_MATCH_COLUMNS) + (insert_data['raw_data'],)
+            )
             inserted_count += 1
         
+        upsert_rows(cur, TEAM_MATCHES_WITH_ID, list(rows.values()))
+        
+        if ledger is not None:
+            ledger.record(
+                "matches",
+                {'league_id': league_id, 'season_id': season_id, 'team_id': team_id},
+                'ok' if matches_data else 'empty',
+                data=matches_data,
+                complete=is_team_season_complete(matches_data),
+                cur=cur
+            )
+        
         conn.commit()
         cur.close()
         conn.close()
+        get_progress_reporter().rows_written(inserted_count)
         
         print(f"✅ Inserted {inserted_count} team matches for league {league_id}, season {season_id}, team {team_id}")
         if skipped_count > 0:
@@ -269,24 +510,31 @@ def insert_team_matches_data(data: Dict[str, Any], league_id: int, season_id: st
 def load_team_matches_data(league_ids: Optional[List[int]] = None, 
                           season_ids: Optional[List[str]] = None,
                           time_period: Optional[str] = None,
-                          update_only: bool = False) -> bool:
+                          update_only: bool = False,
+                          include_team_fields: bool = False,
+                          ledger: Optional[CollectionLedger] = None,
+                          claims: Optional[WorkClaims] = None,
+                          league_seasons: Optional[List[Tuple[int, str]]] = None) -> bool:
     """
     Load team matches data from API using team IDs from league_matches table
     
-    ⚠️  IMPORTANT: This creates duplicate match data
-    Each match is recorded twice - once from each team's perspective.
-    For example, Arsenal vs Chelsea creates two records:
-    - Arsenal's perspective (home team)
-    - Chelsea's perspective (away team)
-    
-    This design allows for easy team-centric analysis but doubles storage.
-    For Premier League: 380 unique matches → 760 team match records per season.
+    Each match is still recorded twice - once from each team's perspective -
+    but only a minimal set of covering teams is fetched. The other
+    perspective is mirrored from the opponent's row, and league_matches
+    scores are backfilled from the home team's row.
+    For a knockout cup: 2 teams per tie → 1 call per tie instead of 2.
     
     Args:
         league_ids: List of league IDs to collect (None = all available)
         season_ids: List of season IDs to collect (None = all available)
         time_period: Time period filter (e.g., "2024", "2020s")
         update_only: If True, only update existing records
+        include_team_fields: If True, also fetch every remaining team so that
+            team-only fields (formation, captain) are filled in
+        ledger: Preloaded collection ledger (None = load it here)
+        claims: Work claims shared with concurrent runs (None = process-wide claims)
+        league_seasons: Exact (league_id, season_id) pairs to collect, in this
+            order (overrides league_ids, season_ids and time_period)
     
     Returns:
         bool: True if successful, False otherwise
@@ -300,72 +548,137 @@ def load_team_matches_data(league_ids: Optional[List[int]] = None,
         print("❌ Matches endpoint is blacklisted, skipping collection")
         return False
     
-    # Get team combinations from league_matches table
-    team_combinations = get_team_ids_from_league_matches(league_ids, season_ids, time_period)
+    # Get completed matches and their coverage from league_matches table
+    if league_seasons is not None:
+        seasons = get_completed_league_matches(sorted({league_id for league_id, _ in league_seasons}))
+        seasons = {pair: seasons[pair] for pair in league_seasons if pair in seasons}
+    else:
+        seasons = get_completed_league_matches(league_ids, season_ids, time_period)
     
-    if not team_combinations:
-        print("❌ No team combinations found")
+    if not seasons:
+        print("❌ No completed league matches found")
         return False
     
+    # Finalized seasons are complete and verified; nothing left to fetch or derive
+    registry = get_season_registry()
+    finalized = [pair for pair in seasons if registry.is_finalized(*pair)]
+    for pair in finalized:
+        del seasons[pair]
+    if finalized:
+        print(f"🔒 Skipping {len(finalized)} finalized league-seasons")
+    if not seasons:
+        return True
+    
+    if ledger is None:
+        ledger = load_collection_ledger(["matches"])
+    
+    # Plan the calls per league-season
+    plan = []
+    total_teams = 0
+    for (league_id, season_id), season in seasons.items():
+        teams_to_fetch = select_covering_teams(season['uncovered'])
+        if ledger.run is not None:
+            # Resumed run: teams fetched before the interruption stay done
+            teams_to_fetch = [
+                team_id for team_id in teams_to_fetch
+                if not ledger.run.is_done("matches", league_id=league_id, season_id=season_id, team_id=team_id)
+            ]
+        if include_team_fields:
+            remaining = season['teams'] - season['fetched_teams'] - set(teams_to_fetch)
+            teams_to_fetch.extend(sorted(
+                team_id for team_id in remaining
+                if ledger.needs_fetch("matches", league_id=league_id,
+                                      season_id=season_id, team_id=team_id)
+            ))
+        total_teams += len(season['teams'])
+        if teams_to_fetch:
+            plan.append((league_id, season_id, teams_to_fetch))
+    
+    planned_calls = sum(len(teams) for _, _, teams in plan)
+    print(f"📋 Planned {planned_calls} team calls for {len(plan)} league-seasons "
+          f"({total_teams} teams play completed matches)")
+    
     # Initialize FBR client
-    client = FBRClient()
+    client = FBRClient() if plan else None
+    claims = claims or load_work_claims()
     
-    # Collect data for each combination
+    # Collect data for each planned team
     total_matches = 0
-    successful_combinations = 0
-    data_available_combinations = 0
+    successful_calls = 0
+    failed_calls = 0
+    claimed_elsewhere = 0
+    deferred = 0
     
-    for league_id, season_id, team_id in team_combinations:
-        print(f"\n📊 Processing League {league_id}, Season {season_id}, Team {team_id}...")
+    for league_id, season_id, teams_to_fetch in plan:
+        print(f"\n📊 Processing League {league_id}, Season {season_id} "
+              f"({len(teams_to_fetch)} teams)...")
         
-        try:
-            # Check if we already have data for this combination
+        for team_id in teams_to_fetch:
+            unit = WorkUnit.of("matches", league_id=league_id, season_id=season_id, team_id=team_id)
+            outcome = claims.claim(unit, ledger)
+            if outcome is ClaimOutcome.DEFERRED:
+                deferred += 1
+                continue
+            if not outcome:
+                # Another run owns this team's schedule
+                claimed_elsewhere += 1
+                continue
+            
             try:
-                conn = get_database_connection()
-                cur = conn.cursor()
-                cur.execute("""
-                    SELECT COUNT(*) FROM staging.team_matches 
-                    WHERE league_id = %s AND season_id = %s AND team_id = %s
-                """, (league_id, season_id, team_id))
-                existing_count = cur.fetchone()[0]
-                cur.close()
-                conn.close()
+                # Make API call with team_id
+                response = client.get_matches(str(league_id), season_id, team_id)
                 
-                if existing_count > 0:
-                    print(f"   ℹ️  Found {existing_count} existing matches, skipping API call")
-                    data_available_combinations += 1
+                if 'error' in response:
+                    print(f"   ❌ API Error for team {team_id}: {response['error']}")
+                    ledger.record("matches",
+                                  {'league_id': league_id, 'season_id': season_id, 'team_id': team_id},
+                                  'error', error_message=str(response['error']))
+                    failed_calls += 1
                     continue
-            except Exception as e:
-                print(f"   ⚠️  Error checking existing data: {e}")
-            
-            # Make API call with team_id
-            response = client.get_matches(str(league_id), season_id, team_id)
-            
-            if 'error' in response:
-                print(f"   ❌ API Error: {response['error']}")
-                continue
-            
-            # Insert data
-            if insert_team_matches_data(response, league_id, season_id, team_id):
-                match_count = len(response.get('data', []))
-                total_matches += match_count
-                successful_combinations += 1
-                data_available_combinations += 1
-                print(f"   ✅ Successfully processed {match_count} matches")
-            else:
-                print(f"   ❌ Failed to insert team matches data")
                 
+                # Insert data
+                if insert_team_matches_data(response, league_id, season_id, team_id, ledger):
+                    match_count = len(response.get('data', []))
+                    total_matches += match_count
+                    successful_calls += 1
+                    print(f"   ✅ Successfully processed {match_count} matches for team {team_id}")
+                else:
+                    print(f"   ❌ Failed to insert team matches data for team {team_id}")
+                    failed_calls += 1
+                    
+            except Exception as e:
+                print(f"   ❌ Error processing league {league_id}, season {season_id}, team {team_id}: {e}")
+                failed_calls += 1
+            finally:
+                # Matches and ledger entry are committed by now
+                claims.release(unit)
+    
+    # Derive the opponent perspective and league scores in SQL
+    total_mirrored = 0
+    total_scored = 0
+    for league_id, season_id in seasons:
+        try:
+            mirrored, scored = derive_team_match_perspectives(league_id, season_id)
+            total_mirrored += mirrored
+            total_scored += scored
         except Exception as e:
-            print(f"   ❌ Error processing league {league_id}, season {season_id}, team {team_id}: {e}")
+            print(f"   ❌ Error deriving perspectives for league {league_id}, season {season_id}: {e}")
+    
+    # Seasons now complete and verified are never planned again
+    registry.finalize(list(seasons))
     
     # Summary
     print(f"\n📊 Collection Summary:")
-    print(f"   - Successful combinations: {successful_combinations}/{len(team_combinations)}")
-    print(f"   - Data available combinations: {data_available_combinations}/{len(team_combinations)}")
+    print(f"   - Team calls: {successful_calls}/{planned_calls} successful")
+    print(f"   - Claimed by other runs: {claimed_elsewhere}")
+    if deferred:
+        print(f"   - Deferred by the run budget: {deferred}")
     print(f"   - Total matches collected: {total_matches}")
+    print(f"   - Mirrored team match rows: {total_mirrored}")
+    print(f"   - League match scores filled: {total_scored}")
     
-    # Return True if we have data for any combination (either existing or newly collected)
-    if data_available_combinations > 0:
+    # Return True unless every planned call failed
+    if planned_calls == 0 or successful_calls > 0 or claimed_elsewhere > 0 or deferred > 0:
         print("✅ Team matches data collection completed successfully!")
         return True
     else:
@@ -373,9 +686,17 @@ def load_team_matches_data(league_ids: Optional[List[int]] = None,
         return False
 
 if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Load Team Matches Data")
+    parser.add_argument("--profile", action="store_true",
+                        help="Sample CPU and allocations and write flamegraph files (see the profiling config block)")
+    args = parser.parse_args()
+    
     # Test the function
-    success = load_team_matches_data()
+    with profiled("load_team_matches_data", args.profile):
+        success = load_team_matches_data()
     if success:
         print("\n🎉 Test completed successfully!")
     else:
-        print("\n❌ Test failed!") 
\ No newline at end of file
+        print("\n❌ Test failed!") 
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""
+Team Season Stats Loader
+Loads /team-season-stats, one call per league-season covering every team,
+into staging.team_season_stats: one row per team, with a typed column per
+known stat and the rest in extra_stats.
+
+A league-season whose last fixture is in the past and whose rows are
+already stored is never fetched again, so a finished season costs one call.
+"""
+
+import os
+import sys
+import json
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple
+from dotenv import load_dotenv
+
+# Add src to path
+sys.path.append('src')
+
+from api.fbr_client import FBRClient
+from api.endpoint_config import TableMapping
+from utils.collection_ledger import CollectionLedger, load_collection_ledger
+from utils.endpoint_blacklist import EndpointBlacklist, load_endpoint_blacklist
+from utils.league_catalog import LeagueCatalog, load_league_catalog
+from utils.work_claims import ClaimOutcome, WorkClaims, WorkUnit, load_work_claims
+from utils.db import connect
+from utils.progress import get_progress_reporter
+from utils.tracing import traced
+from utils.profiling import profiled
+from etl.loader_engine import upsert_rows
+from etl.load_league_season_details_data import get_league_season_combinations
+from etl.load_player_match_stats_data import to_number
+
+ENDPOINT = "team-season-stats"
+
+# Stat columns: (API key, column, type); keys are unique across the stats categories
+TEAM_STATS = [
+    # flat format
+    ('position', 'position', 'int'), ('played', 'played', 'int'), ('won', 'won', 'int'),
+    ('drawn', 'drawn', 'int'), ('lost', 'lost', 'int'), ('goals_for', 'goals_for', 'int'),
+    ('goals_against', 'goals_against', 'int'), ('goal_difference', 'goal_difference', 'int'),
+    ('points', 'points', 'int'), ('expected_goals', 'expected_goals', 'num'),
+    ('expected_goals_against', 'expected_goals_against', 'num'),
+    ('clean_sheets', 'clean_sheets', 'int'), ('failed_to_score', 'failed_to_score', 'int'),
+    # stats, shooting and passing categories
+    ('roster_size', 'roster_size', 'int'), ('matches_played', 'matches_played', 'int'),
+    ('ttl_sh', 'ttl_sh', 'int'), ('ttl_sot', 'ttl_sot', 'int'),
+    ('ttl_pass_cmp', 'ttl_pass_cmp', 'int'), ('pct_pass_cmp', 'pct_pass_cmp', 'num'),
+]
+
+TEAMS_TABLE = TableMapping(
+    table="staging.team_season_stats",
+    record_path="data",
+    columns={column: column for column in
+             ['league_id', 'season_id', 'team_id', 'team_name']
+             + [column for _, column, _ in TEAM_STATS] + ['extra_stats']},
+    conflict_keys=['league_id', 'season_id', 'team_id'],
+    raw_payload=False  # every stat is a column or in extra_stats
+)
+
+# API key -> (position in the stat columns, type)
+TEAM_INDEX = {key: (i, column_type) for i, (key, _, column_type) in enumerate(TEAM_STATS)}
+
+# Team fields of the flat response format, which carries its stats at the top level
+TEAM_FIELDS = {'team', 'team_id', 'team_name', 'meta_data', 'stats'}
+
+def team_stats(record: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Dict[str, Any]]]:
+    """
+    Team meta data and stats by category from a response record
+
+    Handles both the nested format ({"meta_data": {...}, "stats": {category:
+    {stat: value}}}) and the flat one (team fields and stats side by side,
+    kept under the "stats" category).
+
+    Returns:
+        Tuple of (meta data, {category: {stat: value}})
+    """
+    if isinstance(record.get('stats'), dict):
+        meta = record.get('meta_data') or record
+        categories = {category: values for category, values in record['stats'].items() if isinstance(values, dict)}
+    else:
+        meta = record
+        categories = {'stats': {key: value for key, value in record.items() if key not in TEAM_FIELDS}}
+    return meta, categories
+
+def extract_team_season_stats(data: List[Dict[str, Any]], league_id: int, season_id: str) -> List[Tuple]:
+    """
+    Team rows of a /team-season-stats response
+
+    Args:
+        data: Response records, one per team
+        league_id: League ID of the call
+        season_id: Season ID of the call
+
+    Returns:
+        Row tuples in TEAMS_TABLE column order; a later record for the same team replaces an earlier one
+    """
+    teams: Dict[str, Tuple] = {}
+    for record in data:
+        meta, categories = team_stats(record)
+        team_id = meta.get('team_id')
+        if not team_id:
+            continue
+        stats: List[Any] = [None] * len(TEAM_STATS)
+        extra: Dict[str, Dict[str, Any]] = {}
+        for category, values in categories.items():
+            for key, value in values.items():
+                position = TEAM_INDEX.get(key)
+                if position is None:
+                    extra.setdefault(category, {})[key] = value
+                else:
+                    stats[position[0]] = to_number(value, position[1])
+        teams[team_id] = (league_id, season_id, team_id, meta.get('team_name') or meta.get('team'),
+                          *stats, json.dumps(extra) if extra else None)
+    return list(teams.values())
+
+@traced("db.team_season_stats_state")
+def season_state(league_seasons: List[Tuple[int, str]],
+                 database_url: Optional[str] = None) -> Tuple[Set[Tuple[int, str]], Dict[Tuple[int, str], date]]:
+    """
+    League-seasons with stored team stats and the date of each season's last fixture
+
+    The last fixture is league_season_details.league_end where known, else
+    the latest stored league match (which can be early for cups whose later
+    rounds are not drawn yet).
+
+    Returns:
+        Tuple of (pairs with rows, {pair: last fixture date}) for the given pairs
+    """
+    leagues = sorted({league_id for league_id, _ in league_seasons})
+    with connect(database_url) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT DISTINCT league_id, season_id FROM staging.team_season_stats WHERE league_id = ANY(%s)
+            """, (leagues,))
+            present = {(league_id, season_id) for league_id, season_id in cur.fetchall()}
+            cur.execute("""
+                SELECT league_id, season_id, MAX(match_date)
+                FROM staging.league_matches
+                WHERE league_id = ANY(%s) AND match_date IS NOT NULL
+                GROUP BY league_id, season_id
+            """, (leagues,))
+            last_fixtures = {(league_id, season_id): last for league_id, season_id, last in cur.fetchall()}
+            cur.execute("""
+                SELECT league_id, season_id, league_end
+                FROM staging.league_season_details
+                WHERE league_id = ANY(%s) AND league_end IS NOT NULL
+            """, (leagues,))
+            last_fixtures.update({(league_id, season_id): end for league_id, season_id, end in cur.fetchall()})
+    pairs = set(league_seasons)
+    return present & pairs, {pair: last for pair, last in last_fixtures.items() if pair in pairs}
+
+def load_team_season_stats_data(league_ids: Optional[List[int]] = None,
+                                season_ids: Optional[List[str]] = None,
+                                time_period: Optional[str] = None,
+                                league_seasons: Optional[List[Tuple[int, str]]] = None,
+                                ledger: Optional[CollectionLedger] = None,
+                                claims: Optional[WorkClaims] = None,
+                                blacklist: Optional[EndpointBlacklist] = None,
+                                catalog: Optional[LeagueCatalog] = None) -> bool:
+    """
+    Load team season stats, one call per league-season
+
+    A league-season is skipped when it is over and its rows are stored, or
+    when the ledger has a complete fetch of it. A season is over when the
+    league catalog does not list it as current and its last fixture
+    (league_end, else the latest stored match) is in the past.
+
+    Args:
+        league_ids: List of league IDs to collect (None for all)
+        season_ids: List of season IDs to collect (None for all)
+        time_period: Time period filter (e.g., "2024", "2020s")
+        league_seasons: Exact (league_id, season_id) pairs (None = from league_seasons with the filters above)
+        ledger: Preloaded collection ledger (None = load it here)
+        claims: Work claims shared with concurrent runs (None = process-wide claims)
+        blacklist: Endpoint blacklist (None = load it)
+        catalog: League catalog for current seasons (None = load it here)
+
+    Returns:
+        bool: True if successful, False otherwise
+    """
+    load_dotenv()
+    database_url = os.getenv('DATABASE_URL')
+    if league_seasons is None:
+        league_seasons = [(combo['league_id'], combo['season_id'])
+                          for combo in get_league_season_combinations(league_ids, season_ids, time_period)]
+    if not league_seasons:
+        print("❌ No league-season combinations found")
+        return False
+    print(f"🏈 Loading Team Season Stats for {len(league_seasons)} league-seasons")
+
+    ledger = ledger if ledger is not None else load_collection_ledger([ENDPOINT], database_url)
+    claims = claims or load_work_claims(database_url)
+    blacklist = blacklist or load_endpoint_blacklist()
+    catalog = catalog or load_league_catalog(database_url)
+    try:
+        present, last_fixtures = season_state(league_seasons, database_url)
+    except Exception as e:
+        print(f"⚠️ Error reading stored team season stats: {e}")
+        present, last_fixtures = set(), {}
+
+    def finished(league_id: int, season_id: str) -> bool:
+        """Whether a league-season is over: not the current season, and its last fixture is in the past"""
+        if catalog.is_current_season(league_id, season_id):
+            return False
+        last = last_fixtures.get((league_id, season_id))
+        return last is None or last < date.today()
+
+    client = FBRClient()
+    fetched = failed = skipped = blacklisted = claimed_elsewhere = deferred = rows = 0
+    started = time.monotonic()
+
+    for league_id, season_id in league_seasons:
+        params = {'league_id': league_id, 'season_id': season_id}
+        if blacklist.is_blacklisted(ENDPOINT, **params):
+            blacklisted += 1
+            continue
+        if ((league_id, season_id) in present and finished(league_id, season_id)) \
+                or not ledger.needs_fetch(ENDPOINT, **params):
+            skipped += 1
+            continue
+
+        unit = WorkUnit.of(ENDPOINT, **params)
+        outcome = claims.claim(unit, ledger)
+        if outcome is ClaimOutcome.DEFERRED:
+            deferred += 1
+            continue
+        if not outcome:
+            claimed_elsewhere += 1
+            continue
+        try:
+            print(f"\n📊 Fetching team season stats for league {league_id}, season {season_id}...")
+            response = client.get_team_season_stats(league_id, season_id)
+            if 'error' in response:
+                print(f"   ❌ API Error: {response['error']}")
+                ledger.record(ENDPOINT, params, 'error', error_message=str(response['error']))
+                failed += 1
+                continue
+
+            teams = extract_team_season_stats(response.get('data') or [], league_id, season_id)
+            with connect(database_url) as conn:
+                with conn.cursor() as cur:
+                    written = upsert_rows(cur, TEAMS_TABLE, teams)
+                    # Final once the season is over: with its rows stored it is never fetched again
+                    ledger.record(ENDPOINT, params, 'ok' if teams else 'empty',
+                                  data=[team[2] for team in teams],
+                                  complete=bool(teams) and finished(league_id, season_id), cur=cur)
+            get_progress_reporter().rows_written(written)
+            fetched += 1
+            rows += written
+            print(f"   ✅ {len(teams)} teams")
+        except Exception as e:
+            print(f"   ❌ Error loading team season stats for league {league_id}, season {season_id}: {e}")
+            failed += 1
+        finally:
+            claims.release(unit)
+
+    print(f"\n📊 Collection Summary ({ENDPOINT}):")
+    print(f"   Successful: {fetched}")
+    print(f"   Errors: {failed}")
+    print(f"   Already final: {skipped}")
+    print(f"   Blacklisted: {blacklisted}")
+    if claimed_elsewhere:
+        print(f"   Claimed by other runs: {claimed_elsewhere}")
+    if deferred:
+        print(f"   Deferred by the run budget: {deferred}")
+    print(f"   Rows written: {rows} in {time.monotonic() - started:.1f}s")
+
+    if fetched > 0 or failed == 0:
+        print("✅ Team season stats collection completed successfully!")
+        return True
+    print("❌ No data was collected successfully")
+    return False
+
+def main():
+    """Main CLI function"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Load Team Season Stats Data")
+    parser.add_argument("--league-ids", help="Comma-separated list of league IDs")
+    parser.add_argument("--season-ids", help="Comma-separated list of season IDs")
+    parser.add_argument("--time-period", help="Time period filter (e.g., 2024, 2020s)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Sample CPU and allocations and write flamegraph files (see the profiling config block)")
+
+    args = parser.parse_args()
+
+    league_ids = [int(x.strip()) for x in args.league_ids.split(",")] if args.league_ids else None
+    season_ids = [x.strip() for x in args.season_ids.split(",")] if args.season_ids else None
+
+    with profiled("load_team_season_stats_data", args.profile):
+        success = load_team_season_stats_data(
+            league_ids=league_ids,
+            season_ids=season_ids,
+            time_period=args.time_period
+        )
+
+    return 0 if success else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+#!/usr/bin/env python3
+"""
+Loader Engine
+Shared fetch → extract → bulk upsert path for endpoints that declare a
+LoaderSpec in api/endpoint_config.py. Handles the fan-out of calls, the
+blacklist, the collection ledger and work claims, skip-if-present checks,
+type coercion, execute_values upserts and per-endpoint metrics.
+"""
+
+import os
+import sys
+import json
+import time
+import psycopg2.extras
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from dotenv import load_dotenv
+
+# Add src to path
+sys.path.append('src')
+
+from api.fbr_client import FBRClient
+from api.endpoint_config import LoaderSpec, TableMapping, get_endpoint_config
+from utils.collection_config import load_collection_config
+from utils.raw_payloads import raw_payload
+from utils.endpoint_blacklist import EndpointBlacklist, load_endpoint_blacklist
+from utils.collection_ledger import CollectionLedger, load_collection_ledger
+from utils.work_claims import ClaimOutcome, WorkClaims, WorkUnit, load_work_claims
+from utils.db import connect
+from utils.progress import get_progress_reporter
+from utils.tracing import get_tracer, traced
+
+@dataclass
+class LoaderMetrics:
+    """Outcome counts of one run_loader call"""
+    endpoint: str
+    planned: int = 0
+    fetched: int = 0
+    empty: int = 0
+    errors: int = 0
+    final: int = 0
+    present: int = 0
+    blacklisted: int = 0
+    claimed_elsewhere: int = 0
+    deferred: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+    @property
+    def succeeded(self) -> bool:
+        """Whether anything was loaded, or nothing was left to load"""
+        return self.fetched > 0 or (self.errors == 0 and self.planned > 0)
+
+    def print_summary(self):
+        """Print the collection summary"""
+        print(f"\n📊 Collection Summary ({self.endpoint}):")
+        print(f"   Successful: {self.fetched} ({self.empty} empty)")
+        print(f"   Errors: {self.errors}")
+        print(f"   Already final: {self.final}")
+        if self.present:
+            print(f"   Already present: {self.present}")
+        print(f"   Blacklisted: {self.blacklisted}")
+        if self.claimed_elsewhere:
+            print(f"   Claimed by other runs: {self.claimed_elsewhere}")
+        if self.deferred:
+            print(f"   Deferred by the run budget: {self.deferred}")
+        print(f"   Rows written: {self.rows} in {self.seconds:.1f}s")
+        print(f"   Total Processed: {self.planned}")
+
+def coerce(value: Any, column_type: Optional[str]) -> Any:
+    """
+    Convert an API value to its column type
+
+    Empty strings and unparseable values become NULL; untyped values are
+    stored as they come.
+    """
+    if column_type is None:
+        return value
+    if value == "" or value is None:
+        return None
+    try:
+        if column_type == 'int':
+            return int(value)
+        if column_type == 'date':
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        if column_type == 'time':
+            return datetime.strptime(value, '%H:%M').time()
+        if column_type == 'json':
+            return json.dumps(value)
+    except (ValueError, TypeError):
+        return None
+    raise ValueError(f"Unknown column type: {column_type}")
+
+def lookup(record: Any, path: str) -> Any:
+    """Value at a dotted path of a JSON object (None if any step is missing)"""
+    for key in path.split('.'):
+        if not isinstance(record, dict):
+            return None
+        record = record.get(key)
+    return record
+
+def iter_records(data: Any, record_path: str) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    """
+    Walk a response to its records
+
+    Yields:
+        (record, parent) pairs; parent is the element fanned out over last
+    """
+    def walk(node: Any, segments: List[str], parent: Dict[str, Any]):
+        if not segments:
+            for record in node if isinstance(node, list) else [node]:
+                if isinstance(record, dict):
+                    yield record, parent
+            return
+        segment, rest = segments[0], segments[1:]
+        fan_out = segment.endswith('[]')
+        node = node.get(segment[:-2] if fan_out else segment) if isinstance(node, dict) else None
+        if node is None:
+            return
+        if fan_out:
+            for element in node if isinstance(node, list) else [node]:
+                yield from walk(element, rest, element if isinstance(element, dict) else parent)
+        else:
+            yield from walk(node, rest, parent)
+    yield from walk(data, record_path.split('.'), {})
+
+def extract_rows(mapping: TableMapping, data: Dict[str, Any], params: Dict[str, Any]) -> List[Tuple]:
+    """
+    Build the row tuples of one table from a response
+
+    Rows are in mapping.columns order, followed by the raw payload when
+    mapping.raw_payload is set. Records missing a required column are
+    dropped, and a later record replaces an earlier one with the same
+    conflict key (one statement cannot update a row twice).
+    """
+    columns = list(mapping.columns)
+    key_positions = [columns.index(key) for key in mapping.conflict_keys]
+    required_positions = [columns.index(column) for column in mapping.required]
+    rows: Dict[Tuple, Tuple] = {}
+    for record, parent in iter_records(data, mapping.record_path):
+        values = []
+        for column, source in mapping.columns.items():
+            if source.startswith('@'):
+                value = params.get(source[1:])
+            elif source.startswith('^'):
+                value = lookup(parent, source[1:])
+            else:
+                value = lookup(record, source)
+            values.append(coerce(value, mapping.column_types.get(column)))
+        if any(values[position] in (None, "") for position in required_positions):
+            continue
+        if mapping.raw_payload:
+            values.append(raw_payload(record))
+        row = tuple(values)
+        rows[tuple(row[position] for position in key_positions)] = row
+    return list(rows.values())
+
+@traced("db.bulk_upsert")
+def upsert_rows(cur, mapping: TableMapping, rows: List[Tuple], page_size: Optional[int] = None) -> int:
+    """
+    Upsert rows built by extract_rows with execute_values
+
+    Args:
+        cur: Cursor to write with, committed by the caller
+        mapping: Target table mapping
+        rows: Row tuples
+        page_size: Rows per INSERT statement (None = defaults.upsert_page_size)
+
+    Returns:
+        int: Number of rows written
+    """
+    if not rows:
+        return 0
+    columns = list(mapping.columns) + (['raw_data_hash'] if mapping.raw_payload else [])
+    template = "(" + ", ".join(
+        "staging.store_raw_payload(%s::jsonb)" if column == 'raw_data_hash' else "%s"
+        for column in columns
+    ) + ")"
+    updates = mapping.update_columns or [column for column in columns if column not in mapping.conflict_keys]
+    conflict = f"({', '.join(mapping.conflict_keys)})"
+    if mapping.conflict_where:
+        conflict += f" WHERE {mapping.conflict_where}"
+    set_clause = ",\n                ".join(f"{column} = EXCLUDED.{column}" for column in updates)
+    psycopg2.extras.execute_values(cur, f"""
+        INSERT INTO {mapping.table} ({', '.join(columns)})
+        VALUES %s
+        ON CONFLICT {conflict} DO UPDATE SET
+                {set_clause},
+                updated_at = CURRENT_TIMESTAMP
+    """, rows, template=template,
+        page_size=page_size or load_collection_config().defaults.get('upsert_page_size', 500))
+    return len(rows)
+
+def param_columns(mapping: TableMapping) -> Dict[str, str]:
+    """Call parameters a table stores, with their columns"""
+    return {source[1:]: column for column, source in mapping.columns.items() if source.startswith('@')}
+
+@traced("db.fan_out")
+def fan_out(spec: LoaderSpec, database_url: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Call parameters from the spec's fan-out query (one dict per call)"""
+    if not spec.fan_out_query:
+        return []
+    with connect(database_url) as conn:
+        with conn.cursor() as cur:
+            cur.execute(spec.fan_out_query)
+            names = [column[0] for column in cur.description]
+            return [dict(zip(names, row)) for row in cur.fetchall()]
+
+@traced("db.present_params")
+def present_params(spec: LoaderSpec, database_url: Optional[str] = None) -> Set[Tuple]:
+    """Call parameter tuples (sorted by name) that already have rows in the spec's first table"""
+    columns = param_columns(spec.tables[0])
+    if not columns:
+        return set()
+    names = sorted(columns)
+    with connect(database_url) as conn:
+        with conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT DISTINCT {', '.join(columns[name] for name in names)}
+                FROM {spec.tables[0].table}
+            """)
+            return {tuple(row) for row in cur.fetchall()}
+
+def is_final(spec: LoaderSpec, data: Dict[str, Any]) -> bool:
+    """Whether a response is final (its final_after date has passed)"""
+    if not spec.final_after:
+        return False
+    final_date = coerce(lookup(data, spec.final_after), 'date')
+    return final_date is not None and final_date < date.today()
+
+def run_loader(endpoint_name: str, calls: Optional[List[Dict[str, Any]]] = None,
+               client: Optional[FBRClient] = None,
+               blacklist: Optional[EndpointBlacklist] = None,
+               ledger: Optional[CollectionLedger] = None,
+               claims: Optional[WorkClaims] = None,
+               skip_present: Optional[bool] = None,
+               verbose: bool = False) -> LoaderMetrics:
+    """
+    Load an endpoint through its LoaderSpec
+
+    Each call is skipped if blacklisted, final in the ledger, claimed by
+    another run or (with skip_present) already stored. Otherwise it is
+    fetched and its rows and ledger entry are written in one transaction.
+
+    Args:
+        endpoint_name: ENDPOINT_CONFIGS key (e.g. "teams")
+        calls: Call parameters, one dict per call (None = the spec's fan-out query)
+        client: FBR client (None = create one)
+        blacklist: Endpoint blacklist (None = load it)
+        ledger: Preloaded collection ledger (None = load it here)
+        claims: Work claims shared with concurrent runs (None = process-wide claims)
+        skip_present: Skip calls that already have rows (None = spec.skip_if_present)
+        verbose: Enable verbose logging
+
+    Returns:
+        LoaderMetrics of the run
+
+    Raises:
+        ValueError: If the endpoint has no LoaderSpec
+    """
+    config = get_endpoint_config(endpoint_name)
+    if config is None or config.loader is None:
+        raise ValueError(f"Endpoint '{endpoint_name}' has no loader spec")
+    spec = config.loader
+    endpoint = config.path.strip('/')
+    started = time.monotonic()
+
+    load_dotenv()
+    database_url = os.getenv('DATABASE_URL')
+    client = client or FBRClient()
+    blacklist = blacklist or load_endpoint_blacklist()
+    if ledger is None:
+        ledger = load_collection_ledger([endpoint])
+    claims = claims or load_work_claims()
+
+    if calls is None:
+        calls = fan_out(spec, database_url)
+    metrics = LoaderMetrics(endpoint=endpoint, planned=len(calls))
+
+    present: Set[Tuple] = set()
+    if spec.skip_if_present if skip_present is None else skip_present:
+        present = present_params(spec, database_url)
+
+    tracer = get_tracer()
+    for i, params in enumerate(calls, 1):
+        if verbose:
+            print(f"   [{i}/{len(calls)}] {endpoint} {params}")
+
+        if blacklist.is_blacklisted(endpoint, **params):
+            metrics.blacklisted += 1
+            continue
+        if not ledger.needs_fetch(endpoint, **params):
+            metrics.final += 1
+            continue
+        if present and tuple(params.get(name) for name in sorted(param_columns(spec.tables[0]))) in present:
+            metrics.present += 1
+            continue
+
+        unit = WorkUnit.of(endpoint, **params)
+        outcome = claims.claim(unit, ledger)
+        if outcome is ClaimOutcome.DEFERRED:
+            metrics.deferred += 1
+            continue
+        if not outcome:
+            metrics.claimed_elsewhere += 1
+            continue
+
+        try:
+            response = client.get_endpoint(endpoint, unit.params)
+            if "error" in response:
+                if verbose:
+                    print(f"      ❌ API Error: {response['error']}")
+                ledger.record(endpoint, params, 'error', error_message=str(response['error']))
+                metrics.errors += 1
+                continue
+
+            with tracer.span("extract", endpoint=endpoint):
+                table_rows = [(mapping, extract_rows(mapping, response, params)) for mapping in spec.tables]
+            written = 0
+            with connect(database_url) as conn:
+                with conn.cursor() as cur:
+                    for mapping, rows in table_rows:
+                        written += upsert_rows(cur, mapping, rows)
+                    records = [record for record, _ in iter_records(response, spec.tables[0].record_path)]
+                    ledger.record(endpoint, params, 'ok' if written else 'empty', data=records,
+                                  complete=is_final(spec, response), cur=cur)
+            get_progress_reporter().rows_written(written)
+            metrics.fetched += 1
+            metrics.rows += written
+            if not written:
+                metrics.empty += 1
+            if verbose:
+                print(f"      ✅ Stored {written} rows")
+        except Exception as e:
+            metrics.errors += 1
+            print(f"   ❌ Error loading {endpoint} {params}: {e}")
+        finally:
+            claims.release(unit)
+
+    metrics.seconds = time.monotonic() - started
+    return metrics
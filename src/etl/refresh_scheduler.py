@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Fixture-Aware Refresh Scheduler
+Re-fetches league-seasons in progress when their matches finish instead of on
+a fixed cron: sleeps until the earliest league-season whose results are due,
+fetches it, and plans again
+
+Usage:
+    python3 src/etl/refresh_scheduler.py --scope european_majors_2020s
+    python3 src/etl/refresh_scheduler.py --scope european_majors_2020s --scope english_football --once
+    python3 src/etl/refresh_scheduler.py --scope european_majors_2020s --dry-run
+"""
+
+import sys
+import time
+import argparse
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+# Add src to path
+sys.path.append('src')
+
+from utils.collection_config import load_collection_config
+from utils.collection_ledger import CollectionLedger
+from utils.crawl_planner import CrawlPlanner, scope_time_period
+from utils.refresh_schedule import RefreshSlot, build_refresh_schedule, load_refresh_schedule_settings
+from utils.work_claims import load_work_claims
+from etl.load_league_matches_data import load_league_matches_data
+from etl.load_team_matches_data import load_team_matches_data
+
+def plan_refresh(scope_names: List[str], time_period: Optional[str] = None) -> Tuple[List[RefreshSlot], CrawlPlanner]:
+    """
+    Schedule every incomplete league-season of the scopes
+
+    Args:
+        scope_names: Collection scope names
+        time_period: Time period for scopes without their own
+
+    Returns:
+        Tuple of (slots sorted by due time, planner holding the loaded ledger)
+
+    Raises:
+        ValueError: If a scope does not exist
+    """
+    config = load_collection_config()
+    planner = CrawlPlanner()
+    league_seasons = []
+    for scope_name in scope_names:
+        scope = config.get_scope(scope_name)
+        if not scope:
+            raise ValueError(f"Scope '{scope_name}' not found")
+        stage = planner.plan_league_matches(planner.scope_league_ids(scope), scope_time_period(scope, time_period))
+        for unit in stage.units:
+            pair = (unit.params['league_id'], unit.params['season_id'])
+            if pair not in league_seasons:
+                league_seasons.append(pair)
+    return build_refresh_schedule(league_seasons, planner.ledger, catalog=planner.catalog), planner
+
+def refresh_slot(slot: RefreshSlot, ledger: CollectionLedger) -> bool:
+    """Fetch a due league-season's matches, then the team matches that complete its results"""
+    claims = load_work_claims()
+    success = load_league_matches_data(
+        league_ids=[slot.league_id],
+        season_ids=[slot.season_id],
+        ledger=ledger,
+        claims=claims
+    )
+    if success:
+        success = load_team_matches_data(
+            league_ids=[slot.league_id],
+            season_ids=[slot.season_id],
+            ledger=ledger,
+            claims=claims
+        )
+    return success
+
+def print_schedule(slots: List[RefreshSlot], now: datetime, limit: int = 20):
+    """Print the next slots with their due times"""
+    print(f"\n📅 Refresh schedule ({len(slots)} league-seasons, now {now:%Y-%m-%d %H:%M} UTC)")
+    print("=" * 50)
+    if not slots:
+        print("  (nothing to wait for)")
+    for slot in slots[:limit]:
+        when = "due now" if slot.is_due(now) else f"{slot.due_at:%Y-%m-%d %H:%M}"
+        print(f"  League {slot.league_id}, season {slot.season_id}: {when} ({slot.reason})")
+    if len(slots) > limit:
+        print(f"  ... and {len(slots) - limit} more")
+
+def run_scheduler(scope_names: List[str], time_period: Optional[str] = None,
+                  once: bool = False, dry_run: bool = False) -> int:
+    """
+    Refresh league-seasons as they come due until stopped
+
+    Args:
+        scope_names: Collection scope names
+        time_period: Time period for scopes without their own
+        once: Refresh what is due now and exit (for cron)
+        dry_run: Print the schedule and exit
+
+    Returns:
+        int: Number of league-seasons refreshed
+    """
+    settings = load_refresh_schedule_settings()
+    refreshed = 0
+    print(f"⏰ Refresh scheduler started for {', '.join(scope_names)}")
+
+    try:
+        while True:
+            slots, planner = plan_refresh(scope_names, time_period)
+            now = datetime.now(timezone.utc)
+            due = [slot for slot in slots if slot.is_due(now)]
+
+            if dry_run:
+                print_schedule(slots, now)
+                break
+
+            for slot in due:
+                print(f"\n🔄 League {slot.league_id}, season {slot.season_id}: {slot.reason}")
+                if not refresh_slot(slot, planner.ledger):
+                    print(f"⚠️ Refresh of league {slot.league_id}, season {slot.season_id} failed")
+                refreshed += 1
+
+            if once:
+                break
+
+            # Fetches change the schedule; plan again once the earliest slot is due
+            now = datetime.now(timezone.utc)
+            upcoming = [slot.due_at for slot in slots if slot not in due]
+            wake = min(upcoming + [now + settings.max_sleep])
+            sleep_seconds = max(settings.min_sleep.total_seconds(), (wake - now).total_seconds())
+            print(f"😴 Sleeping {sleep_seconds / 60:.0f} minutes "
+                  f"(next due {wake:%Y-%m-%d %H:%M} UTC)")
+            time.sleep(sleep_seconds)
+
+    except KeyboardInterrupt:
+        print("\n🛑 Scheduler stopped")
+
+    print(f"⏰ Refreshed {refreshed} league-seasons")
+    return refreshed
+
+def main():
+    """Main CLI function"""
+    parser = argparse.ArgumentParser(description="Fixture-aware refresh scheduler")
+    parser.add_argument("--scope", action="append", required=True,
+                        help="Scope to keep fresh (repeat for several scopes)")
+    parser.add_argument("--time-period", help="Time period for scopes without their own")
+    parser.add_argument("--once", action="store_true", help="Refresh what is due now and exit")
+    parser.add_argument("--dry-run", action="store_true", help="Print the schedule without fetching")
+
+    args = parser.parse_args()
+
+    try:
+        run_scheduler(args.scope, args.time_period, args.once, args.dry_run)
+        return 0
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,6 +17,15 @@ sys.path.append('src')
 
 from api.fbr_client import FBRClient
 from utils.collection_config import load_collection_config
+from utils.league_diff import LeagueDiff, fetch_league_diff
+from utils.league_catalog import load_league_catalog
+from utils.crawl_planner import scope_time_period
+from utils.change_set import ChangeSet, known_seasons, league_changes, match_changes, season_changes
+from etl.load_countries_data import load_countries_data
+from etl.load_leagues_data import load_leagues_data
+from etl.load_league_seasons_data import load_league_seasons_data
+from etl.load_league_matches_data import load_league_matches_data
+from etl.load_team_matches_data import get_completed_league_matches, load_team_matches_data
 
 class SmartCascadingCollector:
     """Smart cascading data collector that checks database freshness"""
@@ -26,6 +35,8 @@ class SmartCascadingCollector:
         load_dotenv()
         self.database_url = os.getenv("DATABASE_URL")
         self.client = FBRClient()
+        self.league_freshness = load_collection_config().defaults.get('league_freshness', 'per_country')
+        self._league_diff: Optional[LeagueDiff] = None
         
         if not self.database_url:
             raise ValueError("DATABASE_URL not found in .env file")
@@ -69,6 +80,43 @@ class SmartCascadingCollector:
         """
         Check if leagues data is fresh by comparing last_season field
         
+        Uses one /leagues call per country, unless defaults.league_freshness is
+        set to global (one unfiltered call per run, which only sees leagues
+        already stored, since its leagues carry no country).
+        
+        Returns:
+            Tuple[bool, List[Dict]]: (is_fresh, leagues_needing_update)
+        """
+        if self.league_freshness != 'global':
+            return self.check_leagues_freshness_per_country(country_codes)
+        
+        print("🔍 Checking leagues freshness against the global league list...")
+        if self._league_diff is None:
+            self._league_diff = fetch_league_diff(self.client, self.database_url)
+            if self._league_diff is None:
+                print("⚠️ Falling back to per-country league checks")
+                self.league_freshness = 'per_country'
+                return self.check_leagues_freshness_per_country(country_codes)
+        
+        leagues_needing_update = self._league_diff.for_countries(country_codes)
+        for league in leagues_needing_update:
+            if league['db_last_season'] is None:
+                print(f"    ➕ New league found: {league['competition_name']} (ID: {league['league_id']})")
+            else:
+                print(f"    ⚠️ League {league['league_id']} ({league['competition_name']}) needs update")
+                print(f"      DB last_season: {league['db_last_season']}")
+                print(f"      API last_season: {league['api_last_season']}")
+        
+        if leagues_needing_update:
+            print(f"❌ {len(leagues_needing_update)} leagues need update")
+            return False, leagues_needing_update
+        print(f"✅ All leagues are fresh")
+        return True, []
+    
+    def check_leagues_freshness_per_country(self, country_codes: List[str]) -> Tuple[bool, List[Dict]]:
+        """
+        Check leagues freshness with one /leagues call per country
+        
         Returns:
             Tuple[bool, List[Dict]]: (is_fresh, leagues_needing_update)
         """
@@ -153,6 +201,11 @@ class SmartCascadingCollector:
     def collect_european_majors(self) -> bool:
         """
         Collect European majors data using smart cascading approach
+        
+        Each stage only runs on what the stage above changed: leagues whose
+        last_season moved load their seasons, new seasons load their
+        matches, and seasons with newly completed matches load the schedules
+        of the teams playing them.
         """
         print("🚀 Starting Smart European Majors Collection")
         print("=" * 50)
@@ -168,39 +221,73 @@ class SmartCascadingCollector:
         print(f"📋 Scope: {scope.name}")
         print(f"🌍 Countries: {', '.join(scope.countries)}")
         print(f"⏰ Time Period: {scope.time_period.description if scope.time_period else 'All time periods'}")
+        time_period = scope_time_period(scope)
         
         # Step 1: Check countries freshness
         countries_fresh, missing_countries = self.check_countries_freshness(scope.countries)
         
         if not countries_fresh:
             print(f"\n📡 Loading missing countries: {missing_countries}")
-            # TODO: Call countries loading function
-            # load_countries_data(country_codes=missing_countries)
+            if not load_countries_data(country_codes=missing_countries):
+                print("❌ Failed to load countries")
+                return False
         
         # Step 2: Check leagues freshness
         leagues_fresh, leagues_needing_update = self.check_leagues_freshness(scope.countries)
         
         if not leagues_fresh:
             print(f"\n📡 Updating {len(leagues_needing_update)} leagues...")
-            # TODO: Call leagues loading function
-            # load_leagues_data(country_codes=scope.countries)
+            if not load_leagues_data(country_codes=scope.countries):
+                print("❌ Failed to load leagues")
+                return False
         
-        # Step 3: Check if league seasons need refresh
-        if not leagues_fresh:
-            print(f"\n📡 League seasons may need refresh due to league updates...")
-            # TODO: Call league seasons loading function
-            # load_league_seasons_data(league_ids=[l['league_id'] for l in leagues_needing_update])
-        else:
+        catalog = load_league_catalog(self.database_url)
+        league_ids = catalog.league_ids_for_countries(scope.countries)
+        if scope.leagues:
+            league_ids = catalog.filter_by_names(league_ids, scope.leagues)
+        leagues = league_changes(leagues_needing_update, league_ids)
+        print(f"🔀 Changes {leagues.describe()}")
+        
+        # Step 3: Load seasons of changed leagues only
+        if not leagues:
             print(f"\n✅ League seasons are fresh (no league updates needed)")
+            print(f"\n🎉 Smart collection complete!")
+            return True
+        
+        print(f"\n📡 Loading seasons of {len(leagues.leagues)} changed leagues...")
+        before = known_seasons(catalog, leagues.league_ids)
+        if not load_league_seasons_data(league_ids=leagues.league_ids, time_period=time_period, catalog=catalog):
+            print("❌ Failed to load league seasons")
+            return False
+        seasons = season_changes(before, load_league_catalog(self.database_url), time_period)
+        print(f"🔀 Changes {seasons.describe()}")
+        
+        # Step 4: Load matches of new seasons only
+        if seasons:
+            print(f"\n📡 Loading matches of {len(seasons.league_seasons)} new league-seasons...")
+            if not load_league_matches_data(league_ids=seasons.league_ids, league_seasons=seasons.pairs):
+                print("❌ Failed to load league matches")
+                return False
+        
+        # Step 5: Load team schedules for newly completed matches only
+        matches = match_changes(
+            get_completed_league_matches(seasons.league_ids), seasons.pairs
+        ) if seasons else ChangeSet("league-matches")
+        print(f"🔀 Changes {matches.describe()}")
+        if matches:
+            print(f"\n📡 Loading team matches of {len(matches.teams)} affected teams...")
+            if not load_team_matches_data(league_ids=matches.league_ids, league_seasons=matches.pairs):
+                print("❌ Failed to load team matches")
+                return False
         
-        print(f"\n🎉 Smart collection analysis complete!")
+        print(f"\n🎉 Smart collection complete!")
         return True
 
 def main():
     """Main execution function"""
     try:
         collector = SmartCascadingCollector()
-        collector.collect_european_majors()
+        return collector.collect_european_majors()
     except Exception as e:
         print(f"❌ Error: {e}")
         return False
@@ -16,6 +16,7 @@ from dotenv import load_dotenv
 sys.path.append('src')
 
 from api.fbr_client import FBRClient
+from utils.raw_payloads import raw_payload
 
 def get_test_league_season_combinations() -> List[Dict[str, Any]]:
     """Get test league-season combinations from the database"""
@@ -90,15 +91,15 @@ def insert_league_season_details_data(data: Dict[str, Any]) -> bool:
                     'league_type': api_data.get('league_type'),
                     'has_adv_stats': api_data.get('has_adv_stats'),
                     'rounds': json.dumps(api_data.get('rounds', [])),
-                    'raw_data': json.dumps(data)
+                    'raw_data': raw_payload(data)
                 }
                 
                 # Insert with ON CONFLICT handling
                 cur.execute("""
                     INSERT INTO staging.league_season_details 
-                    (league_id, season_id, league_start, league_end, league_type, has_adv_stats, rounds, raw_data)
+                    (league_id, season_id, league_start, league_end, league_type, has_adv_stats, rounds, raw_data_hash)
                     VALUES (%(league_id)s, %(season_id)s, %(league_start)s, %(league_end)s, 
-                            %(league_type)s, %(has_adv_stats)s, %(rounds)s, %(raw_data)s)
+                            %(league_type)s, %(has_adv_stats)s, %(rounds)s, staging.store_raw_payload(%(raw_data)s::jsonb))
                     ON CONFLICT (league_id, season_id) 
                     DO UPDATE SET
                         league_start = EXCLUDED.league_start,
@@ -106,7 +107,7 @@ def insert_league_season_details_data(data: Dict[str, Any]) -> bool:
                         league_type = EXCLUDED.league_type,
                         has_adv_stats = EXCLUDED.has_adv_stats,
                         rounds = EXCLUDED.rounds,
-                        raw_data = EXCLUDED.raw_data,
+                        raw_data_hash = EXCLUDED.raw_data_hash,
                         updated_at = CURRENT_TIMESTAMP
                 """, insert_data)
                 
@@ -132,7 +133,7 @@ def verify_stored_data(league_id: int, season_id: str) -> bool:
                 # Get stored data
                 cur.execute("""
                     SELECT league_id, season_id, league_start, league_end, league_type, 
-                           has_adv_stats, rounds, raw_data
+                           has_adv_stats, rounds, staging.raw_payload(raw_data_hash) AS raw_data
                     FROM staging.league_season_details 
                     WHERE league_id = %s AND season_id = %s
                 """, (league_id, season_id))
@@ -16,6 +16,7 @@ from dotenv import load_dotenv
 sys.path.append('src')
 
 from api.fbr_client import FBRClient
+from utils.raw_payloads import raw_payload
 
 def get_test_league_season_combinations() -> List[Dict[str, Any]]:
     """Get test league_id + season_id combinations from database"""
@@ -94,7 +95,7 @@ def insert_league_standings_data(data: Dict[str, Any], league_id: int, season_id
                         'goal_difference': team_standing.get('goal_difference'),
                         'points': team_standing.get('points'),
                         'top_team_scorer': json.dumps(team_standing.get('top_team_scorer')) if team_standing.get('top_team_scorer') else None,
-                        'raw_data': json.dumps(team_standing)
+                        'raw_data': raw_payload(team_standing)
                     }
                     
                     # Insert with ON CONFLICT handling
@@ -102,11 +103,11 @@ def insert_league_standings_data(data: Dict[str, Any], league_id: int, season_id
                         INSERT INTO staging.league_standings 
                         (league_id, season_id, standings_type, position, team_id, team_name,
                          played, won, drawn, lost, goals_for, goals_against, goal_difference,
-                         points, top_team_scorer, raw_data)
+                         points, top_team_scorer, raw_data_hash)
                         VALUES (%(league_id)s, %(season_id)s, %(standings_type)s, %(position)s,
                                 %(team_id)s, %(team_name)s, %(played)s, %(won)s, %(drawn)s,
                                 %(lost)s, %(goals_for)s, %(goals_against)s, %(goal_difference)s,
-                                %(points)s, %(top_team_scorer)s, %(raw_data)s)
+                                %(points)s, %(top_team_scorer)s, staging.store_raw_payload(%(raw_data)s::jsonb))
                         ON CONFLICT (league_id, season_id, team_id) 
                         DO UPDATE SET
                             standings_type = EXCLUDED.standings_type,
@@ -121,7 +122,7 @@ def insert_league_standings_data(data: Dict[str, Any], league_id: int, season_id
                             goal_difference = EXCLUDED.goal_difference,
                             points = EXCLUDED.points,
                             top_team_scorer = EXCLUDED.top_team_scorer,
-                            raw_data = EXCLUDED.raw_data,
+                            raw_data_hash = EXCLUDED.raw_data_hash,
                             updated_at = CURRENT_TIMESTAMP
                     """, insert_data)
                 
@@ -5,7 +5,6 @@ Tests both league matches (no team_id) and team matches (with team_id) formats
 """
 
 import os
-import json
 import psycopg2
 from datetime import datetime
 from typing import Dict, Any, List, Optional, Tuple
@@ -15,6 +14,7 @@ from dotenv import load_dotenv
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from api.fbr_client import FBRClient
+from utils.raw_payloads import raw_payload
 
 def get_test_league_season_combinations() -> List[Tuple[int, str]]:
     """Get test league-season combinations from database or use fallbacks"""
@@ -143,7 +143,7 @@ def insert_league_matches_data(data: Dict[str, Any], league_id: int, season_id:
                 'venue': match.get('venue'),
                 'attendance': match.get('attendance'),
                 'referee': match.get('referee'),
-                'raw_data': json.dumps(match)
+                'raw_data': raw_payload(match)
             }
             
             # Insert with upsert
@@ -151,11 +151,11 @@ def insert_league_matches_data(data: Dict[str, Any], league_id: int, season_id:
                 INSERT INTO staging.league_matches (
                     match_id, league_id, season_id, match_date, match_time, round, wk,
                     home_team, home_team_id, away_team, away_team_id,
-                    home_team_score, away_team_score, venue, attendance, referee, raw_data
+                    home_team_score, away_team_score, venue, attendance, referee, raw_data_hash
                 ) VALUES (
                     %(match_id)s, %(league_id)s, %(season_id)s, %(match_date)s, %(match_time)s, 
                     %(round)s, %(wk)s, %(home_team)s, %(home_team_id)s, %(away_team)s, %(away_team_id)s,
-                    %(home_team_score)s, %(away_team_score)s, %(venue)s, %(attendance)s, %(referee)s, %(raw_data)s
+                    %(home_team_score)s, %(away_team_score)s, %(venue)s, %(attendance)s, %(referee)s, staging.store_raw_payload(%(raw_data)s::jsonb)
                 ) ON CONFLICT (league_id, season_id, match_id) 
                 DO UPDATE SET
                     match_date = EXCLUDED.match_date,
@@ -171,7 +171,7 @@ def insert_league_matches_data(data: Dict[str, Any], league_id: int, season_id:
                     venue = EXCLUDED.venue,
                     attendance = EXCLUDED.attendance,
                     referee = EXCLUDED.referee,
-                    raw_data = EXCLUDED.raw_data,
+                    raw_data_hash = EXCLUDED.raw_data_hash,
                     updated_at = CURRENT_TIMESTAMP
             """, insert_data)
             
@@ -242,7 +242,7 @@ def insert_team_matches_data(data: Dict[str, Any], league_id: int, season_id: st
                 'captain': match.get('captain'),
                 'attendance': match.get('attendance'),
                 'referee': match.get('referee'),
-                'raw_data': json.dumps(match)
+                'raw_data': raw_payload(match)
             }
             
             # Insert with upsert
@@ -250,11 +250,11 @@ def insert_team_matches_data(data: Dict[str, Any], league_id: int, season_id: st
                 INSERT INTO staging.team_matches (
                     match_id, league_id, season_id, team_id, match_date, match_time, round,
                     home_away, opponent, opponent_id, result, goals_for, goals_against,
-                    formation, captain, attendance, referee, raw_data
+                    formation, captain, attendance, referee, raw_data_hash
                 ) VALUES (
                     %(match_id)s, %(league_id)s, %(season_id)s, %(team_id)s, %(match_date)s, %(match_time)s, 
                     %(round)s, %(home_away)s, %(opponent)s, %(opponent_id)s, %(result)s, %(goals_for)s, %(goals_against)s,
-                    %(formation)s, %(captain)s, %(attendance)s, %(referee)s, %(raw_data)s
+                    %(formation)s, %(captain)s, %(attendance)s, %(referee)s, staging.store_raw_payload(%(raw_data)s::jsonb)
                 ) ON CONFLICT (league_id, season_id, match_id, team_id) 
                 DO UPDATE SET
                     match_date = EXCLUDED.match_date,
@@ -270,7 +270,7 @@ def insert_team_matches_data(data: Dict[str, Any], league_id: int, season_id: st
                     captain = EXCLUDED.captain,
                     attendance = EXCLUDED.attendance,
                     referee = EXCLUDED.referee,
-                    raw_data = EXCLUDED.raw_data,
+                    raw_data_hash = EXCLUDED.raw_data_hash,
                     updated_at = CURRENT_TIMESTAMP
             """, insert_data)
             
@@ -8,7 +8,6 @@ Handles nested JSON structure: team_roster and team_schedule data
 import os
 import sys
 import psycopg2
-import json
 from datetime import datetime
 from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
@@ -17,6 +16,7 @@ from dotenv import load_dotenv
 sys.path.append('src')
 
 from api.fbr_client import FBRClient
+from utils.raw_payloads import raw_payload
 
 def get_test_team_ids() -> List[Dict[str, Any]]:
     """Get test team IDs from API documentation examples"""
@@ -57,16 +57,16 @@ def insert_team_rosters_data(data: Dict[str, Any], team_id: str) -> bool:
                         'age': player.get('age'),
                         'matches_played': player.get('mp'),
                         'starts': player.get('starts'),
-                        'raw_data': json.dumps(player)
+                        'raw_data': raw_payload(player)
                     }
                     
                     # Insert with ON CONFLICT handling
                     cur.execute("""
                         INSERT INTO staging.team_rosters 
                         (team_id, player_id, player_name, nationality, position, age, 
-                         matches_played, starts, raw_data)
+                         matches_played, starts, raw_data_hash)
                         VALUES (%(team_id)s, %(player_id)s, %(player_name)s, %(nationality)s, 
-                                %(position)s, %(age)s, %(matches_played)s, %(starts)s, %(raw_data)s)
+                                %(position)s, %(age)s, %(matches_played)s, %(starts)s, staging.store_raw_payload(%(raw_data)s::jsonb))
                         ON CONFLICT (team_id, player_id) 
                         DO UPDATE SET
                             player_name = EXCLUDED.player_name,
@@ -75,7 +75,7 @@ def insert_team_rosters_data(data: Dict[str, Any], team_id: str) -> bool:
                             age = EXCLUDED.age,
                             matches_played = EXCLUDED.matches_played,
                             starts = EXCLUDED.starts,
-                            raw_data = EXCLUDED.raw_data,
+                            raw_data_hash = EXCLUDED.raw_data_hash,
                             updated_at = CURRENT_TIMESTAMP
                     """, insert_data)
                 
@@ -140,7 +140,7 @@ def insert_team_schedules_data(data: Dict[str, Any], team_id: str) -> bool:
                         'captain': match.get('captain'),
                         'formation': match.get('formation'),
                         'referee': match.get('referee'),
-                        'raw_data': json.dumps(match)
+                        'raw_data': raw_payload(match)
                     }
                     
                     # Insert with ON CONFLICT handling
@@ -148,11 +148,11 @@ def insert_team_schedules_data(data: Dict[str, Any], team_id: str) -> bool:
                         INSERT INTO staging.team_schedules 
                         (team_id, match_id, match_date, match_time, league_name, league_id,
                          opponent, opponent_id, home_away, result, goals_for, goals_against,
-                         attendance, captain, formation, referee, raw_data)
+                         attendance, captain, formation, referee, raw_data_hash)
                         VALUES (%(team_id)s, %(match_id)s, %(match_date)s, %(match_time)s,
                                 %(league_name)s, %(league_id)s, %(opponent)s, %(opponent_id)s,
                                 %(home_away)s, %(result)s, %(goals_for)s, %(goals_against)s,
-                                %(attendance)s, %(captain)s, %(formation)s, %(referee)s, %(raw_data)s)
+                                %(attendance)s, %(captain)s, %(formation)s, %(referee)s, staging.store_raw_payload(%(raw_data)s::jsonb))
                         ON CONFLICT (team_id, match_id) 
                         DO UPDATE SET
                             match_date = EXCLUDED.match_date,
@@ -169,7 +169,7 @@ def insert_team_schedules_data(data: Dict[str, Any], team_id: str) -> bool:
                             captain = EXCLUDED.captain,
                             formation = EXCLUDED.formation,
                             referee = EXCLUDED.referee,
-                            raw_data = EXCLUDED.raw_data,
+                            raw_data_hash = EXCLUDED.raw_data_hash,
                             updated_at = CURRENT_TIMESTAMP
                     """, insert_data)
                 
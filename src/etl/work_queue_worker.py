@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Distributed Crawl Planner and Worker
+Plans API call units from collection scopes into staging.work_queue and drains
+the queue from any number of worker processes on any number of machines
+
+Usage:
+    python3 src/etl/work_queue_worker.py plan --scope european_majors
+    python3 src/etl/work_queue_worker.py work --api-key-env FBR_API_KEY_2
+    python3 src/etl/work_queue_worker.py status
+    python3 src/etl/work_queue_worker.py requeue-dead
+"""
+
+import os
+import sys
+import time
+import socket
+import argparse
+import threading
+from typing import Callable, Dict, FrozenSet, List, Optional, Tuple
+
+# Add src to path
+sys.path.append('src')
+
+from api.fbr_client import FBRClient
+from utils.collection_config import load_collection_config
+from utils.collection_ledger import CollectionLedger, load_collection_ledger
+from utils.crawl_planner import CrawlPlanner, StagePlan
+from utils.work_claims import WorkUnit, load_work_claims
+from utils.work_queue import QueueJob, WorkQueue, WorkQueueSettings, load_work_queue_settings
+from etl.load_leagues_data import load_leagues_data
+from etl.load_league_seasons_data import load_league_seasons_data
+from etl.load_league_matches_data import load_league_matches_data
+from etl.load_team_matches_data import derive_team_match_perspectives, insert_team_matches_data
+
+# Earlier collection stages are leased first
+STAGE_PRIORITIES = {
+    'leagues': 10,
+    'league-seasons': 20,
+    'league-matches': 30,
+    'team-matches': 40
+}
+
+PlannedUnits = List[Tuple[WorkUnit, int]]
+Handler = Callable[[QueueJob, CollectionLedger], bool]
+
+# Handlers keyed by endpoint and the set of call parameter names
+HANDLERS: Dict[Tuple[str, FrozenSet[str]], Handler] = {}
+
+def register_handler(endpoint: str, *param_names: str):
+    """Register the function that processes units of an endpoint with these parameters"""
+    def decorator(handler: Handler) -> Handler:
+        HANDLERS[(endpoint, frozenset(param_names))] = handler
+        return handler
+    return decorator
+
+def find_handler(unit: WorkUnit) -> Optional[Handler]:
+    """Look up the handler for a unit"""
+    return HANDLERS.get((unit.endpoint, frozenset(unit.params)))
+
+@register_handler("leagues", "country_code")
+def handle_leagues(job: QueueJob, ledger: CollectionLedger) -> bool:
+    """Load one country's leagues"""
+    return load_leagues_data(country_codes=[job.unit.params['country_code']])
+
+@register_handler("league-seasons", "league_id")
+def handle_league_seasons(job: QueueJob, ledger: CollectionLedger) -> bool:
+    """Load one league's seasons"""
+    return load_league_seasons_data(
+        league_ids=[job.unit.params['league_id']],
+        time_period=job.time_period,
+        ledger=ledger
+    )
+
+@register_handler("matches", "league_id", "season_id")
+def handle_league_matches(job: QueueJob, ledger: CollectionLedger) -> bool:
+    """Load one league-season's matches"""
+    return load_league_matches_data(
+        league_ids=[job.unit.params['league_id']],
+        season_ids=[job.unit.params['season_id']],
+        ledger=ledger
+    )
+
+@register_handler("matches", "league_id", "season_id", "team_id")
+def handle_team_matches(job: QueueJob, ledger: CollectionLedger) -> bool:
+    """Load one team's matches and derive the opponents' perspective"""
+    league_id = job.unit.params['league_id']
+    season_id = job.unit.params['season_id']
+    team_id = job.unit.params['team_id']
+
+    # Orchestrator runs coordinate through the same claims
+    with load_work_claims().claimed(job.unit, ledger) as claimed:
+        if not claimed:
+            return True
+
+        response = FBRClient().get_matches(str(league_id), season_id, team_id)
+        if 'error' in response:
+            ledger.record("matches", job.unit.params, 'error', error_message=str(response['error']))
+            return False
+
+        if not insert_team_matches_data(response, league_id, season_id, team_id, ledger):
+            return False
+
+    derive_team_match_perspectives(league_id, season_id)
+    return True
+
+def stage_units(stage: StagePlan) -> PlannedUnits:
+    """A planned stage's exact units with the stage priority"""
+    return [(unit, STAGE_PRIORITIES[stage.stage]) for unit in stage.units]
+
+def plan_scope(scope_name: str, time_period: Optional[str] = None) -> Tuple[PlannedUnits, Optional[str]]:
+    """
+    Plan every unit of a scope that the current database state allows
+
+    Later stages depend on earlier ones (matches need league seasons); workers
+    plan those follow-up units as they finish each job.
+
+    Args:
+        scope_name: Collection scope name
+        time_period: Time period for scopes without their own
+
+    Returns:
+        Tuple of (planned units, time period the scope is collected for)
+
+    Raises:
+        ValueError: If the scope does not exist
+    """
+    manifest = CrawlPlanner().plan_scope(scope_name, time_period)
+    units: PlannedUnits = []
+    for stage in manifest.stages:
+        # Countries come from a single call the collector makes, not the queue
+        if stage.stage in STAGE_PRIORITIES:
+            units += stage_units(stage)
+    return units, manifest.time_period
+
+def plan_follow_ups(job: QueueJob, ledger: CollectionLedger) -> PlannedUnits:
+    """Units that became plannable because a job finished"""
+    unit = job.unit
+    scope = load_collection_config().get_scope(job.scope) if job.scope else None
+    planner = CrawlPlanner(ledger=ledger)
+
+    if unit.endpoint == "leagues":
+        if scope:
+            league_ids = planner.scope_league_ids(scope, [unit.params['country_code']])
+        else:
+            league_ids = planner.catalog.league_ids_for_countries([unit.params['country_code']])
+        return stage_units(planner.plan_league_seasons(league_ids, job.time_period))
+
+    if unit.endpoint == "league-seasons":
+        return stage_units(planner.plan_league_matches([unit.params['league_id']], job.time_period))
+
+    if unit.endpoint == "matches" and 'team_id' not in unit.params:
+        return stage_units(planner.plan_team_matches([unit.params['league_id']], job.time_period,
+                                                     season_ids=[unit.params['season_id']]))
+
+    return []
+
+class LeaseHeartbeat:
+    """Extends a job's lease from a background thread while its handler runs"""
+
+    def __init__(self, job: QueueJob, worker_id: str, settings: WorkQueueSettings):
+        """Initialize the heartbeat for a leased job"""
+        self.job = job
+        self.worker_id = worker_id
+        self.settings = settings
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        """Heartbeat on its own connection until stopped or the lease is lost"""
+        queue = WorkQueue(self.settings)
+        try:
+            while not self.stop.wait(self.settings.heartbeat_seconds):
+                if not queue.heartbeat(self.job, self.worker_id):
+                    print(f"⚠️ Lost lease on job {self.job.id} ({self.job.unit})")
+                    break
+        finally:
+            queue.close()
+
+    def __enter__(self) -> "LeaseHeartbeat":
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop.set()
+        self.thread.join()
+
+def run_worker(worker_id: str, max_jobs: Optional[int] = None, exit_when_idle: bool = False) -> int:
+    """
+    Lease and process jobs until stopped
+
+    Args:
+        worker_id: Identifier recorded on leased jobs
+        max_jobs: Stop after this many jobs (None = no limit)
+        exit_when_idle: Stop when no job is ready instead of polling
+
+    Returns:
+        int: Number of jobs processed
+    """
+    settings = load_work_queue_settings()
+    queue = WorkQueue(settings)
+    ledger = load_collection_ledger()
+    processed = 0
+
+    print(f"👷 Worker {worker_id} started (lease {settings.lease_seconds}s, "
+          f"heartbeat {settings.heartbeat_seconds}s)")
+
+    try:
+        while max_jobs is None or processed < max_jobs:
+            job = queue.lease(worker_id)
+            if job is None:
+                if exit_when_idle:
+                    print("ℹ️ No ready jobs, exiting")
+                    break
+                time.sleep(settings.poll_seconds)
+                continue
+
+            processed += 1
+            print(f"\n🔧 Job {job.id}: {job.unit} (attempt {job.attempts}/{job.max_attempts})")
+
+            handler = find_handler(job.unit)
+            if handler is None:
+                queue.fail(job, worker_id, f"No handler for {job.unit}", retry=False)
+                print(f"💀 No handler for {job.unit}, dead-lettered")
+                continue
+
+            # Only skip units someone else collected after this job was leased
+            ledger.loaded_at = job.leased_at
+
+            error = None
+            with LeaseHeartbeat(job, worker_id, settings):
+                try:
+                    if not handler(job, ledger):
+                        error = "handler reported failure"
+                except Exception as e:
+                    error = str(e)
+
+            if error is None:
+                if queue.complete(job, worker_id):
+                    follow_ups = plan_follow_ups(job, ledger)
+                    if follow_ups:
+                        queued = queue.enqueue(follow_ups, job.scope, job.time_period)
+                        print(f"➕ Queued {queued} follow-up jobs")
+                    print(f"✅ Job {job.id} done")
+                else:
+                    print(f"⚠️ Job {job.id} finished after its lease was lost")
+            else:
+                status = queue.fail(job, worker_id, error)
+                print(f"❌ Job {job.id} failed ({error}), now {status}")
+
+    except KeyboardInterrupt:
+        print("\n🛑 Worker interrupted; the current lease will expire and be retried")
+    finally:
+        queue.close()
+
+    print(f"👷 Worker {worker_id} processed {processed} jobs")
+    return processed
+
+def print_status(queue: WorkQueue):
+    """Print job counts and recent dead letters"""
+    print("📊 Work Queue Status")
+    print("=" * 50)
+    summary = queue.summary()
+    if not summary:
+        print("  (empty)")
+    for endpoint, counts in summary.items():
+        print(f"  {endpoint}: " + ", ".join(f"{status} {count}" for status, count in counts.items()))
+
+    dead = queue.dead_letters()
+    if dead:
+        print("\n💀 Dead letters (most recent first):")
+        for endpoint, params, attempts, last_error, updated_at in dead:
+            print(f"  {WorkUnit(endpoint, params)} after {attempts} attempts: {last_error}")
+
+def main():
+    """Main CLI function"""
+    parser = argparse.ArgumentParser(description="Distributed crawl planner and worker")
+    parser.add_argument("command", choices=["plan", "work", "status", "requeue-dead"])
+    parser.add_argument("--scope", help="Scope to plan (plan)")
+    parser.add_argument("--time-period", help="Time period for scopes without their own (plan)")
+    parser.add_argument("--worker-id", help="Worker identifier (work, default: host-pid)")
+    parser.add_argument("--api-key-env", help="Environment variable holding this worker's API key (work)")
+    parser.add_argument("--max-jobs", type=int, help="Stop after this many jobs (work)")
+    parser.add_argument("--exit-when-idle", action="store_true", help="Stop when the queue is drained (work)")
+    parser.add_argument("--endpoint", help="Only requeue dead jobs of this endpoint (requeue-dead)")
+
+    args = parser.parse_args()
+
+    try:
+        if args.command == "plan":
+            if not args.scope:
+                parser.error("plan requires --scope")
+            units, period = plan_scope(args.scope, args.time_period)
+            queue = WorkQueue()
+            queued = queue.enqueue(units, args.scope, period)
+            queue.close()
+            print(f"📋 Planned {len(units)} units for scope '{args.scope}', {queued} queued")
+            return 0
+
+        if args.command == "work":
+            if args.api_key_env:
+                if not os.getenv(args.api_key_env):
+                    print(f"❌ {args.api_key_env} is not set")
+                    return 1
+                os.environ["FBR_API_KEY"] = os.environ[args.api_key_env]
+            worker_id = args.worker_id or f"{socket.gethostname()}-{os.getpid()}"
+            run_worker(worker_id, args.max_jobs, args.exit_when_idle)
+            return 0
+
+        queue = WorkQueue()
+        if args.command == "status":
+            print_status(queue)
+        else:
+            print(f"🔄 Requeued {queue.requeue_dead(args.endpoint)} dead jobs")
+        queue.close()
+        return 0
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Change Set Utility
+What one cascade stage actually changed, handed to the stage below it:
+leagues whose last_season moved → their new league-season rows → the
+league-seasons with newly completed matches and the teams playing them
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+
+from utils.league_catalog import LeagueCatalog
+
+@dataclass
+class ChangeSet:
+    """Changes produced by one cascade stage"""
+    stage: str
+    leagues: Set[int] = field(default_factory=set)
+    league_seasons: Set[Tuple[int, str]] = field(default_factory=set)
+    teams: Set[Tuple[int, str, str]] = field(default_factory=set)  # (league_id, season_id, team_id)
+
+    def __bool__(self) -> bool:
+        """Whether the stage changed anything"""
+        return bool(self.leagues or self.league_seasons or self.teams)
+
+    @property
+    def league_ids(self) -> List[int]:
+        """Every league touched by the change set"""
+        league_ids = set(self.leagues)
+        league_ids.update(league_id for league_id, _ in self.league_seasons)
+        league_ids.update(league_id for league_id, _, _ in self.teams)
+        return sorted(league_ids)
+
+    @property
+    def pairs(self) -> List[Tuple[int, str]]:
+        """(league_id, season_id) pairs touched by the change set"""
+        pairs = set(self.league_seasons)
+        pairs.update((league_id, season_id) for league_id, season_id, _ in self.teams)
+        return sorted(pairs)
+
+    def describe(self) -> str:
+        """One-line summary for logs"""
+        parts = []
+        if self.leagues:
+            parts.append(f"{len(self.leagues)} leagues")
+        if self.league_seasons:
+            parts.append(f"{len(self.league_seasons)} league-seasons")
+        if self.teams:
+            parts.append(f"{len(self.teams)} teams")
+        return f"{self.stage}: " + (", ".join(parts) if parts else "no changes")
+
+def league_changes(leagues_needing_update: Iterable[Dict[str, Any]],
+                   league_ids: Optional[Iterable[int]] = None) -> ChangeSet:
+    """
+    Leagues that are new or whose last_season moved
+
+    Args:
+        leagues_needing_update: Changes from the leagues freshness check
+        league_ids: Restrict to these leagues (None = all)
+
+    Returns:
+        ChangeSet of the leagues stage
+    """
+    scope = set(league_ids) if league_ids is not None else None
+    return ChangeSet("leagues", leagues={
+        change['league_id'] for change in leagues_needing_update
+        if change.get('league_id') is not None and (scope is None or change['league_id'] in scope)
+    })
+
+def known_seasons(catalog: LeagueCatalog, league_ids: Iterable[int]) -> Dict[int, Set[str]]:
+    """Snapshot of the seasons the catalog knows per league, taken before a seasons load"""
+    return {
+        league_id: set(catalog.get(league_id).seasons) if catalog.get(league_id) else set()
+        for league_id in league_ids
+    }
+
+def season_changes(before: Dict[int, Set[str]], catalog: LeagueCatalog,
+                   time_period: Optional[str] = None) -> ChangeSet:
+    """
+    League-season rows added since a known_seasons snapshot
+
+    Args:
+        before: Snapshot from known_seasons
+        catalog: Catalog reloaded after the seasons load
+        time_period: Keep only seasons expected for this time period
+
+    Returns:
+        ChangeSet of the league-seasons stage
+    """
+    changes = ChangeSet("league-seasons")
+    for league_id, seasons in before.items():
+        league = catalog.get(league_id)
+        if not league:
+            continue
+        added = league.seasons - seasons
+        if time_period:
+            added &= set(catalog.expected_seasons(league_id, time_period))
+        changes.league_seasons.update((league_id, season_id) for season_id in added)
+    return changes
+
+def match_changes(completed: Dict[Tuple[int, str], Dict[str, Any]],
+                  league_seasons: Iterable[Tuple[int, str]]) -> ChangeSet:
+    """
+    League-seasons with completed matches not yet reflected in team_matches
+
+    Args:
+        completed: Completed matches per league-season, as returned by
+            get_completed_league_matches
+        league_seasons: League-seasons the matches stage refreshed
+
+    Returns:
+        ChangeSet of the league-matches stage, with the teams playing those matches
+    """
+    changes = ChangeSet("league-matches")
+    for pair in league_seasons:
+        season = completed.get(pair)
+        if not season or not season['uncovered']:
+            continue
+        league_id, season_id = pair
+        changes.league_seasons.add(pair)
+        for _, home_team_id, away_team_id in season['uncovered']:
+            changes.teams.add((league_id, season_id, home_team_id))
+            changes.teams.add((league_id, season_id, away_team_id))
+    return changes
@@ -9,36 +9,61 @@ import yaml
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+from utils.config_cache import cached_config
+from utils.seasons import SeasonRange, parse_season, range_from_pattern
+
 @dataclass
 class TimePeriod:
     """Represents a time period for data collection"""
     start_season: Optional[str] = None
     end_season: Optional[str] = None
-    pattern: Optional[str] = None  # Regex pattern for season matching
+    pattern: Optional[str] = None  # Legacy regex pattern, used only without years
     description: Optional[str] = None
+    start_year: Optional[int] = None  # First season start year (inclusive)
+    end_year: Optional[int] = None  # Last season start year (inclusive, None = current)
+    name: Optional[str] = None  # Name in time_periods, if predefined
     
     def is_valid(self) -> bool:
         """Validate time period configuration"""
-        # Must have either start/end seasons or a pattern
-        if not self.start_season and not self.end_season and not self.pattern:
+        # Must have start/end years or seasons, or a pattern
+        if (self.start_year is None and self.end_year is None and
+                not self.start_season and not self.end_season and not self.pattern):
             return False
         return True
     
-    def matches_season(self, season_id: str) -> bool:
-        """Check if a season ID matches this time period"""
-        if self.pattern:
-            import re
-            return bool(re.match(self.pattern, season_id))
+    def season_range(self) -> SeasonRange:
+        """Compile this time period into an integer range of season start years"""
+        start_year = self.start_year
+        end_year = self.end_year
+        
+        if start_year is None and self.start_season:
+            season = parse_season(self.start_season)
+            start_year = season.start_year if season else None
+        if end_year is None and self.end_season:
+            season = parse_season(self.end_season)
+            end_year = season.start_year if season else None
         
-        # Simple range checking
-        if self.start_season and self.end_season:
-            return self.start_season <= season_id <= self.end_season
-        elif self.start_season:
-            return season_id >= self.start_season
-        elif self.end_season:
-            return season_id <= self.end_season
+        if start_year is None and end_year is None and self.pattern:
+            return range_from_pattern(self.pattern) or SeasonRange()
         
-        return True  # No constraints
+        return SeasonRange(start_year, end_year)
+    
+    def matches_season(self, season_id: str) -> bool:
+        """Check if a season ID falls within this time period"""
+        return self.season_range().contains(season_id)
+    
+    @classmethod
+    def from_config(cls, tp_config: Dict[str, Any], name: Optional[str] = None) -> 'TimePeriod':
+        """Build a time period from its YAML configuration"""
+        return cls(
+            name=name,
+            start_season=tp_config.get('start_season'),
+            end_season=tp_config.get('end_season'),
+            pattern=tp_config.get('pattern'),
+            description=tp_config.get('description'),
+            start_year=tp_config.get('start_year'),
+            end_year=tp_config.get('end_year')
+        )
 
 @dataclass
 class CollectionScope:
@@ -105,23 +130,14 @@ class CollectionConfig:
                 if isinstance(time_period_config, str):
                     # Reference to predefined time period
                     if time_period_config in time_periods:
-                        tp_config = time_periods[time_period_config]
-                        time_period = TimePeriod(
-                            start_season=tp_config.get('start_season'),
-                            end_season=tp_config.get('end_season'),
-                            pattern=tp_config.get('pattern'),
-                            description=tp_config.get('description')
+                        time_period = TimePeriod.from_config(
+                            time_periods[time_period_config], time_period_config
                         )
                     else:
                         print(f"⚠️ Unknown time period reference: {time_period_config}")
                 else:
                     # Inline time period configuration
-                    time_period = TimePeriod(
-                        start_season=time_period_config.get('start_season'),
-                        end_season=time_period_config.get('end_season'),
-                        pattern=time_period_config.get('pattern'),
-                        description=time_period_config.get('description')
-                    )
+                    time_period = TimePeriod.from_config(time_period_config)
             
             # Create scope object
             scope = CollectionScope(
@@ -202,13 +218,7 @@ class CollectionConfig:
         time_periods = self.config.get('time_periods', {})
         
         if time_period_name in time_periods:
-            tp_config = time_periods[time_period_name]
-            return TimePeriod(
-                start_season=tp_config.get('start_season'),
-                end_season=tp_config.get('end_season'),
-                pattern=tp_config.get('pattern'),
-                description=tp_config.get('description')
-            )
+            return TimePeriod.from_config(time_periods[time_period_name], time_period_name)
         
         return None
     
@@ -244,8 +254,8 @@ class CollectionConfig:
                     print(f"   Time Period: All time periods")
 
 def load_collection_config(config_path: str = "config/collection_config.yaml") -> CollectionConfig:
-    """Convenience function to load collection configuration"""
-    return CollectionConfig(config_path)
+    """Load collection configuration (parsed once, reparsed when the file changes)"""
+    return cached_config("collection config", config_path, CollectionConfig)
 
 if __name__ == "__main__":
     # Test the configuration loader
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+Collection Ledger Utility
+Loads staging.collection_ledger once per run so loaders can plan API calls in memory
+"""
+
+import os
+import json
+import hashlib
+import psycopg2
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+from utils.db import connect
+from utils.progress import get_progress_reporter
+from utils.season_registry import get_season_registry
+from utils.tracing import traced
+
+@dataclass
+class LedgerEntry:
+    """Collection state of one API call unit"""
+    endpoint: str
+    params: Dict[str, Any]
+    last_fetched_at: Optional[datetime] = None
+    response_digest: Optional[bytes] = None
+    row_count: Optional[int] = None
+    status: str = "pending"
+    complete: bool = False
+    error_message: Optional[str] = None
+
+def ledger_params(**params) -> Dict[str, Any]:
+    """Normalize call parameters into the form stored in the ledger (None values dropped)"""
+    normalized = {}
+    for name, value in params.items():
+        if value is None:
+            continue
+        # League IDs are stored as numbers; season and team IDs are strings
+        normalized[name] = int(value) if name == 'league_id' else str(value)
+    return normalized
+
+def response_digest(data: Any) -> bytes:
+    """SHA-256 of an API response's data, independent of key order"""
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).digest()
+
+# Columns read into a LedgerEntry, in field order
+LEDGER_COLUMNS = """endpoint, params, last_fetched_at, response_digest, row_count,
+                   status, complete, error_message"""
+
+def entry_from_row(row: Tuple) -> LedgerEntry:
+    """Build a LedgerEntry from a LEDGER_COLUMNS row"""
+    return LedgerEntry(
+        endpoint=row[0],
+        params=row[1],
+        last_fetched_at=row[2],
+        response_digest=bytes(row[3]) if row[3] is not None else None,
+        row_count=row[4],
+        status=row[5],
+        complete=row[6],
+        error_message=row[7]
+    )
+
+class CollectionLedger:
+    """In-memory view of staging.collection_ledger"""
+
+    def __init__(self, entries: Optional[List[LedgerEntry]] = None,
+                 loaded_at: Optional[datetime] = None):
+        """Initialize the ledger from already loaded entries"""
+        self.loaded_at = loaded_at  # database time the entries were read
+        self.run = None  # RunCheckpoint of a checkpointed run, told about every fetch
+        self.entries: Dict[Tuple[str, str], LedgerEntry] = {}
+        for entry in entries or []:
+            self.entries[self._key(entry.endpoint, entry.params)] = entry
+
+    @staticmethod
+    def _key(endpoint: str, params: Dict[str, Any]) -> Tuple[str, str]:
+        """Build the lookup key for an endpoint and normalized params"""
+        return endpoint, json.dumps(params, sort_keys=True)
+
+    def get(self, endpoint: str, **params) -> Optional[LedgerEntry]:
+        """Get the ledger entry for a call unit, if it was ever fetched"""
+        return self.entries.get(self._key(endpoint, ledger_params(**params)))
+
+    def is_complete(self, endpoint: str, **params) -> bool:
+        """Check if a call unit needs no further fetching (a matches unit's league-season may be finalized)"""
+        entry = self.get(endpoint, **params)
+        if entry is not None and entry.status == 'ok' and entry.complete:
+            return True
+        # Finalization verifies match data only; other endpoints track their own completeness
+        if endpoint != 'matches':
+            return False
+        return get_season_registry().is_finalized(params.get('league_id'), params.get('season_id'))
+
+    def needs_fetch(self, endpoint: str, **params) -> bool:
+        """Check if a call unit is missing, failed, or only partially collected (and not done in this run)"""
+        if self.run is not None and self.run.is_done(endpoint, **params):
+            return False
+        return not self.is_complete(endpoint, **params)
+
+    def is_unchanged(self, endpoint: str, digest: bytes, **params) -> bool:
+        """Check if a response is identical to the last successfully stored one"""
+        entry = self.get(endpoint, **params)
+        return entry is not None and entry.status == 'ok' and entry.response_digest == digest
+
+    @traced("db.ledger_record")
+    def record(self, endpoint: str, params: Dict[str, Any], status: str,
+               data: Any = None, complete: bool = False,
+               error_message: Optional[str] = None, cur=None) -> LedgerEntry:
+        """
+        Record the outcome of a fetch in the database and in memory
+
+        Args:
+            endpoint: API endpoint name (blacklist naming, e.g. "matches")
+            params: Call parameters (normalized with ledger_params)
+            status: 'ok', 'empty' or 'error'
+            data: Response data list, used for the digest and row count
+            complete: Whether the unit needs no further fetching
+            error_message: Error text for failed fetches
+            cur: Cursor to write with, committed by the caller
+                (None = own connection, committed immediately)
+
+        Returns:
+            LedgerEntry: The recorded entry
+        """
+        params = ledger_params(**params)
+        previous = self.entries.get(self._key(endpoint, params))
+
+        # A failed fetch keeps the last good digest and row count
+        if status == 'error' and previous is not None:
+            digest, row_count = previous.response_digest, previous.row_count
+        else:
+            digest = response_digest(data) if data is not None else None
+            row_count = len(data) if data is not None else 0
+
+        conn = None
+        if cur is None:
+            load_dotenv()
+            conn = connect(os.getenv('DATABASE_URL'))
+            cur = conn.cursor()
+
+        cur.execute("""
+            INSERT INTO staging.collection_ledger (
+                endpoint, params, last_fetched_at, response_digest, row_count,
+                status, complete, error_message
+            ) VALUES (%s, %s::jsonb, CURRENT_TIMESTAMP, %s, %s, %s, %s, %s)
+            ON CONFLICT ON CONSTRAINT uk_collection_ledger_unit DO UPDATE SET
+                last_fetched_at = EXCLUDED.last_fetched_at,
+                response_digest = EXCLUDED.response_digest,
+                row_count = EXCLUDED.row_count,
+                status = EXCLUDED.status,
+                complete = EXCLUDED.complete,
+                error_message = EXCLUDED.error_message
+            RETURNING last_fetched_at
+        """, (
+            endpoint, json.dumps(params), psycopg2.Binary(digest) if digest else None,
+            row_count, status, complete, error_message
+        ))
+        last_fetched_at = cur.fetchone()[0]
+
+        if conn is not None:
+            conn.commit()
+            cur.close()
+            conn.close()
+
+        entry = LedgerEntry(
+            endpoint=endpoint,
+            params=params,
+            last_fetched_at=last_fetched_at,
+            response_digest=digest,
+            row_count=row_count,
+            status=status,
+            complete=complete,
+            error_message=error_message
+        )
+        self.entries[self._key(endpoint, params)] = entry
+        if self.run is not None:
+            self.run.mark(endpoint, params, 'failed' if status == 'error' else 'done', error_message)
+        get_progress_reporter().unit_done(endpoint, params, ok=status != 'error')
+        return entry
+
+    def reload(self, endpoint: str, cur=None, **params) -> Optional[LedgerEntry]:
+        """
+        Re-read one call unit from the database (e.g. after another run may have collected it)
+
+        Args:
+            endpoint: API endpoint name
+            cur: Cursor to read with (None = own connection)
+            **params: Call parameters
+
+        Returns:
+            LedgerEntry, or None if the unit was never fetched
+        """
+        params = ledger_params(**params)
+
+        conn = None
+        if cur is None:
+            load_dotenv()
+            conn = connect(os.getenv('DATABASE_URL'))
+            cur = conn.cursor()
+
+        cur.execute(f"""
+            SELECT {LEDGER_COLUMNS}
+            FROM staging.collection_ledger
+            WHERE endpoint = %s AND params = %s::jsonb
+        """, (endpoint, json.dumps(params)))
+        row = cur.fetchone()
+
+        if conn is not None:
+            cur.close()
+            conn.close()
+
+        if row is None:
+            return None
+        entry = entry_from_row(row)
+        self.entries[self._key(endpoint, params)] = entry
+        return entry
+
+    def collected_since_load(self, endpoint: str, cur=None, **params) -> bool:
+        """Check if a call unit was successfully fetched by anyone after this ledger was loaded"""
+        if self.loaded_at is None:
+            return False
+        entry = self.reload(endpoint, cur=cur, **params)
+        return (entry is not None and entry.status in ('ok', 'empty')
+                and entry.last_fetched_at is not None and entry.last_fetched_at >= self.loaded_at)
+
+    def summary(self, endpoint: Optional[str] = None) -> Dict[str, int]:
+        """Count entries by status (plus 'complete') for one or all endpoints"""
+        counts: Dict[str, int] = {}
+        for entry in self.entries.values():
+            if endpoint and entry.endpoint != endpoint:
+                continue
+            counts[entry.status] = counts.get(entry.status, 0) + 1
+            if entry.complete:
+                counts['complete'] = counts.get('complete', 0) + 1
+        return counts
+
+@traced("db.ledger_load")
+def load_collection_ledger(endpoints: Optional[List[str]] = None,
+                           database_url: Optional[str] = None) -> CollectionLedger:
+    """
+    Load the collection ledger in a single query
+
+    Args:
+        endpoints: Only load entries for these endpoints (None = all)
+        database_url: Database URL (defaults to DATABASE_URL)
+
+    Returns:
+        CollectionLedger: Ledger view (empty if the table is unavailable)
+    """
+    try:
+        load_dotenv()
+        conn = connect(database_url or os.getenv('DATABASE_URL'))
+        cur = conn.cursor()
+
+        cur.execute("SELECT CURRENT_TIMESTAMP")
+        loaded_at = cur.fetchone()[0]
+
+        query = f"""
+            SELECT {LEDGER_COLUMNS}
+            FROM staging.collection_ledger
+        """
+        params = []
+        if endpoints:
+            query += " WHERE endpoint = ANY(%s)"
+            params.append(list(endpoints))
+
+        cur.execute(query, params)
+        entries = [entry_from_row(row) for row in cur.fetchall()]
+        cur.close()
+        conn.close()
+
+        print(f"📒 Loaded {len(entries)} collection ledger entries")
+        return CollectionLedger(entries, loaded_at)
+
+    except Exception as e:
+        print(f"⚠️ Error loading collection ledger: {e}")
+        return CollectionLedger()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Config Cache Utility
+Keeps objects built from config files warm for the life of the process and
+rebuilds them when a file changes on disk
+"""
+
+import os
+from typing import Any, Callable, Dict, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# (kind, absolute path) -> (file mtime when built, object)
+_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+
+def config_mtime(config_path: str) -> float:
+    """Modification time of a config file (0 if it does not exist)"""
+    try:
+        return os.stat(config_path).st_mtime
+    except OSError:
+        return 0.0
+
+def cached_config(kind: str, config_path: str, factory: Callable[[str], T]) -> T:
+    """
+    Build an object from a config file once, and again whenever the file changes
+
+    Args:
+        kind: Name of the object built from the file (e.g. "blacklist")
+        config_path: Config file path
+        factory: Builds the object from the config path
+
+    Returns:
+        The cached or rebuilt object
+    """
+    key = (kind, os.path.abspath(config_path))
+    mtime = config_mtime(config_path)
+    cached = _cache.get(key)
+    if cached is None or cached[0] != mtime:
+        if cached is not None:
+            print(f"🔄 {config_path} changed, reloading {kind}")
+        cached = (mtime, factory(config_path))
+        _cache[key] = cached
+    return cached[1]
+
+def clear_config_cache():
+    """Forget every cached config object"""
+    _cache.clear()
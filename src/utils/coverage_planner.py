@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Coverage Planner Utility
+Chooses the endpoints that cover the requested player stats entities in the
+fewest API calls, from the call-cost metadata in ENDPOINT_CONFIGS and the
+endpoint blacklist. One /all-players-match-stats call covers a whole
+league-season; /player-match-stats (per match) only fills the gaps it leaves.
+Only endpoints with a loader are planned.
+"""
+
+import os
+from datetime import date
+from typing import Any, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from dotenv import load_dotenv
+
+from api.endpoint_config import EndpointConfig, get_covering_endpoints
+from utils.collection_config import load_collection_config
+from utils.collection_ledger import CollectionLedger
+from utils.endpoint_blacklist import EndpointBlacklist
+from utils.seasons import season_filter_sql
+from utils.work_claims import WorkUnit
+from utils.db import connect
+from utils.tracing import traced
+
+# Call scopes from coarsest to finest; ties between endpoints go to the coarser one
+CALL_SCOPES = ["league_season", "team_season", "match"]
+
+# Endpoints with a player stats loader (PLAYER_STATS_LOADERS in etl/collect_football_data.py)
+LOADABLE_ENDPOINTS = ("all-players-match-stats", "player-match-stats")
+
+class PlayerStatsSettings:
+    """Player stats settings from the `player_stats` config block, re-read when the file changes"""
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Current `player_stats` config block"""
+        return load_collection_config().config.get('player_stats', {})
+
+    @property
+    def enabled(self) -> bool:
+        """Whether collections include the player stats stage"""
+        return self.config.get('enabled', False)
+
+    @property
+    def entities(self) -> List[str]:
+        """Entity kinds to cover: 'player_match' (per match) and/or 'player_season' (per team-season)"""
+        return self.config.get('entities', ['player_match'])
+
+    @property
+    def flatten_workers(self) -> int:
+        """Processes flattening player match stats (None in the config = one per CPU)"""
+        return self.config.get('flatten_workers') or os.cpu_count() or 1
+
+    @property
+    def pool_min_matches(self) -> int:
+        """Matches in a response before flattening moves to the process pool"""
+        return self.config.get('pool_min_matches', 50)
+
+    @property
+    def flatten_chunk_matches(self) -> int:
+        """Matches flattened per pool task"""
+        return self.config.get('flatten_chunk_matches', 20)
+
+def load_player_stats_settings() -> PlayerStatsSettings:
+    """Load player stats settings"""
+    return PlayerStatsSettings()
+
+def endpoint_name(config: EndpointConfig) -> str:
+    """Blacklist and ledger name of an endpoint (its path without slashes)"""
+    return config.path.strip('/')
+
+@dataclass
+class SeasonEntities:
+    """Completed matches of one league-season and the player stats already covering them"""
+    league_id: int
+    season_id: str
+    matches: Dict[str, Tuple[date, str, str]] = field(default_factory=dict)  # match_id: (date, home, away)
+    stored: Dict[str, Set[str]] = field(default_factory=dict)  # entity kind: keys with stored rows
+
+    def entities(self, kind: str) -> Set[str]:
+        """Entity keys of a kind: match IDs for 'player_match', team IDs for 'player_season'"""
+        if kind == 'player_match':
+            return set(self.matches)
+        if kind == 'player_season':
+            return {team_id for _, home, away in self.matches.values() for team_id in (home, away)}
+        return set()
+
+    def last_match_date(self, kind: str, key: str) -> Optional[date]:
+        """Date of the last match an entity depends on"""
+        if kind == 'player_match':
+            return self.matches[key][0]
+        dates = [match_date for match_date, home, away in self.matches.values() if key in (home, away)]
+        return max(dates) if dates else None
+
+@dataclass
+class CoveragePlan:
+    """Units chosen to cover the requested entities"""
+    units: List[WorkUnit] = field(default_factory=list)
+    cache_hits: int = 0     # league-seasons already covered
+    covered_seasons: List[Tuple[int, str]] = field(default_factory=list)  # which ones
+    uncoverable: int = 0    # entities no allowed, loadable endpoint can cover
+    calls_by_endpoint: Dict[str, int] = field(default_factory=dict)
+
+class CoveragePlanner:
+    """
+    Greedy set cover over endpoints, per league-season and entity kind
+
+    Each round takes the endpoint with the fewest calls per uncovered
+    entity (coarser call scope on ties), skipping blacklisted units and
+    units the ledger marks complete: a finished league-season call that left
+    gaps would leave them again, so only finer endpoints can fill them.
+    """
+
+    def __init__(self, blacklist: EndpointBlacklist, ledger: CollectionLedger,
+                 entities: Optional[List[str]] = None,
+                 endpoints: Tuple[str, ...] = LOADABLE_ENDPOINTS):
+        """
+        Initialize the planner
+
+        Args:
+            blacklist: Endpoint blacklist
+            ledger: Collection ledger
+            entities: Entity kinds to cover (None = the configured ones)
+            endpoints: Endpoints that may be planned (the ones a loader can store)
+        """
+        self.blacklist = blacklist
+        self.ledger = ledger
+        self.entities = entities or load_player_stats_settings().entities
+        self.endpoints = endpoints
+
+    def is_blacklisted(self, config: EndpointConfig, season: SeasonEntities, **params) -> bool:
+        """Check a unit against the blacklist, including its league-season"""
+        name = endpoint_name(config)
+        # An entry without parameter lists blacklists the whole endpoint
+        if name in self.blacklist.blacklisted_endpoints and not self.blacklist.blacklisted_endpoints[name] \
+                and self.blacklist.blacklist_config.get('enabled', False):
+            return True
+        return self.blacklist.is_blacklisted(name, league_id=season.league_id,
+                                             season_id=season.season_id, **params)
+
+    def covered(self, season: SeasonEntities, kind: str) -> Set[str]:
+        """
+        Entities already covered
+
+        Stored rows are the truth where a loader reports them, so matches a
+        league-season response left out stay gaps. Otherwise an entity counts
+        as covered by a successful fetch after its last match.
+
+        Args:
+            season: League-season entities
+            kind: Entity kind
+
+        Returns:
+            Set of covered entity keys
+        """
+        if kind in season.stored:
+            return set(season.stored[kind])
+        covered = set()
+        for config in get_covering_endpoints(kind):
+            name, per = endpoint_name(config), config.cost.per
+            for key in season.entities(kind) - covered:
+                if per == 'league_season':
+                    entry = self.ledger.get(name, league_id=season.league_id, season_id=season.season_id)
+                elif per == 'team_season' and kind == 'player_season':
+                    entry = self.ledger.get(name, team_id=key, league_id=season.league_id,
+                                            season_id=season.season_id)
+                elif per == 'match' and kind == 'player_match':
+                    entry = self.ledger.get(name, match_id=key)
+                else:
+                    continue
+                last_match = season.last_match_date(kind, key)
+                if entry is not None and entry.status == 'ok' and entry.last_fetched_at is not None \
+                        and (last_match is None or entry.last_fetched_at.date() > last_match):
+                    covered.add(key)
+        return covered
+
+    def candidate_units(self, config: EndpointConfig, season: SeasonEntities,
+                        kind: str, gaps: Set[str]) -> List[Tuple[WorkUnit, Set[str]]]:
+        """
+        Units of one endpoint that can cover some of the gaps, with what each covers
+
+        Args:
+            config: Endpoint configuration (with call-cost metadata)
+            season: League-season entities
+            kind: Entity kind
+            gaps: Uncovered entity keys
+
+        Returns:
+            List of (unit, covered entity keys)
+        """
+        name, per = endpoint_name(config), config.cost.per
+        if per == 'league_season':
+            options = [(WorkUnit.of(name, league_id=season.league_id, season_id=season.season_id),
+                        set(gaps), {})]
+        elif per == 'team_season' and kind == 'player_season':
+            options = [(WorkUnit.of(name, team_id=team_id, league_id=season.league_id,
+                                    season_id=season.season_id), {team_id}, {'team_id': team_id})
+                       for team_id in sorted(gaps)]
+        elif per == 'match' and kind == 'player_match':
+            options = [(WorkUnit.of(name, match_id=match_id), {match_id}, {})
+                       for match_id in sorted(gaps, key=lambda match_id: (season.matches[match_id][0], match_id))]
+        else:
+            return []
+        return [
+            (unit, covers) for unit, covers, params in options
+            if not self.is_blacklisted(config, season, **params)
+            and self.ledger.needs_fetch(unit.endpoint, **unit.params)
+        ]
+
+    def plan_season(self, season: SeasonEntities) -> Tuple[List[Tuple[EndpointConfig, WorkUnit]], int]:
+        """
+        Choose the fewest calls covering every requested entity of a league-season
+
+        Units chosen for one entity kind count towards the next (a league-season
+        call covering player matches also covers player seasons).
+
+        Returns:
+            Tuple of ((endpoint config, unit) list, number of uncoverable entities)
+        """
+        chosen: List[Tuple[EndpointConfig, WorkUnit]] = []
+        uncoverable = 0
+        for kind in self.entities:
+            gaps = season.entities(kind) - self.covered(season, kind)
+            for config, unit in chosen:
+                if kind in config.cost.covers and config.cost.per == 'league_season':
+                    gaps = set()
+            # Gaps only unloadable endpoints could fill stay uncoverable
+            candidates = [config for config in get_covering_endpoints(kind)
+                          if endpoint_name(config) in self.endpoints]
+            while gaps and candidates:
+                options = []
+                for config in candidates:
+                    units = self.candidate_units(config, season, kind, gaps)
+                    covers = set().union(*(covered for _, covered in units)) if units else set()
+                    if covers:
+                        options.append((len(units) / len(covers), CALL_SCOPES.index(config.cost.per),
+                                        config, units, covers))
+                if not options:
+                    break
+                _, _, config, units, covers = min(options, key=lambda option: option[:2])
+                chosen.extend((config, unit) for unit, _ in units)
+                gaps -= covers
+                candidates = [candidate for candidate in candidates if candidate is not config]
+            uncoverable += len(gaps)
+        return chosen, uncoverable
+
+    def plan(self, seasons: List[SeasonEntities]) -> CoveragePlan:
+        """
+        Plan every league-season
+
+        Args:
+            seasons: League-seasons with their completed matches
+
+        Returns:
+            CoveragePlan
+        """
+        plan = CoveragePlan()
+        seen = set()
+        for season in seasons:
+            chosen, uncoverable = self.plan_season(season)
+            plan.uncoverable += uncoverable
+            if not chosen and not uncoverable:
+                plan.cache_hits += 1
+                plan.covered_seasons.append((season.league_id, season.season_id))
+            for config, unit in chosen:
+                key = (unit.endpoint, tuple(sorted(unit.params.items())))
+                if key in seen:
+                    continue
+                seen.add(key)
+                plan.units.append(unit)
+                plan.calls_by_endpoint[unit.endpoint] = plan.calls_by_endpoint.get(unit.endpoint, 0) + 1
+        return plan
+
+@traced("db.player_stats_entities")
+def load_season_entities(league_ids: List[int], time_period: Optional[str] = None,
+                         league_seasons: Optional[List[Tuple[int, str]]] = None,
+                         database_url: Optional[str] = None) -> List[SeasonEntities]:
+    """
+    Completed matches per league-season and the player match rows already stored
+
+    Args:
+        league_ids: League IDs
+        time_period: Time period filter
+        league_seasons: Exact (league_id, season_id) pairs (None = all in the time period)
+        database_url: Database URL (None = DATABASE_URL)
+
+    Returns:
+        List of SeasonEntities, in league and season order
+    """
+    if not league_ids:
+        return []
+    load_dotenv()
+    # Matches are complete two days after kickoff, like the team matches loader
+    query = """
+        SELECT lm.league_id, lm.season_id, lm.match_id, lm.match_date, lm.home_team_id, lm.away_team_id
+        FROM staging.league_matches lm
+        WHERE lm.league_id = ANY(%s)
+          AND lm.match_id IS NOT NULL
+          AND lm.home_team_id IS NOT NULL
+          AND lm.away_team_id IS NOT NULL
+          AND lm.match_date + INTERVAL '2 days' < CURRENT_DATE
+    """
+    params: List[Any] = [league_ids]
+    season_clause, season_params = season_filter_sql(time_period, "lm.season_start_year")
+    query += season_clause + " ORDER BY lm.league_id, lm.season_id, lm.match_date, lm.match_id"
+    params.extend(season_params)
+    # Player match rows already loaded (either table), so the planner sees what responses left out
+    stored_query = """
+        SELECT league_id, season_id, match_id FROM staging.player_match_stats WHERE league_id = ANY(%s)
+        UNION
+        SELECT league_id, season_id, match_id FROM staging.keeper_match_stats WHERE league_id = ANY(%s)
+    """
+
+    seasons: Dict[Tuple[int, str], SeasonEntities] = {}
+    try:
+        with connect(database_url or os.getenv('DATABASE_URL')) as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                for league_id, season_id, match_id, match_date, home, away in cur.fetchall():
+                    season = seasons.setdefault((league_id, season_id), SeasonEntities(league_id, season_id))
+                    season.matches[match_id] = (match_date, home, away)
+                cur.execute(stored_query, (league_ids, league_ids))
+                stored_rows = cur.fetchall()
+    except Exception as e:
+        print(f"⚠️ Error querying completed matches for player stats: {e}")
+        return []
+
+    for season in seasons.values():
+        season.stored['player_match'] = set()
+    for league_id, season_id, match_id in stored_rows:
+        season = seasons.get((league_id, season_id))
+        if season is not None and match_id in season.matches:
+            season.stored['player_match'].add(match_id)
+
+    if league_seasons is not None:
+        return [seasons[pair] for pair in league_seasons if pair in seasons]
+    return list(seasons.values())
@@ -0,0 +1,625 @@
+#!/usr/bin/env python3
+"""
+Crawl Planner Utility
+Expands a collection scope into concrete API call units per stage
+(countries → leagues → league seasons → league matches → team matches
+→ player stats)
+from existing staging data, and estimates how long the crawl will take
+"""
+
+import os
+import json
+import yaml
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from dotenv import load_dotenv
+
+from utils.collection_config import CollectionScope, load_collection_config
+from utils.collection_ledger import CollectionLedger, load_collection_ledger
+from utils.coverage_planner import CoveragePlanner, load_player_stats_settings, load_season_entities
+from utils.endpoint_blacklist import EndpointBlacklist, load_endpoint_blacklist
+from utils.league_catalog import LeagueCatalog, load_league_catalog
+from utils.seasons import season_filter_sql
+from utils.season_registry import get_season_registry
+from utils.work_claims import WorkUnit
+from utils.db import connect
+from utils.tracing import traced
+
+# Gaps between consecutive ledger fetches longer than this are between runs
+MAX_CALL_GAP_SECONDS = 120
+
+# Observed gaps needed before they replace the configured rate limit
+MIN_LATENCY_SAMPLES = 20
+
+# Assumed response time on top of the rate limit when nothing was observed yet
+ASSUMED_LATENCY_SECONDS = 1.0
+
+# Scope priorities, best first
+SCOPE_PRIORITIES = ["high", "medium", "low"]
+
+# Stage order of a crawl
+STAGE_ORDER = ["countries", "leagues", "league-seasons", "league-matches", "team-matches", "player-stats"]
+
+@dataclass
+class StagePlan:
+    """Planned API calls for one collection stage"""
+    stage: str
+    units: List[WorkUnit] = field(default_factory=list)
+    estimated_calls: int = 0  # calls that depend on data earlier stages will fetch
+    probe_calls: int = 0      # freshness-check calls made before deciding
+    cache_hits: int = 0       # units skipped because stored data is complete or fresh
+    blacklisted: int = 0
+    notes: List[str] = field(default_factory=list)
+    estimates: Dict[str, int] = field(default_factory=dict)  # estimated calls by what they load
+    hit_keys: Set[str] = field(default_factory=set)          # what the cache hits are
+
+    @property
+    def calls(self) -> int:
+        """All API calls this stage is expected to make"""
+        return len(self.units) + self.estimated_calls + self.probe_calls
+
+    def estimate(self, key: str, calls: int):
+        """Add estimated calls for one league or league-season (key), so scopes sharing it count it once"""
+        self.estimates[key] = self.estimates.get(key, 0) + calls
+        self.estimated_calls += calls
+
+    def cache_hit(self, key: str):
+        """Count a cache hit for one country, league or league-season (key)"""
+        self.hit_keys.add(key)
+        self.cache_hits += 1
+
+@dataclass
+class CrawlManifest:
+    """Planned crawl for a scope with its expected duration"""
+    scope: Optional[str]
+    time_period: Optional[str]
+    stages: List[StagePlan]
+    seconds_per_call: float
+    latency_source: str
+
+    @property
+    def total_calls(self) -> int:
+        """API calls across all stages"""
+        return sum(stage.calls for stage in self.stages)
+
+    @property
+    def eta_seconds(self) -> float:
+        """Expected crawl duration"""
+        return self.total_calls * self.seconds_per_call
+
+    def stage(self, name: str) -> Optional[StagePlan]:
+        """Get one stage's plan"""
+        return next((stage for stage in self.stages if stage.stage == name), None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable manifest, including every exact unit"""
+        return {
+            'scope': self.scope,
+            'time_period': self.time_period,
+            'total_calls': self.total_calls,
+            'seconds_per_call': round(self.seconds_per_call, 2),
+            'latency_source': self.latency_source,
+            'eta_seconds': round(self.eta_seconds),
+            'stages': [
+                {
+                    'stage': stage.stage,
+                    'calls': stage.calls,
+                    'exact_calls': len(stage.units),
+                    'estimated_calls': stage.estimated_calls,
+                    'probe_calls': stage.probe_calls,
+                    'cache_hits': stage.cache_hits,
+                    'blacklisted': stage.blacklisted,
+                    'notes': stage.notes,
+                    'units': [{'endpoint': unit.endpoint, 'params': unit.params} for unit in stage.units]
+                }
+                for stage in self.stages
+            ]
+        }
+
+    def write(self, path: str):
+        """Write the manifest as JSON"""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f, indent=2)
+        print(f"💾 Manifest written to {path}")
+
+    def print_manifest(self):
+        """Print per-stage call counts, cache hits and the ETA"""
+        title = self.scope or "custom countries"
+        print(f"\n📋 Crawl Manifest: {title}" + (f" (time period: {self.time_period})" if self.time_period else ""))
+        print("=" * 72)
+        print(f"  {'Stage':<16}{'Exact':>8}{'Estimated':>11}{'Probes':>8}{'Cache hits':>12}{'Blacklisted':>13}")
+        for stage in self.stages:
+            print(f"  {stage.stage:<16}{len(stage.units):>8}{stage.estimated_calls:>11}"
+                  f"{stage.probe_calls:>8}{stage.cache_hits:>12}{stage.blacklisted:>13}")
+        for stage in self.stages:
+            for note in stage.notes:
+                print(f"  ℹ️  {stage.stage}: {note}")
+        print("-" * 72)
+        print(f"  Total API calls: {self.total_calls}")
+        print(f"  Seconds per call: {self.seconds_per_call:.1f} ({self.latency_source})")
+        print(f"  ETA: {format_duration(self.eta_seconds)}")
+
+def priority_rank(priority: Optional[str]) -> int:
+    """Sort key of a scope priority (high first, unknown values last)"""
+    if priority in SCOPE_PRIORITIES:
+        return SCOPE_PRIORITIES.index(priority)
+    return len(SCOPE_PRIORITIES)
+
+def merge_stage_plans(stage: str, ranked_plans: List[Tuple[StagePlan, int]],
+                      value_key: Optional[Callable[[WorkUnit, int], Tuple]] = None) -> StagePlan:
+    """
+    Merge one stage planned for several scopes
+
+    Units requested by more than one scope are kept once, with the best
+    priority rank of the scopes requesting them, and the merged units are
+    ordered by that rank (or by value_key of unit and rank). Estimated calls
+    and cache hits are counted once per league or league-season as well.
+
+    Args:
+        stage: Stage name
+        ranked_plans: (stage plan, priority rank) per scope
+        value_key: Sort key of a unit and its rank, e.g. CrawlPlanner.value_key
+
+    Returns:
+        Merged StagePlan
+    """
+    merged = StagePlan(stage)
+    best: Dict[Tuple[str, str], Tuple[int, int, WorkUnit]] = {}
+    requested = 0
+    estimates: Dict[str, int] = {}
+    hit_keys: Set[str] = set()
+    for plan, rank in ranked_plans:
+        for unit in plan.units:
+            requested += 1
+            key = (unit.endpoint, json.dumps(unit.params, sort_keys=True))
+            if key not in best:
+                best[key] = (rank, len(best), unit)
+            elif rank < best[key][0]:
+                best[key] = (rank, best[key][1], unit)
+        for key, calls in plan.estimates.items():
+            estimates[key] = max(estimates.get(key, 0), calls)
+        hit_keys |= plan.hit_keys
+        # Estimates and hits recorded without a key cannot be matched across scopes
+        merged.estimated_calls += plan.estimated_calls - sum(plan.estimates.values())
+        merged.cache_hits += plan.cache_hits - len(plan.hit_keys)
+        merged.probe_calls = max(merged.probe_calls, plan.probe_calls)
+        merged.blacklisted += plan.blacklisted
+        merged.notes.extend(note for note in plan.notes if note not in merged.notes)
+
+    merged.estimates = estimates
+    merged.estimated_calls += sum(estimates.values())
+    merged.hit_keys = hit_keys
+    merged.cache_hits += len(hit_keys)
+
+    if value_key is None:
+        ordered = sorted(best.values(), key=lambda item: item[:2])
+    else:
+        ordered = sorted(best.values(), key=lambda item: (value_key(item[2], item[0]), item[1]))
+    merged.units = [unit for _, _, unit in ordered]
+    if requested > len(merged.units):
+        merged.notes.append(f"{requested - len(merged.units)} units requested by several scopes run once")
+    return merged
+
+def format_duration(seconds: float) -> str:
+    """Format seconds as e.g. "2h 13m" or "45s" """
+    seconds = int(round(seconds))
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    if minutes:
+        return f"{minutes}m {seconds:02d}s"
+    return f"{seconds}s"
+
+class CrawlPlanner:
+    """Plans crawls from staging data, the league catalog, the ledger and the blacklist"""
+
+    def __init__(self, database_url: Optional[str] = None,
+                 blacklist: Optional[EndpointBlacklist] = None,
+                 catalog: Optional[LeagueCatalog] = None,
+                 ledger: Optional[CollectionLedger] = None,
+                 api_config_path: str = "config/config.yaml",
+                 delta: bool = False):
+        """Initialize the planner (catalog and ledger are loaded when not given)"""
+        load_dotenv()
+        self.database_url = database_url or os.getenv('DATABASE_URL')
+        self.blacklist = blacklist or load_endpoint_blacklist()
+        self.catalog = catalog or load_league_catalog(self.database_url, self.blacklist)
+        self.ledger = ledger or load_collection_ledger(database_url=self.database_url)
+        self.api_config_path = api_config_path
+        # Plan league matches like the delta refresh (only seasons with newly completed matches)
+        self.delta = delta
+
+    def value_key(self, unit: WorkUnit, rank: int = 0) -> Tuple[int, int, int]:
+        """
+        Sort key of a unit by expected value, most valuable first
+
+        Current seasons come before older ones, then higher-priority scopes,
+        then units never fetched before units being refreshed.
+
+        Args:
+            unit: Work unit
+            rank: Priority rank of the scope requesting it
+
+        Returns:
+            Tuple sorting the most valuable units first
+        """
+        league_id, season_id = unit.params.get('league_id'), unit.params.get('season_id')
+        current = season_id is None or self.catalog.is_current_season(league_id, season_id)
+        never_fetched = self.ledger.get(unit.endpoint, **unit.params) is None
+        return (0 if current else 1, rank, 0 if never_fetched else 1)
+
+    @traced("db.planner_query")
+    def _query(self, query: str, params: List[Any]) -> List[Tuple]:
+        """Run a read-only planning query"""
+        with connect(self.database_url) as conn:
+            with conn.cursor() as cur:
+                cur.execute(query, params)
+                return cur.fetchall()
+
+    def scope_league_ids(self, scope: CollectionScope,
+                         country_codes: Optional[List[str]] = None) -> List[int]:
+        """
+        League IDs a scope covers, from the catalog
+
+        Args:
+            scope: Collection scope
+            country_codes: Restrict to these countries (None = the scope's countries)
+
+        Returns:
+            List of league IDs
+        """
+        countries = country_codes if country_codes is not None else scope.countries
+        if countries is None:
+            league_ids = sorted(self.catalog.leagues)
+        else:
+            league_ids = self.catalog.league_ids_for_countries(countries)
+        if scope.leagues:
+            league_ids = self.catalog.filter_by_names(league_ids, scope.leagues)
+        return league_ids
+
+    def plan_countries(self, country_codes: List[str], force_refresh: bool = False) -> StagePlan:
+        """One /countries call if any country is missing from staging.countries"""
+        plan = StagePlan("countries")
+        rows = self._query(
+            "SELECT country_code FROM staging.countries WHERE country_code = ANY(%s)",
+            [country_codes]
+        )
+        missing = set(country_codes) - {row[0] for row in rows}
+        if missing or force_refresh:
+            # All countries come back from a single call
+            plan.units.append(WorkUnit.of("countries"))
+        else:
+            for code in country_codes:
+                plan.cache_hit(f"country:{code}")
+        return plan
+
+    def plan_leagues(self, country_codes: List[str], force_refresh: bool = False,
+                     probe_freshness: bool = True) -> StagePlan:
+        """
+        One /leagues call per country without leagues in the catalog
+
+        Args:
+            country_codes: Countries in scope
+            force_refresh: Refetch every country
+            probe_freshness: Count the per-country freshness check calls
+
+        Returns:
+            StagePlan for the leagues stage
+        """
+        plan = StagePlan("leagues")
+        known = {code for league in self.catalog.leagues.values() for code, _ in league.memberships}
+        for code in country_codes:
+            if force_refresh or code not in known:
+                plan.units.append(WorkUnit.of("leagues", country_code=code))
+            else:
+                plan.cache_hit(f"country:{code}")
+        if probe_freshness and country_codes:
+            per_country = load_collection_config().defaults.get('league_freshness', 'per_country') != 'global'
+            plan.probe_calls = len(country_codes) if per_country else 1
+            plan.notes.append("last_season changes found by the freshness check add one call per country")
+        return plan
+
+    def plan_league_seasons(self, league_ids: List[int], time_period: Optional[str],
+                            force_refresh: bool = False) -> StagePlan:
+        """One /league-seasons call per league missing expected seasons"""
+        plan = StagePlan("league-seasons")
+        for league_id in league_ids:
+            if self.catalog.is_blacklisted("league-seasons", league_id):
+                plan.blacklisted += 1
+            elif force_refresh or not self.catalog.get(league_id) or \
+                    (time_period and self.catalog.missing_seasons(league_id, time_period)):
+                plan.units.append(WorkUnit.of("league-seasons", league_id=league_id))
+            else:
+                plan.cache_hit(f"league:{league_id}")
+        return plan
+
+    def plan_league_matches(self, league_ids: List[int], time_period: Optional[str],
+                            season_ids: Optional[List[str]] = None) -> StagePlan:
+        """
+        One /matches call per league-season in the time period that is not complete
+
+        Known league-seasons are joined against the collection ledger; expected
+        seasons the league seasons stage has yet to load are estimated.
+        """
+        plan = StagePlan("league-matches")
+        if not league_ids:
+            return plan
+
+        query = """
+            SELECT ls.league_id, ls.season_id, cl.status, cl.complete
+            FROM staging.league_seasons ls
+            LEFT JOIN staging.collection_ledger cl
+              ON cl.endpoint = 'matches'
+             AND cl.params = jsonb_build_object('league_id', ls.league_id, 'season_id', ls.season_id)
+            WHERE ls.league_id = ANY(%s)
+        """
+        params: List[Any] = [league_ids]
+        if season_ids:
+            query += " AND ls.season_id = ANY(%s)"
+            params.append(season_ids)
+        season_clause, season_params = season_filter_sql(time_period, "ls.season_start_year")
+        query += season_clause + " ORDER BY ls.league_id, ls.season_id"
+        params.extend(season_params)
+
+        registry = get_season_registry()
+        for league_id, season_id, status, complete in self._query(query, params):
+            if self.catalog.is_blacklisted("matches", league_id) or \
+                    self.blacklist.is_blacklisted("matches", season_id=season_id):
+                plan.blacklisted += 1
+            elif (status == 'ok' and complete) or registry.is_finalized(league_id, season_id):
+                plan.cache_hit(f"{league_id}/{season_id}")
+            else:
+                plan.units.append(WorkUnit.of("matches", league_id=league_id, season_id=season_id))
+
+        if plan.units:
+            # Imported here: the ETL loaders import utilities from this package
+            from etl.load_league_matches_data import probe_complete_league_seasons
+            # Seasons fetched before their stored rows became complete
+            pairs = [(unit.params['league_id'], unit.params['season_id']) for unit in plan.units]
+            stored_complete = probe_complete_league_seasons(pairs)
+            for league_id, season_id in stored_complete:
+                plan.cache_hit(f"{league_id}/{season_id}")
+            plan.units = [unit for unit, pair in zip(plan.units, pairs) if pair not in stored_complete]
+
+        if self.delta and plan.units:
+            from etl.load_league_matches_data import get_due_league_seasons
+            pairs = [(unit.params['league_id'], unit.params['season_id']) for unit in plan.units]
+            due = set(get_due_league_seasons(pairs, self.ledger))
+            for league_id, season_id in set(pairs) - due:
+                plan.cache_hit(f"{league_id}/{season_id}")
+            plan.units = [unit for unit, pair in zip(plan.units, pairs) if pair in due]
+
+        # Seasons not loaded yet get one call each once they are
+        if time_period and not season_ids:
+            pending = 0
+            for league_id in league_ids:
+                if self.catalog.is_blacklisted("matches", league_id):
+                    continue
+                missing = len(self.catalog.missing_seasons(league_id, time_period))
+                if missing:
+                    plan.estimate(f"league:{league_id}", missing)
+                    pending += missing
+            if pending:
+                plan.notes.append(f"{pending} league-seasons are not loaded yet")
+        return plan
+
+    def plan_team_matches(self, league_ids: List[int], time_period: Optional[str],
+                          season_ids: Optional[List[str]] = None,
+                          league_matches: Optional[StagePlan] = None) -> StagePlan:
+        """
+        One /matches call per team in the minimal covering set of each league-season
+
+        League-seasons whose matches are still to be fetched are estimated at
+        num_squads - 1 teams, the covering set of a round robin.
+        """
+        # Imported here: the ETL loaders import utilities from this package
+        from etl.load_team_matches_data import get_completed_league_matches, select_covering_teams
+
+        plan = StagePlan("team-matches")
+        if not league_ids:
+            return plan
+
+        seasons = get_completed_league_matches(league_ids, season_ids, time_period)
+        for (league_id, season_id), season in seasons.items():
+            if self.catalog.is_blacklisted("matches", league_id):
+                plan.blacklisted += 1
+                continue
+            teams = [
+                team_id for team_id in select_covering_teams(season['uncovered'])
+                if self.ledger.needs_fetch("matches", league_id=league_id,
+                                           season_id=season_id, team_id=team_id)
+            ]
+            if teams:
+                plan.units.extend(
+                    WorkUnit.of("matches", league_id=league_id, season_id=season_id, team_id=team_id)
+                    for team_id in teams
+                )
+            else:
+                plan.cache_hit(f"{league_id}/{season_id}")
+
+        # League-seasons with no league matches loaded yet
+        if league_matches is not None:
+            unloaded = [
+                (unit.params['league_id'], unit.params['season_id']) for unit in league_matches.units
+                if (unit.params['league_id'], unit.params['season_id']) not in seasons
+            ]
+            if unloaded:
+                rows = self._query("""
+                    SELECT league_id, season_id, num_squads
+                    FROM staging.league_seasons
+                    WHERE (league_id, season_id) IN (SELECT * FROM unnest(%s::int[], %s::text[]))
+                """, [[league_id for league_id, _ in unloaded], [season_id for _, season_id in unloaded]])
+                for league_id, season_id, num_squads in rows:
+                    plan.estimate(f"{league_id}/{season_id}", max(0, (num_squads or 0) - 1))
+                unknown = sum(1 for row in rows if not row[2])
+                plan.notes.append(f"{len(unloaded)} league-seasons have no league matches yet")
+                if unknown:
+                    plan.notes.append(f"{unknown} of them have no squad count and are not estimated")
+        return plan
+
+    def plan_player_stats(self, league_ids: List[int], time_period: Optional[str],
+                          league_seasons: Optional[List[Tuple[int, str]]] = None,
+                          league_matches: Optional[StagePlan] = None) -> StagePlan:
+        """
+        Fewest calls covering the player stats of every completed match
+
+        One /all-players-match-stats call per league-season where allowed;
+        per-team and per-match endpoints only for the gaps (see
+        utils/coverage_planner.py). League-seasons whose matches are still to
+        be fetched are estimated at one call each.
+        """
+        plan = StagePlan("player-stats")
+        if not league_ids:
+            return plan
+
+        seasons = load_season_entities(league_ids, time_period, league_seasons, self.database_url)
+        coverage = CoveragePlanner(self.blacklist, self.ledger).plan(seasons)
+        plan.units = coverage.units
+        for league_id, season_id in coverage.covered_seasons:
+            plan.cache_hit(f"{league_id}/{season_id}")
+        if coverage.calls_by_endpoint:
+            plan.notes.append("calls by endpoint: " + ", ".join(
+                f"{count} /{endpoint}" for endpoint, count in coverage.calls_by_endpoint.items()))
+        if coverage.uncoverable:
+            plan.notes.append(f"{coverage.uncoverable} player stats entities have no endpoint left "
+                              f"(blacklisted, already fetched without them, "
+                              f"or only on endpoints without a loader)")
+
+        if league_matches is not None:
+            loaded = {(season.league_id, season.season_id) for season in seasons}
+            unloaded = {
+                (unit.params['league_id'], unit.params['season_id']) for unit in league_matches.units
+            } - loaded
+            if unloaded:
+                for league_id, season_id in sorted(unloaded):
+                    plan.estimate(f"{league_id}/{season_id}", 1)
+                plan.notes.append(f"{len(unloaded)} league-seasons have no completed matches loaded yet")
+        return plan
+
+    def observed_seconds_per_call(self) -> Tuple[float, str]:
+        """
+        Seconds per API call from recent ledger fetch times, else the configured rate limit
+
+        Consecutive fetches within a run are spaced by the rate limiter, the
+        response time and the insert, so their median gap is the real pace.
+
+        Returns:
+            Tuple of (seconds per call, description of the source)
+        """
+        rate_limit_delay = 6.0
+        try:
+            with open(self.api_config_path, 'r') as f:
+                rate_limit_delay = float(yaml.safe_load(f)['api']['rate_limit_delay'])
+        except Exception as e:
+            print(f"⚠️ Error loading API rate limit, assuming {rate_limit_delay}s: {e}")
+
+        try:
+            rows = self._query("""
+                SELECT percentile_cont(0.5) WITHIN GROUP (ORDER BY gap), COUNT(*)
+                FROM (
+                    SELECT EXTRACT(EPOCH FROM last_fetched_at
+                                   - LAG(last_fetched_at) OVER (ORDER BY last_fetched_at)) AS gap
+                    FROM staging.collection_ledger
+                    WHERE last_fetched_at > CURRENT_TIMESTAMP - INTERVAL '30 days'
+                ) gaps
+                WHERE gap > 0 AND gap < %s
+            """, [MAX_CALL_GAP_SECONDS])
+            median, samples = rows[0]
+            if median is not None and samples >= MIN_LATENCY_SAMPLES:
+                return max(rate_limit_delay, float(median)), f"observed median of {samples} recent calls"
+        except Exception as e:
+            print(f"⚠️ Error reading observed call times: {e}")
+
+        return (rate_limit_delay + ASSUMED_LATENCY_SECONDS,
+                f"rate limit {rate_limit_delay:g}s + assumed {ASSUMED_LATENCY_SECONDS:g}s latency")
+
+    def plan(self, country_codes: Optional[List[str]] = None, league_names: Optional[List[str]] = None,
+             time_period: Optional[str] = None, force_refresh: bool = False,
+             scope_name: Optional[str] = None) -> CrawlManifest:
+        """
+        Plan every stage of a crawl
+
+        Args:
+            country_codes: Countries in scope (None = all countries)
+            league_names: Restrict to these competitions
+            time_period: Time period name or season ID
+            force_refresh: Plan as if freshness checks were ignored
+            scope_name: Scope name for the manifest title
+
+        Returns:
+            CrawlManifest
+        """
+        scope = CollectionScope(name=scope_name or "custom", description="",
+                                countries=country_codes, leagues=league_names)
+        countries = country_codes or []
+        league_ids = self.scope_league_ids(scope)
+
+        leagues = self.plan_leagues(countries, force_refresh)
+        league_seasons = self.plan_league_seasons(league_ids, time_period, force_refresh)
+        league_matches = self.plan_league_matches(league_ids, time_period)
+        team_matches = self.plan_team_matches(league_ids, time_period, league_matches=league_matches)
+
+        # Countries without leagues yet add leagues the later stages cannot see
+        if leagues.units and not force_refresh:
+            league_seasons.notes.append(
+                f"leagues of {len(leagues.units)} countries without leagues are not included")
+
+        stages = [self.plan_countries(countries, force_refresh)] if countries else []
+        stages += [leagues, league_seasons, league_matches, team_matches]
+        if load_player_stats_settings().enabled:
+            stages.append(self.plan_player_stats(league_ids, time_period, league_matches=league_matches))
+
+        seconds_per_call, source = self.observed_seconds_per_call()
+        return CrawlManifest(scope_name, time_period, stages, seconds_per_call, source)
+
+    def plan_scope(self, scope_name: str, time_period: Optional[str] = None,
+                   force_refresh: bool = False) -> CrawlManifest:
+        """
+        Plan a predefined scope
+
+        Raises:
+            ValueError: If the scope does not exist
+        """
+        scope = load_collection_config().get_scope(scope_name)
+        if not scope:
+            raise ValueError(f"Scope '{scope_name}' not found")
+        period = scope_time_period(scope, time_period)
+        return self.plan(scope.countries, scope.leagues, period, force_refresh, scope_name)
+
+    def plan_scopes(self, scope_names: List[str], time_period: Optional[str] = None,
+                    force_refresh: bool = False) -> CrawlManifest:
+        """
+        Plan several predefined scopes as one deduplicated crawl
+
+        Estimated calls of league-seasons not loaded yet are summed per scope
+        and can overlap between scopes.
+
+        Raises:
+            ValueError: If a scope does not exist
+        """
+        config = load_collection_config()
+        ranked = []
+        for scope_name in scope_names:
+            scope = config.get_scope(scope_name)
+            if not scope:
+                raise ValueError(f"Scope '{scope_name}' not found")
+            ranked.append((self.plan_scope(scope_name, time_period, force_refresh),
+                           priority_rank(scope.priority)))
+
+        stages = []
+        for stage in STAGE_ORDER:
+            plans = [(manifest.stage(stage), rank) for manifest, rank in ranked if manifest.stage(stage)]
+            if plans:
+                stages.append(merge_stage_plans(stage, plans))
+
+        periods = list(dict.fromkeys(manifest.time_period for manifest, _ in ranked if manifest.time_period))
+        seconds_per_call, source = self.observed_seconds_per_call()
+        return CrawlManifest(",".join(scope_names), ",".join(periods) or None, stages,
+                             seconds_per_call, source)
+
+def scope_time_period(scope: CollectionScope, time_period: Optional[str] = None) -> Optional[str]:
+    """Time period a scope is collected for (the scope's own, else the given one)"""
+    if scope.time_period:
+        return scope.time_period.name or scope.time_period.pattern or time_period
+    return time_period
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Database Connection Utility
+Opens staging database connections; long-running processes enable a
+process-wide pool so connections stay warm between jobs
+"""
+
+import os
+import psycopg2
+from psycopg2 import pool
+from typing import Optional
+from dotenv import load_dotenv
+
+_pool: Optional[pool.ThreadedConnectionPool] = None
+_pool_url: Optional[str] = None
+
+class PooledConnection:
+    """
+    Connection borrowed from the pool, returned on close()
+
+    Behaves like a psycopg2 connection: a with-block commits or rolls back
+    without closing. A connection that is never closed explicitly goes back
+    to the pool when it is garbage collected, as a plain one would be closed.
+    """
+
+    def __init__(self, conn, connection_pool: pool.ThreadedConnectionPool):
+        """Wrap a connection taken from the pool"""
+        self._conn = conn
+        self._pool = connection_pool
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self) -> "PooledConnection":
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+    @property
+    def closed(self) -> bool:
+        """Whether this borrowed connection was returned (or the server closed it)"""
+        return self._conn is None or bool(self._conn.closed)
+
+    def close(self):
+        """Discard uncommitted work and return the connection to the pool"""
+        if self._conn is None:
+            return
+        conn, self._conn = self._conn, None
+        try:
+            if not conn.closed:
+                conn.rollback()
+                conn.autocommit = False
+            self._pool.putconn(conn, close=bool(conn.closed))
+        except Exception:
+            self._pool.putconn(conn, close=True)
+
+    def __del__(self):
+        self.close()
+
+def _resolve_url(database_url: Optional[str]) -> Optional[str]:
+    """Database URL, defaulting to DATABASE_URL"""
+    if database_url:
+        return database_url
+    load_dotenv()
+    return os.getenv('DATABASE_URL')
+
+def enable_connection_pool(database_url: Optional[str] = None, max_connections: int = 10):
+    """
+    Serve connect() from a process-wide pool
+
+    Args:
+        database_url: Database URL (defaults to DATABASE_URL)
+        max_connections: Connections kept open at most
+    """
+    global _pool, _pool_url
+    close_connection_pool()
+    _pool_url = _resolve_url(database_url)
+    _pool = pool.ThreadedConnectionPool(1, max_connections, _pool_url)
+
+def close_connection_pool():
+    """Close every pooled connection and go back to one connection per connect()"""
+    global _pool, _pool_url
+    if _pool is not None:
+        _pool.closeall()
+    _pool = None
+    _pool_url = None
+
+def connect(database_url: Optional[str] = None):
+    """
+    Open a database connection
+
+    Args:
+        database_url: Database URL (defaults to DATABASE_URL)
+
+    Returns:
+        A pooled connection when the pool is enabled for this URL, else a new one
+    """
+    url = _resolve_url(database_url)
+    if _pool is None or url != _pool_url:
+        return psycopg2.connect(url)
+
+    conn = _pool.getconn()
+    if conn.closed:
+        # Dropped by the server while idle
+        _pool.putconn(conn, close=True)
+        conn = _pool.getconn()
+    return PooledConnection(conn, _pool)
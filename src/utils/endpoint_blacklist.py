@@ -9,6 +9,8 @@ import yaml
 from typing import Dict, List, Optional, Set
 from datetime import datetime, timedelta
 
+from utils.config_cache import cached_config
+
 class EndpointBlacklist:
     """Manages endpoint blacklist to avoid calling broken endpoints"""
     
@@ -125,5 +127,5 @@ class EndpointBlacklist:
             print()
 
 def load_endpoint_blacklist(config_path: str = "config/collection_config.yaml") -> EndpointBlacklist:
-    """Load endpoint blacklist from configuration"""
-    return EndpointBlacklist(config_path) 
\ No newline at end of file
+    """Load endpoint blacklist from configuration (built once, rebuilt when the file changes)"""
+    return cached_config("endpoint blacklist", config_path, EndpointBlacklist) 
\ No newline at end of file
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+League Catalog Utility
+Loads every league with its last season, known seasons and season format in one
+query, so collection planning needs no per-league database round trips
+"""
+
+import os
+from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass, field
+from dotenv import load_dotenv
+
+from utils.endpoint_blacklist import EndpointBlacklist, load_endpoint_blacklist
+from utils.seasons import SINGLE_YEAR, SPLIT_YEAR, parse_season, resolve_season_range
+from utils.season_registry import get_season_registry
+from utils.db import connect
+from utils.tracing import traced
+
+# Endpoints whose blacklist flags are precomputed per league
+CATALOG_ENDPOINTS = ["league-seasons", "league-season-details", "league-standings", "matches"]
+
+@dataclass
+class LeagueEntry:
+    """Catalog entry for one league"""
+    league_id: int
+    competition_name: Optional[str] = None
+    memberships: Set[Tuple[str, str]] = field(default_factory=set)  # (country_code, league_type)
+    last_season: Optional[str] = None
+    seasons: Set[str] = field(default_factory=set)
+    season_format: str = SPLIT_YEAR
+    blacklisted_endpoints: Set[str] = field(default_factory=set)
+
+    @property
+    def max_start_year(self) -> Optional[int]:
+        """Start year of the latest season the API lists for this league"""
+        season = parse_season(self.last_season)
+        return season.start_year if season else None
+
+def dominant_season_format(seasons: Set[str]) -> str:
+    """Most common season format among known seasons (YYYY-YYYY when unknown or tied)"""
+    formats = [season.format for season in map(parse_season, seasons) if season]
+    if formats.count(SINGLE_YEAR) > formats.count(SPLIT_YEAR):
+        return SINGLE_YEAR
+    return SPLIT_YEAR
+
+class LeagueCatalog:
+    """In-memory view of staging.leagues and staging.league_seasons"""
+
+    def __init__(self, leagues: Optional[Dict[int, LeagueEntry]] = None):
+        """Initialize the catalog from already loaded entries"""
+        self.leagues: Dict[int, LeagueEntry] = leagues or {}
+        self._expected_seasons: Dict[Tuple[int, str], Tuple[str, ...]] = {}
+
+    def get(self, league_id: int) -> Optional[LeagueEntry]:
+        """Get the catalog entry for a league"""
+        return self.leagues.get(league_id)
+
+    def expected_seasons(self, league_id: int, time_period: str) -> Tuple[str, ...]:
+        """
+        Season IDs a league should have for a time period (memoized)
+
+        Seasons are enumerated in the league's own format and capped at the
+        league's last_season.
+
+        Args:
+            league_id: League ID
+            time_period: Time period name (e.g., "2020s", "default_2024")
+
+        Returns:
+            Tuple of season IDs, oldest first
+        """
+        key = (league_id, time_period)
+        if key not in self._expected_seasons:
+            season_range = resolve_season_range(time_period)
+            league = self.get(league_id) or LeagueEntry(league_id)
+            self._expected_seasons[key] = tuple(
+                season_range.seasons(league.season_format, league.max_start_year)
+            ) if season_range else ()
+        return self._expected_seasons[key]
+
+    def missing_seasons(self, league_id: int, time_period: str) -> Set[str]:
+        """Expected seasons not yet in league_seasons (seasons the API does not list are not missing)"""
+        league = self.get(league_id)
+        known = league.seasons if league else set()
+        absent = get_season_registry().absent_seasons(league_id)
+        return set(self.expected_seasons(league_id, time_period)) - known - absent
+
+    def is_current_season(self, league_id: int, season_id: str) -> bool:
+        """Check if a season is the league's latest season"""
+        league = self.get(league_id)
+        return league is not None and league.last_season == season_id
+
+    def is_blacklisted(self, endpoint: str, league_id: int) -> bool:
+        """Check a precomputed league-level blacklist flag"""
+        league = self.get(league_id)
+        return league is not None and endpoint in league.blacklisted_endpoints
+
+    def league_ids_for_countries(self, country_codes: List[str],
+                                 league_types: Tuple[str, ...] = ('domestic_leagues', 'domestic_cups')) -> List[int]:
+        """League IDs listed under any of the given countries with one of the given types"""
+        countries = set(country_codes)
+        return sorted(
+            league.league_id for league in self.leagues.values()
+            if any(code in countries and league_type in league_types
+                   for code, league_type in league.memberships)
+        )
+
+    def filter_by_names(self, league_ids: List[int], league_names: List[str]) -> List[int]:
+        """Keep the league IDs whose competition name is in league_names"""
+        names = set(league_names)
+        return sorted(
+            league_id for league_id in league_ids
+            if league_id in self.leagues and self.leagues[league_id].competition_name in names
+        )
+
+@traced("db.catalog_load")
+def load_league_catalog(database_url: Optional[str] = None,
+                        blacklist: Optional[EndpointBlacklist] = None) -> LeagueCatalog:
+    """
+    Load the league catalog in a single query
+
+    Args:
+        database_url: Database URL (defaults to DATABASE_URL)
+        blacklist: Endpoint blacklist for the precomputed flags (None = load from config)
+
+    Returns:
+        LeagueCatalog: Catalog (empty if the query fails)
+    """
+    blacklist = blacklist or load_endpoint_blacklist()
+
+    try:
+        load_dotenv()
+        conn = connect(database_url or os.getenv('DATABASE_URL'))
+        cur = conn.cursor()
+
+        cur.execute("""
+            SELECT l.league_id, l.competition_name, l.memberships, l.last_seasons, s.season_ids
+            FROM (
+                SELECT league_id,
+                       MIN(competition_name) AS competition_name,
+                       ARRAY_AGG(DISTINCT country_code || ':' || league_type) AS memberships,
+                       ARRAY_AGG(DISTINCT last_season) FILTER (WHERE last_season IS NOT NULL) AS last_seasons
+                FROM staging.leagues
+                GROUP BY league_id
+            ) l
+            LEFT JOIN (
+                SELECT league_id, ARRAY_AGG(season_id) AS season_ids
+                FROM staging.league_seasons
+                GROUP BY league_id
+            ) s ON s.league_id = l.league_id
+        """)
+
+        leagues = {}
+        for league_id, competition_name, memberships, last_seasons, season_ids in cur.fetchall():
+            seasons = set(season_ids or [])
+            # Leagues listed under several countries may report different last seasons
+            last_season = max(
+                last_seasons or [None],
+                key=lambda season: (parse_season(season).start_year if parse_season(season) else -1)
+            )
+            leagues[league_id] = LeagueEntry(
+                league_id=league_id,
+                competition_name=competition_name,
+                memberships={tuple(m.split(':', 1)) for m in memberships or [] if m},
+                last_season=last_season,
+                seasons=seasons,
+                season_format=dominant_season_format(seasons),
+                blacklisted_endpoints={
+                    endpoint for endpoint in CATALOG_ENDPOINTS
+                    if blacklist.is_blacklisted(endpoint, league_id=league_id)
+                }
+            )
+
+        cur.close()
+        conn.close()
+
+        print(f"📚 Loaded league catalog with {len(leagues)} leagues")
+        return LeagueCatalog(leagues)
+
+    except Exception as e:
+        print(f"⚠️ Error loading league catalog: {e}")
+        return LeagueCatalog()
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+League Diff Utility
+Finds new and changed leagues for every country at once by diffing a single
+unfiltered /leagues response against staging.leagues on (league_id, last_season)
+
+/leagues documents country_code as required and its leagues carry no country,
+so a league not yet in staging.leagues cannot be attributed to a country here
+"""
+
+import os
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from dataclasses import dataclass, asdict
+from dotenv import load_dotenv
+
+from api.fbr_client import FBRClient
+from utils.db import connect
+
+@dataclass
+class LeagueChange:
+    """A league that is new or whose last_season differs from staging.leagues"""
+    league_id: int
+    country_code: Optional[str]
+    competition_name: Optional[str]
+    db_last_season: Optional[str]
+    api_last_season: Optional[str]
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Dict in the leagues_needing_update format of the freshness checks"""
+        return asdict(self)
+
+class LeagueDiff:
+    """Changed leagues across all countries, answered per scope without further calls"""
+
+    def __init__(self, changes: Optional[List[LeagueChange]] = None):
+        """Initialize from a list of changes"""
+        self.changes = changes or []
+
+    def for_countries(self, country_codes: List[str]) -> List[Dict[str, Any]]:
+        """Changes affecting these countries"""
+        codes = set(country_codes)
+        return [change.as_dict() for change in self.changes if change.country_code in codes]
+
+    def unattributed(self) -> List[LeagueChange]:
+        """New leagues the API listed without a country that staging does not know either"""
+        return [change for change in self.changes if change.country_code is None]
+
+    def resolve(self, country_codes: List[str]):
+        """Drop changes of countries whose leagues were just reloaded"""
+        codes = set(country_codes)
+        self.changes = [change for change in self.changes if change.country_code not in codes]
+
+def iter_api_leagues(response: Dict[str, Any]) -> Iterator[Tuple[Optional[str], Dict[str, Any]]]:
+    """
+    Yield (country_code, league) pairs from a /leagues response
+
+    Leagues are grouped by league type; the country comes from the league
+    itself or its group when the response is not filtered by country.
+    """
+    for group in response.get('data', []):
+        group_country = group.get('country_code')
+        for league in group.get('leagues', []):
+            yield league.get('country_code') or group_country, league
+
+def diff_leagues(response: Dict[str, Any],
+                 db_rows: List[Tuple[int, str, Optional[str]]]) -> LeagueDiff:
+    """
+    Diff an unfiltered /leagues response against stored leagues
+
+    Args:
+        response: /leagues API response without a country filter
+        db_rows: (league_id, country_code, last_season) rows of staging.leagues
+
+    Returns:
+        LeagueDiff with one change per new or changed (league, country)
+    """
+    stored: Dict[int, Dict[str, Optional[str]]] = {}
+    for league_id, country_code, last_season in db_rows:
+        stored.setdefault(league_id, {})[country_code] = last_season
+
+    changes = []
+    seen: Set[Tuple[int, Optional[str]]] = set()
+    for api_country, league in iter_api_leagues(response):
+        league_id = league.get('league_id')
+        if league_id is None:
+            continue
+        known = stored.get(league_id, {})
+        # Without a country in the response, compare against every stored membership
+        countries = [api_country] if api_country else (list(known) or [None])
+        for country_code in countries:
+            if (league_id, country_code) in seen:
+                continue
+            seen.add((league_id, country_code))
+            db_last_season = known.get(country_code)
+            api_last_season = league.get('last_season')
+            if country_code in known and db_last_season == api_last_season:
+                continue
+            changes.append(LeagueChange(
+                league_id=league_id,
+                country_code=country_code,
+                competition_name=league.get('competition_name'),
+                db_last_season=db_last_season,
+                api_last_season=api_last_season
+            ))
+    return LeagueDiff(changes)
+
+def fetch_league_diff(client: Optional[FBRClient] = None,
+                      database_url: Optional[str] = None) -> Optional[LeagueDiff]:
+    """
+    Fetch the unfiltered league list once and diff it against staging.leagues
+
+    Args:
+        client: FBR API client (None = create one)
+        database_url: Database URL (defaults to DATABASE_URL)
+
+    Returns:
+        LeagueDiff, or None if the API call or the query failed
+    """
+    client = client or FBRClient()
+    response = client.get_leagues()
+    if "error" in response:
+        print(f"❌ Unfiltered /leagues call failed: {response['error']}")
+        return None
+
+    try:
+        load_dotenv()
+        with connect(database_url or os.getenv('DATABASE_URL')) as conn:
+            with conn.cursor() as cur:
+                cur.execute("SELECT league_id, country_code, last_season FROM staging.leagues")
+                db_rows = cur.fetchall()
+    except Exception as e:
+        print(f"❌ Error reading stored leagues: {e}")
+        return None
+
+    return diff_leagues(response, db_rows)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Profiling Utility
+Sampling CPU profiler and tracemalloc allocation tracking for collector and
+loader runs (--profile). Samples are grouped by crawl stage and written as
+collapsed stacks for flamegraph.pl, speedscope or Perfetto; allocation sites
+are diffed per stage. Time spent in the API rate-limit sleep is not sampled.
+"""
+
+import os
+import sys
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from utils.collection_config import load_collection_config
+
+class ProfilingSettings:
+    """Profiling settings from the `profiling` config block, re-read when the file changes"""
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Current `profiling` config block"""
+        return load_collection_config().config.get('profiling', {})
+
+    @property
+    def output_dir(self) -> str:
+        """Directory each profiled run writes its own subdirectory to"""
+        return self.config.get('output_dir', 'logs/profiles')
+
+    @property
+    def sample_interval(self) -> float:
+        """Seconds between CPU samples"""
+        return max(1, self.config.get('sample_interval_ms', 5)) / 1000
+
+    @property
+    def tracemalloc_frames(self) -> int:
+        """Stack frames kept per allocation"""
+        return max(1, self.config.get('tracemalloc_frames', 10))
+
+    @property
+    def top_allocations(self) -> int:
+        """Allocation sites listed per stage"""
+        return self.config.get('top_allocations', 20)
+
+    @property
+    def top_functions(self) -> int:
+        """Functions listed in the end-of-run CPU summary"""
+        return self.config.get('top_functions', 15)
+
+def load_profiling_settings() -> ProfilingSettings:
+    """Load profiling settings"""
+    return ProfilingSettings()
+
+def frame_label(frame) -> str:
+    """Collapsed-stack name of a frame: function (file:first line)"""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+class Profiler:
+    """
+    Process-wide profiler, idle until begin()
+
+    A sampler thread reads the profiled thread's stack every sample_interval
+    and counts it under the current stage. While idle there is no sampler
+    thread and no tracemalloc; stage() and paused() cost one attribute check.
+    """
+
+    def __init__(self, settings: Optional[ProfilingSettings] = None):
+        """Initialize an idle profiler"""
+        self.settings = settings or load_profiling_settings()
+        self.active = False
+        self.label: Optional[str] = None
+        self.thread_id: Optional[int] = None
+        self._stages: List[str] = []
+        self._paused: Set[int] = set()
+        # Set while the profiler takes or diffs snapshots, which is not sampled
+        self._bookkeeping = False
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+        self._stage_snapshots: List[tracemalloc.Snapshot] = []
+        # stage -> collapsed stack -> samples
+        self.samples: Dict[str, Dict[str, int]] = {}
+        # stage -> formatted top allocation sites
+        self.allocations: Dict[str, List[str]] = {}
+        self.skipped_samples = 0
+
+    def begin(self, label: str):
+        """
+        Start profiling the calling thread
+
+        Args:
+            label: Run name, used for the output directory and the outermost stage
+        """
+        self.label = label
+        self.thread_id = threading.get_ident()
+        self._stages = [label]
+        self._paused = set()
+        self.samples = {}
+        self.allocations = {}
+        self.skipped_samples = 0
+        tracemalloc.start(self.settings.tracemalloc_frames)
+        self._stage_snapshots = [tracemalloc.take_snapshot()]
+        self._stop.clear()
+        self.active = True
+        self._sampler = threading.Thread(target=self._sample_loop, name="profiler-sampler", daemon=True)
+        self._sampler.start()
+        print(f"🔬 Profiling {label} (sampling every {self.settings.sample_interval * 1000:.0f} ms, "
+              f"tracemalloc {self.settings.tracemalloc_frames} frames)")
+
+    def _sample_loop(self):
+        """Sample the profiled thread's stack until stopped"""
+        interval = self.settings.sample_interval
+        while not self._stop.wait(interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None or self._bookkeeping:
+                continue
+            if self.thread_id in self._paused:
+                self.skipped_samples += 1
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(frame_label(frame))
+                frame = frame.f_back
+            collapsed = ";".join(reversed(stack))
+            stage_samples = self.samples.setdefault(self._stages[-1], {})
+            stage_samples[collapsed] = stage_samples.get(collapsed, 0) + 1
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Count samples and allocations inside the with-block under a stage"""
+        if not self.active or threading.get_ident() != self.thread_id:
+            yield
+            return
+        self._stages.append(name)
+        self._bookkeeping = True
+        self._stage_snapshots.append(tracemalloc.take_snapshot())
+        self._bookkeeping = False
+        try:
+            yield
+        finally:
+            self._record_allocations(name, self._stage_snapshots.pop())
+            self._stages.pop()
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Leave the with-block out of CPU samples (e.g. the rate-limit sleep)"""
+        if not self.active:
+            yield
+            return
+        thread_id = threading.get_ident()
+        self._paused.add(thread_id)
+        try:
+            yield
+        finally:
+            self._paused.discard(thread_id)
+
+    def _record_allocations(self, stage: str, start: tracemalloc.Snapshot):
+        """Keep the allocation sites that grew most since a stage started"""
+        self._bookkeeping = True
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__)
+        ])
+        diffs = [diff for diff in snapshot.compare_to(start, 'lineno') if diff.size_diff > 0]
+        lines = self.allocations.setdefault(stage, [])
+        for diff in diffs[:self.settings.top_allocations]:
+            frame = diff.traceback[0]
+            lines.append(f"{diff.size_diff / 1024:>10.1f} KiB {diff.count_diff:>+9} blocks  "
+                         f"{frame.filename}:{frame.lineno}")
+        self._bookkeeping = False
+
+    def write(self) -> str:
+        """
+        Write collapsed stacks per stage and the allocation report
+
+        Returns:
+            str: Output directory
+        """
+        safe_label = "".join(c if c.isalnum() or c in '-_' else '_' for c in self.label)
+        directory = os.path.join(self.settings.output_dir,
+                                 f"{safe_label}-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+        os.makedirs(directory, exist_ok=True)
+
+        merged: Dict[str, int] = {}
+        for stage, stacks in self.samples.items():
+            with open(os.path.join(directory, f"{stage}.collapsed"), 'w') as f:
+                for stack, count in sorted(stacks.items()):
+                    f.write(f"{stack} {count}\n")
+                    merged[f"{stage};{stack}"] = count
+        with open(os.path.join(directory, "all.collapsed"), 'w') as f:
+            for stack, count in sorted(merged.items()):
+                f.write(f"{stack} {count}\n")
+
+        with open(os.path.join(directory, "allocations.txt"), 'w') as f:
+            for stage, lines in self.allocations.items():
+                f.write(f"== {stage}\n")
+                f.write("\n".join(lines) + "\n\n")
+        return directory
+
+    def print_summary(self):
+        """Print the functions with the most samples on top of the stack"""
+        self_samples: Dict[str, int] = {}
+        for stacks in self.samples.values():
+            for stack, count in stacks.items():
+                leaf = stack.rsplit(";", 1)[-1]
+                self_samples[leaf] = self_samples.get(leaf, 0) + count
+        total = sum(self_samples.values())
+        if not total:
+            return
+        print(f"\n🔬 CPU samples by function ({total} samples, "
+              f"{self.skipped_samples} skipped in rate-limit sleep)")
+        print("=" * 72)
+        for leaf, count in sorted(self_samples.items(), key=lambda item: item[1],
+                                  reverse=True)[:self.settings.top_functions]:
+            print(f"  {count:>7} {100 * count / total:>6.1f}%  {leaf}")
+
+    def end(self):
+        """Stop sampling, write the output files and print the summary"""
+        if not self.active:
+            return
+        self._stop.set()
+        self._sampler.join()
+        self._record_allocations(self.label, self._stage_snapshots[0])
+        self.active = False
+        tracemalloc.stop()
+        directory = self.write()
+        self.print_summary()
+        print(f"🔬 Profile written to {directory} (*.collapsed for flamegraph.pl or speedscope, "
+              f"allocations.txt)")
+
+_profiler: Optional[Profiler] = None
+
+def get_profiler() -> Profiler:
+    """Get the process-wide profiler"""
+    global _profiler
+    if _profiler is None:
+        _profiler = Profiler()
+    return _profiler
+
+@contextmanager
+def profiled(label: str, enabled: bool = True) -> Iterator[None]:
+    """Profile the with-block when enabled (the --profile option of the CLIs)"""
+    if not enabled:
+        yield
+        return
+    profiler = get_profiler()
+    profiler.begin(label)
+    try:
+        yield
+    finally:
+        profiler.end()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Progress Reporting Utility
+Tracks a collection run's units done out of planned, API calls per minute,
+rows written per second, rate-budget utilization and a rolling ETA. Renders
+them as a terminal status line and writes them to a JSON progress file.
+"""
+
+import os
+import json
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from utils.collection_config import load_collection_config
+
+class ProgressSettings:
+    """Progress settings from the `progress` config block, re-read when the file changes"""
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Current `progress` config block"""
+        return load_collection_config().get_progress_config()
+
+    @property
+    def log_interval(self) -> int:
+        """Units between status lines"""
+        return max(1, self.config.get('log_interval', 10))
+
+    @property
+    def estimate_remaining(self) -> bool:
+        """Whether the status line and file include an ETA"""
+        return self.config.get('estimate_remaining', True)
+
+    @property
+    def show_percentage(self) -> bool:
+        """Whether the status line shows the percentage done"""
+        return self.config.get('show_percentage', True)
+
+    @property
+    def window_seconds(self) -> float:
+        """Rolling window for rates and the ETA"""
+        return self.config.get('window_minutes', 10) * 60
+
+    @property
+    def progress_file(self) -> Optional[str]:
+        """JSON file rewritten as units finish (None = no file)"""
+        return self.config.get('progress_file', 'logs/collection_progress.json')
+
+def load_progress_settings() -> ProgressSettings:
+    """Load progress settings"""
+    return ProgressSettings()
+
+# Endpoints whose units make up the player stats stage
+PLAYER_STATS_ENDPOINTS = {"all-players-match-stats", "player-match-stats", "player-season-stats"}
+
+def unit_stage(endpoint: str, params: Dict[str, Any]) -> str:
+    """Crawl stage of a call unit (stage names of the crawl planner)"""
+    if endpoint == 'matches':
+        return 'team-matches' if 'team_id' in params else 'league-matches'
+    if endpoint in PLAYER_STATS_ENDPOINTS:
+        return 'player-stats'
+    return endpoint
+
+class ProgressReporter:
+    """
+    Progress of the current collection run
+
+    Loaders report into it through the collection ledger (a unit finished),
+    the API client (a call was made) and their inserts (rows written). It
+    renders only between begin() and finish(); outside a run, reports are
+    counted but not shown.
+    """
+
+    def __init__(self, settings: Optional[ProgressSettings] = None):
+        """Initialize an idle reporter"""
+        self.settings = settings or load_progress_settings()
+        self.label: Optional[str] = None
+        self.active = False
+        self.reset()
+
+    def reset(self):
+        """Clear all counters"""
+        self.started_at = time.monotonic()
+        self.totals: Dict[str, int] = {}
+        self.done: Dict[str, int] = {}
+        self.failed: Dict[str, int] = {}
+        self.current_stage: Optional[str] = None
+        self.calls = 0
+        self.rows = 0
+        self.rate_limit_delay: Optional[float] = None
+        # (monotonic time, count) events inside the rolling window
+        self.unit_times: Deque[float] = deque()
+        self.call_times: Deque[float] = deque()
+        self.row_events: Deque[Tuple[float, int]] = deque()
+
+    def begin(self, label: str, stage_totals: Dict[str, int],
+              rate_limit_delay: Optional[float] = None):
+        """
+        Start reporting a run
+
+        Args:
+            label: Run name for the status line and file (e.g. scope and run ID)
+            stage_totals: Planned units per stage
+            rate_limit_delay: Seconds between API calls, for budget utilization
+        """
+        self.reset()
+        self.label = label
+        self.totals = dict(stage_totals)
+        self.rate_limit_delay = rate_limit_delay
+        self.active = True
+        self.render()
+
+    def _trim(self, now: float):
+        """Drop events older than the rolling window"""
+        cutoff = now - self.settings.window_seconds
+        for events in (self.unit_times, self.call_times):
+            while events and events[0] < cutoff:
+                events.popleft()
+        while self.row_events and self.row_events[0][0] < cutoff:
+            self.row_events.popleft()
+
+    def api_call(self):
+        """Report one API call"""
+        now = time.monotonic()
+        self.calls += 1
+        self.call_times.append(now)
+        self._trim(now)
+
+    def rows_written(self, count: int):
+        """Report rows inserted or updated"""
+        if count <= 0:
+            return
+        now = time.monotonic()
+        self.rows += count
+        self.row_events.append((now, count))
+        self._trim(now)
+
+    def unit_done(self, endpoint: str, params: Dict[str, Any], ok: bool = True):
+        """Report a finished unit (successful or failed)"""
+        now = time.monotonic()
+        stage = unit_stage(endpoint, params)
+        self.current_stage = stage
+        self.done[stage] = self.done.get(stage, 0) + 1
+        if not ok:
+            self.failed[stage] = self.failed.get(stage, 0) + 1
+        self.unit_times.append(now)
+        self._trim(now)
+
+        if not self.active:
+            return
+        self.write_file()
+        if sum(self.done.values()) % self.settings.log_interval == 0:
+            self.render()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current progress as a dict (the progress file contents)"""
+        now = time.monotonic()
+        self._trim(now)
+        elapsed = now - self.started_at
+        window = max(1.0, min(elapsed, self.settings.window_seconds))
+
+        stages = {}
+        for stage in list(self.totals) + [stage for stage in self.done if stage not in self.totals]:
+            done = self.done.get(stage, 0)
+            stages[stage] = {
+                'done': done,
+                'failed': self.failed.get(stage, 0),
+                # Estimated totals can be exceeded as earlier stages load data
+                'total': max(self.totals.get(stage, 0), done)
+            }
+        units_done = sum(stage['done'] for stage in stages.values())
+        units_total = sum(stage['total'] for stage in stages.values())
+
+        calls_per_minute = len(self.call_times) * 60 / window
+        budget = 60 / self.rate_limit_delay if self.rate_limit_delay else None
+        units_per_second = len(self.unit_times) / window
+        eta_seconds = None
+        if self.settings.estimate_remaining and units_per_second > 0:
+            eta_seconds = (units_total - units_done) / units_per_second
+
+        return {
+            'label': self.label,
+            'active': self.active,
+            'stage': self.current_stage,
+            'stages': stages,
+            'units_done': units_done,
+            'units_total': units_total,
+            'percent': round(100 * units_done / units_total, 1) if units_total else None,
+            'api_calls': self.calls,
+            'calls_per_minute': round(calls_per_minute, 2),
+            'rows_written': self.rows,
+            'rows_per_second': round(sum(count for _, count in self.row_events) / window, 2),
+            'rate_budget_utilization': round(calls_per_minute / budget, 3) if budget else None,
+            'eta_seconds': round(eta_seconds) if eta_seconds is not None else None,
+            'elapsed_seconds': round(elapsed),
+            'updated_at': datetime.now(timezone.utc).isoformat()
+        }
+
+    def status_line(self, snapshot: Optional[Dict[str, Any]] = None) -> str:
+        """One-line summary for the terminal"""
+        snapshot = snapshot or self.snapshot()
+        parts = [f"{snapshot['units_done']}/{snapshot['units_total']} units"]
+        if self.settings.show_percentage and snapshot['percent'] is not None:
+            parts[0] += f" ({snapshot['percent']:.1f}%)"
+        if snapshot['stage']:
+            parts.append(snapshot['stage'])
+        parts.append(f"{snapshot['calls_per_minute']:.1f} calls/min")
+        if snapshot['rate_budget_utilization'] is not None:
+            parts.append(f"{snapshot['rate_budget_utilization']:.0%} of rate budget")
+        parts.append(f"{snapshot['rows_per_second']:.1f} rows/s")
+        if snapshot['eta_seconds'] is not None:
+            # Imported here: the crawl planner imports the collection ledger, which imports this module
+            from utils.crawl_planner import format_duration
+            parts.append(f"ETA {format_duration(snapshot['eta_seconds'])}")
+        return " | ".join(parts)
+
+    def render(self):
+        """Print the status line"""
+        if self.active:
+            print(f"📈 {self.label}: {self.status_line()}")
+
+    def write_file(self, snapshot: Optional[Dict[str, Any]] = None):
+        """Atomically rewrite the progress file"""
+        path = self.settings.progress_file
+        if not path:
+            return
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot or self.snapshot(), f, indent=2)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️ Error writing progress file {path}: {e}")
+
+    def finish(self):
+        """Print the final status line, write the final file and stop rendering"""
+        if not self.active:
+            return
+        self.render()
+        self.active = False
+        self.write_file()
+
+_reporter: Optional[ProgressReporter] = None
+
+def get_progress_reporter() -> ProgressReporter:
+    """Get the process-wide progress reporter"""
+    global _reporter
+    if _reporter is None:
+        _reporter = ProgressReporter()
+    return _reporter
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Raw Payload Storage Utility
+Settings and helpers for the content-addressed staging.raw_payloads side table
+"""
+
+import os
+import json
+import yaml
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+
+from utils.config_cache import cached_config
+from utils.db import connect
+
+class RawPayloadSettings:
+    """Manages whether and how raw API payloads are retained"""
+
+    def __init__(self, config_path: str = "config/collection_config.yaml"):
+        """Initialize raw payload settings"""
+        self.config_path = config_path
+        self.config = self._load_config()
+
+    def _load_config(self) -> Dict:
+        """Load raw payload configuration from config file"""
+        try:
+            with open(self.config_path, 'r') as f:
+                config = yaml.safe_load(f) or {}
+                return config.get('raw_payloads', {})
+        except Exception as e:
+            print(f"❌ Error loading raw payload config: {e}")
+            return {}
+
+    @property
+    def enabled(self) -> bool:
+        """Whether raw payloads are stored at all"""
+        return self.config.get('enabled', True)
+
+    @property
+    def keep_superseded(self) -> bool:
+        """Whether payloads no longer referenced by any staging row are kept"""
+        return self.config.get('keep_superseded', False)
+
+    def serialize(self, payload: Any) -> Optional[str]:
+        """
+        Serialize an API element for staging.store_raw_payload
+
+        Args:
+            payload: Raw API element
+
+        Returns:
+            JSON string, or None when raw payloads are disabled (stores a NULL hash)
+        """
+        if not self.enabled or payload is None:
+            return None
+        return json.dumps(payload)
+
+def load_raw_payload_settings(config_path: str = "config/collection_config.yaml") -> RawPayloadSettings:
+    """Load raw payload settings from configuration (cached until the file changes)"""
+    return cached_config("raw payload settings", config_path, RawPayloadSettings)
+
+def raw_payload(payload: Any) -> Optional[str]:
+    """Serialize an API element for the raw_data parameter of a staging insert"""
+    return load_raw_payload_settings().serialize(payload)
+
+def prune_raw_payloads(force: bool = False) -> int:
+    """
+    Delete raw payloads that no staging row references any more
+
+    The prune takes the raw payload advisory lock exclusively, so it waits
+    for concurrent runs whose rows are not committed yet.
+
+    Args:
+        force: Prune even when keep_superseded is enabled
+
+    Returns:
+        int: Number of payloads deleted
+    """
+    settings = load_raw_payload_settings()
+    if settings.keep_superseded and not force:
+        print("ℹ️ keep_superseded is enabled, keeping superseded raw payloads")
+        return 0
+
+    try:
+        load_dotenv()
+        conn = connect(os.getenv('DATABASE_URL'))
+        cur = conn.cursor()
+        cur.execute("SELECT staging.prune_raw_payloads()")
+        deleted = cur.fetchone()[0]
+        conn.commit()
+        cur.close()
+        conn.close()
+
+        print(f"🧹 Pruned {deleted} superseded raw payloads")
+        return deleted
+
+    except Exception as e:
+        print(f"⚠️ Error pruning raw payloads: {e}")
+        return 0
+
+if __name__ == "__main__":
+    prune_raw_payloads(force=True)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Refresh Schedule Utility
+Computes when each league-season in progress is next worth re-fetching, from
+its fixtures in staging.league_matches, its cup rounds in
+staging.league_season_details and its last fetch in the collection ledger
+"""
+
+import os
+import yaml
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+from utils.collection_ledger import CollectionLedger
+from utils.db import connect
+from utils.league_catalog import LeagueCatalog, load_league_catalog
+
+class RefreshScheduleSettings:
+    """Manages match timing and retry settings for the refresh scheduler"""
+
+    def __init__(self, config_path: str = "config/collection_config.yaml"):
+        """Initialize refresh schedule settings"""
+        self.config_path = config_path
+        self.config = self._load_config()
+
+    def _load_config(self) -> Dict:
+        """Load refresh scheduler configuration from config file"""
+        try:
+            with open(self.config_path, 'r') as f:
+                config = yaml.safe_load(f) or {}
+                return config.get('refresh_scheduler', {})
+        except Exception as e:
+            print(f"❌ Error loading refresh scheduler config: {e}")
+            return {}
+
+    @property
+    def match_duration(self) -> timedelta:
+        """Kickoff to final whistle, including stoppage time"""
+        return timedelta(minutes=self.config.get('match_duration_minutes', 120))
+
+    @property
+    def data_entry_buffer(self) -> timedelta:
+        """Time after a match ends before its result is available from the API"""
+        return timedelta(hours=self.config.get('data_entry_buffer_hours', 48))
+
+    @property
+    def default_kickoff(self) -> time:
+        """Kickoff assumed for fixtures without a time"""
+        return datetime.strptime(self.config.get('default_kickoff', '15:00'), '%H:%M').time()
+
+    @property
+    def late_result_retry(self) -> timedelta:
+        """Retry interval for results still missing after their due time"""
+        return timedelta(hours=self.config.get('late_result_retry_hours', 12))
+
+    @property
+    def late_result_give_up(self) -> timedelta:
+        """How long after its due time a missing result is retried (postponed matches)"""
+        return timedelta(days=self.config.get('late_result_give_up_days', 7))
+
+    @property
+    def fixture_discovery(self) -> timedelta:
+        """Re-fetch interval for seasons waiting on fixtures (empty, or cup rounds not drawn)"""
+        return timedelta(hours=self.config.get('fixture_discovery_hours', 168))
+
+    @property
+    def error_retry(self) -> timedelta:
+        """Retry interval after a failed fetch"""
+        return timedelta(minutes=self.config.get('error_retry_minutes', 60))
+
+    @property
+    def min_sleep(self) -> timedelta:
+        """Shortest sleep between cycles, so units another run holds are not polled in a loop"""
+        return timedelta(seconds=self.config.get('min_sleep_seconds', 60))
+
+    @property
+    def max_sleep(self) -> timedelta:
+        """Longest sleep, so new fixtures and scope changes are noticed"""
+        return timedelta(minutes=self.config.get('max_sleep_minutes', 360))
+
+def load_refresh_schedule_settings(config_path: str = "config/collection_config.yaml") -> RefreshScheduleSettings:
+    """Load refresh scheduler settings from configuration"""
+    return RefreshScheduleSettings(config_path)
+
+@dataclass
+class RefreshSlot:
+    """Next time a league-season is worth re-fetching"""
+    league_id: int
+    season_id: str
+    due_at: datetime
+    reason: str
+
+    def is_due(self, now: datetime) -> bool:
+        """Whether the slot is due at the given time"""
+        return self.due_at <= now
+
+def result_due_at(match_date: date, match_time: Optional[time],
+                  settings: RefreshScheduleSettings) -> datetime:
+    """When a match result should be available: kickoff + duration + data-entry buffer (UTC)"""
+    kickoff = datetime.combine(match_date, match_time or settings.default_kickoff, tzinfo=timezone.utc)
+    return kickoff + settings.match_duration + settings.data_entry_buffer
+
+def get_pending_results(league_seasons: List[Tuple[int, str]]) -> Dict[Tuple[int, str], List[Tuple[date, Optional[time]]]]:
+    """
+    Fixtures without a result in league_matches or team_matches, per league-season
+
+    Args:
+        league_seasons: (league_id, season_id) pairs
+
+    Returns:
+        Dict of (league_id, season_id) -> list of (match_date, match_time)
+    """
+    pending: Dict[Tuple[int, str], List[Tuple[date, Optional[time]]]] = {}
+    if not league_seasons:
+        return pending
+
+    load_dotenv()
+    with connect(os.getenv('DATABASE_URL')) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT lm.league_id, lm.season_id, lm.match_date, lm.match_time
+                FROM unnest(%s::int[], %s::text[]) AS u(league_id, season_id)
+                JOIN staging.league_matches lm
+                  ON lm.league_id = u.league_id AND lm.season_id = u.season_id
+                WHERE lm.home_team_score IS NULL
+                  AND lm.match_date IS NOT NULL
+                  AND NOT EXISTS (
+                      SELECT 1 FROM staging.team_matches tm
+                      WHERE tm.league_id = lm.league_id
+                        AND tm.season_id = lm.season_id
+                        AND tm.match_id = lm.match_id
+                        AND tm.goals_for IS NOT NULL
+                  )
+                ORDER BY lm.league_id, lm.season_id, lm.match_date, lm.match_time
+            """, ([pair[0] for pair in league_seasons], [pair[1] for pair in league_seasons]))
+            for league_id, season_id, match_date, match_time in cur.fetchall():
+                pending.setdefault((league_id, season_id), []).append((match_date, match_time))
+    return pending
+
+def get_undrawn_cup_seasons(league_seasons: List[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+    """
+    Cup league-seasons still running with rounds that have no fixtures yet
+
+    Uses the round names in staging.league_season_details; later rounds get
+    fixtures only after each draw, so these seasons need periodic re-fetching.
+    """
+    if not league_seasons:
+        return set()
+
+    load_dotenv()
+    with connect(os.getenv('DATABASE_URL')) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT d.league_id, d.season_id
+                FROM unnest(%s::int[], %s::text[]) AS u(league_id, season_id)
+                JOIN staging.league_season_details d
+                  ON d.league_id = u.league_id AND d.season_id = u.season_id
+                WHERE jsonb_typeof(d.rounds) = 'array'
+                  AND (d.league_end IS NULL OR d.league_end >= CURRENT_DATE)
+                  AND EXISTS (
+                      SELECT 1 FROM jsonb_array_elements_text(d.rounds) AS r(round_name)
+                      WHERE NOT EXISTS (
+                          SELECT 1 FROM staging.league_matches lm
+                          WHERE lm.league_id = d.league_id
+                            AND lm.season_id = d.season_id
+                            AND lm.round = r.round_name
+                      )
+                  )
+            """, ([pair[0] for pair in league_seasons], [pair[1] for pair in league_seasons]))
+            return set(cur.fetchall())
+
+def get_running_cup_seasons(league_seasons: List[Tuple[int, str]]) -> Set[Tuple[int, str]]:
+    """Cup league-seasons whose league_end in staging.league_season_details is still ahead"""
+    if not league_seasons:
+        return set()
+
+    load_dotenv()
+    with connect(os.getenv('DATABASE_URL')) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT d.league_id, d.season_id
+                FROM unnest(%s::int[], %s::text[]) AS u(league_id, season_id)
+                JOIN staging.league_season_details d
+                  ON d.league_id = u.league_id AND d.season_id = u.season_id
+                WHERE d.league_type = 'cup'
+                  AND d.league_end >= CURRENT_DATE
+            """, ([pair[0] for pair in league_seasons], [pair[1] for pair in league_seasons]))
+            return set(cur.fetchall())
+
+def build_refresh_schedule(league_seasons: List[Tuple[int, str]], ledger: CollectionLedger,
+                           settings: Optional[RefreshScheduleSettings] = None,
+                           now: Optional[datetime] = None,
+                           catalog: Optional[LeagueCatalog] = None) -> List[RefreshSlot]:
+    """
+    Next worthwhile fetch for each incomplete league-season
+
+    A league-season is due when a pending match's result becomes available
+    after its last fetch, when a result is late (retried until it is given
+    up on as postponed), when it is waiting for fixtures, or when its last
+    fetch failed. Only a league's current season, or a cup whose league_end
+    is still ahead, waits for fixtures; an older season that came back empty
+    has no fixtures coming. League-seasons with nothing left to wait for get
+    no slot.
+
+    Args:
+        league_seasons: Incomplete (league_id, season_id) pairs
+        ledger: Collection ledger with the last fetch of each league-season
+        settings: Scheduler settings (None = load from config)
+        now: Current time (UTC)
+        catalog: League catalog for current seasons (None = load it)
+
+    Returns:
+        Slots sorted by due time
+    """
+    settings = settings or load_refresh_schedule_settings()
+    now = now or datetime.now(timezone.utc)
+    pending = get_pending_results(league_seasons)
+    undrawn = get_undrawn_cup_seasons(league_seasons)
+    running_cups = get_running_cup_seasons(league_seasons)
+    catalog = catalog or load_league_catalog()
+
+    slots = []
+    for league_id, season_id in league_seasons:
+        entry = ledger.get("matches", league_id=league_id, season_id=season_id)
+        if entry is None or entry.last_fetched_at is None:
+            slots.append(RefreshSlot(league_id, season_id, now, "never fetched"))
+            continue
+        last_fetched = entry.last_fetched_at
+        if entry.status == 'error':
+            slots.append(RefreshSlot(league_id, season_id, last_fetched + settings.error_retry, "retry after error"))
+            continue
+        if entry.status == 'empty':
+            if catalog.is_current_season(league_id, season_id) or (league_id, season_id) in running_cups:
+                slots.append(RefreshSlot(league_id, season_id, last_fetched + settings.fixture_discovery,
+                                         "waiting for fixtures"))
+            continue
+
+        candidates = []
+        due_times = [result_due_at(d, t, settings) for d, t in pending.get((league_id, season_id), [])]
+        upcoming = [due for due in due_times if due > last_fetched]
+        if upcoming:
+            candidates.append((min(upcoming), "results due"))
+        if any(due <= last_fetched < due + settings.late_result_give_up for due in due_times):
+            candidates.append((last_fetched + settings.late_result_retry, "late results"))
+        if (league_id, season_id) in undrawn:
+            candidates.append((last_fetched + settings.fixture_discovery, "cup rounds without fixtures"))
+
+        if candidates:
+            due_at, reason = min(candidates)
+            slots.append(RefreshSlot(league_id, season_id, due_at, reason))
+
+    return sorted(slots, key=lambda slot: slot.due_at)
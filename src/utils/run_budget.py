@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Run Budget Utility
+Caps a collection run at a number of API calls (--max-api-calls) and/or a
+wall-clock deadline (--deadline). Once either is spent, units are deferred
+instead of started, so the run stops cleanly between units and reports what
+it left for the next run.
+"""
+
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from utils.collection_config import load_collection_config
+from utils.progress import unit_stage
+
+class RunBudgetSettings:
+    """Run budget settings from the `run_budget` config block, re-read when the file changes"""
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Current `run_budget` config block"""
+        return load_collection_config().config.get('run_budget', {})
+
+    @property
+    def deadline_margin_seconds(self) -> float:
+        """Time kept free before the deadline on top of one call"""
+        return self.config.get('deadline_margin_seconds', 60)
+
+    @property
+    def report_deferred(self) -> int:
+        """Deferred units listed in the end-of-run report"""
+        return self.config.get('report_deferred', 20)
+
+def load_run_budget_settings() -> RunBudgetSettings:
+    """Load run budget settings"""
+    return RunBudgetSettings()
+
+def parse_deadline(value: str, now: Optional[datetime] = None) -> datetime:
+    """
+    Wall-clock deadline from a --deadline value
+
+    Args:
+        value: Duration from now ("90m", "2h", "45s"), time of day ("05:30",
+            its next occurrence) or ISO datetime ("2026-10-20T05:30")
+        now: Current local time (None = now)
+
+    Returns:
+        datetime: Local deadline
+
+    Raises:
+        ValueError: If the value is not in one of these forms
+    """
+    now = now or datetime.now()
+    value = value.strip()
+    duration = re.fullmatch(r'(\d+)\s*([smh])', value)
+    if duration:
+        unit = {'s': 'seconds', 'm': 'minutes', 'h': 'hours'}[duration.group(2)]
+        return now + timedelta(**{unit: int(duration.group(1))})
+    time_of_day = re.fullmatch(r'(\d{1,2}):(\d{2})', value)
+    if time_of_day:
+        deadline = now.replace(hour=int(time_of_day.group(1)), minute=int(time_of_day.group(2)),
+                               second=0, microsecond=0)
+        return deadline if deadline > now else deadline + timedelta(days=1)
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid deadline '{value}' (use e.g. 90m, 2h, 05:30 or 2026-10-20T05:30)")
+
+class RunBudget:
+    """
+    API call and time budget of the current collection run
+
+    The API client counts calls into it and work claims ask it before each
+    unit starts. Outside a budgeted run (before begin()) every unit is allowed.
+    """
+
+    def __init__(self, settings: Optional[RunBudgetSettings] = None):
+        """Initialize an inactive budget"""
+        self.settings = settings or load_run_budget_settings()
+        self.active = False
+        self.max_api_calls: Optional[int] = None
+        self.deadline: Optional[datetime] = None
+        self.seconds_per_call = 0.0
+        self.api_calls = 0
+        self.deferred: List[Tuple[str, Dict[str, Any]]] = []
+        self.exhausted: Optional[str] = None
+
+    def begin(self, max_api_calls: Optional[int] = None, deadline: Optional[datetime] = None,
+              seconds_per_call: float = 0.0):
+        """
+        Start budgeting a run (a no-op when neither limit is given)
+
+        Args:
+            max_api_calls: API calls the run may make
+            deadline: Local time by which the run must stop
+            seconds_per_call: Expected duration of one call, kept free before the deadline
+        """
+        self.active = max_api_calls is not None or deadline is not None
+        self.max_api_calls = max_api_calls
+        self.deadline = deadline
+        self.seconds_per_call = seconds_per_call
+        self.api_calls = 0
+        self.deferred = []
+        self.exhausted = None
+        if self.active:
+            limits = []
+            if max_api_calls is not None:
+                limits.append(f"{max_api_calls} API calls")
+            if deadline is not None:
+                limits.append(f"deadline {deadline:%Y-%m-%d %H:%M}")
+            print(f"⏳ Run budget: {' and '.join(limits)}")
+
+    def api_call(self):
+        """Count one API call"""
+        self.api_calls += 1
+
+    @property
+    def remaining_calls(self) -> Optional[int]:
+        """API calls left (None = unlimited)"""
+        if self.max_api_calls is None:
+            return None
+        return max(0, self.max_api_calls - self.api_calls)
+
+    @property
+    def remaining_seconds(self) -> Optional[float]:
+        """Seconds left before the deadline (None = no deadline)"""
+        if self.deadline is None:
+            return None
+        return (self.deadline - datetime.now()).total_seconds()
+
+    def check(self) -> Optional[str]:
+        """Why the budget is spent, or None while units may still start"""
+        if not self.active:
+            return None
+        if self.remaining_calls == 0:
+            return f"API call budget of {self.max_api_calls} spent"
+        remaining = self.remaining_seconds
+        if remaining is not None and remaining < self.seconds_per_call + self.settings.deadline_margin_seconds:
+            return f"deadline {self.deadline:%H:%M} reached"
+        return None
+
+    def allows(self, endpoint: str, params: Dict[str, Any]) -> bool:
+        """
+        Check if a unit may start, deferring it once the budget is spent
+
+        Args:
+            endpoint: API endpoint name (blacklist naming)
+            params: Call parameters
+
+        Returns:
+            bool: True if the unit may be fetched now
+        """
+        reason = self.check()
+        if reason is None:
+            return True
+        self._defer(endpoint, [params], reason)
+        return False
+
+    def allows_batch(self, endpoint: str, params_list: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Units of a batch that fit the budget, deferring the rest
+
+        For loaders that run several calls back to back without asking the
+        budget in between: only as many units as calls (and time) remain are
+        allowed.
+
+        Args:
+            endpoint: API endpoint name (blacklist naming)
+            params_list: Call parameters of each unit, in run order
+
+        Returns:
+            List of the parameters that may be fetched now
+        """
+        reason = self.check()
+        if reason is not None:
+            self._defer(endpoint, params_list, reason)
+            return []
+        fits = len(params_list)
+        if self.remaining_calls is not None and self.remaining_calls < fits:
+            fits = self.remaining_calls
+            reason = f"API call budget of {self.max_api_calls} spent"
+        remaining = self.remaining_seconds
+        if remaining is not None and self.seconds_per_call > 0:
+            calls_left = int((remaining - self.settings.deadline_margin_seconds) // self.seconds_per_call)
+            if calls_left < fits:
+                fits = max(0, calls_left)
+                reason = f"deadline {self.deadline:%H:%M} reached"
+        if fits < len(params_list):
+            self._defer(endpoint, params_list[fits:], reason)
+        return params_list[:fits]
+
+    def _defer(self, endpoint: str, params_list: List[Dict[str, Any]], reason: str):
+        """Record units left for a later run"""
+        if self.exhausted is None:
+            self.exhausted = reason
+            print(f"⏳ Run budget exhausted ({reason}); deferring the remaining units")
+        self.deferred.extend((endpoint, dict(params)) for params in params_list)
+
+    def print_summary(self, run_id: Optional[int] = None):
+        """Print the calls used and the units deferred to a later run"""
+        if not self.active:
+            return
+        used = f"{self.api_calls}" + (f"/{self.max_api_calls}" if self.max_api_calls is not None else "")
+        print(f"\n⏳ Run budget: {used} API calls used", end="")
+        if self.deadline is not None:
+            print(f", {max(0, self.remaining_seconds) / 60:.0f} min left before the deadline", end="")
+        print()
+        if not self.deferred:
+            print("   Nothing deferred")
+            return
+
+        by_stage: Dict[str, int] = {}
+        for endpoint, params in self.deferred:
+            stage = unit_stage(endpoint, params)
+            by_stage[stage] = by_stage.get(stage, 0) + 1
+        print(f"   Deferred {len(self.deferred)} units ({self.exhausted}): "
+              + ", ".join(f"{count} {stage}" for stage, count in by_stage.items()))
+        for endpoint, params in self.deferred[:self.settings.report_deferred]:
+            print(f"     - {endpoint}({', '.join(f'{name}={value}' for name, value in params.items())})")
+        if len(self.deferred) > self.settings.report_deferred:
+            print(f"     ... and {len(self.deferred) - self.settings.report_deferred} more")
+        if run_id is not None:
+            print(f"↩️  Collect the deferred units with --resume {run_id}")
+
+    def end(self):
+        """Stop budgeting (deferred units stay available for the summary)"""
+        self.active = False
+
+_budget: Optional[RunBudget] = None
+
+def get_run_budget() -> RunBudget:
+    """Get the process-wide run budget"""
+    global _budget
+    if _budget is None:
+        _budget = RunBudget()
+    return _budget
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Run Checkpoint Utility
+Keeps the manifest and per-unit state (pending, in_flight, done, failed) of a
+collection run in staging.collection_runs / staging.collection_run_units, so
+an interrupted run can be resumed without repeating finished API calls
+"""
+
+import os
+import json
+import psycopg2.extras
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple
+from dotenv import load_dotenv
+
+from utils.collection_config import load_collection_config
+from utils.collection_ledger import CollectionLedger, ledger_params
+from utils.work_claims import WorkUnit
+from utils.db import connect
+from utils.tracing import traced
+
+UNIT_STATES = ['pending', 'in_flight', 'done', 'failed']
+
+class RunCheckpoint:
+    """
+    Per-unit state of one collection run
+
+    State changes are kept in memory and flushed every checkpoint_interval
+    changes, in statements of batch_size rows. Changes lost in a crash are
+    recovered on resume from the collection ledger, which records every
+    fetch as it is committed.
+    """
+
+    def __init__(self, run_id: int, started_at: datetime, args: Dict[str, Any],
+                 states: Optional[Dict[Tuple[str, str], str]] = None,
+                 database_url: Optional[str] = None):
+        """Initialize the checkpoint of a started or resumed run"""
+        self.run_id = run_id
+        self.started_at = started_at
+        self.args = args
+        self.states = states or {}
+        self.database_url = database_url
+        self._dirty: Dict[Tuple[str, str], Tuple[str, Optional[str]]] = {}
+        defaults = load_collection_config().defaults
+        self.checkpoint_interval = defaults.get('checkpoint_interval', 50)
+        self.batch_size = defaults.get('batch_size', 10)
+
+    @staticmethod
+    def _key(endpoint: str, params: Dict[str, Any]) -> Tuple[str, str]:
+        """Lookup key of a unit (same form as the collection ledger)"""
+        return endpoint, json.dumps(ledger_params(**params), sort_keys=True)
+
+    def state(self, endpoint: str, **params) -> Optional[str]:
+        """State of a unit in this run, if it is in the manifest"""
+        return self.states.get(self._key(endpoint, params))
+
+    def is_done(self, endpoint: str, **params) -> bool:
+        """Check if this run already finished a unit"""
+        return self.state(endpoint, **params) == 'done'
+
+    def mark(self, endpoint: str, params: Dict[str, Any], state: str,
+             error_message: Optional[str] = None):
+        """
+        Set a unit's state, flushing once checkpoint_interval changes are pending
+
+        Args:
+            endpoint: API endpoint name (blacklist naming)
+            params: Call parameters
+            state: 'pending', 'in_flight', 'done' or 'failed'
+            error_message: Error text for failed units
+        """
+        key = self._key(endpoint, params)
+        self.states[key] = state
+        self._dirty[key] = (state, error_message)
+        if len(self._dirty) >= self.checkpoint_interval:
+            self.flush()
+
+    def add_pending(self, units: Iterable[WorkUnit]) -> int:
+        """Add planned units to the manifest (units already in it keep their state)"""
+        added = 0
+        for unit in units:
+            key = self._key(unit.endpoint, unit.params)
+            if key not in self.states:
+                self.states[key] = 'pending'
+                self._dirty[key] = ('pending', None)
+                added += 1
+        self.flush()
+        return added
+
+    def reconcile(self, ledger: CollectionLedger) -> int:
+        """
+        Mark units the ledger shows fetched since the run started as done
+
+        Covers state changes that were not flushed before a crash.
+
+        Returns:
+            int: Units newly marked done
+        """
+        reconciled = 0
+        for entry in ledger.entries.values():
+            if entry.status not in ('ok', 'empty') or entry.last_fetched_at is None \
+                    or entry.last_fetched_at < self.started_at:
+                continue
+            if not self.is_done(entry.endpoint, **entry.params):
+                self.mark(entry.endpoint, entry.params, 'done')
+                reconciled += 1
+        return reconciled
+
+    @traced("db.checkpoint_flush")
+    def flush(self):
+        """Write pending state changes (kept for the next flush if the write fails)"""
+        if not self._dirty:
+            return
+        rows = [
+            (self.run_id, endpoint, params, state, 1 if state == 'in_flight' else 0, error_message)
+            for (endpoint, params), (state, error_message) in self._dirty.items()
+        ]
+        try:
+            with connect(self.database_url) as conn:
+                with conn.cursor() as cur:
+                    psycopg2.extras.execute_values(cur, """
+                        INSERT INTO staging.collection_run_units
+                            (run_id, endpoint, params, state, attempts, error_message)
+                        VALUES %s
+                        ON CONFLICT (run_id, endpoint, params) DO UPDATE SET
+                            state = EXCLUDED.state,
+                            attempts = staging.collection_run_units.attempts + EXCLUDED.attempts,
+                            error_message = EXCLUDED.error_message
+                    """, rows, template="(%s, %s, %s::jsonb, %s, %s, %s)",
+                        page_size=max(1, self.batch_size))
+                    cur.execute("""
+                        UPDATE staging.collection_runs
+                        SET checkpointed_at = CURRENT_TIMESTAMP
+                        WHERE run_id = %s
+                    """, (self.run_id,))
+            self._dirty.clear()
+        except Exception as e:
+            print(f"⚠️ Error writing checkpoint for run {self.run_id}: {e}")
+
+    def finish(self, status: str):
+        """Flush and record how the run ended ('completed', 'failed' or 'interrupted')"""
+        self.flush()
+        try:
+            with connect(self.database_url) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        UPDATE staging.collection_runs
+                        SET status = %s, finished_at = CURRENT_TIMESTAMP
+                        WHERE run_id = %s
+                    """, (status, self.run_id))
+        except Exception as e:
+            print(f"⚠️ Error recording the end of run {self.run_id}: {e}")
+
+    def summary(self) -> Dict[str, int]:
+        """Count units by state"""
+        counts = {state: 0 for state in UNIT_STATES}
+        for state in self.states.values():
+            counts[state] = counts.get(state, 0) + 1
+        return counts
+
+    def print_summary(self):
+        """Print unit counts by state"""
+        counts = self.summary()
+        print(f"📍 Run {self.run_id}: " + ", ".join(f"{counts[state]} {state}" for state in UNIT_STATES))
+
+def start_run(args: Dict[str, Any], database_url: Optional[str] = None) -> RunCheckpoint:
+    """
+    Record a new collection run
+
+    Args:
+        args: Collection arguments needed to resume the run
+        database_url: Database URL (defaults to DATABASE_URL)
+
+    Returns:
+        RunCheckpoint with an empty manifest
+    """
+    load_dotenv()
+    database_url = database_url or os.getenv('DATABASE_URL')
+    with connect(database_url) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                INSERT INTO staging.collection_runs (args)
+                VALUES (%s::jsonb)
+                RETURNING run_id, started_at
+            """, (json.dumps(args),))
+            run_id, started_at = cur.fetchone()
+    print(f"📍 Started collection run {run_id}")
+    return RunCheckpoint(run_id, started_at, args, database_url=database_url)
+
+def resume_run(run_id: int, database_url: Optional[str] = None) -> RunCheckpoint:
+    """
+    Load an unfinished run with its checkpointed unit states
+
+    Units left in_flight by the interruption are fetched again; done units are not.
+
+    Args:
+        run_id: Run to resume
+        database_url: Database URL (defaults to DATABASE_URL)
+
+    Returns:
+        RunCheckpoint of the run
+
+    Raises:
+        ValueError: If the run does not exist or already completed
+    """
+    load_dotenv()
+    database_url = database_url or os.getenv('DATABASE_URL')
+    with connect(database_url) as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT args, status, started_at
+                FROM staging.collection_runs
+                WHERE run_id = %s
+            """, (run_id,))
+            row = cur.fetchone()
+            if row is None:
+                raise ValueError(f"Collection run {run_id} not found")
+            args, status, started_at = row
+            if status == 'completed':
+                raise ValueError(f"Collection run {run_id} already completed")
+
+            cur.execute("""
+                SELECT endpoint, params, state
+                FROM staging.collection_run_units
+                WHERE run_id = %s
+            """, (run_id,))
+            states = {
+                RunCheckpoint._key(endpoint, params): state
+                for endpoint, params, state in cur.fetchall()
+            }
+
+            cur.execute("""
+                UPDATE staging.collection_runs
+                SET status = 'running', finished_at = NULL, resume_count = resume_count + 1
+                WHERE run_id = %s
+            """, (run_id,))
+
+    checkpoint = RunCheckpoint(run_id, started_at, args, states, database_url)
+    print(f"📍 Resuming collection run {run_id} (was {status})")
+    checkpoint.print_summary()
+    return checkpoint
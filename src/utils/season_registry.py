@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Season Registry Utility
+Keeps staging.season_finalization: historical league-seasons whose data is
+complete and verified are finalized, and expected seasons /league-seasons
+does not list are marked absent. The collection ledger, league catalog and
+crawl planner exclude both, so they are never fetched again unless
+--refinalize is given.
+"""
+
+import os
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from dotenv import load_dotenv
+
+from utils.collection_config import load_collection_config
+from utils.db import connect
+from utils.tracing import traced
+
+class SeasonFinalizationSettings:
+    """Finalization settings from the `season_finalization` config block, re-read when the file changes"""
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Current `season_finalization` config block"""
+        return load_collection_config().config.get('season_finalization', {})
+
+    @property
+    def buffer_days(self) -> int:
+        """Days after a season's last fixture before it can be finalized"""
+        return self.config.get('buffer_days', 7)
+
+def load_season_finalization_settings() -> SeasonFinalizationSettings:
+    """Load season finalization settings"""
+    return SeasonFinalizationSettings()
+
+# Seasons with a newer season listed, a last fixture past the buffer, every match
+# scored, a successful /matches fetch and every match covered by team matches
+FINALIZE_QUERY = """
+    SELECT m.league_id, m.season_id, MAX(m.match_date), COUNT(*)
+    FROM (
+        SELECT lm.league_id, lm.season_id, lm.match_date,
+               lm.match_id IS NOT NULL
+               AND lm.home_team_score IS NOT NULL
+               AND lm.away_team_score IS NOT NULL
+               AND EXISTS (
+                   SELECT 1 FROM staging.team_matches tm
+                   WHERE tm.league_id = lm.league_id
+                     AND tm.season_id = lm.season_id
+                     AND tm.match_id = lm.match_id
+                     AND tm.goals_for IS NOT NULL
+               ) AS verified
+        FROM staging.league_matches lm
+        WHERE {pair_filter}
+    ) m
+    JOIN staging.collection_ledger cl
+      ON cl.endpoint = 'matches'
+     AND cl.params = jsonb_build_object('league_id', m.league_id, 'season_id', m.season_id)
+     AND cl.status = 'ok'
+    WHERE NOT EXISTS (
+        SELECT 1 FROM staging.leagues l
+        WHERE l.league_id = m.league_id AND l.last_season = m.season_id
+    )
+    GROUP BY m.league_id, m.season_id
+    HAVING MAX(m.match_date) + %s::interval < CURRENT_DATE
+       AND BOOL_AND(m.verified)
+"""
+
+class SeasonRegistry:
+    """
+    In-memory view of staging.season_finalization, loaded on first use
+
+    With refinalize set, nothing counts as finalized or absent for this
+    process, and finalize() re-evaluates the seasons it is given.
+    """
+
+    def __init__(self, database_url: Optional[str] = None,
+                 settings: Optional[SeasonFinalizationSettings] = None):
+        """Initialize an unloaded registry"""
+        self.database_url = database_url
+        self.settings = settings or load_season_finalization_settings()
+        self.refinalize = False
+        self._statuses: Optional[Dict[Tuple[int, str], str]] = None
+
+    @property
+    def statuses(self) -> Dict[Tuple[int, str], str]:
+        """(league_id, season_id) -> 'finalized' or 'absent'"""
+        if self._statuses is None:
+            self._statuses = self._load()
+        return self._statuses
+
+    @traced("db.season_registry_load")
+    def _load(self) -> Dict[Tuple[int, str], str]:
+        """Read the registry in a single query (empty if the table is unavailable)"""
+        try:
+            load_dotenv()
+            with connect(self.database_url or os.getenv('DATABASE_URL')) as conn:
+                with conn.cursor() as cur:
+                    cur.execute("SELECT league_id, season_id, status FROM staging.season_finalization")
+                    return {(league_id, season_id): status for league_id, season_id, status in cur.fetchall()}
+        except Exception as e:
+            print(f"⚠️ Error loading season finalization registry: {e}")
+            return {}
+
+    def invalidate(self):
+        """Reload the registry on next use (e.g. for the next job of a long-lived collector)"""
+        self._statuses = None
+
+    def is_finalized(self, league_id: Any, season_id: Any) -> bool:
+        """Check if a league-season is finalized (never with refinalize)"""
+        if self.refinalize or league_id is None or season_id is None:
+            return False
+        return self.statuses.get((int(league_id), str(season_id))) == 'finalized'
+
+    def absent_seasons(self, league_id: int) -> Set[str]:
+        """Expected seasons of a league the API does not list (none with refinalize)"""
+        if self.refinalize:
+            return set()
+        return {
+            season_id for (absent_league_id, season_id), status in self.statuses.items()
+            if absent_league_id == league_id and status == 'absent'
+        }
+
+    def mark_absent(self, cur, league_id: int, absent: Iterable[str], listed: Iterable[str]) -> int:
+        """
+        Record a /league-seasons response: expected seasons it lacks are absent
+
+        Args:
+            cur: Cursor to write with, committed by the caller
+            league_id: League ID
+            absent: Historical expected seasons the response did not list
+            listed: Seasons the response listed (their absent rows are dropped)
+
+        Returns:
+            int: Absent seasons recorded
+        """
+        absent, listed = sorted(set(absent)), sorted(set(listed))
+        if listed:
+            cur.execute("""
+                DELETE FROM staging.season_finalization
+                WHERE league_id = %s AND status = 'absent' AND season_id = ANY(%s)
+            """, (league_id, listed))
+        for season_id in absent:
+            cur.execute("""
+                INSERT INTO staging.season_finalization (league_id, season_id, status)
+                VALUES (%s, %s, 'absent')
+                ON CONFLICT (league_id, season_id) DO NOTHING
+            """, (league_id, season_id))
+        if self._statuses is not None:
+            for season_id in listed:
+                if self._statuses.get((league_id, season_id)) == 'absent':
+                    del self._statuses[(league_id, season_id)]
+            for season_id in absent:
+                self._statuses.setdefault((league_id, season_id), 'absent')
+        return len(absent)
+
+    @traced("db.finalize_seasons")
+    def finalize(self, league_seasons: Optional[List[Tuple[int, str]]] = None) -> int:
+        """
+        Finalize league-seasons that are complete and verified
+
+        Args:
+            league_seasons: Candidate (league_id, season_id) pairs (None = every
+                league-season not finalized yet, or every one with refinalize)
+
+        Returns:
+            int: Seasons finalized
+        """
+        if league_seasons is not None:
+            pairs = [(league_id, season_id) for league_id, season_id in league_seasons
+                     if self.refinalize or not self.is_finalized(league_id, season_id)]
+            if not pairs:
+                return 0
+            pair_filter = "(lm.league_id, lm.season_id) IN (SELECT * FROM unnest(%s::int[], %s::text[]))"
+            params: List[Any] = [[league_id for league_id, _ in pairs], [season_id for _, season_id in pairs]]
+        elif self.refinalize:
+            pair_filter, params = "TRUE", []
+        else:
+            pair_filter = """NOT EXISTS (
+                SELECT 1 FROM staging.season_finalization sf
+                WHERE sf.league_id = lm.league_id AND sf.season_id = lm.season_id
+            )"""
+            params = []
+        params.append(f"{self.settings.buffer_days} days")
+
+        try:
+            load_dotenv()
+            with connect(self.database_url or os.getenv('DATABASE_URL')) as conn:
+                with conn.cursor() as cur:
+                    if self.refinalize:
+                        # Re-evaluate: seasons that no longer qualify lose their finalization
+                        if league_seasons is None:
+                            cur.execute("DELETE FROM staging.season_finalization WHERE status = 'finalized'")
+                        else:
+                            cur.execute("""
+                                DELETE FROM staging.season_finalization
+                                WHERE status = 'finalized'
+                                  AND (league_id, season_id) IN (SELECT * FROM unnest(%s::int[], %s::text[]))
+                            """, params[:2])
+                    cur.execute(FINALIZE_QUERY.format(pair_filter=pair_filter), params)
+                    rows = cur.fetchall()
+                    for league_id, season_id, last_match_date, match_count in rows:
+                        cur.execute("""
+                            INSERT INTO staging.season_finalization
+                                (league_id, season_id, status, last_match_date, match_count)
+                            VALUES (%s, %s, 'finalized', %s, %s)
+                            ON CONFLICT (league_id, season_id) DO UPDATE SET
+                                status = EXCLUDED.status,
+                                last_match_date = EXCLUDED.last_match_date,
+                                match_count = EXCLUDED.match_count,
+                                finalized_at = CURRENT_TIMESTAMP
+                        """, (league_id, season_id, last_match_date, match_count))
+        except Exception as e:
+            print(f"⚠️ Error finalizing seasons: {e}")
+            return 0
+
+        self.invalidate()
+        if rows:
+            print(f"🔒 Finalized {len(rows)} league-seasons (complete and verified)")
+        return len(rows)
+
+_registry: Optional[SeasonRegistry] = None
+
+def get_season_registry() -> SeasonRegistry:
+    """Get the process-wide season registry"""
+    global _registry
+    if _registry is None:
+        _registry = SeasonRegistry()
+    return _registry
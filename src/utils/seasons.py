@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Season Utility
+Parses FBR season IDs ("2024", "2024-2025") into integer years and compiles
+time periods into integer range predicates
+"""
+
+import re
+import functools
+from datetime import datetime
+from typing import List, Optional, Tuple
+from dataclasses import dataclass
+
+from utils.config_cache import config_mtime
+
+SEASON_PATTERN = re.compile(r"^(\d{4})(?:-(\d{4}))?$")
+
+# Season ID formats
+SINGLE_YEAR = "YYYY"
+SPLIT_YEAR = "YYYY-YYYY"
+
+@dataclass(frozen=True)
+class Season:
+    """A parsed season ID"""
+    season_id: str
+    start_year: int
+    end_year: int
+    format: str
+
+def parse_season(season_id: Optional[str]) -> Optional[Season]:
+    """
+    Parse a season ID into its years and format
+
+    Args:
+        season_id: Season ID (e.g., "2024" or "2024-2025")
+
+    Returns:
+        Season, or None if the ID is not in a known format
+    """
+    if not season_id:
+        return None
+    match = SEASON_PATTERN.match(season_id.strip())
+    if not match:
+        return None
+    start_year = int(match.group(1))
+    if match.group(2):
+        return Season(season_id, start_year, int(match.group(2)), SPLIT_YEAR)
+    return Season(season_id, start_year, start_year, SINGLE_YEAR)
+
+def season_start_year(season_id: Optional[str]) -> Optional[int]:
+    """Start year of a season ID, or None if it cannot be parsed"""
+    season = parse_season(season_id)
+    return season.start_year if season else None
+
+def format_season(start_year: int, season_format: str) -> str:
+    """Build a season ID for a start year in the given format"""
+    if season_format == SINGLE_YEAR:
+        return str(start_year)
+    return f"{start_year}-{start_year + 1}"
+
+@dataclass(frozen=True)
+class SeasonRange:
+    """Inclusive range of season start years (None = unbounded)"""
+    start_year: Optional[int] = None
+    end_year: Optional[int] = None
+
+    def contains(self, season_id: str) -> bool:
+        """Check if a season ID starts within this range"""
+        start_year = season_start_year(season_id)
+        if start_year is None:
+            return False
+        if self.start_year is not None and start_year < self.start_year:
+            return False
+        if self.end_year is not None and start_year > self.end_year:
+            return False
+        return True
+
+    def sql(self, column: str = "season_start_year") -> Tuple[str, List[int]]:
+        """
+        Compile the range into a predicate on an integer start-year column
+
+        Args:
+            column: Start year column (e.g., "ls.season_start_year")
+
+        Returns:
+            Tuple of (" AND ..." clause, params)
+        """
+        if self.start_year is not None and self.end_year is not None:
+            return f" AND {column} BETWEEN %s AND %s", [self.start_year, self.end_year]
+        if self.start_year is not None:
+            return f" AND {column} >= %s", [self.start_year]
+        if self.end_year is not None:
+            return f" AND {column} <= %s", [self.end_year]
+        return "", []
+
+    def seasons(self, season_format: str, max_start_year: Optional[int] = None) -> List[str]:
+        """
+        Enumerate the season IDs in this range for one season format
+
+        Args:
+            season_format: SINGLE_YEAR or SPLIT_YEAR
+            max_start_year: Latest season start year available (None = current year)
+
+        Returns:
+            List of season IDs, oldest first (empty if the range has no start)
+        """
+        if self.start_year is None:
+            return []
+        last = max_start_year if max_start_year is not None else datetime.now().year
+        if self.end_year is not None:
+            last = min(last, self.end_year)
+        return [format_season(year, season_format) for year in range(self.start_year, last + 1)]
+
+def range_from_pattern(pattern: str) -> Optional[SeasonRange]:
+    """Derive a start-year range from a legacy alternation pattern like "^(2024|2024-2025)$" """
+    alternatives = pattern.strip().lstrip("^").rstrip("$").strip("()").split("|")
+    start_years = [season_start_year(alternative) for alternative in alternatives]
+    start_years = [year for year in start_years if year is not None]
+    if not start_years:
+        return None
+    return SeasonRange(min(start_years), max(start_years))
+
+def resolve_season_range(time_period: Optional[str],
+                         config_path: str = "config/collection_config.yaml") -> Optional[SeasonRange]:
+    """
+    Compile a time period into a season start-year range (memoized until the config changes)
+
+    Args:
+        time_period: Time period name from config (e.g., "default_2024", "2020s"),
+            "recent_seasons", a season ID (e.g., "2024"), or a legacy pattern
+        config_path: Collection config with the time period definitions
+
+    Returns:
+        SeasonRange, or None when no time period is given
+
+    Raises:
+        ValueError: If the time period cannot be interpreted
+    """
+    if not time_period:
+        return None
+    return _resolve_season_range(time_period, config_path, config_mtime(config_path), datetime.now().year)
+
+@functools.lru_cache(maxsize=None)
+def _resolve_season_range(time_period: str, config_path: str,
+                          mtime: float, current_year: int) -> Optional[SeasonRange]:
+    """Memoized resolve_season_range, keyed on the config version and year ("recent_seasons")"""
+    from utils.collection_config import load_collection_config
+    configured = load_collection_config(config_path).get_time_period(time_period)
+    if configured:
+        return configured.season_range()
+
+    if time_period == "recent_seasons":
+        return SeasonRange(current_year - 4, current_year)
+
+    season = parse_season(time_period)
+    if season:
+        return SeasonRange(season.start_year, season.start_year)
+
+    season_range = range_from_pattern(time_period)
+    if season_range:
+        return season_range
+
+    raise ValueError(f"Unrecognized time period: {time_period}")
+
+def season_filter_sql(time_period: Optional[str], column: str = "season_start_year") -> Tuple[str, List[int]]:
+    """Compile a time period into an " AND ..." predicate on an integer start-year column"""
+    season_range = resolve_season_range(time_period)
+    if season_range is None:
+        return "", []
+    return season_range.sql(column)
@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+Shadow Table Swap Utility
+Full refreshes for small staging tables: bulk-load a shadow copy without
+indexes, build its indexes after the load, validate row counts and swap it in
+with a rename
+"""
+
+import os
+import psycopg2
+import psycopg2.extras
+from typing import Any, List, Optional, Sequence, Tuple
+from dotenv import load_dotenv
+
+from utils.db import connect
+from utils.progress import get_progress_reporter
+from utils.tracing import traced
+
+# Refuse to swap in a table that lost more than 10% of the live rows
+MIN_ROW_RATIO = 0.9
+
+# Postgres identifier length limit
+MAX_IDENTIFIER_LENGTH = 63
+
+class ShadowTable:
+    """
+    Shadow copy of a staging table, swapped in by renaming
+
+    Every step runs on the caller's cursor, so the whole refresh is one
+    transaction: readers keep seeing the old table until commit, and a failed
+    refresh rolls back without leaving a shadow behind. lock_live() blocks
+    writers from before the live rows are copied until the final rename, so no
+    concurrent write is lost with the old table.
+    """
+
+    def __init__(self, cur, table: str, schema: str = "staging"):
+        """Initialize the shadow for schema.table"""
+        self.cur = cur
+        self.schema = schema
+        self.table = table
+        self.shadow = self._shadow_name(table)
+
+    @staticmethod
+    def _shadow_name(name: str) -> str:
+        """Name used for the shadow copy of a table, index or constraint"""
+        return f"{name[:MAX_IDENTIFIER_LENGTH - len('_shadow')]}_shadow"
+
+    @property
+    def qualified(self) -> str:
+        """Schema-qualified live table name"""
+        return f"{self.schema}.{self.table}"
+
+    @property
+    def qualified_shadow(self) -> str:
+        """Schema-qualified shadow table name"""
+        return f"{self.schema}.{self.shadow}"
+
+    def columns(self) -> List[str]:
+        """Writable (non-generated) columns of the live table, in table order"""
+        self.cur.execute("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_schema = %s AND table_name = %s AND is_generated = 'NEVER'
+            ORDER BY ordinal_position
+        """, (self.schema, self.table))
+        return [row[0] for row in self.cur.fetchall()]
+
+    def lock_live(self):
+        """Block writes to the live table (reads continue) until the transaction ends"""
+        self.cur.execute(f"LOCK TABLE {self.qualified} IN SHARE ROW EXCLUSIVE MODE")
+
+    def create(self):
+        """Create an empty shadow with the live table's columns, defaults and triggers"""
+        self.cur.execute(f"DROP TABLE IF EXISTS {self.qualified_shadow}")
+        self.cur.execute(f"""
+            CREATE TABLE {self.qualified_shadow} (
+                LIKE {self.qualified}
+                INCLUDING DEFAULTS INCLUDING GENERATED INCLUDING CONSTRAINTS INCLUDING COMMENTS
+            )
+        """)
+
+        # Table comment is not copied by LIKE
+        self.cur.execute("SELECT obj_description(%s::regclass, 'pg_class')", (self.qualified,))
+        comment = self.cur.fetchone()[0]
+        if comment:
+            self.cur.execute(f"COMMENT ON TABLE {self.qualified_shadow} IS %s", (comment,))
+
+        # Triggers before the load, so insert-time side effects (e.g. season registration) still run
+        self.cur.execute("""
+            SELECT pg_get_triggerdef(oid)
+            FROM pg_trigger
+            WHERE tgrelid = %s::regclass AND NOT tgisinternal
+        """, (self.qualified,))
+        for (definition,) in self.cur.fetchall():
+            self.cur.execute(self._retarget(definition, f" ON {self.qualified} ", f" ON {self.qualified_shadow} "))
+
+    def copy_live_rows(self, where: str, params: Sequence[Any] = ()) -> int:
+        """
+        Carry rows that are not being refreshed over from the live table
+
+        Args:
+            where: SQL condition selecting the live rows to keep
+            params: Parameters for the condition
+
+        Returns:
+            int: Number of rows copied
+        """
+        column_list = ", ".join(self.columns())
+        self.cur.execute(f"""
+            INSERT INTO {self.qualified_shadow} ({column_list})
+            SELECT {column_list} FROM {self.qualified} WHERE {where}
+        """, list(params))
+        return self.cur.rowcount
+
+    @traced("db.shadow_load")
+    def load(self, columns: List[str], rows: List[Tuple], page_size: int = 1000) -> int:
+        """
+        Bulk-insert rows into the shadow
+
+        A raw_data_hash column takes the serialized raw payload and stores it
+        through staging.store_raw_payload.
+
+        Args:
+            columns: Column names, in row order
+            rows: Row tuples
+            page_size: Rows per INSERT statement
+
+        Returns:
+            int: Number of rows loaded
+        """
+        if not rows:
+            return 0
+        template = "(" + ", ".join(
+            "staging.store_raw_payload(%s::jsonb)" if column == "raw_data_hash" else "%s"
+            for column in columns
+        ) + ")"
+        psycopg2.extras.execute_values(
+            self.cur,
+            f"INSERT INTO {self.qualified_shadow} ({', '.join(columns)}) VALUES %s",
+            rows,
+            template=template,
+            page_size=page_size
+        )
+        return len(rows)
+
+    def validate(self, expected_rows: int, min_ratio: float = MIN_ROW_RATIO):
+        """
+        Check the shadow row count before swapping
+
+        Args:
+            expected_rows: Rows the shadow must contain (loaded plus carried over)
+            min_ratio: Minimum shadow/live row ratio
+
+        Raises:
+            ValueError: If the shadow is empty, has an unexpected row count,
+                or shrank by more than min_ratio allows
+        """
+        self.cur.execute(f"SELECT COUNT(*) FROM {self.qualified_shadow}")
+        shadow_rows = self.cur.fetchone()[0]
+        self.cur.execute(f"SELECT COUNT(*) FROM {self.qualified}")
+        live_rows = self.cur.fetchone()[0]
+
+        if shadow_rows == 0:
+            raise ValueError(f"Shadow of {self.qualified} is empty")
+        if shadow_rows != expected_rows:
+            raise ValueError(f"Shadow of {self.qualified} has {shadow_rows} rows, expected {expected_rows}")
+        if shadow_rows < live_rows * min_ratio:
+            raise ValueError(
+                f"Shadow of {self.qualified} has {shadow_rows} rows, "
+                f"below {min_ratio:.0%} of the {live_rows} live rows"
+            )
+        print(f"✅ Shadow of {self.qualified} validated: {shadow_rows} rows (live: {live_rows})")
+
+    def build_indexes(self):
+        """Build the live table's constraints and indexes on the loaded shadow"""
+        # Primary key, unique and exclusion constraints
+        self.cur.execute("""
+            SELECT conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'x')
+        """, (self.qualified,))
+        for name, definition in self.cur.fetchall():
+            self.cur.execute(
+                f"ALTER TABLE {self.qualified_shadow} ADD CONSTRAINT {self._shadow_name(name)} {definition}"
+            )
+
+        # Remaining indexes
+        self.cur.execute("""
+            SELECT i.relname, pg_get_indexdef(i.oid)
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            WHERE x.indrelid = %s::regclass
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid)
+        """, (self.qualified,))
+        for name, definition in self.cur.fetchall():
+            self.cur.execute(self._retarget(
+                definition,
+                f" INDEX {name} ON {self.qualified} ",
+                f" INDEX {self._shadow_name(name)} ON {self.qualified_shadow} "
+            ))
+
+        self.cur.execute(f"ANALYZE {self.qualified_shadow}")
+
+    def swap(self):
+        """Replace the live table with the shadow and restore the original index names"""
+        self.cur.execute(f"LOCK TABLE {self.qualified} IN ACCESS EXCLUSIVE MODE")
+
+        # Serial sequences are shared through the copied defaults; move ownership
+        # so dropping the old table keeps them
+        for column in self.columns():
+            self.cur.execute("SELECT pg_get_serial_sequence(%s, %s)", (self.qualified, column))
+            sequence = self.cur.fetchone()[0]
+            if sequence:
+                self.cur.execute(f"ALTER SEQUENCE {sequence} OWNED BY {self.qualified_shadow}.{column}")
+
+        # Names the shadow's constraints and indexes must take over
+        self.cur.execute("""
+            SELECT i.relname, c.conname
+            FROM pg_index x
+            JOIN pg_class i ON i.oid = x.indexrelid
+            LEFT JOIN pg_constraint c ON c.conindid = x.indexrelid AND c.conrelid = x.indrelid
+            WHERE x.indrelid = %s::regclass
+        """, (self.qualified,))
+        names = self.cur.fetchall()
+
+        self.cur.execute(f"DROP TABLE {self.qualified}")
+        self.cur.execute(f"ALTER TABLE {self.qualified_shadow} RENAME TO {self.table}")
+
+        for index_name, constraint_name in names:
+            if constraint_name:
+                self.cur.execute(
+                    f"ALTER TABLE {self.qualified} RENAME CONSTRAINT "
+                    f"{self._shadow_name(constraint_name)} TO {constraint_name}"
+                )
+            else:
+                self.cur.execute(
+                    f"ALTER INDEX {self.schema}.{self._shadow_name(index_name)} RENAME TO {index_name}"
+                )
+
+    @staticmethod
+    def _retarget(definition: str, old: str, new: str) -> str:
+        """Point a catalog-generated definition at the shadow"""
+        if old not in definition:
+            raise ValueError(f"Cannot retarget definition: {definition}")
+        return definition.replace(old, new, 1)
+
+def refresh_table(table: str, columns: List[str], rows: List[Tuple],
+                  key_columns: List[str], keep_where: Optional[str] = None,
+                  keep_params: Sequence[Any] = (), min_ratio: float = MIN_ROW_RATIO,
+                  database_url: Optional[str] = None) -> bool:
+    """
+    Fully refresh a staging table through an atomic shadow-table swap
+
+    Args:
+        table: Staging table name (e.g., "countries")
+        columns: Columns supplied by each row (raw_data_hash takes the serialized payload)
+        rows: Fresh rows from the API
+        key_columns: Unique key columns; later rows replace earlier ones with the same key
+        keep_where: Condition selecting live rows outside the refreshed scope to keep
+            (None = replace the whole table)
+        keep_params: Parameters for keep_where
+        min_ratio: Minimum new/old row ratio accepted for the swap
+        database_url: Database URL (defaults to DATABASE_URL)
+
+    Returns:
+        bool: True if the new table was swapped in, False otherwise
+    """
+    # Same key twice would violate the unique constraint; keep the last, like an upsert
+    key_positions = [columns.index(column) for column in key_columns]
+    unique_rows = list({tuple(row[i] for i in key_positions): row for row in rows}.values())
+    if len(unique_rows) < len(rows):
+        print(f"ℹ️ Collapsed {len(rows) - len(unique_rows)} duplicate rows for staging.{table}")
+
+    print(f"🔁 Full refresh of staging.{table} via shadow table")
+
+    try:
+        load_dotenv()
+        with connect(database_url or os.getenv('DATABASE_URL')) as conn:
+            with conn.cursor() as cur:
+                shadow = ShadowTable(cur, table)
+                # Writes committed after the live rows are copied would be dropped by the swap
+                shadow.lock_live()
+                shadow.create()
+
+                kept = shadow.copy_live_rows(keep_where, keep_params) if keep_where else 0
+                loaded = shadow.load(columns, unique_rows)
+                print(f"📥 Loaded {loaded} fresh rows, kept {kept} rows outside the refresh scope")
+
+                shadow.validate(loaded + kept, min_ratio)
+                shadow.build_indexes()
+                shadow.swap()
+
+        print(f"✅ Swapped in refreshed staging.{table}")
+        get_progress_reporter().rows_written(loaded)
+        return True
+
+    except Exception as e:
+        print(f"❌ Full refresh of staging.{table} failed, live table unchanged: {e}")
+        return False
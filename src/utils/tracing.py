@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Tracing Utility
+Lightweight spans around orchestrator stages, work units, API requests and
+database batches. Finished spans are appended to a JSONL file in the OTLP
+span JSON shape, converted to Chrome trace format for Perfetto or
+chrome://tracing, and summarized by self-time per span name.
+"""
+
+import os
+import json
+import time
+import threading
+import functools
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, Iterator, List, Optional
+
+from utils.collection_config import load_collection_config
+from utils.profiling import get_profiler
+
+class TracingSettings:
+    """Tracing settings from the `tracing` config block, re-read when the file changes"""
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Current `tracing` config block"""
+        return load_collection_config().config.get('tracing', {})
+
+    @property
+    def enabled(self) -> bool:
+        """Trace every collection run (--trace traces a single run)"""
+        return self.config.get('enabled', False)
+
+    @property
+    def trace_file(self) -> str:
+        """JSONL file spans are appended to"""
+        return self.config.get('trace_file', 'logs/trace.jsonl')
+
+    @property
+    def chrome_trace(self) -> bool:
+        """Also write <trace_file>.chrome.json for trace viewers at the end of a run"""
+        return self.config.get('chrome_trace', True)
+
+    @property
+    def summary_top(self) -> int:
+        """Span names listed in the end-of-run self-time summary"""
+        return self.config.get('summary_top', 20)
+
+def load_tracing_settings() -> TracingSettings:
+    """Load tracing settings"""
+    return TracingSettings()
+
+class Span:
+    """One timed operation; child time is subtracted for its self-time"""
+
+    __slots__ = ('name', 'span_id', 'parent_id', 'attributes', 'start_ns', 'child_ns', 'error')
+
+    def __init__(self, name: str, span_id: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start_ns = time.time_ns()
+        self.child_ns = 0
+        self.error: Optional[str] = None
+
+def otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Attributes as OTLP key/value pairs"""
+    pairs = []
+    for key, value in attributes.items():
+        if isinstance(value, bool):
+            typed = {'boolValue': value}
+        elif isinstance(value, int):
+            typed = {'intValue': str(value)}
+        elif isinstance(value, float):
+            typed = {'doubleValue': value}
+        else:
+            typed = {'stringValue': str(value)}
+        pairs.append({'key': key, 'value': typed})
+    return pairs
+
+class Tracer:
+    """
+    Process-wide tracer, idle until begin()
+
+    Spans nest per thread. While idle, span() costs one attribute check.
+    """
+
+    def __init__(self, settings: Optional[TracingSettings] = None):
+        """Initialize an idle tracer"""
+        self.settings = settings or load_tracing_settings()
+        self.enabled = False
+        self.trace_id: Optional[str] = None
+        self.path: Optional[str] = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # name -> [count, total_ns, self_ns]
+        self.totals: Dict[str, List[int]] = {}
+
+    def _stack(self) -> List[Span]:
+        """Open spans of the current thread"""
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def begin(self, path: Optional[str] = None):
+        """
+        Start tracing a run
+
+        Args:
+            path: JSONL file to append spans to (None = tracing.trace_file)
+        """
+        self.path = path or self.settings.trace_file
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, 'a')
+        self.trace_id = os.urandom(16).hex()
+        self.totals = {}
+        self.enabled = True
+        print(f"🔭 Tracing to {self.path} (trace {self.trace_id})")
+
+    def start_span(self, name: str, **attributes) -> Optional[Span]:
+        """Open a span as a child of the current thread's innermost span (None while idle)"""
+        if not self.enabled:
+            return None
+        stack = self._stack()
+        span = Span(name, os.urandom(8).hex(), stack[-1].span_id if stack else None,
+                    {key: value for key, value in attributes.items() if value is not None})
+        stack.append(span)
+        return span
+
+    def end_span(self, span: Optional[Span], error: Optional[str] = None):
+        """Close a span (and any spans left open inside it) and export it"""
+        if span is None or not self.enabled:
+            return
+        stack = self._stack()
+        if span not in stack:
+            return
+        while stack:
+            current = stack.pop()
+            end_ns = time.time_ns()
+            if current is span and error:
+                current.error = error
+            self._export(current, end_ns)
+            duration = end_ns - current.start_ns
+            if stack:
+                stack[-1].child_ns += duration
+            if current is span:
+                break
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """Time a with-block as a span"""
+        if not self.enabled:
+            yield None
+            return
+        span = self.start_span(name, **attributes)
+        try:
+            yield span
+        except BaseException as e:
+            self.end_span(span, error=f"{type(e).__name__}: {e}")
+            raise
+        self.end_span(span)
+
+    def _export(self, span: Span, end_ns: int):
+        """Append a finished span to the trace file and add it to the totals"""
+        duration = end_ns - span.start_ns
+        record = {
+            'traceId': self.trace_id,
+            'spanId': span.span_id,
+            'parentSpanId': span.parent_id or '',
+            'name': span.name,
+            'kind': 1,
+            'startTimeUnixNano': str(span.start_ns),
+            'endTimeUnixNano': str(end_ns),
+            'attributes': otlp_attributes(dict(span.attributes, **{'thread.id': threading.get_ident()})),
+            'status': {'code': 2, 'message': span.error} if span.error else {'code': 1}
+        }
+        with self._lock:
+            totals = self.totals.setdefault(span.name, [0, 0, 0])
+            totals[0] += 1
+            totals[1] += duration
+            totals[2] += duration - span.child_ns
+            if self._file is not None:
+                self._file.write(json.dumps(record) + "\n")
+
+    def print_summary(self):
+        """Print self-time per span name, largest first"""
+        if not self.totals:
+            return
+        rows = sorted(self.totals.items(), key=lambda item: item[1][2], reverse=True)
+        total_self = sum(totals[2] for _, totals in rows) or 1
+        print(f"\n🔭 Self-time by span ({len(rows)} span names)")
+        print("=" * 72)
+        print(f"  {'span':<32}{'count':>8}{'total s':>11}{'self s':>11}{'self %':>9}")
+        for name, (count, total_ns, self_ns) in rows[:self.settings.summary_top]:
+            print(f"  {name:<32}{count:>8}{total_ns / 1e9:>11.2f}{self_ns / 1e9:>11.2f}"
+                  f"{100 * self_ns / total_self:>8.1f}%")
+
+    def end(self):
+        """Close open spans, write the trace viewer file and print the summary"""
+        if not self.enabled:
+            return
+        stack = self._stack()
+        if stack:
+            self.end_span(stack[0])
+        self.enabled = False
+        with self._lock:
+            self._file.close()
+            self._file = None
+        if self.settings.chrome_trace:
+            chrome_path = write_chrome_trace(self.path, self.trace_id)
+            print(f"🔭 Trace viewer file: {chrome_path} (open in Perfetto or chrome://tracing)")
+        self.print_summary()
+
+def write_chrome_trace(jsonl_path: str, trace_id: Optional[str] = None) -> str:
+    """
+    Convert spans from a JSONL trace file to Chrome trace event format
+
+    Args:
+        jsonl_path: JSONL trace file
+        trace_id: Only convert this trace (None = every trace in the file)
+
+    Returns:
+        str: Path of the written .chrome.json file
+    """
+    events = []
+    with open(jsonl_path, 'r') as f:
+        for line in f:
+            span = json.loads(line)
+            if trace_id and span['traceId'] != trace_id:
+                continue
+            args = {pair['key']: next(iter(pair['value'].values())) for pair in span['attributes']}
+            start_ns = int(span['startTimeUnixNano'])
+            events.append({
+                'name': span['name'],
+                'ph': 'X',
+                'ts': start_ns / 1000,
+                'dur': (int(span['endTimeUnixNano']) - start_ns) / 1000,
+                'pid': 1,
+                'tid': int(args.pop('thread.id', 0)),
+                'args': args
+            })
+    chrome_path = os.path.splitext(jsonl_path)[0] + ".chrome.json"
+    with open(chrome_path, 'w') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+    return chrome_path
+
+_tracer: Optional[Tracer] = None
+
+def get_tracer() -> Tracer:
+    """Get the process-wide tracer"""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+def traced(name: str):
+    """
+    Decorator: run the function inside a span of the given name
+
+    Spans named stage.* also mark a profiler stage while --profile is on.
+    """
+    stage = name[len("stage."):] if name.startswith("stage.") else None
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            tracer = get_tracer()
+            profiler = get_profiler()
+            if not tracer.enabled and not (stage and profiler.active):
+                return func(*args, **kwargs)
+            with tracer.span(name), profiler.stage(stage) if stage else nullcontext():
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
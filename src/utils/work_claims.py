@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Work Claims Utility
+Claims API call units (endpoint + params) with Postgres advisory locks so that
+concurrent collector runs never fetch the same unit twice
+"""
+
+import os
+import json
+import struct
+import hashlib
+import psycopg2
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Set
+from dataclasses import dataclass
+from enum import Enum
+from dotenv import load_dotenv
+
+from utils.collection_ledger import CollectionLedger, ledger_params
+from utils.run_budget import get_run_budget
+from utils.tracing import get_tracer
+
+@dataclass
+class WorkUnit:
+    """One API call unit: endpoint (blacklist naming) plus normalized params"""
+    endpoint: str
+    params: Dict[str, Any]
+
+    @classmethod
+    def of(cls, endpoint: str, **params) -> "WorkUnit":
+        """Build a unit with params normalized like the collection ledger"""
+        return cls(endpoint, ledger_params(**params))
+
+    @property
+    def lock_key(self) -> int:
+        """Signed 64-bit advisory lock key derived from the endpoint and params"""
+        digest = hashlib.sha256(
+            f"{self.endpoint}:{json.dumps(self.params, sort_keys=True)}".encode('utf-8')
+        ).digest()
+        return struct.unpack('>q', digest[:8])[0]
+
+    def __str__(self) -> str:
+        params = ", ".join(f"{name}={value}" for name, value in self.params.items())
+        return f"{self.endpoint}({params})"
+
+class ClaimOutcome(Enum):
+    """Result of a claim; only CLAIMED is truthy"""
+    CLAIMED = "claimed"
+    TAKEN = "taken"        # another run holds the unit or has just collected it
+    DEFERRED = "deferred"  # the run budget is spent; the unit is left for a later run
+
+    def __bool__(self) -> bool:
+        return self is ClaimOutcome.CLAIMED
+
+class WorkClaims:
+    """
+    Session-level advisory locks held on a dedicated connection
+
+    A claim lasts until it is released after the unit's data is committed, or
+    until the process exits and its connection closes, so a crashed run never
+    leaves stale claims behind.
+    """
+
+    def __init__(self, database_url: Optional[str] = None):
+        """Initialize claims (the connection is opened on first use)"""
+        self.database_url = database_url
+        self.held: Set[int] = set()
+        # Open tracing span per claimed unit, closed on release
+        self._unit_spans: Dict[int, Any] = {}
+        self._conn = None
+        self._unavailable = False
+
+    def _cursor(self):
+        """Cursor on the claims connection, or None if the database is unreachable"""
+        if self._unavailable:
+            return None
+        if self._conn is None or self._conn.closed:
+            try:
+                load_dotenv()
+                self._conn = psycopg2.connect(self.database_url or os.getenv('DATABASE_URL'))
+                # Autocommit: locks are session-level, never hold a transaction open
+                self._conn.autocommit = True
+            except Exception as e:
+                print(f"⚠️ Work claims unavailable, continuing without coordination: {e}")
+                self._unavailable = True
+                return None
+        return self._conn.cursor()
+
+    def claim(self, unit: WorkUnit, ledger: Optional[CollectionLedger] = None) -> ClaimOutcome:
+        """
+        Try to claim a unit without waiting
+
+        Args:
+            unit: Work unit to claim
+            ledger: Collection ledger to re-check once claimed; a unit another
+                run collected after the ledger was loaded is not claimed
+
+        Returns:
+            ClaimOutcome: CLAIMED if this run should fetch the unit, TAKEN if
+                another run owns or collected it, DEFERRED once the run budget
+                is spent (the unit stays pending in a checkpointed run)
+        """
+        if not get_run_budget().allows(unit.endpoint, unit.params):
+            return ClaimOutcome.DEFERRED
+
+        cur = self._cursor()
+        if cur is None:
+            self._mark_in_flight(unit, ledger)
+            return ClaimOutcome.CLAIMED
+
+        cur.execute("SELECT pg_try_advisory_lock(%s)", (unit.lock_key,))
+        if not cur.fetchone()[0]:
+            print(f"   ⏭️  {unit} is claimed by another run, skipping")
+            return ClaimOutcome.TAKEN
+        self.held.add(unit.lock_key)
+
+        # Planned from a snapshot; another run may have finished the unit since
+        if ledger is not None and ledger.collected_since_load(unit.endpoint, cur=cur, **unit.params):
+            print(f"   ⏭️  {unit} was collected by another run, skipping")
+            self.release(unit)
+            return ClaimOutcome.TAKEN
+        self._mark_in_flight(unit, ledger)
+        return ClaimOutcome.CLAIMED
+
+    def _mark_in_flight(self, unit: WorkUnit, ledger: Optional[CollectionLedger]):
+        """Checkpoint a claimed unit as in flight when the run is checkpointed, and open its span"""
+        if ledger is not None and ledger.run is not None:
+            ledger.run.mark(unit.endpoint, unit.params, 'in_flight')
+        span = get_tracer().start_span("unit", endpoint=unit.endpoint, **unit.params)
+        if span is not None:
+            self._unit_spans[unit.lock_key] = span
+
+    def release(self, unit: WorkUnit):
+        """Release a claimed unit (call after its data is committed)"""
+        get_tracer().end_span(self._unit_spans.pop(unit.lock_key, None))
+        if unit.lock_key not in self.held:
+            return
+        cur = self._cursor()
+        if cur is not None:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (unit.lock_key,))
+        self.held.discard(unit.lock_key)
+
+    @contextmanager
+    def claimed(self, unit: WorkUnit, ledger: Optional[CollectionLedger] = None) -> Iterator[bool]:
+        """Claim a unit for the duration of a with-block; yields whether it was claimed"""
+        claimed = self.claim(unit, ledger)
+        try:
+            yield claimed
+        finally:
+            if claimed:
+                self.release(unit)
+
+    def close(self):
+        """Release every claim by closing the claims connection"""
+        if self._conn is not None and not self._conn.closed:
+            self._conn.close()
+        self.held.clear()
+
+_claims: Optional[WorkClaims] = None
+
+def load_work_claims(database_url: Optional[str] = None) -> WorkClaims:
+    """Get the process-wide work claims (one advisory lock session per process)"""
+    global _claims
+    if _claims is None:
+        _claims = WorkClaims(database_url)
+    return _claims
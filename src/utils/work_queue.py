@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Work Queue Utility
+Postgres-backed queue of API call units (staging.work_queue) shared by any
+number of worker processes on any number of machines
+"""
+
+import os
+import json
+import yaml
+import psycopg2
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+from utils.work_claims import WorkUnit
+
+class WorkQueueSettings:
+    """Manages lease, retry and polling settings for queue workers"""
+
+    def __init__(self, config_path: str = "config/collection_config.yaml"):
+        """Initialize work queue settings"""
+        self.config_path = config_path
+        self.config = self._load_config()
+
+    def _load_config(self) -> Dict:
+        """Load work queue configuration from config file"""
+        try:
+            with open(self.config_path, 'r') as f:
+                config = yaml.safe_load(f) or {}
+                return config.get('work_queue', {})
+        except Exception as e:
+            print(f"❌ Error loading work queue config: {e}")
+            return {}
+
+    @property
+    def lease_seconds(self) -> int:
+        """How long a leased job stays reserved without a heartbeat"""
+        return self.config.get('lease_seconds', 300)
+
+    @property
+    def heartbeat_seconds(self) -> int:
+        """How often a busy worker extends its lease"""
+        return self.config.get('heartbeat_seconds', max(1, self.lease_seconds // 3))
+
+    @property
+    def max_attempts(self) -> int:
+        """Attempts before a job is dead-lettered"""
+        return self.config.get('max_attempts', 5)
+
+    @property
+    def retry_backoff_seconds(self) -> int:
+        """Delay before the first retry; doubles with each attempt"""
+        return self.config.get('retry_backoff_seconds', 60)
+
+    @property
+    def poll_seconds(self) -> int:
+        """How long an idle worker waits before polling again"""
+        return self.config.get('poll_seconds', 10)
+
+def load_work_queue_settings(config_path: str = "config/collection_config.yaml") -> WorkQueueSettings:
+    """Load work queue settings from configuration"""
+    return WorkQueueSettings(config_path)
+
+@dataclass
+class QueueJob:
+    """A leased work queue job"""
+    id: int
+    unit: WorkUnit
+    scope: Optional[str] = None
+    time_period: Optional[str] = None
+    attempts: int = 0
+    max_attempts: int = 5
+    leased_at: Optional[datetime] = None
+
+class WorkQueue:
+    """Queue operations on one autocommit connection (use one instance per thread)"""
+
+    def __init__(self, settings: Optional[WorkQueueSettings] = None,
+                 database_url: Optional[str] = None):
+        """Initialize the queue and connect"""
+        self.settings = settings or load_work_queue_settings()
+        load_dotenv()
+        self.conn = psycopg2.connect(database_url or os.getenv('DATABASE_URL'))
+        self.conn.autocommit = True
+
+    def close(self):
+        """Close the queue connection"""
+        self.conn.close()
+
+    def enqueue(self, units: Iterable[Tuple[WorkUnit, int]], scope: Optional[str] = None,
+                time_period: Optional[str] = None) -> int:
+        """
+        Add units to the queue
+
+        A unit that is already queued keeps its place (with the better priority);
+        a finished one is queued again; leased and dead jobs are left alone.
+
+        Args:
+            units: (unit, priority) pairs
+            scope: Scope the units were planned for
+            time_period: Time period the units were planned for
+
+        Returns:
+            int: Number of jobs inserted or re-queued
+        """
+        enqueued = 0
+        with self.conn.cursor() as cur:
+            for unit, priority in units:
+                cur.execute("""
+                    INSERT INTO staging.work_queue (
+                        endpoint, params, scope, time_period, priority, max_attempts
+                    ) VALUES (%s, %s::jsonb, %s, %s, %s, %s)
+                    ON CONFLICT ON CONSTRAINT uk_work_queue_unit DO UPDATE SET
+                        priority = LEAST(staging.work_queue.priority, EXCLUDED.priority),
+                        status = 'queued',
+                        attempts = CASE WHEN staging.work_queue.status = 'done' THEN 0
+                                        ELSE staging.work_queue.attempts END,
+                        available_at = CASE WHEN staging.work_queue.status = 'done' THEN CURRENT_TIMESTAMP
+                                            ELSE staging.work_queue.available_at END,
+                        scope = COALESCE(EXCLUDED.scope, staging.work_queue.scope),
+                        time_period = COALESCE(EXCLUDED.time_period, staging.work_queue.time_period),
+                        completed_at = NULL
+                    WHERE staging.work_queue.status IN ('queued', 'done')
+                """, (
+                    unit.endpoint, json.dumps(unit.params), scope, time_period,
+                    priority, self.settings.max_attempts
+                ))
+                enqueued += cur.rowcount
+        return enqueued
+
+    def reap_expired(self) -> int:
+        """Return jobs whose lease expired to the queue, or dead-letter them when out of attempts"""
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                UPDATE staging.work_queue
+                SET status = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END,
+                    last_error = 'lease expired (worker ' || COALESCE(leased_by, '?') || ' stopped heartbeating)',
+                    leased_by = NULL,
+                    lease_until = NULL
+                WHERE id IN (
+                    SELECT id FROM staging.work_queue
+                    WHERE status = 'leased' AND lease_until < CURRENT_TIMESTAMP
+                    FOR UPDATE SKIP LOCKED
+                )
+            """)
+            return cur.rowcount
+
+    def lease(self, worker_id: str) -> Optional[QueueJob]:
+        """
+        Lease the next ready job without waiting on other workers
+
+        Args:
+            worker_id: Identifier of the leasing worker
+
+        Returns:
+            QueueJob, or None if no job is ready
+        """
+        self.reap_expired()
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                UPDATE staging.work_queue q
+                SET status = 'leased',
+                    attempts = q.attempts + 1,
+                    leased_by = %s,
+                    lease_until = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                    heartbeat_at = CURRENT_TIMESTAMP
+                FROM (
+                    SELECT id FROM staging.work_queue
+                    WHERE status = 'queued' AND available_at <= CURRENT_TIMESTAMP
+                    ORDER BY priority, available_at, id
+                    FOR UPDATE SKIP LOCKED
+                    LIMIT 1
+                ) next_job
+                WHERE q.id = next_job.id
+                RETURNING q.id, q.endpoint, q.params, q.scope, q.time_period,
+                          q.attempts, q.max_attempts, q.heartbeat_at
+            """, (worker_id, self.settings.lease_seconds))
+            row = cur.fetchone()
+
+        if row is None:
+            return None
+        return QueueJob(
+            id=row[0],
+            unit=WorkUnit(row[1], row[2]),
+            scope=row[3],
+            time_period=row[4],
+            attempts=row[5],
+            max_attempts=row[6],
+            leased_at=row[7]
+        )
+
+    def heartbeat(self, job: QueueJob, worker_id: str) -> bool:
+        """Extend a lease; False if the job is no longer leased by this worker"""
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                UPDATE staging.work_queue
+                SET lease_until = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                    heartbeat_at = CURRENT_TIMESTAMP
+                WHERE id = %s AND status = 'leased' AND leased_by = %s
+            """, (self.settings.lease_seconds, job.id, worker_id))
+            return cur.rowcount == 1
+
+    def complete(self, job: QueueJob, worker_id: str) -> bool:
+        """Mark a leased job done; False if the lease was lost meanwhile"""
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                UPDATE staging.work_queue
+                SET status = 'done', completed_at = CURRENT_TIMESTAMP,
+                    leased_by = NULL, lease_until = NULL, last_error = NULL
+                WHERE id = %s AND status = 'leased' AND leased_by = %s
+            """, (job.id, worker_id))
+            return cur.rowcount == 1
+
+    def fail(self, job: QueueJob, worker_id: str, error: str, retry: bool = True) -> str:
+        """
+        Record a failed attempt: retry later with exponential backoff, or dead-letter
+
+        Args:
+            job: Leased job
+            worker_id: Identifier of the leasing worker
+            error: Error description
+            retry: False to dead-letter immediately (e.g. no handler for the unit)
+
+        Returns:
+            str: New job status ('queued' or 'dead')
+        """
+        status = 'queued' if retry and job.attempts < job.max_attempts else 'dead'
+        backoff = self.settings.retry_backoff_seconds * 2 ** max(0, job.attempts - 1)
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                UPDATE staging.work_queue
+                SET status = %s, last_error = %s,
+                    available_at = CURRENT_TIMESTAMP + make_interval(secs => %s),
+                    leased_by = NULL, lease_until = NULL
+                WHERE id = %s AND status = 'leased' AND leased_by = %s
+            """, (status, error, backoff, job.id, worker_id))
+        return status
+
+    def requeue_dead(self, endpoint: Optional[str] = None) -> int:
+        """Give dead-lettered jobs a fresh set of attempts"""
+        query = """
+            UPDATE staging.work_queue
+            SET status = 'queued', attempts = 0, available_at = CURRENT_TIMESTAMP
+            WHERE status = 'dead'
+        """
+        params = []
+        if endpoint:
+            query += " AND endpoint = %s"
+            params.append(endpoint)
+        with self.conn.cursor() as cur:
+            cur.execute(query, params)
+            return cur.rowcount
+
+    def summary(self) -> Dict[str, Dict[str, int]]:
+        """Count jobs by endpoint and status"""
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT endpoint, status, COUNT(*)
+                FROM staging.work_queue
+                GROUP BY endpoint, status
+                ORDER BY endpoint, status
+            """)
+            counts: Dict[str, Dict[str, int]] = {}
+            for endpoint, status, count in cur.fetchall():
+                counts.setdefault(endpoint, {})[status] = count
+            return counts
+
+    def dead_letters(self, limit: int = 20) -> List[Tuple[str, Dict[str, Any], int, Optional[str], datetime]]:
+        """Most recently dead-lettered jobs: (endpoint, params, attempts, last_error, updated_at)"""
+        with self.conn.cursor() as cur:
+            cur.execute("""
+                SELECT endpoint, params, attempts, last_error, updated_at
+                FROM staging.work_queue
+                WHERE status = 'dead'
+                ORDER BY updated_at DESC
+                LIMIT %s
+            """, (limit,))
+            return cur.fetchall()
@@ -43,7 +43,8 @@ def verify_countries_data():
             with conn.cursor() as cur:
                 cur.execute("""
                     SELECT country_name, country_code, governing_body, 
-                           num_clubs, num_players, national_teams, raw_data
+                           num_clubs, num_players, national_teams,
+                           staging.raw_payload(raw_data_hash) AS raw_data
                     FROM staging.countries 
                     ORDER BY country_code
                 """)
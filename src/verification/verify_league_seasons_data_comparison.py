@@ -73,7 +73,8 @@ def verify_league_seasons_data():
                 with conn.cursor() as cur:
                     cur.execute("""
                         SELECT season_id, competition_name, num_squads,
-                               champion, top_scorer_player, top_scorer_goals, raw_data
+                               champion, top_scorer_player, top_scorer_goals,
+                               staging.raw_payload(raw_data_hash) AS raw_data
                         FROM staging.league_seasons 
                         WHERE league_id = %s
                         ORDER BY season_id
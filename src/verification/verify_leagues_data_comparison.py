@@ -50,7 +50,8 @@ def verify_leagues_data():
                 with conn.cursor() as cur:
                     cur.execute("""
                         SELECT league_id, competition_name, gender, first_season, 
-                               last_season, tier, league_type, raw_data
+                               last_season, tier, league_type,
+                               staging.raw_payload(raw_data_hash) AS raw_data
                         FROM staging.leagues 
                         WHERE country_code = %s
                         ORDER BY league_id